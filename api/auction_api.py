@@ -4,9 +4,12 @@
 """
 
 from typing import Dict, Any, List
-from core.game_engine import game_engine
-from core.auction_system import auction_system
+from core.session_store import get_current_session
+from core.game_config import GameConfig
 from core.item_system import item_system
+from core.game_logger import get_logger
+
+logger = get_logger('auction')
 
 
 class AuctionAPI:
@@ -15,9 +18,12 @@ class AuctionAPI:
     @staticmethod
     def setup_auction(auction_items: List[Dict[str, Any]]) -> Dict[str, Any]:
         """オークション出品を設定"""
+        session = get_current_session()
+        engine = session.engine
+        auction = session.auction_system
         try:
             # 既存のオークション出品をクリア
-            game_engine.state['auction_items'] = []
+            engine.clear_auction_items()
             
             # 新しい出品を設定
             valid_items = []
@@ -29,10 +35,10 @@ class AuctionAPI:
                     continue
                 
                 # インベントリから商品を検索
-                item = game_engine.remove_from_inventory(item_id)
+                item = engine.remove_from_inventory(item_id)
                 if item:
-                    auction_item = auction_system.create_auction_item(item, float(start_price))
-                    game_engine.add_to_auction(auction_item)
+                    auction_item = auction.create_auction_item(item, float(start_price))
+                    engine.add_to_auction(auction_item)
                     valid_items.append({
                         'item_id': item_id,
                         'start_price': start_price,
@@ -55,10 +61,28 @@ class AuctionAPI:
             }
     
     @staticmethod
-    def start_auction() -> Dict[str, Any]:
+    def start_auction(*, client_version: int = None) -> Dict[str, Any]:
+        """
+        オークションを開始し、結果に状態差分（data.delta）を付ける
+        
+        Args:
+            client_version: クライアントが保持している状態バージョン（差分の基準）
+        """
+        engine = get_current_session().engine
+        with engine.record_changes(client_version) as changes:
+            result = AuctionAPI._start_auction()
+        if result['success']:
+            result['data']['delta'] = changes.to_delta()
+        return result
+    
+    @staticmethod
+    def _start_auction() -> Dict[str, Any]:
         """オークションを開始"""
+        session = get_current_session()
+        engine = session.engine
+        auction = session.auction_system
         try:
-            current_auction_items = game_engine.get_state()['auction_items']
+            current_auction_items = engine.view()['auction_items'].to_list()
             
             if not current_auction_items:
                 return {
@@ -67,7 +91,7 @@ class AuctionAPI:
                 }
             
             # オークション設定の妥当性をチェック
-            valid, error_message = auction_system.validate_auction_setup(current_auction_items)
+            valid, error_message = auction.validate_auction_setup(current_auction_items)
             if not valid:
                 return {
                     'success': False,
@@ -75,52 +99,59 @@ class AuctionAPI:
                 }
             
             # オークションを実行（詳細ログ付き）
-            results = auction_system.simulate_auction(current_auction_items, verbose=True)
+            results = auction.simulate_auction(current_auction_items, verbose=True)
             
-            # 結果を処理
+            # 結果を処理（履歴用にジャンル・仕入れ値を出品から引く）
+            listed = {auction_item['item']['id']: auction_item['item'] for auction_item in current_auction_items}
             total_revenue = 0
             total_profit = 0
             sold_count = 0
             failed_count = 0
             
-            print(f"\n🔍 オークション結果処理開始:")
+            logger.debug("オークション結果処理開始")
             
             for result in results:
+                item = listed.get(result['item_id'], {})
+                session.record_event(
+                    'auction', item_id=result['item_id'], genre=item.get('genre'), base_value=item.get('base_value'),
+                    sold=result['sold'], start_price=result['start_price'], final_price=result['final_price'],
+                    bid_count=result['bid_count'], winner_id=result['winner_id'],
+                    profit=auction.calculate_profit(result['final_price']) if result['sold'] else 0)
                 if result['sold']:
                     sold_count += 1
                     revenue = result['final_price']
-                    profit = auction_system.calculate_profit(revenue)
+                    profit = auction.calculate_profit(revenue)
                     total_revenue += revenue
                     total_profit += profit
                     
                     # お金を獲得
-                    game_engine.earn_money(profit)
+                    engine.earn_money(profit)
                     
                     # オークションアイテムを売却済みにマーク
-                    game_engine.update_auction_item(result['item_id'], {
+                    engine.update_auction_item(result['item_id'], {
                         'sold': True,
                         'final_price': revenue,
                         'winner_id': result['winner_id']
                     })
                     
-                    print(f"   ✅ 商品ID:{result['item_id']} 売却完了 → オークションから削除")
+                    logger.debug("✅ 商品ID:%s 売却完了 → オークションから削除", result['item_id'])
                 else:
                     failed_count += 1
                     # 売却失敗した商品を在庫に戻す
-                    failed_item = game_engine.get_auction_item(result['item_id'])
+                    failed_item = engine.get_auction_item(result['item_id'])
                     if failed_item:
                         # 商品を在庫に復元
-                        game_engine.add_to_inventory([failed_item['item']])
+                        engine.add_to_inventory([failed_item['item']])
                         # オークションから削除（在庫復元なし版を使用）
-                        game_engine.remove_auction_item_without_restore(result['item_id'])
-                        print(f"   ❌ 商品ID:{result['item_id']} 売却失敗 → 在庫に復元")
+                        engine.remove_auction_item_without_restore(result['item_id'])
+                        logger.debug("❌ 商品ID:%s 売却失敗 → 在庫に復元", result['item_id'])
                     else:
-                        print(f"   ❌ 商品ID:{result['item_id']} 売却失敗 → 商品が見つかりません")
+                        logger.warning("❌ 商品ID:%s 売却失敗 → 商品が見つかりません", result['item_id'])
             
             # 売却済みアイテムのみをクリア（失敗したものは残す）
-            game_engine.clear_sold_auction_items()
+            engine.clear_sold_auction_items()
             
-            print(f"🔍 処理後のオークションアイテム数: {len(game_engine.get_state()['auction_items'])}個")
+            logger.debug("処理後のオークションアイテム数: %d個", len(engine.state['auction_items']))
             
             return {
                 'success': True,
@@ -134,8 +165,8 @@ class AuctionAPI:
                         'total_profit': round(total_profit, 2),
                         'average_sale_price': round(total_revenue / max(sold_count, 1), 2) if sold_count > 0 else 0
                     },
-                    'new_money': game_engine.get_state()['money'],
-                    'remaining_auction_items': len(game_engine.get_state()['auction_items'])
+                    'new_money': engine.state['money'],
+                    'remaining_auction_items': len(engine.state['auction_items'])
                 }
             }
         
@@ -148,8 +179,9 @@ class AuctionAPI:
     @staticmethod
     def cancel_auction_item(item_id: int) -> Dict[str, Any]:
         """オークション出品を取り消し"""
+        engine = get_current_session().engine
         try:
-            auction_item = game_engine.remove_from_auction(item_id)
+            auction_item = engine.remove_from_auction(item_id)
             
             if auction_item:
                 return {
@@ -175,6 +207,9 @@ class AuctionAPI:
     @staticmethod
     def preview_auction(auction_items: List[Dict[str, Any]]) -> Dict[str, Any]:
         """オークションの事前予測"""
+        session = get_current_session()
+        engine = session.engine
+        auction = session.auction_system
         try:
             # 仮の出品アイテムを作成
             temp_auction_items = []
@@ -185,9 +220,9 @@ class AuctionAPI:
                 if not item_id or not start_price:
                     continue
                 
-                item = game_engine.get_inventory_item(item_id)
+                item = engine.get_inventory_item(item_id)
                 if item:
-                    auction_item = auction_system.create_auction_item(item, float(start_price))
+                    auction_item = auction.create_auction_item(item, float(start_price))
                     temp_auction_items.append(auction_item)
             
             if not temp_auction_items:
@@ -197,7 +232,7 @@ class AuctionAPI:
                 }
             
             # 予測を実行
-            preview_result = auction_system.preview_auction(temp_auction_items)
+            preview_result = auction.preview_auction(temp_auction_items)
             
             return {
                 'success': True,
@@ -213,9 +248,9 @@ class AuctionAPI:
     @staticmethod
     def get_auction_status() -> Dict[str, Any]:
         """現在のオークション状況を取得"""
+        engine = get_current_session().engine
         try:
-            state = game_engine.get_state()
-            auction_items = state['auction_items']
+            auction_items = engine.view()['auction_items']
             
             # 各出品アイテムの詳細情報
             detailed_items = []
@@ -249,22 +284,48 @@ class AuctionAPI:
             }
     
     @staticmethod
-    def get_auction_history() -> Dict[str, Any]:
-        """オークション履歴を取得（将来の機能）"""
-        # TODO: 実装予定
-        return {
-            'success': True,
-            'data': {
-                'history': [],
-                'message': 'オークション履歴機能は実装予定です'
+    def get_auction_history(limit: int = None, before_id: int = None) -> Dict[str, Any]:
+        """
+        オークション結果の履歴を新しい順に取得（ゲームストアから、キーセットページング）
+        
+        Args:
+            limit: 件数（省略時は GameConfig.HISTORY_PAGE_SIZE、最大 GameConfig.HISTORY_PAGE_MAX）
+            before_id: 前ページの next_before_id（このIDより古い履歴を取得）
+        """
+        session = get_current_session()
+        if limit is None:
+            limit = GameConfig.HISTORY_PAGE_SIZE
+        if not 0 < limit <= GameConfig.HISTORY_PAGE_MAX:
+            return {
+                'success': False,
+                'error': f'件数は1～{GameConfig.HISTORY_PAGE_MAX}で指定してください'
+            }
+        if session.store is None:
+            return {
+                'success': True,
+                'data': {
+                    'history': [],
+                    'next_before_id': None,
+                    'message': 'ゲームストアが無効のため履歴は保存されていません'
+                }
+            }
+        try:
+            return {
+                'success': True,
+                'data': session.store.history_page(session, 'auction', limit, before_id)
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f'履歴の取得に失敗しました: {str(e)}'
             }
-        }
     
     @staticmethod
     def get_auction_statistics() -> Dict[str, Any]:
         """オークション統計情報を取得"""
+        auction = get_current_session().auction_system
         try:
-            stats = auction_system.get_auction_statistics()
+            stats = auction.get_auction_statistics()
             
             return {
                 'success': True,
@@ -288,10 +349,11 @@ class AuctionAPI:
     def update_auction_settings(fee_rate: float = None, duration_rounds: int = None, 
                                bid_threshold: float = None) -> Dict[str, Any]:
         """オークション設定を更新"""
+        auction = get_current_session().auction_system
         try:
-            auction_system.update_settings(fee_rate, duration_rounds, bid_threshold)
+            auction.update_settings(fee_rate, duration_rounds, bid_threshold)
             
-            updated_stats = auction_system.get_auction_statistics()
+            updated_stats = auction.get_auction_statistics()
             
             return {
                 'success': True,
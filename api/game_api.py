@@ -4,7 +4,7 @@
 """
 
 from typing import Dict, Any
-from core.game_engine import game_engine
+from core.session_store import get_current_session
 from core.item_system import item_system
 
 
@@ -14,28 +14,42 @@ class GameAPI:
     @staticmethod
     def get_game_state() -> Dict[str, Any]:
         """ゲーム状態を取得"""
+        engine = get_current_session().engine
         return {
             'success': True,
-            'data': game_engine.get_state()
+            'data': engine.get_state()
+        }
+    
+    @staticmethod
+    def get_game_state_view() -> Dict[str, Any]:
+        """ゲーム状態の読み取り専用ビューを取得（テンプレート描画用、コピーなし）"""
+        engine = get_current_session().engine
+        return {
+            'success': True,
+            'data': engine.view()
         }
     
     @staticmethod
     def get_game_summary() -> Dict[str, Any]:
         """ゲーム状態のサマリーを取得"""
+        engine = get_current_session().engine
         return {
             'success': True,
-            'data': game_engine.get_summary()
+            'data': engine.get_summary()
         }
     
     @staticmethod
     def reset_game() -> Dict[str, Any]:
-        """ゲームをリセット"""
+        """ゲームをリセット（履歴も新しいゲームの分から記録し直す）"""
+        session = get_current_session()
+        engine = session.engine
         try:
-            game_engine.reset_game()
+            engine.reset_game()
+            session.clear_history()
             return {
                 'success': True,
                 'message': 'ゲームがリセットされました',
-                'data': game_engine.get_state()
+                'data': engine.get_state()
             }
         except Exception as e:
             return {
@@ -46,8 +60,8 @@ class GameAPI:
     @staticmethod
     def get_inventory() -> Dict[str, Any]:
         """在庫一覧を取得"""
-        state = game_engine.get_state()
-        inventory = state['inventory']
+        engine = get_current_session().engine
+        inventory = engine.view()['inventory']
         
         # 在庫アイテムに表示用情報を追加
         enhanced_inventory = [
@@ -59,26 +73,50 @@ class GameAPI:
             'success': True,
             'data': {
                 'inventory': enhanced_inventory,
-                'summary': item_system.get_inventory_summary(inventory)
+                'summary': engine.get_inventory_summary()
             }
         }
     
+    @staticmethod
+    def get_turn_info() -> Dict[str, Any]:
+        """ターン情報を取得"""
+        turn_system = get_current_session().turn_system
+        return {
+            'success': True,
+            'data': turn_system.get_turn_info()
+        }
+    
     @staticmethod
     def get_auction_items() -> Dict[str, Any]:
         """出品中のアイテム一覧を取得"""
-        state = game_engine.get_state()
+        engine = get_current_session().engine
         return {
             'success': True,
             'data': {
-                'auction_items': state['auction_items']
+                'auction_items': engine.view()['auction_items'].to_list()
             }
         }
     
     @staticmethod
-    def save_game(filepath: str) -> Dict[str, Any]:
-        """ゲーム状態を保存"""
+    def save_game(filepath: str, save_format: str = 'json') -> Dict[str, Any]:
+        """
+        ゲーム状態を保存
+        
+        Args:
+            filepath: 保存先
+            save_format: 'json'（スナップショット + ジャーナル） / 'binary'（列指向のバイナリ、読み込み時は自動判別）
+        """
+        if save_format not in ('json', 'binary'):
+            return {
+                'success': False,
+                'error': f'不明な保存形式です: {save_format}'
+            }
+        engine = get_current_session().engine
         try:
-            game_engine.save_state(filepath)
+            if save_format == 'binary':
+                engine.save_state_binary(filepath)
+            else:
+                engine.save_state(filepath)
             return {
                 'success': True,
                 'message': f'ゲーム状態を {filepath} に保存しました'
@@ -92,13 +130,14 @@ class GameAPI:
     @staticmethod
     def load_game(filepath: str) -> Dict[str, Any]:
         """ゲーム状態を読み込み"""
+        engine = get_current_session().engine
         try:
-            success = game_engine.load_state(filepath)
+            success = engine.load_state(filepath)
             if success:
                 return {
                     'success': True,
                     'message': f'ゲーム状態を {filepath} から読み込みました',
-                    'data': game_engine.get_state()
+                    'data': engine.get_state()
                 }
             else:
                 return {
@@ -114,8 +153,9 @@ class GameAPI:
     @staticmethod
     def export_game_json() -> Dict[str, Any]:
         """ゲーム状態をJSONとして出力"""
+        engine = get_current_session().engine
         try:
-            json_data = game_engine.export_state_json()
+            json_data = engine.export_state_json()
             return {
                 'success': True,
                 'data': json_data
@@ -129,13 +169,14 @@ class GameAPI:
     @staticmethod
     def import_game_json(json_data: str) -> Dict[str, Any]:
         """JSON文字列からゲーム状態を読み込み"""
+        engine = get_current_session().engine
         try:
-            success = game_engine.import_state_json(json_data)
+            success = engine.import_state_json(json_data)
             if success:
                 return {
                     'success': True,
                     'message': 'ゲーム状態をインポートしました',
-                    'data': game_engine.get_state()
+                    'data': engine.get_state()
                 }
             else:
                 return {
@@ -151,9 +192,10 @@ class GameAPI:
     @staticmethod
     def get_item_by_id(item_id: int) -> Dict[str, Any]:
         """IDでアイテムを取得"""
+        engine = get_current_session().engine
         try:
             # 在庫から検索
-            item = game_engine.get_inventory_item(item_id)
+            item = engine.get_inventory_item(item_id)
             if item:
                 return {
                     'success': True,
@@ -164,7 +206,7 @@ class GameAPI:
                 }
             
             # オークション中から検索
-            auction_item = game_engine.get_auction_item(item_id)
+            auction_item = engine.get_auction_item(item_id)
             if auction_item:
                 return {
                     'success': True,
@@ -193,9 +235,10 @@ class GameAPI:
     @staticmethod
     def get_statistics() -> Dict[str, Any]:
         """統計情報を取得"""
+        engine = get_current_session().engine
         try:
-            state = game_engine.get_state()
-            summary = game_engine.get_summary()
+            state = engine.view()
+            summary = engine.get_summary()
             
             return {
                 'success': True,
@@ -210,7 +253,7 @@ class GameAPI:
                             summary['total_profit'] / max(state['statistics']['turn_count'], 1), 2
                         )
                     },
-                    'inventory_stats': item_system.get_inventory_summary(state['inventory'])
+                    'inventory_stats': engine.get_inventory_summary()
                 }
             }
         except Exception as e:
@@ -218,6 +261,27 @@ class GameAPI:
                 'success': False,
                 'error': f'統計情報の取得に失敗しました: {str(e)}'
             }
+    
+    @staticmethod
+    def get_history_summary() -> Dict[str, Any]:
+        """タイムトラベル・オークション履歴の集計を取得（ゲームストアのSQL集計）"""
+        session = get_current_session()
+        if session.store is None:
+            return {
+                'success': False,
+                'error': 'ゲームストアが無効のため履歴は保存されていません'
+            }
+        try:
+            session.store.save_session(session)
+            return {
+                'success': True,
+                'data': session.store.get_history_summary(session.session_id)
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f'履歴の集計に失敗しました: {str(e)}'
+            }
 
 
 # APIインスタンス
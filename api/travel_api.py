@@ -4,10 +4,16 @@
 """
 
 from typing import Dict, Any
-from core.game_engine import game_engine
+from core.session_store import get_current_session
+from core.game_config import GameConfig
 from core.item_system import item_system
+from core.travel_table import travel_table
+from core.travel_model import evaluate_travel
+from core.invest_planner import investment_planner
 from core.asset_manager import AssetManager
-import random
+from core.game_logger import get_logger
+
+logger = get_logger('travel')
 
 
 class TravelAPI:
@@ -16,6 +22,8 @@ class TravelAPI:
     @staticmethod
     def calculate_travel_cost(years: int, distance: int) -> Dict[str, Any]:
         """タイムトラベルコストを計算（フェーズ2: UFOサイズ廃止）"""
+        session = get_current_session()
+        engine = session.engine
         try:
             # パラメータ検証
             valid, error_message = item_system.validate_travel_parameters(years, distance)
@@ -28,13 +36,11 @@ class TravelAPI:
             # 投資コスト計算
             investment_cost = item_system.calculate_travel_cost(years, distance)
             
-            # 現在のゲーム状態取得
-            current_state = game_engine.get_state()
-            current_money = current_state['money']
-            current_inventory = current_state['inventory']
+            # 現在の所持金
+            current_money = engine.state['money']
             
-            # 資産・固定費計算
-            assets = AssetManager.calculate_assets(current_money, current_inventory)
+            # 資産・固定費計算（台帳から取得）
+            assets = engine.get_assets()
             fixed_cost = AssetManager.calculate_fixed_cost(assets)
             
             # 購入可能性判定
@@ -54,8 +60,8 @@ class TravelAPI:
                     'current_money': current_money,
                     'affordable': can_afford,
                     'afford_message': afford_message,
-                    'estimated_items': random.randint(2, 5),  # 新仕様: 2-5個固定
-                    'rarity_multiplier': item_system.calculate_rarity_multiplier(years, distance)
+                    'estimated_items': session.rng.randint(2, 5),  # 新仕様: 2-5個固定
+                    'rarity_multiplier': travel_table.rarity_multiplier(years, distance)
                 }
             }
         except Exception as e:
@@ -75,12 +81,20 @@ class TravelAPI:
             
             # 新仕様: 期待値計算
             investment_cost = cost_result['data']['investment_cost']
-            estimated_items = random.randint(2, 5)  # 2-5個固定
+            estimated_items = get_current_session().rng.randint(2, 5)  # 2-5個固定
+            
+            # 新仕様: 投資額±10%の期待値（早見表から取得）
+            value_range = travel_table.lookup(years, distance)['value_range']
+            expected_min_total = value_range['min']
+            expected_max_total = value_range['max']
+            expected_avg_total = value_range['avg']
             
-            # 新仕様: 投資額±10%の期待値
-            expected_min_total = investment_cost * 0.9
-            expected_max_total = investment_cost * 1.1
-            expected_avg_total = investment_cost
+            # 現在の価格倍率での価値分布・リスク（解析モデル）
+            engine = get_current_session().engine
+            analytic_outcome = evaluate_travel(
+                years, distance, cost_result['data']['current_money'], cost_result['data']['assets'],
+                engine.turn_system.get_current_price_multiplier()
+            )
             
             return {
                 'success': True,
@@ -97,6 +111,7 @@ class TravelAPI:
                             'avg': round(expected_avg_total - investment_cost, 2)
                         }
                     },
+                    'analytic_outcome': analytic_outcome,
                     'risk_assessment': {
                         'failure_rate': 0.1,  # 10%失敗率
                         'high_risk': cost_result['data']['total_cost'] > cost_result['data']['assets'] * 0.8,
@@ -115,15 +130,30 @@ class TravelAPI:
             }
     
     @staticmethod
-    def execute_travel(years: int, distance: int) -> Dict[str, Any]:
+    def execute_travel(years: int, distance: int, *, client_version: int = None) -> Dict[str, Any]:
+        """
+        タイムトラベルを実行し、結果に状態差分（data.delta）を付ける
+        
+        Args:
+            client_version: クライアントが保持している状態バージョン（差分の基準）
+        """
+        engine = get_current_session().engine
+        with engine.record_changes(client_version) as changes:
+            result = TravelAPI._execute_travel(years, distance)
+        if result['success']:
+            result['data']['delta'] = changes.to_delta()
+        return result
+    
+    @staticmethod
+    def _execute_travel(years: int, distance: int) -> Dict[str, Any]:
         """タイムトラベルを実行（フェーズ2: UFOサイズ廃止・固定費統合）"""
+        session = get_current_session()
+        engine = session.engine
         try:
-            current_state = game_engine.get_state()
-            current_money = current_state['money']
-            current_inventory = current_state['inventory']
+            current_money = engine.state['money']
             
             # 事前チェック: 資産・固定費・購入可能性
-            assets = AssetManager.calculate_assets(current_money, current_inventory)
+            assets = engine.get_assets()
             fixed_cost = AssetManager.calculate_fixed_cost(assets)
             investment_cost = item_system.calculate_travel_cost(years, distance)
             
@@ -134,29 +164,40 @@ class TravelAPI:
                     'error': afford_message
                 }
             
-            # タイムトラベル結果を取得
-            travel_result = item_system.get_travel_result(years, distance, current_money)
+            # タイムトラベル結果を取得（履歴にはターンが進む前の倍率・ターンを記録する）
+            price_multiplier = engine.turn_system.get_current_price_multiplier()
+            turn = {'major_turn': engine.turn_system.major_turn, 'minor_turn': engine.turn_system.minor_turn}
+            travel_result = item_system.get_travel_result(
+                years, distance, current_money,
+                price_multiplier=price_multiplier,
+                rng=session.rng,
+                id_allocator=engine.id_allocator
+            )
             
             if not travel_result['success']:
                 return travel_result
             
             # フェーズ2: 固定費徴収
             total_cost = investment_cost + fixed_cost
-            if not game_engine.spend_money(total_cost):
+            if not engine.spend_money(total_cost):
                 return {
                     'success': False,
                     'error': '資金が不足しています（固定費含む）'
                 }
             
-            print(f"[TravelAPI] 資金消費完了: 投資{investment_cost}円 + UFO代金{fixed_cost}円 = 合計{total_cost}円")
+            logger.debug("資金消費完了: 投資%s円 + UFO代金%s円 = 合計%s円", investment_cost, fixed_cost, total_cost)
             
             # 失敗時の処理
             if travel_result['failed']:
                 # ゲームオーバー判定
-                new_state = game_engine.get_state()
-                new_assets = AssetManager.calculate_assets(new_state['money'], new_state['inventory'])
+                new_assets = engine.get_assets()
                 new_fixed_cost = AssetManager.calculate_fixed_cost(new_assets)
                 is_game_over = AssetManager.check_game_over(new_assets, new_fixed_cost)
+                session.record_event(
+                    'travel', years=years, distance=distance, price_multiplier=price_multiplier,
+                    investment_cost=investment_cost, fixed_cost=fixed_cost, total_cost=total_cost,
+                    failed=True, item_count=0, total_value=0, money_after=engine.state['money'],
+                    assets_after=new_assets, **turn)
                 
                 return {
                     'success': True,
@@ -167,7 +208,7 @@ class TravelAPI:
                         'total_cost': total_cost,
                         'items': [],
                         'message': travel_result['message'],
-                        'new_money': new_state['money'],
+                        'new_money': engine.state['money'],
                         'new_assets': new_assets,
                         'game_over': is_game_over
                     }
@@ -175,7 +216,7 @@ class TravelAPI:
             
             # 成功時の処理
             items = travel_result['items']
-            game_engine.add_to_inventory(items)
+            engine.add_to_inventory(items)
             
             # 表示用のアイテム情報を生成
             display_items = [
@@ -184,10 +225,14 @@ class TravelAPI:
             ]
             
             # 最終状態とゲームオーバー判定
-            final_state = game_engine.get_state()
-            final_assets = AssetManager.calculate_assets(final_state['money'], final_state['inventory'])
+            final_assets = engine.get_assets()
             final_fixed_cost = AssetManager.calculate_fixed_cost(final_assets)
             is_game_over = AssetManager.check_game_over(final_assets, final_fixed_cost)
+            session.record_event(
+                'travel', years=years, distance=distance, price_multiplier=price_multiplier,
+                investment_cost=investment_cost, fixed_cost=fixed_cost, total_cost=total_cost,
+                failed=False, item_count=len(items), total_value=travel_result['total_value'],
+                money_after=engine.state['money'], assets_after=final_assets, **turn)
             
             return {
                 'success': True,
@@ -200,14 +245,14 @@ class TravelAPI:
                     'item_count': len(items),
                     'total_value': travel_result['total_value'],
                     'message': travel_result['message'],
-                    'new_money': final_state['money'],
+                    'new_money': engine.state['money'],
                     'new_assets': final_assets,
-                    'new_inventory_count': len(final_state['inventory']),
+                    'new_inventory_count': len(engine.state['inventory']),
                     'game_over': is_game_over,
                     'travel_info': {
                         'years': years,
                         'distance': distance,
-                        'rarity_multiplier': item_system.calculate_rarity_multiplier(years, distance)
+                        'rarity_multiplier': travel_table.rarity_multiplier(years, distance)
                     }
                 }
             }
@@ -219,32 +264,120 @@ class TravelAPI:
             }
     
     @staticmethod
-    def get_travel_history() -> Dict[str, Any]:
-        """タイムトラベル履歴を取得（将来の機能）"""
-        # TODO: 実装予定
-        return {
-            'success': True,
-            'data': {
-                'history': [],
-                'message': 'タイムトラベル履歴機能は実装予定です'
+    def get_travel_history(limit: int = None, before_id: int = None,
+                           major_from: int = None, major_to: int = None) -> Dict[str, Any]:
+        """
+        タイムトラベル履歴を新しい順に取得（ゲームストアの索引を使うキーセットページング）
+        
+        Args:
+            limit: 件数（省略時は GameConfig.HISTORY_PAGE_SIZE、最大 GameConfig.HISTORY_PAGE_MAX）
+            before_id: 前ページの next_before_id（このIDより古い履歴を取得）
+            major_from: この大ターン以降のみ
+            major_to: この大ターン以前のみ
+        """
+        session = get_current_session()
+        if limit is None:
+            limit = GameConfig.HISTORY_PAGE_SIZE
+        if not 0 < limit <= GameConfig.HISTORY_PAGE_MAX:
+            return {
+                'success': False,
+                'error': f'件数は1～{GameConfig.HISTORY_PAGE_MAX}で指定してください'
+            }
+        if major_from is not None and major_to is not None and major_from > major_to:
+            return {
+                'success': False,
+                'error': '大ターンの範囲が無効です'
+            }
+        if session.store is None:
+            return {
+                'success': True,
+                'data': {
+                    'history': [],
+                    'next_before_id': None,
+                    'message': 'ゲームストアが無効のため履歴は保存されていません'
+                }
+            }
+        try:
+            return {
+                'success': True,
+                'data': session.store.history_page(session, 'travel', limit, before_id, major_from, major_to)
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f'履歴の取得に失敗しました: {str(e)}'
+            }
+    
+    @staticmethod
+    def get_travel_roi(window: int = None, major_from: int = None, major_to: int = None,
+                       limit: int = None) -> Dict[str, Any]:
+        """
+        大ターンごとのタイムトラベル収支・ROIと直近 window 大ターンの移動ROIを取得
+        
+        Args:
+            window: 移動ROIの大ターン数（省略時は GameConfig.TRAVEL_ROI_WINDOW）
+            major_from: この大ターンから（省略時は1、前ページの next_major_from を渡すと次ページ）
+            major_to: この大ターンまで
+            limit: 大ターン数（省略時は GameConfig.HISTORY_PAGE_SIZE、最大 GameConfig.HISTORY_PAGE_MAX）
+        """
+        session = get_current_session()
+        window = GameConfig.TRAVEL_ROI_WINDOW if window is None else window
+        major_from = 1 if major_from is None else major_from
+        limit = GameConfig.HISTORY_PAGE_SIZE if limit is None else limit
+        if not 0 < limit <= GameConfig.HISTORY_PAGE_MAX:
+            return {
+                'success': False,
+                'error': f'件数は1～{GameConfig.HISTORY_PAGE_MAX}で指定してください'
+            }
+        if window < 1 or major_from < 1 or (major_to is not None and major_from > major_to):
+            return {
+                'success': False,
+                'error': '集計範囲が無効です'
+            }
+        if session.store is None:
+            return {
+                'success': False,
+                'error': 'ゲームストアが無効のため履歴は保存されていません'
+            }
+        try:
+            session.store.save_session(session)
+            return {
+                'success': True,
+                'data': session.store.travel_roi(session.session_id, window, major_from, major_to, limit)
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f'ROIの集計に失敗しました: {str(e)}'
             }
-        }
     
     @staticmethod
     def get_travel_recommendations() -> Dict[str, Any]:
-        """おすすめのタイムトラベル先を取得"""
+        """おすすめのタイムトラベル先を取得（各候補の期待利益・リスクは解析モデルで算出）"""
+        engine = get_current_session().engine
         try:
-            current_money = game_engine.get_state()['money']
+            current_money = engine.state['money']
             
             recommendations = []
             
-            # 現在の資産状況取得
-            current_state = game_engine.get_state()
-            assets = AssetManager.calculate_assets(current_money, current_state['inventory'])
+            # 現在の資産状況取得（台帳から取得）
+            assets = engine.get_assets()
+            price_multiplier = engine.turn_system.get_current_price_multiplier()
+            
+            def outlook(params: Dict[str, int]) -> Dict[str, Any]:
+                evaluation = evaluate_travel(params['years'], params['distance'],
+                                             current_money, assets, price_multiplier)
+                return {
+                    'expected_value': evaluation['value']['mean'],
+                    'expected_profit': evaluation['expected_profit'],
+                    'loss_probability': evaluation['loss_probability'],
+                    'game_over_probability': evaluation['game_over_probability']
+                }
             
             # 低コスト・安全志向
             safe_params = {'years': 10, 'distance': 100}
-            safe_cost = item_system.calculate_travel_cost(**safe_params)
+            safe_row = travel_table.lookup(**safe_params)
+            safe_cost = safe_row['cost']
             safe_fixed_cost = AssetManager.calculate_fixed_cost(assets)
             safe_total = safe_cost + safe_fixed_cost
             
@@ -256,12 +389,15 @@ class TravelAPI:
                     'investment_cost': safe_cost,
                     'fixed_cost': safe_fixed_cost,
                     'total_cost': safe_total,
+                    'rarity_multiplier': safe_row['rarity_multiplier'],
+                    **outlook(safe_params),
                     'risk_level': 'Low'
                 })
             
             # バランス型
             balanced_params = {'years': 30, 'distance': 500}
-            balanced_cost = item_system.calculate_travel_cost(**balanced_params)
+            balanced_row = travel_table.lookup(**balanced_params)
+            balanced_cost = balanced_row['cost']
             balanced_total = balanced_cost + safe_fixed_cost  # 固定費は同じ
             
             if balanced_total <= assets:
@@ -272,13 +408,16 @@ class TravelAPI:
                     'investment_cost': balanced_cost,
                     'fixed_cost': safe_fixed_cost,
                     'total_cost': balanced_total,
+                    'rarity_multiplier': balanced_row['rarity_multiplier'],
+                    **outlook(balanced_params),
                     'risk_level': 'Medium'
                 })
             
             # 高リスク・高リターン
             if assets >= 1000:
                 risky_params = {'years': 100, 'distance': 2000}
-                risky_cost = item_system.calculate_travel_cost(**risky_params)
+                risky_row = travel_table.lookup(**risky_params)
+                risky_cost = risky_row['cost']
                 risky_total = risky_cost + safe_fixed_cost
                 
                 if risky_total <= assets * 0.8:  # 資産の80%以下
@@ -289,6 +428,8 @@ class TravelAPI:
                         'investment_cost': risky_cost,
                         'fixed_cost': safe_fixed_cost,
                         'total_cost': risky_total,
+                        'rarity_multiplier': risky_row['rarity_multiplier'],
+                        **outlook(risky_params),
                         'risk_level': 'High'
                     })
             
@@ -298,6 +439,7 @@ class TravelAPI:
                     'recommendations': recommendations,
                     'current_money': current_money,
                     'current_assets': assets,
+                    'price_multiplier': price_multiplier,
                     'fixed_cost_rate': AssetManager.calculate_fixed_cost(assets) / assets if assets > 0 else 0
                 }
             }
@@ -308,6 +450,36 @@ class TravelAPI:
                 'error': f'おすすめの取得に失敗しました: {str(e)}'
             }
     
+    @staticmethod
+    def plan_auto_invest(resale_rate: float = None) -> Dict[str, Any]:
+        """
+        大ターンの残りの子ターンの投資計画を取得（期待資産を最大化する割合と年数・距離）
+        
+        Args:
+            resale_rate: 仕入れた商品を次のターンまでに売却する場合の売却率（省略時は保有を前提に計画）
+        """
+        engine = get_current_session().engine
+        try:
+            plan = investment_planner.plan_for_engine(engine, resale_rate)
+            plan['current_money'] = engine.state['money']
+            return {
+                'success': True,
+                'data': plan
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f'投資計画の作成に失敗しました: {str(e)}'
+            }
+    
+    @staticmethod
+    def get_travel_table() -> Dict[str, Any]:
+        """スライダーUI向けのレア度倍率早見表を取得"""
+        return {
+            'success': True,
+            'data': travel_table.slider_table()
+        }
+    
     @staticmethod
     def _get_travel_recommendation(total_cost: float, expected_value: float, assets: float) -> str:
         """タイムトラベルの推奨度を判定（フェーズ2: 資産ベース）"""
@@ -1,4 +1,5 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for
+from flask import Flask, render_template, request, jsonify, redirect, url_for, session, g, make_response
+from flask.json.provider import DefaultJSONProvider
 import sys
 import os
 
@@ -9,9 +10,73 @@ from api.game_api import game_api
 from api.travel_api import travel_api
 from api.auction_api import auction_api
 from core.game_config import GameConfig
+from core.game_store import create_game_store
+from core.session_store import session_store, activate_session, deactivate_session, get_current_session
+from core.game_logger import get_logger
+from core.item_record import Item
+from core.travel_model import evaluate_travel
+
+logger = get_logger('app')
+
+class GameJSONProvider(DefaultJSONProvider):
+    """商品レコード（Item）をAPI境界で従来形式の辞書に変換するJSONプロバイダ"""
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, Item):
+            return o.to_dict()
+        return DefaultJSONProvider.default(o)
 
 app = Flask(__name__)
+app.json = GameJSONProvider(app)
 app.secret_key = 'timetravel_game_secret_key'
+session_store.attach_store(create_game_store())
+
+@app.before_request
+def bind_game_session():
+    """リクエストごとにCookieのセッションIDからゲーム状態を解決（同じセッションのリクエストは1件ずつ処理）"""
+    game_session = session_store.get_or_create(session.get('game_session_id'))
+    game_session.lock.acquire()
+    g.game_session = game_session  # 以降で失敗しても teardown でロックを解除する
+    session['game_session_id'] = game_session.session_id
+    g.game_session_token = activate_session(game_session)
+
+@app.teardown_request
+def unbind_game_session(exc):
+    """リクエスト終了時にセッションの変更をゲームストアへまとめて書き込み、紐付けとロックを解除"""
+    game_session = g.pop('game_session', None)
+    token = g.pop('game_session_token', None)
+    if game_session is None:
+        return
+    try:
+        session_store.persist(game_session)  # 失敗は障害通知用ロガーに記録され、次のリクエストで再試行
+        if token is not None:
+            deactivate_session(token)
+    finally:
+        game_session.lock.release()
+
+def versioned_response(render):
+    """
+    状態バージョンをETagにした応答を返す
+    
+    If-None-Match が現在の状態と一致すれば render を呼ばずに304を返す。
+    """
+    etag = get_current_session().engine.state_tag
+    if etag in request.if_none_match:
+        response = app.response_class(status=304)
+    else:
+        response = make_response(render())
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def versioned_json(api_call):
+    """読み取りAPIの結果に状態バージョンを付けて返す（ETag付き）"""
+    def render():
+        result = api_call()
+        result['state_version'] = get_current_session().engine.state_version
+        return jsonify(result)
+    return versioned_response(render)
 
 @app.route('/')
 def index():
@@ -21,18 +86,17 @@ def index():
 @app.route('/buy')
 def buy_mode():
     """買うモードページ（フェーズ2: UFOサイズ廃止）"""
-    from core.turn_system import turn_system
-    from core.asset_manager import AssetManager
     
-    result = game_api.get_game_state()
+    result = game_api.get_game_state_view()
     game_state = result['data']
     
     # フェーズ2: 目標倍率と資産情報を追加
-    target_multiplier = turn_system.get_target_multiplier()
-    asset_info = AssetManager.get_asset_info(game_state['money'], game_state['inventory'])
+    target_multiplier = get_current_session().turn_system.get_target_multiplier()
+    asset_info = game_state['asset_info']
     
     return render_template('buy.html', 
                          game_state=game_state,
+                         state_version=get_current_session().engine.state_version,
                          target_multiplier=target_multiplier,
                          asset_info=asset_info,
                          travel_limits={
@@ -43,12 +107,17 @@ def buy_mode():
                              'default_years': GameConfig.DEFAULT_YEARS,
                              'default_distance': GameConfig.DEFAULT_DISTANCE
                          },
-                         auto_invest_options=GameConfig.AUTO_INVEST_OPTIONS)
+                         auto_invest_options=GameConfig.AUTO_INVEST_OPTIONS,
+                         travel_table=travel_api.get_travel_table()['data'])
 
 @app.route('/sell')
 def sell_mode():
-    """売るモードページ"""
-    game_result = game_api.get_game_state()
+    """売るモードページ（状態が変わっていなければ304）"""
+    return versioned_response(render_sell_page)
+
+def render_sell_page():
+    """売るモードページを描画"""
+    game_result = game_api.get_game_state_view()
     inventory_result = game_api.get_inventory()
     auction_result = game_api.get_auction_items()
     
@@ -56,8 +125,67 @@ def sell_mode():
                          game_state=game_result['data'],
                          inventory=inventory_result['data']['inventory'],
                          auction_items=auction_result['data']['auction_items'],
+                         state_version=get_current_session().engine.state_version,
                          max_auction_items=GameConfig.MAX_AUCTION_ITEMS)
 
+@app.route('/api/state')
+def api_state():
+    """ゲーム状態取得API（ETag対応）"""
+    return versioned_json(game_api.get_game_state)
+
+@app.route('/api/inventory')
+def api_inventory():
+    """在庫一覧取得API（ETag対応）"""
+    return versioned_json(game_api.get_inventory)
+
+@app.route('/api/auction/items')
+def api_auction_items():
+    """出品一覧取得API（ETag対応）"""
+    return versioned_json(game_api.get_auction_items)
+
+@app.route('/api/turn')
+def api_turn():
+    """ターン情報取得API（ETag対応）"""
+    return versioned_json(game_api.get_turn_info)
+
+@app.route('/api/travel/table')
+def api_travel_table():
+    """レア度倍率早見表API（ゲーム状態に依存しないためキャッシュ可）"""
+    response = jsonify(travel_api.get_travel_table())
+    response.headers['Cache-Control'] = 'public, max-age=3600'
+    return response
+
+@app.route('/api/travel/history')
+def api_travel_history():
+    """タイムトラベル履歴API（新しい順、before_id で次ページ、major_from / major_to で大ターン範囲）"""
+    result = travel_api.get_travel_history(request.args.get('limit', type=int),
+                                           request.args.get('before_id', type=int),
+                                           request.args.get('major_from', type=int),
+                                           request.args.get('major_to', type=int))
+    return jsonify(result), (200 if result['success'] else 400)
+
+@app.route('/api/travel/roi')
+def api_travel_roi():
+    """大ターンごとのタイムトラベルROI・移動ROI API（next_major_from で次ページ）"""
+    result = travel_api.get_travel_roi(request.args.get('window', type=int),
+                                       request.args.get('major_from', type=int),
+                                       request.args.get('major_to', type=int),
+                                       request.args.get('limit', type=int))
+    return jsonify(result), (200 if result['success'] else 400)
+
+@app.route('/api/auction/history')
+def api_auction_history():
+    """オークション結果履歴API（新しい順、before_id で次ページ）"""
+    result = auction_api.get_auction_history(request.args.get('limit', type=int),
+                                             request.args.get('before_id', type=int))
+    return jsonify(result), (200 if result['success'] else 400)
+
+@app.route('/api/history/summary')
+def api_history_summary():
+    """タイムトラベル・オークション履歴の集計API"""
+    result = game_api.get_history_summary()
+    return jsonify(result), (200 if result['success'] else 400)
+
 @app.route('/api/buy', methods=['POST'])
 def api_buy():
     """商品購入API（フェーズ2: UFOサイズ廃止・固定費統合）"""
@@ -66,7 +194,7 @@ def api_buy():
         years = int(data['years'])
         distance = int(data['distance'])
         
-        result = travel_api.execute_travel(years, distance)
+        result = travel_api.execute_travel(years, distance, client_version=data.get('state_version'))
         
         if result['success']:
             return jsonify(result)
@@ -84,6 +212,8 @@ def api_auction_setup():
         result = auction_api.setup_auction(data['items'])
         
         if result['success']:
+            # 続くオークション開始の差分基準としてバージョンを返す
+            result['state_version'] = get_current_session().engine.state_version
             return jsonify(result)
         else:
             return jsonify(result), 400
@@ -95,7 +225,8 @@ def api_auction_setup():
 def api_auction_start():
     """1分間オークション開始API"""
     try:
-        result = auction_api.start_auction()
+        data = request.get_json(silent=True) or {}
+        result = auction_api.start_auction(client_version=data.get('state_version'))
         
         if result['success']:
             return jsonify(result)
@@ -141,71 +272,116 @@ def api_reset():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 400
 
+@app.route('/api/auto_invest/plan')
+def api_auto_invest_plan():
+    """大ターンの残りの子ターンの投資計画API（ETag付き）"""
+    resale_rate = request.args.get('resale_rate', type=float)
+    return versioned_json(lambda: travel_api.plan_auto_invest(resale_rate))
+
 @app.route('/api/auto_invest', methods=['POST'])
 def api_auto_invest():
-    """自動投資API（フェーズ2: 指定割合でUFO代金を引いた金額から投資）"""
+    """自動投資API（フェーズ2: 指定割合でUFO代金を引いた金額から投資、strategy=plan で投資プランナーの推奨に従う）"""
     try:
-        from core.game_engine import game_engine
         from core.asset_manager import AssetManager
-        from core.turn_system import turn_system
-        import random
+        from core.item_system import item_system
+        
+        game_session = get_current_session()
+        engine = game_session.engine
         
         data = request.get_json()
-        ratio = float(data.get('ratio', 1.0))  # 投資割合（0.1〜1.0）
+        strategy = data.get('strategy', 'ratio')  # ratio: 指定割合 / plan: 投資プランナーの推奨
         
-        if ratio < 0.1 or ratio > 1.0:
+        if strategy not in ('ratio', 'plan'):
             return jsonify({
                 'success': False,
-                'error': f'投資割合は0.1〜1.0の範囲で指定してください。指定値: {ratio}'
+                'error': f'不明な投資方法です: {strategy}'
             })
         
-        # 現在の状態取得
-        current_state = game_engine.get_state()
-        current_money = current_state['money']
-        current_inventory = current_state['inventory']
+        # 現在の所持金
+        current_money = engine.state['money']
         
-        # 資産・固定費計算
-        assets = AssetManager.calculate_assets(current_money, current_inventory)
+        # 資産・固定費計算（台帳から取得）
+        assets = engine.get_assets()
         fixed_cost = AssetManager.calculate_fixed_cost(assets)
         
         # 投資可能額 = 現金 - 固定費
         available_for_investment = current_money - fixed_cost
         
-        if available_for_investment <= 0:
-            return jsonify({
-                'success': False,
-                'error': f'投資可能額がありません。現金: {current_money}円, 固定費: {fixed_cost:.2f}円'
-            })
-        
-        # 指定割合で投資額を計算
-        target_investment = available_for_investment * ratio
-        
-        if target_investment < 1:
-            return jsonify({
-                'success': False,
-                'error': f'投資額が1円未満です。投資可能額: {available_for_investment:.2f}円 × {ratio*100:.0f}% = {target_investment:.2f}円'
-            })
-        
-        # 年数と距離を適当に割り振り（平方根で分配）
-        sqrt_investment = target_investment ** 0.5
-        base_years = int(sqrt_investment * random.uniform(0.5, 1.5))
-        base_distance = int(target_investment / max(base_years, 1))
-        
-        # 制限内に収める
-        years = max(GameConfig.YEARS_MIN, min(base_years, GameConfig.YEARS_MAX))
-        distance = max(GameConfig.DISTANCE_MIN, min(base_distance, GameConfig.DISTANCE_MAX))
+        if strategy == 'plan':
+            # 残りの子ターンの価格倍率を見て、今のターンの投資割合・年数・距離を決める
+            resale_rate = data.get('resale_rate')
+            plan = travel_api.plan_auto_invest(None if resale_rate is None else float(resale_rate))
+            if not plan['success']:
+                return jsonify(plan)
+            step = plan['data']['recommendation']
+            if step is None:
+                return jsonify({
+                    'success': False,
+                    'error': f'固定費を払える現金がありません。現金: {current_money}円, 固定費: {fixed_cost:.2f}円'
+                })
+            if step['skip']:
+                # 投資しないのが最適なターン（タイムトラベルは実行しない）
+                return jsonify({
+                    'success': True,
+                    'skipped': True,
+                    'message': (f"このターンは投資を見送るのが最適です（価格倍率{step['price_multiplier']:.2f}x）。"
+                                "ターンを進める場合は手動でタイムトラベルしてください"),
+                    'auto_invest_info': {
+                        'strategy': strategy,
+                        'ratio': step['ratio'],
+                        'ratio_percent': step['ratio'] * 100,
+                        'available_for_investment': available_for_investment,
+                        'target_investment': step['target_investment'],
+                        'plan': plan['data']
+                    }
+                })
+            ratio = step['ratio']
+            target_investment = step['target_investment']
+            years, distance = step['years'], step['distance']
+        else:
+            ratio = float(data.get('ratio', 1.0))  # 投資割合（0.1〜1.0）
+            
+            if ratio < 0.1 or ratio > 1.0:
+                return jsonify({
+                    'success': False,
+                    'error': f'投資割合は0.1〜1.0の範囲で指定してください。指定値: {ratio}'
+                })
+            
+            if available_for_investment <= 0:
+                return jsonify({
+                    'success': False,
+                    'error': f'投資可能額がありません。現金: {current_money}円, 固定費: {fixed_cost:.2f}円'
+                })
+            
+            # 指定割合で投資額を計算
+            target_investment = available_for_investment * ratio
+            
+            if target_investment < 1:
+                return jsonify({
+                    'success': False,
+                    'error': f'投資額が1円未満です。投資可能額: {available_for_investment:.2f}円 × {ratio*100:.0f}% = {target_investment:.2f}円'
+                })
+            
+            # 年数と距離を割り振り（平方根で分配・制限内に収める）
+            years, distance = item_system.split_investment(target_investment, rng=game_session.rng)
         
         # 実際のコストを計算
         actual_investment = years * distance
         total_cost = actual_investment + fixed_cost
         
-        print(f"[AutoInvest] {ratio*100:.0f}%投資: 投資可能額{available_for_investment:.2f}円 × {ratio} = 目標{target_investment:.2f}円 → 年数{years}年 × 距離{distance}km = 実際{actual_investment}円")
+        logger.debug("自動投資 %.0f%%: 投資可能額%.2f円 × %s = 目標%.2f円 → 年数%d年 × 距離%dkm = 実際%d円",
+                     ratio * 100, available_for_investment, ratio, target_investment, years, distance, actual_investment)
+        
+        # 実行前の期待値・リスク（解析モデル、購入時の価格倍率で評価）
+        expected_outcome = evaluate_travel(years, distance, current_money, assets,
+                                           engine.turn_system.get_current_price_multiplier())
         
         # タイムトラベル実行
-        result = travel_api.execute_travel(years, distance)
+        result = travel_api.execute_travel(years, distance, client_version=data.get('state_version'))
         
         if result['success']:
             result['auto_invest_info'] = {
+                'strategy': strategy,
                 'ratio': ratio,
                 'ratio_percent': ratio * 100,
                 'available_for_investment': available_for_investment,
@@ -214,8 +390,11 @@ def api_auto_invest():
                 'calculated_distance': distance,
                 'actual_investment': actual_investment,
                 'fixed_cost': fixed_cost,
-                'total_cost': total_cost
+                'total_cost': total_cost,
+                'expected_outcome': expected_outcome
             }
+            if strategy == 'plan':
+                result['auto_invest_info']['plan'] = plan['data']
         
         return jsonify(result)
         
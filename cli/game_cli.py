@@ -127,6 +127,32 @@ class GameCLI:
         
         return True
     
+    def show_investment_plan(self, as_json=False, resale_rate=None):
+        """投資計画表示（大ターンの残りの子ターン）"""
+        result = travel_api.plan_auto_invest(resale_rate)
+        if not result['success']:
+            print(f"Error planning investment: {result.get('error', 'Unknown error')}")
+            return False
+        
+        plan = result['data']
+        if as_json:
+            print(json.dumps(plan, ensure_ascii=False, indent=2))
+            return True
+        
+        print(f"\n=== 投資計画 (残り{plan['remaining_turns']}ターン) ===")
+        for step in plan['steps']:
+            if step['skip']:
+                invest = "投資見送り"
+            else:
+                invest = (f"投資{step['ratio'] * 100:.0f}% "
+                          f"({step['years']}年×{step['distance']}km={step['investment']}円)")
+            print(f"{step['major_turn']}-{step['minor_turn']}: 倍率{step['price_multiplier']:.2f}x {invest} "
+                  f"固定費{step['fixed_cost']}円 → 期待資産{step['expected_assets']}円")
+        if not plan['covers_major_turn']:
+            print("⚠️ 現金が残りの固定費に足りません。在庫を売却してください")
+        print(f"大ターン終了時の期待資産: {plan['expected_final_assets']}円 ({plan['expected_growth']}倍)")
+        return True
+    
     def setup_auction(self):
         """オークション設定"""
         inventory_result = game_api.get_inventory()
@@ -231,6 +257,7 @@ s, state      - ゲーム状態表示
 i, inventory  - 在庫表示
 a, auction    - 出品商品表示
 b, buy        - タイムトラベル（商品購入）
+p, plan       - 投資計画（残りの子ターン）
 o, sell       - オークション設定
 r, run        - オークション実行
 reset         - ゲームリセット
@@ -265,6 +292,9 @@ q, quit       - 終了
                 elif command in ['b', 'buy']:
                     self.execute_travel()
                     
+                elif command in ['p', 'plan']:
+                    self.show_investment_plan()
+                    
                 elif command in ['o', 'sell']:
                     self.setup_auction()
                     
@@ -308,6 +338,8 @@ def run_command_mode(args):
         else:
             print("Error: --years, --distance required for buy command")
             return False
+    elif args.command == 'plan':
+        return cli.show_investment_plan(as_json=args.json, resale_rate=args.resale_rate)
     elif args.command == 'reset':
         result = game_api.reset_game()
         print("Game reset" if result['success'] else f"Error: {result.get('error')}")
@@ -324,6 +356,7 @@ def main():
     parser.add_argument('--command', '-c', help='Command to execute (for automation)')
     parser.add_argument('--years', type=int, help='Years for travel')
     parser.add_argument('--distance', type=int, help='Distance for travel')
+    parser.add_argument('--resale-rate', type=float, help='Expected resale rate for plan (default: hold items)')
     parser.add_argument('--json', action='store_true', help='Output in JSON format')
     
     args = parser.parse_args()
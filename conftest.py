@@ -0,0 +1,8 @@
+"""
+pytest 共通設定
+テスト中はゲームストアをプロセス内（:memory:）にし、instance/ のデータベースに書き込まない
+"""
+
+import os
+
+os.environ.setdefault('TIMETRAVEL_DB_PATH', ':memory:')
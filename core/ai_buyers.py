@@ -3,9 +3,19 @@
 オークションでの自動入札者を管理
 """
 
-import random
 from typing import Dict, List, Any, Tuple
+from core.bid_history import BidHistory
+from core.game_config import GameConfig
 from core.item_system import ItemSystem
+from core.rng import resolve_rng
+
+try:
+    import numpy as np
+except ImportError:  # NumPy未導入環境では純Pythonで同じ計算を行う
+    np = None
+
+# ジャンル名 → ジャンル行列の列番号
+GENRE_INDEX = {genre: i for i, genre in enumerate(ItemSystem.GENRES)}
 
 
 class AIBuyer:
@@ -13,7 +23,7 @@ class AIBuyer:
     
     def __init__(self, buyer_id: int, interested_genres: List[str], 
                  condition_preference: float, rarity_preference: float, 
-                 price_sensitivity: float):
+                 price_sensitivity: float, rng=None):
         """
         AIバイヤー初期化
         
@@ -23,13 +33,15 @@ class AIBuyer:
             condition_preference: 状態への関心度 (0.5-1.0)
             rarity_preference: 希少性への関心度 (0.8-1.5)
             price_sensitivity: 価格感度 (0.5-1.2)
+            rng: 入札額の揺らぎに使う乱数生成器（省略時はグローバルのrandom）
         """
         self.id = buyer_id
         self.interested_genres = interested_genres
         self.condition_preference = condition_preference
         self.rarity_preference = rarity_preference
         self.price_sensitivity = price_sensitivity
-        self.bid_history = []
+        self.bid_history = BidHistory()  # 直近の入札（固定長）と入札数・落札数のカウンタ
+        self.rng = resolve_rng(rng)
     
     def calculate_interest(self, item: Dict[str, Any], price: float) -> float:
         """商品への興味度を計算"""
@@ -65,9 +77,12 @@ class AIBuyer:
     def calculate_bid_amount(self, item: Dict[str, Any], current_price: float) -> float:
         """入札額を計算"""
         interest = self.calculate_interest(item, current_price)
-        
+        return self.bid_amount_for_interest(current_price, interest)
+    
+    def bid_amount_for_interest(self, current_price: float, interest: float) -> float:
+        """計算済みの興味度から入札額を計算"""
         # 興味度に基づいて入札額を決定
-        base_increase = current_price * random.uniform(0.05, 0.15)
+        base_increase = current_price * self.rng.uniform(0.05, 0.15)
         interest_multiplier = min(interest, 2.0)
         bid_increase = base_increase * interest_multiplier
         
@@ -75,12 +90,7 @@ class AIBuyer:
     
     def record_bid(self, item_id: int, bid_amount: float, won: bool) -> None:
         """入札履歴を記録"""
-        self.bid_history.append({
-            'item_id': item_id,
-            'bid_amount': bid_amount,
-            'won': won,
-            'timestamp': random.random()  # 簡易タイムスタンプ
-        })
+        self.bid_history.record(item_id, bid_amount, won, self.rng.random())  # 簡易タイムスタンプ
     
     def get_profile(self) -> Dict[str, Any]:
         """バイヤーのプロフィール情報を取得"""
@@ -92,79 +102,261 @@ class AIBuyer:
                 'rarity_preference': self.rarity_preference,
                 'price_sensitivity': self.price_sensitivity
             },
-            'bid_count': len(self.bid_history),
-            'wins': sum(1 for bid in self.bid_history if bid['won'])
+            'bid_count': self.bid_history.total_count,
+            'wins': self.bid_history.win_count
         }
 
 
 class AIBuyerManager:
     """AIバイヤー管理システム"""
     
-    def __init__(self):
-        """AIバイヤーマネージャー初期化"""
+    def __init__(self, rng=None):
+        """
+        AIバイヤーマネージャー初期化
+        
+        Args:
+            rng: バイヤー生成・入札に使う乱数生成器（random.Random / NumPy Generator、
+                 省略時はグローバルのrandom）
+        """
+        self.rng = resolve_rng(rng)
         self.buyers = []
+        # バイヤーパラメータ行列（buyersと同じ並び）
+        self._genre_mask = None         # (バイヤー数, ジャンル数) の興味ジャンル行列
+        self._condition_pref = None
+        self._rarity_pref = None
+        self._price_sensitivity = None
+        self._matrix_buyer_count = -1
+        self._next_buyer_id = 0  # 次に生成するバイヤーのID（入れ替えても重複しない）
         self.initialize_buyers()
     
-    def initialize_buyers(self, count: int = 15) -> None:
+    def initialize_buyers(self, count: int = None) -> None:
         """AIバイヤーを初期化（より多様性を確保）"""
-        self.buyers = []
+        if count is None:
+            count = GameConfig.AI_BUYER_COUNT
+        self._next_buyer_id = 0
+        self.buyers = [self._create_buyer(slot) for slot in range(count)]
+        self.refresh_buyer_matrix()
+    
+    def _create_buyer(self, slot: int) -> AIBuyer:
+        """
+        バイヤー枠 slot に入る新しいバイヤーを生成（IDは通し番号）
         
-        # 全ジャンルが最低1人は興味を持つバイヤーがいるようにする
+        全ジャンルが最低1人は興味を持つバイヤーがいるように、先頭の枠はジャンルごとに固定する
+        """
         all_genres = ItemSystem.GENRES.copy()
+        if slot < len(all_genres):
+            # 最初の数人は各ジャンルを確実にカバー
+            primary_genre = all_genres[slot]
+            # プライマリジャンル + 1-2個の追加ジャンル
+            additional_genres = self.rng.sample([g for g in all_genres if g != primary_genre], 
+                                                self.rng.randint(1, 2))
+            interested_genres = [primary_genre] + additional_genres
+        else:
+            # 残りは完全ランダム（2-4個のジャンル）
+            interested_genres = self.rng.sample(
+                all_genres, 
+                self.rng.randint(2, 4)
+            )
         
-        for i in range(count):
-            if i < len(all_genres):
-                # 最初の数人は各ジャンルを確実にカバー
-                primary_genre = all_genres[i]
-                # プライマリジャンル + 1-2個の追加ジャンル
-                additional_genres = random.sample([g for g in all_genres if g != primary_genre], 
-                                                random.randint(1, 2))
-                interested_genres = [primary_genre] + additional_genres
-            else:
-                # 残りは完全ランダム（2-4個のジャンル）
-                interested_genres = random.sample(
-                    all_genres, 
-                    random.randint(2, 4)
-                )
-            
-            # パラメータをランダム生成（幅を広げて多様性向上）
-            condition_preference = random.uniform(0.3, 1.2)
-            rarity_preference = random.uniform(0.6, 1.8)
-            price_sensitivity = random.uniform(0.3, 1.5)
+        # パラメータをランダム生成（幅を広げて多様性向上）
+        condition_preference = self.rng.uniform(0.3, 1.2)
+        rarity_preference = self.rng.uniform(0.6, 1.8)
+        price_sensitivity = self.rng.uniform(0.3, 1.5)
+        
+        buyer = AIBuyer(
+            buyer_id=self._next_buyer_id,
+            interested_genres=interested_genres,
+            condition_preference=condition_preference,
+            rarity_preference=rarity_preference,
+            price_sensitivity=price_sensitivity,
+            rng=self.rng
+        )
+        self._next_buyer_id += 1
+        return buyer
+    
+    def refresh_buyers(self, fraction: float = None, count: int = None) -> List[int]:
+        """
+        バイヤーの一部だけを新しいバイヤーに入れ替える（オークション開始時に呼ぶ）
+        
+        残ったバイヤーは入札履歴を保ったまま次のオークションに参加する。
+        入れ替えたバイヤーは同じ枠の規則（ジャンルカバー）で生成し、パラメータ行列も該当行だけ更新する。
+        
+        Args:
+            fraction: 入れ替える割合（省略時は GameConfig.AI_BUYER_REFRESH_RATE）
+            count: バイヤー総数（省略時は GameConfig.AI_BUYER_COUNT、現在の人数と異なる場合は全員を生成し直す）
             
-            buyer = AIBuyer(
-                buyer_id=i,
-                interested_genres=interested_genres,
-                condition_preference=condition_preference,
-                rarity_preference=rarity_preference,
-                price_sensitivity=price_sensitivity
-            )
+        Returns:
+            入れ替えた枠の番号（buyers 内の位置）
+        """
+        if fraction is None:
+            fraction = GameConfig.AI_BUYER_REFRESH_RATE
+        if count is None:
+            count = GameConfig.AI_BUYER_COUNT
+        if len(self.buyers) != count:
+            self.initialize_buyers(count)
+            return list(range(count))
+        
+        replace_count = min(count, max(0, round(count * fraction)))
+        slots = sorted(self.rng.sample(range(count), replace_count))
+        for slot in slots:
+            self.buyers[slot] = self._create_buyer(slot)
+        self._update_matrix_rows(slots)
+        return slots
+    
+    def refresh_buyer_matrix(self) -> None:
+        """バイヤーパラメータ行列を再構築（buyersを差し替えた後に呼ぶ）"""
+        genre_rows = [
+            [genre in buyer.interested_genres for genre in ItemSystem.GENRES]
+            for buyer in self.buyers
+        ]
+        condition_pref = [buyer.condition_preference for buyer in self.buyers]
+        rarity_pref = [buyer.rarity_preference for buyer in self.buyers]
+        price_sensitivity = [buyer.price_sensitivity for buyer in self.buyers]
+        
+        if np is not None:
+            self._genre_mask = np.array(genre_rows, dtype=bool).reshape(len(self.buyers), len(ItemSystem.GENRES))
+            self._condition_pref = np.array(condition_pref, dtype=np.float64)
+            self._rarity_pref = np.array(rarity_pref, dtype=np.float64)
+            self._price_sensitivity = np.array(price_sensitivity, dtype=np.float64)
+        else:
+            self._genre_mask = genre_rows
+            self._condition_pref = condition_pref
+            self._rarity_pref = rarity_pref
+            self._price_sensitivity = price_sensitivity
+        self._matrix_buyer_count = len(self.buyers)
+    
+    def _update_matrix_rows(self, slots: List[int]) -> None:
+        """入れ替えた枠の行だけパラメータ行列を更新"""
+        if self._matrix_buyer_count != len(self.buyers):
+            self.refresh_buyer_matrix()
+            return
+        for slot in slots:
+            buyer = self.buyers[slot]
+            genre_row = [genre in buyer.interested_genres for genre in ItemSystem.GENRES]
+            if np is not None:
+                self._genre_mask[slot, :] = genre_row
+            else:
+                self._genre_mask[slot] = genre_row
+            self._condition_pref[slot] = buyer.condition_preference
+            self._rarity_pref[slot] = buyer.rarity_preference
+            self._price_sensitivity[slot] = buyer.price_sensitivity
+    
+    def calculate_interests(self, item: Dict[str, Any], price: float) -> List[float]:
+        """
+        全バイヤーの興味度を一括計算（buyersと同じ並び）
+        
+        AIBuyer.calculate_interest と同じ演算順序で計算するため結果は完全に一致する
+        """
+        if self._matrix_buyer_count != len(self.buyers):
+            self.refresh_buyer_matrix()
+        if not self.buyers:
+            return []
+        
+        genre_index = GENRE_INDEX.get(item['genre'])
+        if genre_index is None:
+            return [0.0] * len(self.buyers)
+        
+        condition_multiplier = ItemSystem.CONDITIONS[item['condition']]['multiplier']
+        rarity_score = item.get('rarity_multiplier', 1.0)
+        value_ratio = item['base_value'] / price if price > 0 else None
+        
+        if np is not None:
+            interest = np.ones(len(self.buyers))
+            interest *= condition_multiplier * self._condition_pref
+            interest *= rarity_score * self._rarity_pref
+            if value_ratio is not None:
+                interest *= np.minimum(2.0, value_ratio * self._price_sensitivity)
+            interest[~self._genre_mask[:, genre_index]] = 0.0
+            # 丸めはPythonのround()に合わせる（np.roundとは端数処理が異なる場合がある）
+            return [round(value, 3) for value in interest.tolist()]
+        
+        interests = []
+        for i in range(len(self.buyers)):
+            if not self._genre_mask[i][genre_index]:
+                interests.append(0.0)
+                continue
+            interest = 1.0
+            interest *= condition_multiplier * self._condition_pref[i]
+            interest *= rarity_score * self._rarity_pref[i]
+            if value_ratio is not None:
+                interest *= min(2.0, value_ratio * self._price_sensitivity[i])
+            interests.append(round(interest, 3))
+        return interests
+    
+    def item_parameters(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """興味度行列計算用に商品属性を配列化（NumPy必須）"""
+        genre_index = np.array([GENRE_INDEX.get(item['genre'], -1) for item in items], dtype=np.intp)
+        return {
+            'genre_index': genre_index,
+            'known_genre': genre_index >= 0,
+            'condition_multiplier': np.array(
+                [ItemSystem.CONDITIONS[item['condition']]['multiplier'] for item in items], dtype=np.float64),
+            'rarity_score': np.array([item.get('rarity_multiplier', 1.0) for item in items], dtype=np.float64),
+            'base_value': np.array([item['base_value'] for item in items], dtype=np.float64),
+        }
+    
+    def calculate_interest_matrix(self, item_params: Dict[str, Any], prices) -> 'np.ndarray':
+        """
+        商品×バイヤーの興味度行列を一括計算（NumPy必須）
+        
+        Args:
+            item_params: item_parameters() の戻り値
+            prices: 商品ごとの現在価格
             
-            self.buyers.append(buyer)
+        Returns:
+            (商品数, バイヤー数) の興味度行列（小数3桁に丸め済み）
+        """
+        if np is None:
+            raise RuntimeError("興味度行列の計算にはNumPyが必要です")
+        if self._matrix_buyer_count != len(self.buyers):
+            self.refresh_buyer_matrix()
+        
+        prices = np.asarray(prices, dtype=np.float64)
+        interest = np.ones((len(prices), len(self.buyers)))
+        interest *= item_params['condition_multiplier'][:, None] * self._condition_pref[None, :]
+        interest *= item_params['rarity_score'][:, None] * self._rarity_pref[None, :]
+        
+        positive = prices > 0
+        value_ratio = np.divide(item_params['base_value'], prices,
+                                out=np.zeros_like(prices), where=positive)
+        price_factor = np.minimum(2.0, value_ratio[:, None] * self._price_sensitivity[None, :])
+        interest *= np.where(positive[:, None], price_factor, 1.0)
+        
+        genre_match = self._genre_mask[:, item_params['genre_index']].T & item_params['known_genre'][:, None]
+        interest[~genre_match] = 0.0
+        return np.round(interest, 3)
+    
+    def get_interested_buyers_with_interest(self, item: Dict[str, Any], current_price: float,
+                                            threshold: float = 0.3) -> List[Tuple[AIBuyer, float]]:
+        """商品に興味を持つバイヤーと興味度の組を取得"""
+        interests = self.calculate_interests(item, current_price)
+        return [
+            (buyer, interest)
+            for buyer, interest in zip(self.buyers, interests)
+            if interest >= threshold
+        ]
     
     def get_interested_buyers(self, item: Dict[str, Any], 
                             current_price: float, threshold: float = 0.3) -> List[AIBuyer]:
         """商品に興味を持つバイヤーを取得"""
-        interested = []
-        for buyer in self.buyers:
-            if buyer.should_bid(item, current_price, threshold):
-                interested.append(buyer)
-        return interested
+        return [
+            buyer for buyer, _ in self.get_interested_buyers_with_interest(item, current_price, threshold)
+        ]
     
     def simulate_bidding_round(self, item: Dict[str, Any], 
                               current_price: float, threshold: float = 0.3) -> Tuple[bool, float, AIBuyer]:
         """入札ラウンドをシミュレート"""
-        interested_buyers = self.get_interested_buyers(item, current_price, threshold)
+        interested = self.get_interested_buyers_with_interest(item, current_price, threshold)
         
-        if not interested_buyers:
+        if not interested:
             return False, current_price, None
         
-        # 最も高い入札額を計算
+        # 最も高い入札額を計算（興味度は一括計算済みのものを使用）
         best_buyer = None
         highest_bid = current_price
         
-        for buyer in interested_buyers:
-            bid_amount = buyer.calculate_bid_amount(item, current_price)
+        for buyer, interest in interested:
+            bid_amount = buyer.bid_amount_for_interest(current_price, interest)
             if bid_amount > highest_bid:
                 highest_bid = bid_amount
                 best_buyer = buyer
@@ -188,15 +380,12 @@ class AIBuyerManager:
     def reset_all_histories(self) -> None:
         """全バイヤーの入札履歴をリセット"""
         for buyer in self.buyers:
-            buyer.bid_history = []
+            buyer.bid_history.clear()
     
     def get_statistics(self) -> Dict[str, Any]:
         """AIバイヤーシステムの統計情報を取得"""
-        total_bids = sum(len(buyer.bid_history) for buyer in self.buyers)
-        total_wins = sum(
-            sum(1 for bid in buyer.bid_history if bid['won']) 
-            for buyer in self.buyers
-        )
+        total_bids = sum(buyer.bid_history.total_count for buyer in self.buyers)
+        total_wins = sum(buyer.bid_history.win_count for buyer in self.buyers)
         
         # ジャンル別興味統計
         genre_interest = {}
@@ -2,13 +2,16 @@
 フェーズ2: 資産管理・固定費・ゲームオーバー管理システム
 """
 
-import random
 from typing import Dict, List, Any, Tuple
+from .game_logger import get_logger
+from .rng import resolve_rng
 from .phase2_config import (
     TARGET_MULTIPLIER_MIN, TARGET_MULTIPLIER_MAX, 
     FIXED_COST_RATE, INVENTORY_SELL_RATE, ENABLE_GAME_OVER
 )
 
+logger = get_logger('asset')
+
 
 class AssetManager:
     """資産・固定費・ゲーム状態管理"""
@@ -29,10 +32,8 @@ class AssetManager:
         
         total_assets = cash + inventory_value
         
-        print(f"[AssetManager] 資産計算:")
-        print(f"  現金: {cash:.2f}円")
-        print(f"  在庫価値: {inventory_value:.2f}円 ({len(inventory)}個)")
-        print(f"  総資産: {total_assets:.2f}円")
+        logger.debug("資産計算: 現金=%.2f円 在庫価値=%.2f円 (%d個) 総資産=%.2f円",
+                     cash, inventory_value, len(inventory), total_assets)
         
         return round(total_assets, 2)
     
@@ -44,10 +45,8 @@ class AssetManager:
         """
         fixed_cost = assets * FIXED_COST_RATE
         
-        print(f"[AssetManager] 固定費計算:")
-        print(f"  資産: {assets:.2f}円")
-        print(f"  固定費率: {FIXED_COST_RATE*100:.1f}%")
-        print(f"  UFO代金: {fixed_cost:.2f}円")
+        logger.debug("固定費計算: 資産=%.2f円 固定費率=%.1f%% UFO代金=%.2f円",
+                     assets, FIXED_COST_RATE * 100, fixed_cost)
         
         return round(fixed_cost, 2)
     
@@ -62,10 +61,8 @@ class AssetManager:
             
         is_game_over = assets < fixed_cost
         
-        print(f"[AssetManager] ゲームオーバー判定:")
-        print(f"  資産: {assets:.2f}円")
-        print(f"  必要固定費: {fixed_cost:.2f}円")
-        print(f"  結果: {'ゲームオーバー' if is_game_over else '継続可能'}")
+        logger.debug("ゲームオーバー判定: 資産=%.2f円 必要固定費=%.2f円 結果=%s",
+                     assets, fixed_cost, 'ゲームオーバー' if is_game_over else '継続可能')
         
         return is_game_over
     
@@ -85,34 +82,29 @@ class AssetManager:
             remaining = assets - required_total
             message = f"購入可能（購入後残高: {remaining:.2f}円）"
         
-        print(f"[AssetManager] 購入可能性判定:")
-        print(f"  資産: {assets:.2f}円")
-        print(f"  固定費: {fixed_cost:.2f}円")
-        print(f"  投資額: {investment:.2f}円")
-        print(f"  必要合計: {required_total:.2f}円")
-        print(f"  結果: {message}")
+        logger.debug("購入可能性判定: 資産=%.2f円 固定費=%.2f円 投資額=%.2f円 必要合計=%.2f円 結果=%s",
+                     assets, fixed_cost, investment, required_total, message)
         
         return can_afford, message
     
     @classmethod
-    def generate_target_multiplier(cls) -> float:
+    def generate_target_multiplier(cls, rng=None) -> float:
         """
         目標倍率をランダム生成
-        0.1倍 ～ 10.0倍
+        0.1倍 ～ 10.0倍（rng省略時はグローバルのrandom）
         """
         # 対数スケールでより自然な分布
         import math
         log_min = math.log(TARGET_MULTIPLIER_MIN)
         log_max = math.log(TARGET_MULTIPLIER_MAX)
-        log_value = random.uniform(log_min, log_max)
+        log_value = resolve_rng(rng).uniform(log_min, log_max)
         multiplier = math.exp(log_value)
         
         # 小数点2桁で丸める
         multiplier = round(multiplier, 2)
         
-        print(f"[AssetManager] 目標倍率生成:")
-        print(f"  範囲: {TARGET_MULTIPLIER_MIN:.1f}倍 ～ {TARGET_MULTIPLIER_MAX:.1f}倍")
-        print(f"  生成値: {multiplier:.2f}倍")
+        logger.debug("目標倍率生成: 範囲=%.1f倍～%.1f倍 生成値=%.2f倍",
+                     TARGET_MULTIPLIER_MIN, TARGET_MULTIPLIER_MAX, multiplier)
         
         return multiplier
     
@@ -145,28 +137,48 @@ class AssetManager:
                 sell_value = float(item['base_value']) * INVENTORY_SELL_RATE
                 total_sell_value += sell_value
         
-        print(f"[AssetManager] 在庫売却価値計算:")
-        print(f"  在庫数: {len(inventory)}個")
-        print(f"  売却率: {INVENTORY_SELL_RATE*100:.0f}%")
-        print(f"  売却可能価値: {total_sell_value:.2f}円")
+        logger.debug("在庫売却価値計算: 在庫数=%d個 売却率=%.0f%% 売却可能価値=%.2f円",
+                     len(inventory), INVENTORY_SELL_RATE * 100, total_sell_value)
         
         return round(total_sell_value, 2)
     
+    @classmethod
+    def calculate_assets_from_value(cls, money: float, inventory_value: float) -> float:
+        """
+        集計済みの在庫価値から総資産を計算（在庫を走査しない）
+        資産 = 現金 + 在庫価値合計
+        """
+        total_assets = float(money) + inventory_value
+        
+        logger.debug("資産計算（集計値）: 現金=%.2f円 在庫価値=%.2f円 総資産=%.2f円",
+                     float(money), inventory_value, total_assets)
+        
+        return round(total_assets, 2)
+    
     @classmethod
     def get_asset_info(cls, money: float, inventory: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         資産情報の詳細を取得
         """
-        assets = cls.calculate_assets(money, inventory)
+        inventory_value = sum(float(item['base_value']) for item in inventory if 'base_value' in item)
+        return cls.get_asset_info_from_totals(money, inventory_value, len(inventory))
+    
+    @classmethod
+    def get_asset_info_from_totals(cls, money: float, inventory_value: float,
+                                   inventory_count: int) -> Dict[str, Any]:
+        """
+        集計済みの在庫価値・個数から資産情報の詳細を取得（O(1)）
+        """
+        assets = cls.calculate_assets_from_value(money, inventory_value)
         fixed_cost = cls.calculate_fixed_cost(assets)
-        sell_value = cls.calculate_inventory_sell_value(inventory)
+        sell_value = round(inventory_value * INVENTORY_SELL_RATE, 2)
         is_game_over = cls.check_game_over(assets, fixed_cost)
         
         return {
             'assets': assets,
             'cash': float(money),
             'inventory_value': assets - float(money),
-            'inventory_count': len(inventory),
+            'inventory_count': inventory_count,
             'fixed_cost': fixed_cost,
             'fixed_cost_rate': FIXED_COST_RATE,
             'sell_value': sell_value,
@@ -3,21 +3,39 @@
 オークションの実行とログ出力を担当
 """
 
+import logging
 import time
 from typing import Dict, List, Any, Tuple
-from core.ai_buyers import ai_buyer_manager
+from core.ai_buyers import AIBuyerManager, ai_buyer_manager
+from core.bid_history import auction_bid_log
 from core.item_system import ItemSystem
 from core.game_config import GameConfig
+from core.game_logger import get_logger
+from core.rng import numpy_generator
+
+try:
+    import numpy as np
+except ImportError:  # NumPy未導入環境では一括オークションを逐次処理で代替
+    np = None
+
+logger = get_logger('auction')
 
 
 class AuctionSystem:
     """オークションシステム管理"""
     
-    def __init__(self):
-        """オークションシステム初期化"""
+    def __init__(self, buyer_manager: AIBuyerManager = None):
+        """
+        オークションシステム初期化
+        
+        Args:
+            buyer_manager: 入札に参加させるAIバイヤー管理（省略時はグローバルインスタンス）
+        """
+        self.buyer_manager = buyer_manager if buyer_manager is not None else ai_buyer_manager
         self.auction_fee_rate = GameConfig.AUCTION_FEE_RATE
         self.auction_duration_rounds = GameConfig.AUCTION_DURATION_ROUNDS
         self.bid_threshold = GameConfig.AUCTION_BID_THRESHOLD
+        self.buyer_refresh_rate = GameConfig.AI_BUYER_REFRESH_RATE
     
     def create_auction_item(self, item: Dict[str, Any], start_price: float) -> Dict[str, Any]:
         """オークション出品アイテムを作成"""
@@ -49,32 +67,35 @@ class AuctionSystem:
     def simulate_auction(self, auction_items: List[Dict[str, Any]], 
                         verbose: bool = True) -> List[Dict[str, Any]]:
         """オークションをシミュレート（詳細ログ付き）"""
-        # オークション開始時にAIバイヤーを新規生成（多様性確保）
-        ai_buyer_manager.initialize_buyers()
+        # 詳細ログはauctionロガーがDEBUG有効な場合のみ出力
+        verbose = verbose and logger.isEnabledFor(logging.DEBUG)
+        
+        # オークション開始時にAIバイヤーの一部を入れ替え（多様性確保、残りは入札履歴を保持）
+        replaced = self.buyer_manager.refresh_buyers(self.buyer_refresh_rate)
         
         if verbose:
-            print(f"\n{'='*50}")
-            print(f"オークション開始 - {len(auction_items)}個の商品")
-            print(f"{'='*50}")
-            print(f"🔄 新しいAIバイヤーが参加しました")
+            logger.debug('=' * 50)
+            logger.debug("オークション開始 - %s個の商品", len(auction_items))
+            logger.debug('=' * 50)
+            logger.debug("🔄 新しいAIバイヤーが%s人参加しました", len(replaced))
             
             # AIバイヤー統計情報を表示
-            buyer_stats = ai_buyer_manager.get_statistics()
-            print(f"📊 AIバイヤー統計:")
-            print(f"   - 総バイヤー数: {buyer_stats['total_buyers']}人")
-            print(f"   - ジャンル別興味: {buyer_stats['genre_interest']}")
-            print(f"   - 入札閾値: {self.bid_threshold}")
+            buyer_stats = self.buyer_manager.get_statistics()
+            logger.debug("📊 AIバイヤー統計:")
+            logger.debug("   - 総バイヤー数: %s人", buyer_stats['total_buyers'])
+            logger.debug("   - ジャンル別興味: %s", buyer_stats['genre_interest'])
+            logger.debug("   - 入札閾値: %s", self.bid_threshold)
         
         results = []
         
         for auction_item in auction_items:
             if verbose:
-                print(f"\n--- 商品 ID:{auction_item['item']['id']} のオークション ---")
-                print(f"ジャンル: {auction_item['item']['genre']}")
-                print(f"状態: {auction_item['item']['condition']} ({auction_item['item'].get('condition_name', '')})")
-                print(f"レア度: {auction_item['item']['rarity']} (倍率: {auction_item['item']['rarity_multiplier']})")
-                print(f"基本価値: {auction_item['item']['base_value']}円")
-                print(f"開始価格: {auction_item['start_price']}円")
+                logger.debug("--- 商品 ID:%s のオークション ---", auction_item['item']['id'])
+                logger.debug("ジャンル: %s", auction_item['item']['genre'])
+                logger.debug("状態: %s (%s)", auction_item['item']['condition'], auction_item['item'].get('condition_name', ''))
+                logger.debug("レア度: %s (倍率: %s)", auction_item['item']['rarity'], auction_item['item']['rarity_multiplier'])
+                logger.debug("基本価値: %s円", auction_item['item']['base_value'])
+                logger.debug("開始価格: %s円", auction_item['start_price'])
             
             # 1分間のオークションをシミュレート
             result = self._simulate_single_auction(auction_item, verbose)
@@ -83,38 +104,108 @@ class AuctionSystem:
             if verbose:
                 if result['sold']:
                     profit = result['final_price'] * (1 - self.auction_fee_rate)
-                    print(f"🎉 売却成功! 最終価格: {result['final_price']}円")
-                    print(f"💰 手取り: {profit:.2f}円 (手数料{self.auction_fee_rate*100}%差引後)")
-                    print(f"🏆 落札者: AIバイヤー #{result['winner_id']}")
+                    logger.debug("🎉 売却成功! 最終価格: %s円", result['final_price'])
+                    logger.debug("💰 手取り: %.2f円 (手数料%s%%差引後)", profit, self.auction_fee_rate*100)
+                    logger.debug("🏆 落札者: AIバイヤー #%s", result['winner_id'])
                 else:
-                    print(f"❌ 売却失敗 (入札: {result['bid_count']}回)")
+                    logger.debug("❌ 売却失敗 (入札: %s回)", result['bid_count'])
         
         if verbose:
-            print(f"\n{'='*50}")
-            print("オークション終了")
+            logger.debug('=' * 50)
+            logger.debug("オークション終了")
             self._print_auction_summary(results)
-            print(f"{'='*50}")
+            logger.debug('=' * 50)
+        
+        return results
+    
+    def simulate_auction_batch(self, auction_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        全出品のラウンドを同時に進める一括オークション（分析用、詳細ログなし）
+        
+        商品×バイヤー行列でラウンドごとに全商品の入札をまとめて計算する（乱数は buyer_manager.rng から派生）。
+        戻り値は simulate_auction と同じ形式。乱数の消費順が異なるため、
+        同じシードでも simulate_auction と個々の結果は一致しない（分布は同じ）。
+        NumPy未導入時は simulate_auction に委譲する。
+        """
+        if np is None:
+            return self.simulate_auction(auction_items, verbose=False)
+        
+        # simulate_auction と同様にAIバイヤーの一部を入れ替え
+        self.buyer_manager.refresh_buyers(self.buyer_refresh_rate)
+        if not auction_items:
+            return []
+        
+        buyers = self.buyer_manager.buyers
+        items = [auction_item['item'] for auction_item in auction_items]
+        item_params = self.buyer_manager.item_parameters(items)
+        item_count = len(items)
+        rows = np.arange(item_count)
+        
+        prices = np.array([auction_item['start_price'] for auction_item in auction_items], dtype=np.float64)
+        bid_counts = np.zeros(item_count, dtype=np.int64)
+        winners = np.full(item_count, -1, dtype=np.intp)
+        bid_histories = [auction_bid_log() for _ in items]
+        # 乱数はバイヤー管理の乱数生成器から派生させ、同じシードで再現できるようにする
+        rng = numpy_generator(self.buyer_manager.rng)
+        
+        for round_num in range(1, self.auction_duration_rounds + 1):
+            interest = self.buyer_manager.calculate_interest_matrix(item_params, prices)
+            bidding = interest >= self.bid_threshold
+            if not bidding.any():
+                # 価格が変わらない限り以降のラウンドも入札は発生しない
+                break
+            
+            # AIBuyer.bid_amount_for_interest と同じ式で全バイヤーの入札額を計算
+            base_increase = prices[:, None] * rng.uniform(0.05, 0.15, size=interest.shape)
+            bids = np.round(prices[:, None] + base_increase * np.minimum(interest, 2.0), 2)
+            bids[~bidding] = -np.inf
+            
+            best = bids.argmax(axis=1)  # 同額なら先頭のバイヤー（逐次版と同じ）
+            best_bids = bids[rows, best]
+            won = best_bids > prices
+            
+            for i in np.flatnonzero(won):
+                bid_histories[i].append(round_num, buyers[best[i]].id, float(best_bids[i]), float(prices[i]))
+            bid_counts[won] += 1
+            winners[won] = best[won]
+            prices = np.where(won, best_bids, prices)
+        
+        results = []
+        for i, auction_item in enumerate(auction_items):
+            sold = bool(bid_counts[i] > 0)
+            final_price = float(prices[i]) if sold else auction_item['start_price']
+            winner_buyer = buyers[winners[i]] if sold else None
+            results.append({
+                'item_id': items[i]['id'],
+                'sold': sold,
+                'final_price': final_price,
+                'start_price': auction_item['start_price'],
+                'bid_count': int(bid_counts[i]),
+                'winner_id': winner_buyer.id if winner_buyer else None,
+                'profit': round(final_price * (1 - self.auction_fee_rate), 2) if sold else 0,
+                'bid_history': bid_histories[i].to_list()
+            })
+            if winner_buyer:
+                winner_buyer.record_bid(items[i]['id'], final_price, True)
         
         return results
     
     def _simulate_single_auction(self, auction_item: Dict[str, Any], 
                                 verbose: bool = True) -> Dict[str, Any]:
         """単一商品のオークションをシミュレート"""
+        verbose = verbose and logger.isEnabledFor(logging.DEBUG)
         item = auction_item['item']
         current_price = auction_item['start_price']
         bid_count = 0
         winner_buyer = None
-        bid_history = []
+        bid_history = auction_bid_log()  # 直近 AUCTION_BID_HISTORY_LIMIT 件のみ保持
         
         if verbose:
-            print(f"入札開始...")
+            logger.debug("入札開始...")
         
         # 10ラウンドの入札シミュレート
         for round_num in range(1, self.auction_duration_rounds + 1):
-            # デバッグ: 興味を持つバイヤーの詳細を確認
-            interested_buyers = ai_buyer_manager.get_interested_buyers(item, current_price, self.bid_threshold)
-            
-            had_bid, new_price, winning_buyer = ai_buyer_manager.simulate_bidding_round(
+            had_bid, new_price, winning_buyer = self.buyer_manager.simulate_bidding_round(
                 item, current_price, self.bid_threshold
             )
             
@@ -125,37 +216,33 @@ class AuctionSystem:
                 winner_buyer = winning_buyer
                 
                 # 入札履歴を記録
-                bid_record = {
-                    'round': round_num,
-                    'bidder_id': winning_buyer.id,
-                    'bid_amount': new_price,
-                    'previous_price': previous_price
-                }
-                bid_history.append(bid_record)
+                bid_history.append(round_num, winning_buyer.id, new_price, previous_price)
                 
                 if verbose:
                     interest = winning_buyer.calculate_interest(item, previous_price)
-                    print(f"  R{round_num}: AIバイヤー#{winning_buyer.id} が {new_price:.2f}円で入札 "
-                          f"(+{new_price - previous_price:.2f}円, 興味度: {interest:.2f})")
+                    logger.debug("  R%d: AIバイヤー#%s が %.2f円で入札 (+%.2f円, 興味度: %.2f)",
+                                 round_num, winning_buyer.id, new_price, new_price - previous_price, interest)
             elif verbose and round_num <= 3:
                 # デバッグ: なぜ入札されないかの詳細分析
-                print(f"  R{round_num}: 入札なし")
+                logger.debug("  R%s: 入札なし", round_num)
                 if round_num == 1:  # 最初のラウンドで詳細分析
-                    print(f"    💡 デバッグ情報:")
-                    print(f"       - 商品ジャンル: {item['genre']}")
-                    print(f"       - 現在価格: {current_price}円")
-                    print(f"       - 基本価値: {item['base_value']}円")
-                    print(f"       - 価値/価格比: {item['base_value']/current_price:.2f}")
+                    logger.debug("    💡 デバッグ情報:")
+                    logger.debug("       - 商品ジャンル: %s", item['genre'])
+                    logger.debug("       - 現在価格: %s円", current_price)
+                    logger.debug("       - 基本価値: %s円", item['base_value'])
+                    logger.debug("       - 価値/価格比: %.2f", item['base_value']/current_price)
                     
-                    # 全バイヤーの興味度を確認
+                    # 全バイヤーの興味度を確認（一括計算）
+                    interests = self.buyer_manager.calculate_interests(item, current_price)
+                    interested_count = sum(1 for value in interests if value >= self.bid_threshold)
                     buyers_analysis = []
-                    for i, buyer in enumerate(ai_buyer_manager.buyers[:5]):  # 最初の5人だけ表示
-                        interest = buyer.calculate_interest(item, current_price)
+                    for i, buyer in enumerate(self.buyer_manager.buyers[:5]):  # 最初の5人だけ表示
+                        interest = interests[i]
                         genre_match = item['genre'] in buyer.interested_genres
                         buyers_analysis.append(f"バイヤー#{i}: {interest:.2f} (ジャンル{'○' if genre_match else '×'})")
                     
-                    print(f"       - 興味度サンプル: {', '.join(buyers_analysis)}")
-                    print(f"       - 興味を持つバイヤー数: {len(interested_buyers)}人")
+                    logger.debug("       - 興味度サンプル: %s", ', '.join(buyers_analysis))
+                    logger.debug("       - 興味を持つバイヤー数: %s人", interested_count)
         
         # オークション結果を決定
         sold = bid_count > 0
@@ -170,7 +257,7 @@ class AuctionSystem:
             'bid_count': bid_count,
             'winner_id': winner_buyer.id if winner_buyer else None,
             'profit': round(final_price * (1 - self.auction_fee_rate), 2) if sold else 0,
-            'bid_history': bid_history
+            'bid_history': bid_history.to_list()
         }
         
         # 勝者の入札履歴に記録
@@ -179,8 +266,8 @@ class AuctionSystem:
         
         if verbose:
             if not sold:
-                print(f"❌ 売却失敗 (入札: {bid_count}回)")
-                print(f"💡 商品はオークションに残り続けます")
+                logger.debug("❌ 売却失敗 (入札: %s回)", bid_count)
+                logger.debug("💡 商品はオークションに残り続けます")
         
         return result
     
@@ -192,15 +279,15 @@ class AuctionSystem:
         total_profit = sum(r['profit'] for r in results if r['sold'])
         total_bids = sum(r['bid_count'] for r in results)
         
-        print(f"📊 オークション結果サマリー:")
-        print(f"   出品数: {total_items}個")
-        print(f"   売却数: {sold_items}個 ({sold_items/total_items*100:.1f}%)")
-        print(f"   総売上: {total_revenue:.2f}円")
-        print(f"   手取り: {total_profit:.2f}円")
-        print(f"   総入札: {total_bids}回")
+        logger.debug("📊 オークション結果サマリー:")
+        logger.debug("   出品数: %s個", total_items)
+        logger.debug("   売却数: %s個 (%.1f%%)", sold_items, sold_items/total_items*100)
+        logger.debug("   総売上: %.2f円", total_revenue)
+        logger.debug("   手取り: %.2f円", total_profit)
+        logger.debug("   総入札: %s回", total_bids)
         
         if sold_items > 0:
-            print(f"   平均売値: {total_revenue/sold_items:.2f}円")
+            logger.debug("   平均売値: %.2f円", total_revenue/sold_items)
         
         # 最高額と最低額
         if results:
@@ -208,8 +295,8 @@ class AuctionSystem:
             if sold_results:
                 max_price = max(r['final_price'] for r in sold_results)
                 min_price = min(r['final_price'] for r in sold_results)
-                print(f"   最高売値: {max_price:.2f}円")
-                print(f"   最低売値: {min_price:.2f}円")
+                logger.debug("   最高売値: %.2f円", max_price)
+                logger.debug("   最低売値: %.2f円", min_price)
     
     def calculate_fee(self, sale_price: float) -> float:
         """手数料を計算"""
@@ -225,7 +312,7 @@ class AuctionSystem:
             'fee_rate': self.auction_fee_rate,
             'auction_duration_rounds': self.auction_duration_rounds,
             'bid_threshold': self.bid_threshold,
-            'ai_buyer_stats': ai_buyer_manager.get_statistics()
+            'ai_buyer_stats': self.buyer_manager.get_statistics()
         }
     
     def update_settings(self, fee_rate: float = None, duration_rounds: int = None, 
@@ -249,14 +336,12 @@ class AuctionSystem:
             start_price = auction_item['start_price']
             
             # 興味を持つバイヤー数を計算
-            interested_buyers = ai_buyer_manager.get_interested_buyers(item, start_price)
+            interested = self.buyer_manager.get_interested_buyers_with_interest(item, start_price)
+            interested_buyers = [buyer for buyer, _ in interested]
             
             # 予想最終価格を計算（簡易）
-            if interested_buyers:
-                max_interest = max(
-                    buyer.calculate_interest(item, start_price) 
-                    for buyer in interested_buyers
-                )
+            if interested:
+                max_interest = max(interest for _, interest in interested)
                 estimated_final = start_price * (1 + max_interest * 0.2)
             else:
                 estimated_final = start_price
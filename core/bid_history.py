@@ -0,0 +1,120 @@
+"""
+タイムトラベル仕入れゲーム - 入札履歴のリングバッファ
+入札履歴を固定長のリングバッファ（列ごとの型付き配列）で保持し、長いセッションでもメモリを一定に保つ
+
+容量を超えた分は古い順に上書きする。件数・落札数は上書きされた分も含めてカウンタで保持するため、
+統計は履歴を走査せずに得られる。
+"""
+
+from array import array
+from typing import Dict, List, Any, Iterator, Tuple
+
+from .game_config import GameConfig
+
+# バイヤーの入札履歴の列（列名, 型コード）
+BUYER_BID_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ('item_id', 'q'),
+    ('bid_amount', 'd'),
+    ('won', 'B'),
+    ('timestamp', 'd'),
+)
+
+# オークション1件の入札経過の列
+AUCTION_BID_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ('round', 'l'),
+    ('bidder_id', 'q'),
+    ('bid_amount', 'd'),
+    ('previous_price', 'd'),
+)
+
+
+class RingBuffer:
+    """列ごとの型付き配列による固定長リングバッファ（古い記録から上書き）"""
+
+    __slots__ = ('capacity', 'fields', '_columns', '_start', 'total_count')
+
+    def __init__(self, fields: Tuple[Tuple[str, str], ...], capacity: int):
+        """
+        Args:
+            fields: (列名, array の型コード) の並び
+            capacity: 保持する最大件数
+        """
+        if capacity <= 0:
+            raise ValueError(f"容量は正の値で指定してください: {capacity}")
+        self.capacity = capacity
+        self.fields = fields
+        self._columns = [array(typecode) for _, typecode in fields]
+        self._start = 0        # 最も古い記録の位置（満杯になってから動く）
+        self.total_count = 0   # 上書きされた分も含めた記録数
+
+    def __len__(self) -> int:
+        return len(self._columns[0])
+
+    def append(self, *values) -> None:
+        """1件記録（値は fields と同じ並び）"""
+        if len(self._columns[0]) < self.capacity:
+            for column, value in zip(self._columns, values):
+                column.append(value)
+        else:
+            for column, value in zip(self._columns, values):
+                column[self._start] = value
+            self._start = (self._start + 1) % self.capacity
+        self.total_count += 1
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """古い順に記録を辞書で返す"""
+        size = len(self)
+        names = [name for name, _ in self.fields]
+        for position in range(self._start, self._start + size):
+            row = position % size
+            yield {name: column[row] for name, column in zip(names, self._columns)}
+
+    def column(self, name: str) -> List[Any]:
+        """1列分の値を古い順に取得"""
+        values = self._columns[[field for field, _ in self.fields].index(name)]
+        return list(values[self._start:]) + list(values[:self._start])
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """保持中の記録を古い順の辞書リストで取得（APIレスポンス用）"""
+        return list(self)
+
+    def clear(self) -> None:
+        """記録とカウンタを消去"""
+        for column in self._columns:
+            del column[:]
+        self._start = 0
+        self.total_count = 0
+
+
+class BidHistory(RingBuffer):
+    """AIバイヤー1人の入札履歴（直近 capacity 件と、入札数・落札数のカウンタ）"""
+
+    __slots__ = ('win_count',)
+
+    def __init__(self, capacity: int = None):
+        """
+        Args:
+            capacity: 保持する最大件数（省略時は GameConfig.AI_BID_HISTORY_CAPACITY）
+        """
+        super().__init__(BUYER_BID_FIELDS, capacity or GameConfig.AI_BID_HISTORY_CAPACITY)
+        self.win_count = 0
+
+    def record(self, item_id: int, bid_amount: float, won: bool, timestamp: float) -> None:
+        """入札を1件記録"""
+        self.append(item_id, bid_amount, 1 if won else 0, timestamp)
+        if won:
+            self.win_count += 1
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for record in super().__iter__():
+            record['won'] = bool(record['won'])
+            yield record
+
+    def clear(self) -> None:
+        super().clear()
+        self.win_count = 0
+
+
+def auction_bid_log(capacity: int = None) -> RingBuffer:
+    """オークション1件の入札経過を記録するリングバッファ（省略時は GameConfig.AUCTION_BID_HISTORY_LIMIT 件）"""
+    return RingBuffer(AUCTION_BID_FIELDS, capacity or GameConfig.AUCTION_BID_HISTORY_LIMIT)
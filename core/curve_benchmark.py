@@ -0,0 +1,142 @@
+"""
+タイムトラベル仕入れゲーム - 価格曲線戦略のベンチマーク
+登録済みの曲線生成戦略ごとに多数の曲線を生成し、生成時間・目標倍率との誤差・乗数の分布を集計する
+
+使い方:
+    report = benchmark_curve_strategies(curves=5000, turns=8, seed=1)
+    print(format_report(report))
+"""
+
+import math
+import random
+import statistics
+import time
+from typing import Dict, Any, Iterable, List, Optional
+
+from .asset_manager import AssetManager
+from .price_curve import CURVE_STRATEGIES, DEFAULT_CURVE_OPTIONS, FACTOR_MIN, FACTOR_MAX, get_curve_strategy
+
+# 目標達成とみなす相対誤差
+HIT_TOLERANCE = 0.01
+
+
+def _percentile(sorted_values: List[float], ratio: float) -> float:
+    """ソート済みの値の分位点（最近傍）"""
+    index = min(int(ratio * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def _summarize(values: List[float]) -> Dict[str, float]:
+    ordered = sorted(values)
+    return {
+        'mean': round(statistics.fmean(ordered), 6),
+        'max': round(ordered[-1], 6),
+        'p50': round(_percentile(ordered, 0.5), 6),
+        'p95': round(_percentile(ordered, 0.95), 6),
+    }
+
+
+def benchmark_strategy(name: str, targets: List[float], turns: int, seed: int = 0,
+                       options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    1つの戦略で目標倍率ごとに曲線を生成して集計
+
+    Args:
+        name: 戦略名
+        targets: 目標倍率（1つにつき1本生成）
+        turns: 子ターン数
+        seed: 乱数シード（戦略間で同じ値を使えば同じ乱数系列から生成）
+        options: 戦略に渡す設定（省略時は TurnSystem の既定値）
+
+    Returns:
+        生成時間・目標誤差（累積 / 平均乗数）・乗数の分布
+    """
+    strategy = get_curve_strategy(name)
+    options = dict(DEFAULT_CURVE_OPTIONS, **(options or {}))
+    rng = random.Random(seed)
+
+    started = time.perf_counter()
+    curves = [strategy(target, turns, rng, options) for target in targets]
+    elapsed = time.perf_counter() - started
+
+    product_errors = []
+    mean_errors = []
+    factors = []
+    first_turn = []
+    for target, multipliers in zip(targets, curves):
+        multipliers = [float(m) for m in multipliers]
+        product_errors.append(abs(math.prod(multipliers) - target) / target)
+        mean_errors.append(abs(statistics.fmean(multipliers) - target) / target)
+        factors.extend(multipliers)
+        first_turn.append(multipliers[0])
+
+    ordered = sorted(factors)
+    return {
+        'strategy': name,
+        'curves': len(curves),
+        'turns': turns,
+        'seconds': round(elapsed, 4),
+        'microseconds_per_curve': round(elapsed / len(curves) * 1e6, 2),
+        # TurnSystem は累積（price_curve の最終値）を目標倍率とみなす
+        'product_error': _summarize(product_errors),
+        'product_hit_rate': round(sum(e <= HIT_TOLERANCE for e in product_errors) / len(curves), 4),
+        'mean_error': _summarize(mean_errors),
+        'multipliers': {
+            'mean': round(statistics.fmean(factors), 4),
+            'std': round(statistics.pstdev(factors), 4),
+            'min': round(ordered[0], 4),
+            'p05': round(_percentile(ordered, 0.05), 4),
+            'p50': round(_percentile(ordered, 0.5), 4),
+            'p95': round(_percentile(ordered, 0.95), 4),
+            'max': round(ordered[-1], 4),
+            'below_one_rate': round(sum(m < 1.0 for m in factors) / len(factors), 4),
+            'out_of_range_rate': round(sum(not FACTOR_MIN <= m <= FACTOR_MAX for m in factors) / len(factors), 4),
+            'first_turn_mean': round(statistics.fmean(first_turn), 4),
+        },
+    }
+
+
+def benchmark_curve_strategies(strategies: Optional[Iterable[str]] = None, curves: int = 2000, turns: int = 8,
+                               seed: int = 0, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    登録済みの戦略を同じ目標倍率の列で比較
+
+    Args:
+        strategies: 比較する戦略名（省略時は全戦略）
+        curves: 戦略ごとの曲線数
+        turns: 子ターン数
+        seed: 目標倍率と各戦略の乱数のシード
+        options: 戦略に渡す設定
+
+    Returns:
+        目標倍率の列の概要と、戦略名 → benchmark_strategy の結果
+    """
+    target_rng = random.Random(seed)
+    targets = [AssetManager.generate_target_multiplier(target_rng) for _ in range(curves)]
+    names = list(strategies) if strategies is not None else sorted(CURVE_STRATEGIES)
+    return {
+        'curves': curves,
+        'turns': turns,
+        'seed': seed,
+        'targets': {'min': min(targets), 'max': max(targets), 'mean': round(statistics.fmean(targets), 4)},
+        'results': {name: benchmark_strategy(name, targets, turns, seed + 1, options) for name in names},
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """ベンチマーク結果を表形式の文字列に整形"""
+    lines = [
+        f"曲線数: {report['curves']} / 子ターン数: {report['turns']} / "
+        f"目標倍率: {report['targets']['min']}〜{report['targets']['max']} (平均{report['targets']['mean']})",
+        f"{'戦略':<16}{'µs/曲線':>10}{'累積誤差(平均)':>16}{'累積誤差(最大)':>16}{'達成率':>8}"
+        f"{'平均乗数':>10}{'標準偏差':>10}{'1未満':>8}{'範囲外':>8}",
+    ]
+    for name, result in report['results'].items():
+        multipliers = result['multipliers']
+        lines.append(
+            f"{name:<16}{result['microseconds_per_curve']:>10.1f}{result['product_error']['mean']:>16.6f}"
+            f"{result['product_error']['max']:>16.6f}{result['product_hit_rate']:>8.1%}"
+            f"{multipliers['mean']:>10.3f}{multipliers['std']:>10.3f}"
+            f"{multipliers['below_one_rate']:>8.1%}{multipliers['out_of_range_rate']:>8.1%}"
+        )
+    return "\n".join(lines)
@@ -3,6 +3,11 @@
 全てのゲームパラメータを一元管理するための設定ファイル
 """
 
+import os
+
+# プロジェクトのルート（Flaskのインスタンスフォルダ instance/ の親）
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 # ===== 基本ゲーム設定 =====
 class GameConfig:
     # 初期設定
@@ -32,8 +37,12 @@ class GameConfig:
     AUCTION_DURATION_ROUNDS = 10
     AUCTION_BID_THRESHOLD = 0.3
     MAX_AUCTION_ITEMS = 8  # 同時出品最大数
+    AUCTION_BID_HISTORY_LIMIT = 20  # 結果に含める商品ごとの入札経過の最大件数（直近分）
     
     # AIバイヤー設定
+    AI_BUYER_COUNT = 15  # オークションに参加するバイヤー数
+    AI_BUYER_REFRESH_RATE = 0.2  # オークションごとに入れ替えるバイヤーの割合
+    AI_BID_HISTORY_CAPACITY = 100  # バイヤーごとに保持する入札履歴の件数（直近分）
     AI_BID_INCREASE_MIN = 0.05  # 5%
     AI_BID_INCREASE_MAX = 0.15  # 15%
     
@@ -45,9 +54,31 @@ class GameConfig:
     RANDOM_MAX = 1.8
     FIRST_TURN_MIN = 1.0
     TREND_STRENGTH = 0.1
+    PRICE_CURVE_STRATEGY = 'batch'  # 'batch' / 'mean_scaled' / 'product_scaled' / 'mean_search'（core/price_curve.py）
     
     # UI設定（自動投資オプション）
     AUTO_INVEST_OPTIONS = [10, 20, 30, 40, 50, 60, 70, 80, 90, 100]  # %
+    
+    # セッション設定（1プロセスで複数プレイヤーを保持）
+    SESSION_MAX_COUNT = 5000  # 同時保持する最大セッション数（超過時はLRUで破棄）
+    SESSION_IDLE_TIMEOUT = 3600  # 無操作で破棄するまでの秒数
+    
+    # 保存設定（スナップショット + 追記型ジャーナル、core/state_journal.py）
+    JOURNAL_SNAPSHOT_INTERVAL = 500  # この件数の変更ごとにスナップショットを書き直してジャーナルを空にする
+    JOURNAL_FSYNC = False  # 保存時にジャーナルを fsync するか（OSクラッシュにも備える場合は True）
+    
+    # ゲームストア設定（SQLite、core/game_store.py。環境変数 TIMETRAVEL_DB_PATH で上書き可能）
+    # データベースファイルのパス（ワーカーの再起動後もゲームを復元。':memory:' はプロセス内のみ（テスト用）、空文字列で無効）
+    GAME_STORE_PATH = os.path.join(PROJECT_ROOT, 'instance', 'game_store.db')
+    HISTORY_PAGE_SIZE = 20  # 履歴APIの1ページの既定件数
+    HISTORY_PAGE_MAX = 100  # 履歴APIの1ページの最大件数
+    TRAVEL_ROI_WINDOW = 3  # タイムトラベルの移動ROIを集計する大ターン数
+    
+    # ログ設定（環境変数 TIMETRAVEL_LOG_MODE でモードを上書き可能）
+    LOG_MODE = 'production'  # 'production'（出力なし） / 'debug'
+    LOG_HANDLER = 'async'  # debug時の出力方式: 'stream' / 'buffered' / 'async'
+    LOG_BUFFER_CAPACITY = 200  # 'buffered' 時にまとめて書き出す件数
+    LOG_LEVELS = {}  # サブシステム別レベル（例: {'asset': 'WARNING', 'turn': 'INFO'}）
 
 # 設定値の妥当性チェック
 def validate_config():
@@ -60,6 +91,18 @@ def validate_config():
     assert 0 <= GameConfig.FIXED_COST_RATE <= 1, "固定費率は0-1の範囲である必要があります"
     assert 0 <= GameConfig.AUCTION_FEE_RATE <= 1, "オークション手数料は0-1の範囲である必要があります"
     assert GameConfig.MAX_AUCTION_ITEMS > 0, "最大出品数は正の値である必要があります"
+    assert GameConfig.AI_BUYER_COUNT > 0, "AIバイヤー数は正の値である必要があります"
+    assert 0 <= GameConfig.AI_BUYER_REFRESH_RATE <= 1, "AIバイヤー入れ替え率は0-1の範囲である必要があります"
+    assert GameConfig.AI_BID_HISTORY_CAPACITY > 0, "入札履歴の容量は正の値である必要があります"
+    assert GameConfig.AUCTION_BID_HISTORY_LIMIT > 0, "入札経過の最大件数は正の値である必要があります"
+    assert GameConfig.SESSION_MAX_COUNT > 0, "最大セッション数は正の値である必要があります"
+    assert GameConfig.SESSION_IDLE_TIMEOUT > 0, "セッションタイムアウトは正の値である必要があります"
+    assert GameConfig.JOURNAL_SNAPSHOT_INTERVAL > 0, "スナップショット間隔は正の値である必要があります"
+    assert 0 < GameConfig.HISTORY_PAGE_SIZE <= GameConfig.HISTORY_PAGE_MAX, "履歴のページ件数が無効です"
+    assert GameConfig.TRAVEL_ROI_WINDOW > 0, "移動ROIの大ターン数は正の値である必要があります"
+    assert GameConfig.LOG_MODE in ('production', 'debug'), "ログモードが無効です"
+    assert GameConfig.LOG_HANDLER in ('stream', 'buffered', 'async'), "ログハンドラが無効です"
+    assert GameConfig.LOG_BUFFER_CAPACITY > 0, "ログバッファ件数は正の値である必要があります"
 
 # 初期化時に妥当性チェック実行
 validate_config()
\ No newline at end of file
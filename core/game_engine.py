@@ -4,182 +4,515 @@
 """
 
 import json
+import os
+from contextlib import contextmanager
 from typing import Dict, List, Any, Optional
 import time
-from .turn_system import turn_system
+import uuid
+from .turn_system import TurnSystem, turn_system as default_turn_system
 from .asset_manager import AssetManager
+from .game_logger import get_logger
+from .item_collection import IndexedCollection, inventory_item_id, auction_item_id
+from .id_allocator import ItemIdAllocator, item_id_allocator
+from .item_record import as_item, json_default
+from .item_columns import ItemColumns
+from .state_view import GameStateView
+from .state_delta import StateChanges
+from .state_journal import StateJournal, read_journal
+from .save_codec import encode_state, is_binary_save, open_save
+
+logger = get_logger('engine')
 
 
 class GameEngine:
     """ゲーム状態管理とコアロジック"""
     
-    def __init__(self):
-        """ゲーム初期化"""
+    def __init__(self, turn_system: Optional[TurnSystem] = None,
+                 id_allocator: Optional[ItemIdAllocator] = None):
+        """
+        ゲーム初期化
+        
+        Args:
+            turn_system: このゲーム専用のターンシステム（省略時はグローバルインスタンス）
+            id_allocator: このゲーム専用の商品ID採番器（省略時は新規生成）
+        """
+        self.turn_system = turn_system if turn_system is not None else default_turn_system
+        self.id_allocator = id_allocator if id_allocator is not None else ItemIdAllocator()
+        # 在庫の列指向ストア（在庫の増減に合わせて更新）
+        # 在庫価値の台帳（銭単位の整数の累計）・サマリーの集計はすべてここから取る
+        self.inventory_columns = ItemColumns(track=True)
+        # 在庫サマリーのキャッシュ（在庫の増減で破棄）
+        self._inventory_summary: Optional[Dict[str, Any]] = None
+        # 状態バージョン（状態を変更するたびに単調増加、ETag用）
+        # エポックはプロセス再起動後に古いETagと一致しないよう生成ごとに変える
+        self.state_epoch = uuid.uuid4().hex[:12]
+        self.state_version = 0
+        # 差分記録中の変更（record_changes の間のみ設定）
+        self._changes: Optional[StateChanges] = None
+        # 保存先のジャーナル（save_state 以降、変更のたびに追記）
+        self.journal: Optional[StateJournal] = None
+        # ゲームストアへの未保存の変更（GameStore.attach で設定、リクエスト終了時に書き出す）
+        self.recorder = None
         self.reset_game()
     
     def reset_game(self) -> None:
         """ゲーム状態をリセット"""
         self.state = {
             'money': 1000,
-            'inventory': [],
-            'auction_items': [],
+            'inventory': IndexedCollection(key=inventory_item_id),
+            'auction_items': IndexedCollection(key=auction_item_id),
             'game_over': False,
             'turn_count': 0,
             'total_profit': 0,
             'total_spent': 0
         }
+        self._rebuild_ledger()
+        self.id_allocator.reset()
         # ターンシステムもリセット
-        turn_system.reset_turns()
-        print(f"[GameEngine] ゲーム状態リセット完了")
+        self.turn_system.reset_turns()
+        self._mark_replaced()
+        self.mark_changed()
+        logger.debug("ゲーム状態リセット完了")
+    
+    def mark_changed(self) -> None:
+        """状態バージョンを進める（状態を変更する操作の最後に呼ぶ）"""
+        self.state_version += 1
+    
+    def _mark_replaced(self) -> None:
+        """状態全体を差し替えたことを差分記録・ジャーナルに伝える（ジャーナルはスナップショットを書き直す）"""
+        if self._changes is not None:
+            self._changes.replaced = True
+        if self.recorder is not None:
+            self.recorder.mark_replaced()
+        if self.journal is not None:
+            self._write_snapshot()
+    
+    def _journal(self, op: str, **payload) -> None:
+        """保存先のジャーナル・ゲームストアに変更を記録（ジャーナルは間隔に達したらスナップショットを書き直す）"""
+        if self.recorder is not None:
+            self.recorder.append(op, **payload)
+        if self.journal is None:
+            return
+        try:
+            self.journal.append(op, **payload)
+            if self.journal.snapshot_due:
+                self.journal.write_snapshot(self._snapshot_state())
+        except OSError as e:
+            logger.error("ジャーナルの書き込みに失敗（以降は記録しない）: %s", e)
+            self.detach_journal()
+    
+    def _write_snapshot(self) -> None:
+        """現在の状態でスナップショットを書き直す"""
+        try:
+            self.journal.write_snapshot(self._snapshot_state())
+        except OSError as e:
+            logger.error("スナップショットの書き込みに失敗（以降は記録しない）: %s", e)
+            self.detach_journal()
+    
+    def detach_journal(self) -> None:
+        """ジャーナルへの記録をやめる（書き込み済みの内容は残る）"""
+        if self.journal is not None:
+            try:
+                self.journal.close()
+            except OSError:
+                pass
+            self.journal = None
+    
+    @contextmanager
+    def record_changes(self, client_version: Optional[int] = None):
+        """
+        ブロック内の状態変更を記録する
+        
+        Args:
+            client_version: クライアントが保持している状態バージョン
+        
+        Yields:
+            StateChanges（ブロック終了後に to_delta() で差分を取得）
+        """
+        changes = StateChanges(self, client_version)
+        previous, self._changes = self._changes, changes
+        try:
+            yield changes
+        finally:
+            self._changes = previous
+    
+    @property
+    def state_tag(self) -> str:
+        """状態バージョンを表すETag用の識別子"""
+        return f"{self.state_epoch}-{self.state_version}"
+    
+    def view(self) -> GameStateView:
+        """現在のゲーム状態の読み取り専用ビューを取得（コピーなし・派生値は遅延計算）"""
+        return GameStateView(self)
     
     def get_state(self) -> Dict[str, Any]:
-        """現在のゲーム状態を取得"""
+        """現在のゲーム状態を取得（在庫・出品をコピーした辞書、JSON出力用）"""
+        view = self.view()
         # ゲームオーバー判定を更新
-        self.state['game_over'] = self.check_game_over()
+        self.state['game_over'] = view['game_over']
+        return view.to_dict()
+    
+    def _adopt_state(self, state: Dict[str, Any]) -> None:
+        """
+        読み込んだ状態を現在の状態にする（変換に失敗したら元の状態のまま）
         
-        # ターン情報を取得
-        turn_info = turn_system.get_turn_info()
+        Raises:
+            ValueError: 商品のジャンル・状態・レア度が不明な場合
+        """
+        previous, self.state = self.state, state
+        try:
+            self._index_collections()
+        except Exception:
+            self.state = previous
+            raise
+    
+    def _index_collections(self) -> None:
+        """読み込んだlist形式の在庫・出品を商品レコード・ID索引付きコレクションに変換"""
+        inventory = [as_item(item) for item in self.state['inventory']]
+        auction_items = [dict(auction_item, item=as_item(auction_item['item']))
+                         for auction_item in self.state['auction_items']]
+        self.state['inventory'] = IndexedCollection(inventory, key=inventory_item_id)
+        self.state['auction_items'] = IndexedCollection(auction_items, key=auction_item_id)
+    
+    def _serializable_state(self) -> Dict[str, Any]:
+        """JSON保存用に在庫・出品をlistへ戻した状態（次の商品IDも保存）"""
+        serializable = dict(self.state)
+        serializable['inventory'] = self.state['inventory'].to_list()
+        serializable['auction_items'] = self.state['auction_items'].to_list()
+        serializable['next_item_id'] = self.id_allocator.next_id
+        return serializable
+    
+    def _snapshot_state(self) -> Dict[str, Any]:
+        """スナップショット用の状態（保存形式の状態 + ターン状態）"""
+        snapshot = self._serializable_state()
+        snapshot['turn_system'] = self.turn_system.export_state()
+        return snapshot
+    
+    def _sync_id_allocator(self) -> None:
+        """読み込んだ状態の商品IDより後から採番するように採番器を進める"""
+        next_item_id = self.state.pop('next_item_id', None)
+        if next_item_id is not None:
+            self.id_allocator.restore(next_item_id)
+        self.id_allocator.observe(self.state['inventory'].ids())
+        self.id_allocator.observe(self.state['auction_items'].ids())
+    
+    def _rebuild_ledger(self, columns: Optional[ItemColumns] = None) -> None:
+        """
+        在庫価値台帳・列指向ストアを在庫から再集計（状態を丸ごと差し替えた時のみ使用）
         
-        # フェーズ2: 資産情報を追加
-        asset_info = AssetManager.get_asset_info(self.state['money'], self.state['inventory'])
+        Args:
+            columns: 在庫と同じ内容の列指向ストア（列形式のセーブデータから作成済みなら再集計しない）
+        """
+        if columns is None:
+            columns = ItemColumns(self.state['inventory'], track=True)
+        else:
+            columns.track(self.state['inventory'])
+        self.inventory_columns = columns
+        self._inventory_summary = None
+    
+    def get_inventory_value(self) -> float:
+        """在庫価値合計（列指向ストアの銭単位の累計から取得、O(1)）"""
+        return self.inventory_columns.total_value()
+    
+    def get_inventory_summary(self) -> Dict[str, Any]:
+        """
+        在庫のサマリー情報を取得（列指向ストアのコード列・銭単位の価値から集計し、在庫が変わるまでキャッシュ）
         
-        return {
-            'money': self.state['money'],
-            'inventory': self.state['inventory'].copy(),
-            'auction_items': self.state['auction_items'].copy(),
-            'game_over': self.state['game_over'],
-            'turn_info': turn_info,
-            'asset_info': asset_info,  # フェーズ2: 資産情報追加
-            'statistics': {
-                'turn_count': self.state['turn_count'],
-                'total_profit': self.state['total_profit'],
-                'total_spent': self.state['total_spent'],
-                'inventory_count': len(self.state['inventory']),
-                'auction_count': len(self.state['auction_items'])
-            }
-        }
+        返す辞書は共有キャッシュのため、呼び出し側で変更しないこと。
+        """
+        if self._inventory_summary is None:
+            self._inventory_summary = self.inventory_columns.summary()
+        return self._inventory_summary
+    
+    def get_assets(self) -> float:
+        """総資産 = 現金 + 在庫価値合計（O(1)）"""
+        return AssetManager.calculate_assets_from_value(self.state['money'], self.get_inventory_value())
+    
+    def get_fixed_cost(self) -> float:
+        """現在の資産に対する固定費（UFO代金）"""
+        return AssetManager.calculate_fixed_cost(self.get_assets())
+    
+    def get_asset_info(self) -> Dict[str, Any]:
+        """資産情報の詳細（台帳から算出、O(1)）"""
+        return AssetManager.get_asset_info_from_totals(
+            self.state['money'], self.get_inventory_value(), len(self.state['inventory'])
+        )
     
     def check_game_over(self) -> bool:
         """ゲームオーバー判定（フェーズ2: 資産・固定費ベース）"""
         # フェーズ2: AssetManagerを使用したゲームオーバー判定
-        assets = AssetManager.calculate_assets(self.state['money'], self.state['inventory'])
+        assets = self.get_assets()
         fixed_cost = AssetManager.calculate_fixed_cost(assets)
         return AssetManager.check_game_over(assets, fixed_cost)
     
     def spend_money(self, amount: float) -> bool:
         """お金を消費してターンを進める（成功時True、残高不足時False）"""
         if self.state['money'] >= amount:
-            print(f"[GameEngine] 資金消費前: {self.state['money']}円")
+            logger.debug("資金消費前: %s円", self.state['money'])
             self.state['money'] -= amount
             self.state['total_spent'] += amount
             self.state['turn_count'] += 1
             
             # ターンシステムを進める
-            print(f"[GameEngine] ターン進行実行: turn_count={self.state['turn_count']}")
-            major_turn_completed = turn_system.advance_minor_turn()
+            logger.debug("ターン進行実行: turn_count=%d", self.state['turn_count'])
+            major_turn_completed = self.turn_system.advance_minor_turn()
             if major_turn_completed:
-                print(f"[GameEngine] 🎉 大ターン完了！新しい大ターン開始")
+                logger.info("🎉 大ターン完了！新しい大ターン開始")
             
-            print(f"[GameEngine] 資金消費後: {self.state['money']}円")
+            # 新しい曲線は乱数から作るため、大ターンが変わった時は曲線ごと記録する
+            self._journal('spend', amount=amount,
+                          turn=self.turn_system.export_state(include_curve=major_turn_completed))
+            self.mark_changed()
+            logger.debug("資金消費後: %s円", self.state['money'])
             return True
         
-        print(f"[GameEngine] 資金不足: 必要{amount}円、所持{self.state['money']}円")
+        logger.info("資金不足: 必要%s円、所持%s円", amount, self.state['money'])
         return False
     
     def earn_money(self, amount: float) -> None:
         """お金を獲得"""
         self.state['money'] += amount
         self.state['total_profit'] += amount
+        self._journal('earn', amount=amount)
+        self.mark_changed()
     
     def add_to_inventory(self, items: List[Dict[str, Any]]) -> None:
-        """アイテムを在庫に追加"""
+        """
+        アイテムを在庫に追加（外部で採番されたIDとも重複しないよう採番器を進める）
+        
+        Raises:
+            ValueError: ジャンル・状態・レア度が不明な商品がある場合（在庫は変更しない）
+        """
+        items = [as_item(item) for item in items]
+        if self._changes is not None:
+            self._changes.touch('inventory', (item['id'] for item in items))
         self.state['inventory'].extend(items)
+        self.inventory_columns.extend(items)
+        self.id_allocator.observe(item['id'] for item in items)
+        self._inventory_summary = None
+        self._journal('inventory_add', items=items)
+        self.mark_changed()
     
     def remove_from_inventory(self, item_id: int) -> Optional[Dict[str, Any]]:
         """在庫からアイテムを削除して返す"""
-        for i, item in enumerate(self.state['inventory']):
-            if item['id'] == item_id:
-                return self.state['inventory'].pop(i)
-        return None
+        if self._changes is not None:
+            self._changes.touch('inventory', (item_id,))
+        removed = self.state['inventory'].pop(item_id)
+        if removed is not None:
+            self.inventory_columns.remove(item_id)
+            self._inventory_summary = None
+            self._journal('inventory_remove', item_id=item_id)
+            self.mark_changed()
+        return removed
     
     def get_inventory_item(self, item_id: int) -> Optional[Dict[str, Any]]:
         """在庫からアイテムを検索"""
-        for item in self.state['inventory']:
-            if item['id'] == item_id:
-                return item
-        return None
+        return self.state['inventory'].get(item_id)
     
     def add_to_auction(self, auction_item: Dict[str, Any]) -> None:
         """オークションに出品"""
+        if self._changes is not None:
+            self._changes.touch('auction_items', (auction_item_id(auction_item),))
         self.state['auction_items'].append(auction_item)
+        self._journal('auction_add', auction_item=auction_item)
+        self.mark_changed()
     
     def remove_from_auction(self, item_id: int) -> Optional[Dict[str, Any]]:
         """オークションから取り下げ"""
-        for i, auction_item in enumerate(self.state['auction_items']):
-            if auction_item['item']['id'] == item_id:
-                removed = self.state['auction_items'].pop(i)
-                # 在庫に戻す
-                self.state['inventory'].append(removed['item'])
-                return removed
-        return None
+        if self._changes is not None:
+            self._changes.touch('auction_items', (item_id,))
+        removed = self.state['auction_items'].pop(item_id)
+        if removed is not None:
+            self._journal('auction_remove', item_id=item_id)
+            # 在庫に戻す（バージョンも進む、ジャーナルには在庫追加として記録）
+            self.add_to_inventory([removed['item']])
+        return removed
+    
+    def clear_auction_items(self) -> None:
+        """出品を全て破棄（在庫復元なし）"""
+        if self._changes is not None:
+            self._changes.touch('auction_items', self.state['auction_items'].ids())
+        self.state['auction_items'].clear()
+        self._journal('auction_clear')
+        self.mark_changed()
     
     def clear_sold_auction_items(self) -> None:
         """売却済みのオークションアイテムをクリア"""
         before_count = len(self.state['auction_items'])
-        self.state['auction_items'] = [
-            auction_item for auction_item in self.state['auction_items']
-            if not auction_item.get('sold', False)
-        ]
+        if self._changes is not None:
+            self._changes.touch('auction_items', (
+                auction_item_id(auction_item) for auction_item in self.state['auction_items']
+                if auction_item.get('sold', False)
+            ))
+        self.state['auction_items'].remove_where(
+            lambda auction_item: auction_item.get('sold', False)
+        )
         after_count = len(self.state['auction_items'])
-        print(f"🔧 オークションアイテム整理: {before_count}個 → {after_count}個 (売却済み{before_count - after_count}個を削除)")
+        if after_count != before_count:
+            self._journal('auction_clear_sold')
+            self.mark_changed()
+        logger.debug("オークションアイテム整理: %d個 → %d個 (売却済み%d個を削除)",
+                     before_count, after_count, before_count - after_count)
     
     def get_auction_item(self, item_id: int) -> Optional[Dict[str, Any]]:
         """オークションアイテムを検索"""
-        for auction_item in self.state['auction_items']:
-            if auction_item['item']['id'] == item_id:
-                return auction_item
-        return None
+        return self.state['auction_items'].get(item_id)
     
     def remove_auction_item_without_restore(self, item_id: int) -> Optional[Dict[str, Any]]:
         """オークションから商品を削除（在庫復元なし）"""
-        for i, auction_item in enumerate(self.state['auction_items']):
-            if auction_item['item']['id'] == item_id:
-                return self.state['auction_items'].pop(i)
-        return None
+        if self._changes is not None:
+            self._changes.touch('auction_items', (item_id,))
+        removed = self.state['auction_items'].pop(item_id)
+        if removed is not None:
+            self._journal('auction_remove', item_id=item_id)
+            self.mark_changed()
+        return removed
     
     def update_auction_item(self, item_id: int, updates: Dict[str, Any]) -> bool:
         """オークションアイテムの情報を更新"""
         auction_item = self.get_auction_item(item_id)
         if auction_item:
+            if self._changes is not None:
+                self._changes.touch('auction_items', (item_id,))
             auction_item.update(updates)
+            self._journal('auction_update', item_id=item_id, updates=updates)
+            self.mark_changed()
             return True
         return False
     
     def increment_turn(self) -> None:
         """ターン数を増加"""
         self.state['turn_count'] += 1
+        self._journal('turn_increment')
+        self.mark_changed()
+    
+    def _apply_journal_entry(self, entry: Dict[str, Any]) -> None:
+        """ジャーナルの1件を状態に適用（読み込み時の再生用）"""
+        op = entry['op']
+        if op == 'spend':
+            self.state['money'] -= entry['amount']
+            self.state['total_spent'] += entry['amount']
+            self.state['turn_count'] += 1
+            self.turn_system.restore_state(entry['turn'])
+        elif op == 'earn':
+            self.earn_money(entry['amount'])
+        elif op == 'inventory_add':
+            self.add_to_inventory(entry['items'])
+        elif op == 'inventory_remove':
+            self.remove_from_inventory(entry['item_id'])
+        elif op == 'auction_add':
+            auction_item = entry['auction_item']
+            self.add_to_auction(dict(auction_item, item=as_item(auction_item['item'])))
+        elif op == 'auction_remove':
+            self.remove_auction_item_without_restore(entry['item_id'])
+        elif op == 'auction_clear':
+            self.clear_auction_items()
+        elif op == 'auction_clear_sold':
+            self.clear_sold_auction_items()
+        elif op == 'auction_update':
+            self.update_auction_item(entry['item_id'], entry['updates'])
+        elif op == 'turn_increment':
+            self.increment_turn()
+        else:
+            raise ValueError(f"不明なジャーナル操作: {op}")
+    
+    def _replay_journal(self, entries: List[Dict[str, Any]]) -> None:
+        """ジャーナルを順に再生（再生中の変更はジャーナルに記録しない）"""
+        journal, self.journal = self.journal, None
+        try:
+            for entry in entries:
+                self._apply_journal_entry(entry)
+        finally:
+            self.journal = journal
     
     def save_state(self, filepath: str) -> None:
-        """ゲーム状態をファイルに保存"""
+        """
+        ゲーム状態をファイルに保存
+        
+        初回（または保存先の変更時）はスナップショットを書き出し、以降の変更は filepath + '.journal' に
+        追記していく。同じ保存先への2回目以降の保存はジャーナルを書き出すだけ（前回以降の変更分の負荷）。
+        """
+        try:
+            if self.journal is not None and os.path.abspath(self.journal.path) == os.path.abspath(filepath):
+                self.journal.sync()
+                return
+            self.detach_journal()
+            self.journal = StateJournal(filepath)
+            self._write_snapshot()
+        except Exception as e:
+            logger.error("ゲーム状態の保存に失敗: %s", e)
+    
+    def save_state_binary(self, filepath: str) -> None:
+        """ゲーム状態をバイナリ形式（core/save_codec.py、在庫は列指向）で保存（アーカイブ用、ジャーナルは付けない）"""
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(self.state, f, ensure_ascii=False, indent=2)
+            temp_path = filepath + '.tmp'
+            with open(temp_path, 'wb') as f:
+                f.write(encode_state(self._snapshot_state()))
+            os.replace(temp_path, filepath)
         except Exception as e:
-            print(f"ゲーム状態の保存に失敗: {e}")
+            logger.error("ゲーム状態の保存に失敗: %s", e)
     
     def load_state(self, filepath: str) -> bool:
-        """ファイルからゲーム状態を読み込み"""
+        """
+        ファイルからゲーム状態を読み込み
+        
+        JSON形式はスナップショット + ジャーナルを再生（従来形式の保存ファイルも可）、
+        バイナリ形式（save_state_binary）は形式を判別して読み込む。
+        バイナリ形式でも在庫は全件 Item にする（在庫は変更される IndexedCollection で、台帳への登録・
+        ゲームストアへの保存・API応答が個々の Item を前提とするため。遅延生成は open_save() を使うツール向け）。
+        集計ストアは列から直接作る。
+        """
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                self.state = json.load(f)
+            columns = None
+            if is_binary_save(filepath):
+                with open_save(filepath) as save:
+                    state, entries = save.to_state(), []
+                    columns = save.inventory.item_columns()
+            else:
+                state, entries = read_journal(filepath)
+            self._replace_state(state, entries, columns)
             return True
         except Exception as e:
-            print(f"ゲーム状態の読み込みに失敗: {e}")
+            logger.error("ゲーム状態の読み込みに失敗: %s", e)
             return False
     
+    def restore_state(self, state: Dict[str, Any]) -> None:
+        """
+        保存済みの状態（_snapshot_state() 形式、ゲームストアの行から組み立てたもの）で状態を差し替える
+        
+        Raises:
+            KeyError: 必要なキーがない場合
+        """
+        self._replace_state(dict(state), [])
+    
+    def _replace_state(self, state: Dict[str, Any], entries: List[Dict[str, Any]],
+                       columns: Optional[ItemColumns] = None) -> None:
+        """
+        状態を丸ごと差し替え、ターン状態を戻してジャーナルを再生する
+        
+        途中で失敗したら状態・台帳・ターン状態を差し替え前に戻して例外を送出する
+        （採番器は進んだまま、IDが飛ぶだけで重複はしない）。
+        """
+        turn_state = state.pop('turn_system', None)
+        state.pop('journal_sequence', None)
+        previous = (self.state, self.inventory_columns, self._inventory_summary, self.turn_system.export_state())
+        try:
+            self._adopt_state(state)
+            self._rebuild_ledger(columns)
+            self._sync_id_allocator()
+            if turn_state is not None:
+                self.turn_system.restore_state(turn_state)
+            self._replay_journal(entries)
+        except Exception:
+            self.state, self.inventory_columns, self._inventory_summary, previous_turn = previous
+            self.turn_system.restore_state(previous_turn)
+            raise
+        self._mark_replaced()
+        self.mark_changed()
+    
     def export_state_json(self) -> str:
         """ゲーム状態をJSON文字列として出力"""
-        return json.dumps(self.get_state(), ensure_ascii=False, indent=2)
+        return json.dumps(self.get_state(), ensure_ascii=False, indent=2, default=json_default)
     
     def import_state_json(self, json_str: str) -> bool:
         """JSON文字列からゲーム状態を読み込み"""
@@ -189,19 +522,23 @@ class GameEngine:
             # 必要なキーの存在確認
             required_keys = ['money', 'inventory', 'auction_items']
             if all(key in imported_state for key in required_keys):
-                self.state.update(imported_state)
+                self._adopt_state(dict(self.state, **imported_state))
+                self._rebuild_ledger()
+                self._sync_id_allocator()
+                self._mark_replaced()
+                self.mark_changed()
                 return True
             return False
         except Exception as e:
-            print(f"JSON状態の読み込みに失敗: {e}")
+            logger.error("JSON状態の読み込みに失敗: %s", e)
             return False
     
     def get_summary(self) -> Dict[str, Any]:
         """ゲーム状態のサマリーを取得（フェーズ2: AssetManager統合）"""
-        state = self.get_state()
+        state = self.view()
         
-        # フェーズ2: AssetManagerを使用した詳細資産情報
-        asset_info = AssetManager.get_asset_info(state['money'], state['inventory'])
+        # フェーズ2: 台帳ベースの詳細資産情報
+        asset_info = state['asset_info']
         
         # オークション中の価値計算
         auction_value = sum(
@@ -227,4 +564,4 @@ class GameEngine:
 
 
 # シングルトンインスタンス
-game_engine = GameEngine()
\ No newline at end of file
+game_engine = GameEngine(id_allocator=item_id_allocator)
\ No newline at end of file
@@ -0,0 +1,148 @@
+"""
+タイムトラベル仕入れゲーム - ログ管理
+サブシステム別のレベル制御と出力ハンドラ（同期・バッファ・非同期）を担当
+
+使い方:
+    logger = get_logger('asset')
+    logger.debug("資産計算: 現金=%.2f円", cash)  # 無効時はフォーマットされない
+
+    get_alert_logger().error("保存に失敗: %s", e)  # 本番モードでも標準エラーに出る運用上の障害
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+from typing import Dict, Optional
+
+from .game_config import GameConfig
+
+ROOT_LOGGER_NAME = 'timetravel'
+# 本番モードでも黙らせない障害通知（保存の失敗など）用ロガー
+ALERT_LOGGER_NAME = f'{ROOT_LOGGER_NAME}.alert'
+
+# サブシステム名（get_logger の引数）
+SUBSYSTEMS = ('engine', 'turn', 'asset', 'item', 'auction', 'buyer', 'travel', 'session', 'app')
+
+LOG_MODES = ('production', 'debug')
+LOG_HANDLERS = ('stream', 'buffered', 'async')
+
+# 本番モードで全出力を止めるためのレベル（CRITICALより上）
+_SILENT_LEVEL = logging.CRITICAL + 1
+
+_LOG_FORMAT = '[%(name)s] %(message)s'
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def get_logger(subsystem: str) -> logging.Logger:
+    """サブシステム用ロガーを取得"""
+    return logging.getLogger(f'{ROOT_LOGGER_NAME}.{subsystem}')
+
+
+def get_alert_logger() -> logging.Logger:
+    """障害通知用ロガーを取得（ログモードによらず ERROR 以上を標準エラーに出力）"""
+    return logging.getLogger(ALERT_LOGGER_NAME)
+
+
+def _configure_alerts(stream) -> None:
+    """障害通知用ロガーに専用の出力先を付ける（ルートのレベル・ハンドラの影響を受けない）"""
+    alert = get_alert_logger()
+    for existing in list(alert.handlers):
+        alert.removeHandler(existing)
+        existing.close()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter('[%(name)s] %(levelname)s %(message)s'))
+    alert.addHandler(handler)
+    alert.setLevel(logging.ERROR)
+    alert.propagate = False
+
+
+def _build_handler(handler: str, stream) -> logging.Handler:
+    """出力ハンドラを生成"""
+    global _listener
+
+    stream_handler = logging.StreamHandler(stream)
+    stream_handler.setFormatter(logging.Formatter(_LOG_FORMAT))
+
+    if handler == 'buffered':
+        # 指定件数たまるか WARNING 以上で書き出し
+        return logging.handlers.MemoryHandler(
+            GameConfig.LOG_BUFFER_CAPACITY, flushLevel=logging.WARNING, target=stream_handler
+        )
+
+    if handler == 'async':
+        # リクエスト処理スレッドはキューに積むだけ、出力は別スレッド
+        log_queue = queue.SimpleQueue()
+        _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+        _listener.start()
+        return logging.handlers.QueueHandler(log_queue)
+
+    return stream_handler
+
+
+def _shutdown() -> None:
+    """非同期リスナーを停止して残りを書き出す"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    root = logging.getLogger(ROOT_LOGGER_NAME)
+    for existing in list(root.handlers):
+        existing.flush()
+
+
+def configure_logging(mode: str = None, levels: Dict[str, str] = None,
+                      handler: str = None, stream=None, alert_stream=None) -> None:
+    """
+    ログ出力を設定
+
+    Args:
+        mode: 'production'（何も出力しない）/ 'debug'
+              省略時は環境変数 TIMETRAVEL_LOG_MODE、次に GameConfig.LOG_MODE
+        levels: サブシステム別レベル（例: {'asset': 'WARNING'}）
+        handler: 'stream' / 'buffered' / 'async'（debugモードのみ有効）
+        stream: 出力先（省略時は標準出力）
+        alert_stream: 障害通知の出力先（省略時は標準エラー、本番モードでも出力）
+    """
+    mode = mode or os.environ.get('TIMETRAVEL_LOG_MODE', GameConfig.LOG_MODE)
+    if mode not in LOG_MODES:
+        raise ValueError(f"不明なログモード: {mode}")
+
+    handler = handler or GameConfig.LOG_HANDLER
+    if handler not in LOG_HANDLERS:
+        raise ValueError(f"不明なログハンドラ: {handler}")
+
+    _shutdown()
+    root = logging.getLogger(ROOT_LOGGER_NAME)
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+        existing.close()
+    root.propagate = False
+
+    # 前回設定したサブシステム別レベルを解除
+    for subsystem in SUBSYSTEMS:
+        get_logger(subsystem).setLevel(logging.NOTSET)
+
+    _configure_alerts(alert_stream or sys.stderr)
+
+    if mode == 'production':
+        root.addHandler(logging.NullHandler())
+        root.setLevel(_SILENT_LEVEL)
+        return
+
+    root.addHandler(_build_handler(handler, stream or sys.stdout))
+    root.setLevel(logging.DEBUG)
+
+    subsystem_levels = dict(GameConfig.LOG_LEVELS)
+    subsystem_levels.update(levels or {})
+    for subsystem, level in subsystem_levels.items():
+        get_logger(subsystem).setLevel(level)
+
+
+atexit.register(_shutdown)
+
+# インポート時点で設定（本番モードなら以降のログは全て破棄される）
+configure_logging()
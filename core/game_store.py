@@ -0,0 +1,487 @@
+"""
+タイムトラベル仕入れゲーム - ゲームストア（SQLite）
+セッションのゲーム状態（お金・ターン・在庫・出品）とタイムトラベル・オークションの履歴をSQLiteに保存する
+
+リクエスト中の変更は SessionRecorder に貯め（GameEngine の変更通知から在庫・出品の触れたIDだけを記録）、
+リクエスト終了時に save_session() で1トランザクションにまとめて書き込む。
+プロセスを再起動しても SessionStore が同じセッションIDで状態を復元できる。
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Any, Optional, Tuple
+
+from .game_config import GameConfig
+from .game_logger import get_logger
+from .item_record import json_default
+
+logger = get_logger('engine')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    money REAL NOT NULL,
+    total_profit REAL NOT NULL,
+    total_spent REAL NOT NULL,
+    turn_count INTEGER NOT NULL,
+    game_over INTEGER NOT NULL,
+    next_item_id INTEGER NOT NULL,
+    turn_state TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_updated ON sessions (updated_at);
+
+CREATE TABLE IF NOT EXISTS inventory (
+    session_id TEXT NOT NULL,
+    item_id INTEGER NOT NULL,
+    genre TEXT NOT NULL,
+    base_value REAL NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (session_id, item_id)
+);
+
+CREATE TABLE IF NOT EXISTS auction_items (
+    session_id TEXT NOT NULL,
+    item_id INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (session_id, item_id)
+);
+
+CREATE TABLE IF NOT EXISTS travel_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    major_turn INTEGER NOT NULL,
+    minor_turn INTEGER NOT NULL,
+    years INTEGER NOT NULL,
+    distance INTEGER NOT NULL,
+    price_multiplier REAL NOT NULL,
+    investment_cost REAL NOT NULL,
+    fixed_cost REAL NOT NULL,
+    total_cost REAL NOT NULL,
+    failed INTEGER NOT NULL,
+    item_count INTEGER NOT NULL,
+    total_value REAL NOT NULL,
+    money_after REAL NOT NULL,
+    assets_after REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_travel_events_session ON travel_events (session_id, id);
+CREATE INDEX IF NOT EXISTS idx_travel_events_turn ON travel_events (session_id, major_turn, id);
+
+CREATE TABLE IF NOT EXISTS auction_results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    major_turn INTEGER NOT NULL,
+    minor_turn INTEGER NOT NULL,
+    item_id INTEGER NOT NULL,
+    genre TEXT,
+    base_value REAL,
+    sold INTEGER NOT NULL,
+    start_price REAL NOT NULL,
+    final_price REAL NOT NULL,
+    bid_count INTEGER NOT NULL,
+    winner_id INTEGER,
+    profit REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_auction_results_session ON auction_results (session_id, id);
+CREATE INDEX IF NOT EXISTS idx_auction_results_turn ON auction_results (session_id, major_turn, id);
+"""
+
+# 履歴テーブルの列（INSERT・取得の順）
+TRAVEL_EVENT_COLUMNS = (
+    'created_at', 'major_turn', 'minor_turn', 'years', 'distance', 'price_multiplier',
+    'investment_cost', 'fixed_cost', 'total_cost', 'failed', 'item_count', 'total_value',
+    'money_after', 'assets_after',
+)
+AUCTION_RESULT_COLUMNS = (
+    'created_at', 'major_turn', 'minor_turn', 'item_id', 'genre', 'base_value', 'sold',
+    'start_price', 'final_price', 'bid_count', 'winner_id', 'profit',
+)
+_BOOLEAN_COLUMNS = frozenset(('failed', 'sold'))
+_HISTORY_TABLES = {'travel': ('travel_events', TRAVEL_EVENT_COLUMNS),
+                   'auction': ('auction_results', AUCTION_RESULT_COLUMNS)}
+
+
+def _roi(value: float, cost: float) -> Optional[float]:
+    """投資収益率（コストが0なら None）"""
+    return round((value - cost) / cost, 4) if cost else None
+
+
+def _dumps(data: Any) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=json_default)
+
+
+class SessionRecorder:
+    """1セッション分の未保存の変更（GameEngine.recorder に設定し、save_session() で書き出して空にする）"""
+
+    __slots__ = ('inventory_ids', 'auction_dirty', 'state_dirty', 'replaced', 'history_cleared', 'events',
+                 'failures', 'last_error')
+
+    def __init__(self):
+        self.inventory_ids = set()   # 追加・削除された在庫ID（保存時の在庫の有無で書き込み・削除を決める）
+        self.auction_dirty = False   # 出品が変わったか（出品は最大数件なので丸ごと書き直す）
+        self.state_dirty = False     # お金・ターンなどセッション行の値が変わったか
+        self.replaced = False        # リセット・読み込みで状態全体が差し替えられたか
+        self.history_cleared = False # ゲームのやり直しで保存済みの履歴を消すか
+        self.events: Dict[str, List[Dict[str, Any]]] = {kind: [] for kind in _HISTORY_TABLES}
+        self.failures = 0            # 連続した保存の失敗回数（失敗した変更は次の保存で再度書き込む）
+        self.last_error: Optional[str] = None
+
+    @property
+    def dirty(self) -> bool:
+        return self.state_dirty or self.replaced or self.history_cleared or any(self.events.values())
+
+    def append(self, op: str, **payload) -> None:
+        """GameEngine の変更通知（StateJournal.append と同じ形式）"""
+        self.state_dirty = True
+        if op == 'inventory_add':
+            self.inventory_ids.update(item['id'] for item in payload['items'])
+        elif op == 'inventory_remove':
+            self.inventory_ids.add(payload['item_id'])
+        elif op.startswith('auction_'):
+            self.auction_dirty = True
+
+    def mark_replaced(self) -> None:
+        self.replaced = True
+        self.state_dirty = True
+
+    def clear_history(self) -> None:
+        """保存済み・未保存の履歴を消す（ゲームのやり直し時、ターン範囲の集計に前のゲームを混ぜない）"""
+        self.history_cleared = True
+        for events in self.events.values():
+            events.clear()
+
+    def record_event(self, kind: str, event: Dict[str, Any]) -> None:
+        """履歴（'travel' / 'auction'）を1件追加"""
+        self.events[kind].append(event)
+
+    def mark_failed(self, error: Exception) -> None:
+        """保存の失敗を記録（未保存の変更は残す）"""
+        self.failures += 1
+        self.last_error = f"{type(error).__name__}: {error}"
+
+    def clear(self) -> None:
+        self.inventory_ids.clear()
+        self.failures = 0
+        self.last_error = None
+        self.auction_dirty = self.state_dirty = self.replaced = self.history_cleared = False
+        for events in self.events.values():
+            events.clear()
+
+
+class GameStore:
+    """SQLiteのゲームストア（1接続をロックで共有）"""
+
+    def __init__(self, path: str = ':memory:'):
+        """
+        Args:
+            path: データベースファイルのパス（':memory:' ならプロセス内のみ）
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        if path != ':memory:':
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # --- セッション状態 ---
+
+    def attach(self, session) -> bool:
+        """
+        セッションをストアに紐付け、保存済みの状態があれば復元する
+
+        Returns:
+            保存済みの状態を復元したか
+        """
+        restored = self._restore(session)
+        session.store = self
+        session.recorder = SessionRecorder()
+        session.engine.recorder = session.recorder
+        if not restored:
+            session.recorder.mark_replaced()  # 新規セッションは次の保存で全体を書く
+        return restored
+
+    def _restore(self, session) -> bool:
+        with self._lock:
+            row = self._conn.execute('SELECT * FROM sessions WHERE session_id = ?', (session.session_id,)).fetchone()
+            if row is None:
+                return False
+            inventory = [json.loads(data) for (data,) in self._conn.execute(
+                'SELECT data FROM inventory WHERE session_id = ? ORDER BY rowid', (session.session_id,))]
+            auction_items = [json.loads(data) for (data,) in self._conn.execute(
+                'SELECT data FROM auction_items WHERE session_id = ? ORDER BY rowid', (session.session_id,))]
+        session.engine.restore_state({
+            'money': row['money'],
+            'inventory': inventory,
+            'auction_items': auction_items,
+            'game_over': bool(row['game_over']),
+            'turn_count': row['turn_count'],
+            'total_profit': row['total_profit'],
+            'total_spent': row['total_spent'],
+            'next_item_id': row['next_item_id'],
+            'turn_system': json.loads(row['turn_state']),
+        })
+        logger.debug("セッション復元: %s (在庫%d個)", session.session_id, len(inventory))
+        return True
+
+    def save_session(self, session) -> bool:
+        """
+        セッションの未保存の変更を1トランザクションで書き込む（リクエスト終了時に呼ぶ）
+
+        Returns:
+            書き込みを行ったか（変更がなければ何もしない）
+        """
+        recorder = session.recorder
+        if recorder is None or not recorder.dirty:
+            return False
+        engine = session.engine
+        session_id = session.session_id
+        state = engine.state
+        now = time.time()
+
+        with self._lock, self._conn:
+            if recorder.state_dirty:
+                self._conn.execute(
+                    'INSERT INTO sessions (session_id, created_at, updated_at, money, total_profit, total_spent,'
+                    ' turn_count, game_over, next_item_id, turn_state) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)'
+                    ' ON CONFLICT(session_id) DO UPDATE SET updated_at = excluded.updated_at,'
+                    ' money = excluded.money, total_profit = excluded.total_profit,'
+                    ' total_spent = excluded.total_spent, turn_count = excluded.turn_count,'
+                    ' game_over = excluded.game_over, next_item_id = excluded.next_item_id,'
+                    ' turn_state = excluded.turn_state',
+                    (session_id, session.created_at, now, state['money'], state['total_profit'],
+                     state['total_spent'], state['turn_count'], int(bool(state['game_over'])),
+                     engine.id_allocator.next_id, _dumps(engine.turn_system.export_state())))
+
+            inventory = state['inventory']
+            if recorder.replaced:
+                self._conn.execute('DELETE FROM inventory WHERE session_id = ?', (session_id,))
+                present, removed = list(inventory), []
+            else:
+                present = [inventory.get(item_id) for item_id in recorder.inventory_ids if item_id in inventory]
+                removed = [item_id for item_id in recorder.inventory_ids if item_id not in inventory]
+            if removed:
+                self._conn.executemany('DELETE FROM inventory WHERE session_id = ? AND item_id = ?',
+                                       [(session_id, item_id) for item_id in removed])
+            if present:
+                self._conn.executemany(
+                    'INSERT OR REPLACE INTO inventory (session_id, item_id, genre, base_value, data)'
+                    ' VALUES (?, ?, ?, ?, ?)',
+                    [(session_id, item['id'], item['genre'], item['base_value'], _dumps(item)) for item in present])
+
+            if recorder.replaced or recorder.auction_dirty:
+                self._conn.execute('DELETE FROM auction_items WHERE session_id = ?', (session_id,))
+                self._conn.executemany(
+                    'INSERT INTO auction_items (session_id, item_id, data) VALUES (?, ?, ?)',
+                    [(session_id, auction_item['item']['id'], _dumps(auction_item))
+                     for auction_item in state['auction_items']])
+
+            for kind, events in recorder.events.items():
+                if recorder.history_cleared:
+                    self._conn.execute(f'DELETE FROM {_HISTORY_TABLES[kind][0]} WHERE session_id = ?', (session_id,))
+                if events:
+                    table, columns = _HISTORY_TABLES[kind]
+                    self._conn.executemany(
+                        f"INSERT INTO {table} (session_id, {', '.join(columns)})"
+                        f" VALUES (?, {', '.join('?' * len(columns))})",
+                        [(session_id, *(event.get(column) for column in columns)) for event in events])
+        recorder.clear()
+        return True
+
+    def delete_session(self, session_id: str) -> None:
+        """セッションの状態と履歴を削除"""
+        with self._lock, self._conn:
+            for table in ('sessions', 'inventory', 'auction_items', 'travel_events', 'auction_results'):
+                self._conn.execute(f'DELETE FROM {table} WHERE session_id = ?', (session_id,))
+
+    def session_ids(self) -> List[str]:
+        """保存済みのセッションID（更新が新しい順）"""
+        with self._lock:
+            return [row[0] for row in self._conn.execute('SELECT session_id FROM sessions ORDER BY updated_at DESC')]
+
+    # --- 履歴 ---
+
+    def history(self, kind: str, session_id: str, limit: int = 20, before_id: Optional[int] = None,
+                major_from: Optional[int] = None, major_to: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        履歴を新しい順に取得（キーセットページング）
+
+        ターン範囲を指定しない場合は (session_id, id)、指定した場合は (session_id, major_turn, id) の索引を
+        順に読むだけで済むため、履歴の総数によらず1ページ分の読み込み・メモリで済む。
+
+        Args:
+            kind: 'travel'（タイムトラベル） / 'auction'（オークション結果）
+            session_id: セッションID
+            limit: 最大件数
+            before_id: このIDより前（古い）の履歴のみ（前ページ最後の id を渡す）
+            major_from: この大ターン以降のみ
+            major_to: この大ターン以前のみ
+        """
+        table, columns = _HISTORY_TABLES[kind]
+        query = f"SELECT id, {', '.join(columns)} FROM {table} WHERE session_id = ?"
+        params: List[Any] = [session_id]
+        by_turn = major_from is not None or major_to is not None
+        if major_from is not None:
+            query += ' AND major_turn >= ?'
+            params.append(major_from)
+        if major_to is not None:
+            query += ' AND major_turn <= ?'
+            params.append(major_to)
+        if before_id is not None:
+            if by_turn:
+                query += f' AND (major_turn, id) < ((SELECT major_turn FROM {table} WHERE id = ?), ?)'
+                params.extend((before_id, before_id))
+            else:
+                query += ' AND id < ?'
+                params.append(before_id)
+        query += ' ORDER BY major_turn DESC, id DESC LIMIT ?' if by_turn else ' ORDER BY id DESC LIMIT ?'
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [
+            {key: bool(row[key]) if key in _BOOLEAN_COLUMNS else row[key] for key in row.keys()}
+            for row in rows
+        ]
+
+    def history_page(self, session, kind: str, limit: int, before_id: Optional[int] = None,
+                     major_from: Optional[int] = None, major_to: Optional[int] = None) -> Dict[str, Any]:
+        """
+        履歴APIの1ページ分（リクエスト中の未保存分も含めるため先にセッションを書き込む）
+
+        Returns:
+            {'history': 新しい順の履歴, 'next_before_id': 次ページの before_id（最終ページなら None）}
+        """
+        self.save_session(session)
+        history = self.history(kind, session.session_id, limit, before_id, major_from, major_to)
+        return {
+            'history': history,
+            'next_before_id': history[-1]['id'] if len(history) == limit else None,
+        }
+
+    def travel_roi(self, session_id: str, window: int, major_from: int = 1, major_to: Optional[int] = None,
+                   limit: int = 20) -> Dict[str, Any]:
+        """
+        大ターンごとのタイムトラベル収支と直近 window 大ターンの移動ROI
+
+        大ターン単位の集計は (session_id, major_turn, id) の索引順に GROUP BY し、カーソルから1行ずつ読んで
+        直近 window 行だけを保持するため、タイムトラベルの件数によらず一定のメモリで済む。
+        ROI = (獲得した商品価値 - 総コスト) / 総コスト。
+
+        Args:
+            session_id: セッションID
+            window: 移動ROIの大ターン数
+            major_from: この大ターンから返す（移動ROI用に手前 window - 1 大ターン分も読む）
+            major_to: この大ターンまで
+            limit: 返す大ターン数の上限
+
+        Returns:
+            {'turns': 大ターン順の集計, 'window': window, 'next_major_from': 次ページの major_from（最終ページなら None）}
+        """
+        query = ('SELECT major_turn, COUNT(*) AS travels, SUM(failed) AS failed, SUM(item_count) AS items,'
+                 ' SUM(investment_cost) AS investment_cost, SUM(fixed_cost) AS fixed_cost,'
+                 ' SUM(total_cost) AS total_cost, SUM(total_value) AS total_value,'
+                 ' AVG(price_multiplier) AS price_multiplier'
+                 ' FROM travel_events WHERE session_id = ? AND major_turn >= ?')
+        params: List[Any] = [session_id, major_from - (window - 1)]
+        if major_to is not None:
+            query += ' AND major_turn <= ?'
+            params.append(major_to)
+        query += ' GROUP BY major_turn ORDER BY major_turn'
+
+        turns: List[Dict[str, Any]] = []
+        recent: Deque[Tuple[float, float]] = deque(maxlen=window)
+        window_cost = window_value = 0.0
+        next_major_from = None
+        with self._lock:
+            for row in self._conn.execute(query, params):
+                if len(recent) == window:
+                    cost, value = recent[0]
+                    window_cost -= cost
+                    window_value -= value
+                recent.append((row['total_cost'], row['total_value']))
+                window_cost += row['total_cost']
+                window_value += row['total_value']
+                if row['major_turn'] < major_from:
+                    continue
+                if len(turns) == limit:
+                    next_major_from = row['major_turn']
+                    break
+                turns.append({
+                    'major_turn': row['major_turn'],
+                    'travels': row['travels'],
+                    'failed': row['failed'],
+                    'items': row['items'],
+                    'investment_cost': round(row['investment_cost'], 2),
+                    'fixed_cost': round(row['fixed_cost'], 2),
+                    'total_cost': round(row['total_cost'], 2),
+                    'total_value': round(row['total_value'], 2),
+                    'price_multiplier': round(row['price_multiplier'], 4),
+                    'roi': _roi(row['total_value'], row['total_cost']),
+                    'rolling_roi': _roi(window_value, window_cost),
+                })
+        return {'turns': turns, 'window': window, 'next_major_from': next_major_from}
+
+    def get_history_summary(self, session_id: str) -> Dict[str, Any]:
+        """タイムトラベル・オークション履歴の集計"""
+        with self._lock:
+            travel = self._conn.execute(
+                'SELECT COUNT(*) AS travels, COALESCE(SUM(failed), 0) AS failed,'
+                ' COALESCE(SUM(total_cost), 0) AS total_cost, COALESCE(SUM(total_value), 0) AS total_value,'
+                ' COALESCE(SUM(item_count), 0) AS items'
+                ' FROM travel_events WHERE session_id = ?', (session_id,)).fetchone()
+            auction = self._conn.execute(
+                'SELECT COUNT(*) AS listed, COALESCE(SUM(sold), 0) AS sold,'
+                ' COALESCE(SUM(CASE WHEN sold THEN final_price ELSE 0 END), 0) AS revenue,'
+                ' COALESCE(SUM(profit), 0) AS profit'
+                ' FROM auction_results WHERE session_id = ?', (session_id,)).fetchone()
+            by_genre = self._conn.execute(
+                'SELECT genre, COUNT(*) AS sold, SUM(final_price) AS revenue FROM auction_results'
+                ' WHERE session_id = ? AND sold GROUP BY genre ORDER BY revenue DESC', (session_id,)).fetchall()
+        return {
+            'travel': {
+                'count': travel['travels'],
+                'failed': travel['failed'],
+                'items': travel['items'],
+                'total_cost': round(travel['total_cost'], 2),
+                'total_value': round(travel['total_value'], 2),
+                'value_ratio': round(travel['total_value'] / travel['total_cost'], 4) if travel['total_cost'] else None,
+            },
+            'auction': {
+                'listed': auction['listed'],
+                'sold': auction['sold'],
+                'sell_rate': round(auction['sold'] / auction['listed'] * 100, 1) if auction['listed'] else None,
+                'revenue': round(auction['revenue'], 2),
+                'profit': round(auction['profit'], 2),
+                'by_genre': {row['genre']: {'sold': row['sold'], 'revenue': round(row['revenue'], 2)}
+                             for row in by_genre},
+            },
+        }
+
+
+def create_game_store(path: str = None) -> Optional[GameStore]:
+    """
+    設定に従ってゲームストアを生成
+
+    Args:
+        path: データベースのパス（省略時は環境変数 TIMETRAVEL_DB_PATH、次に GameConfig.GAME_STORE_PATH。
+              空文字列ならストアを使わない）
+    """
+    if path is None:
+        path = os.environ.get('TIMETRAVEL_DB_PATH', GameConfig.GAME_STORE_PATH)
+    if not path:
+        return None
+    if path != ':memory:':
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    return GameStore(path)
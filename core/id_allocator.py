@@ -0,0 +1,73 @@
+"""
+タイムトラベル仕入れゲーム - 商品ID採番
+ゲーム（またはシャード）ごとに単調増加する整数IDを発行する
+
+ID構成: (シャード番号 << SHARD_SHIFT) | 連番
+    シャード0なら 1, 2, 3, ... の密なIDになる。
+    複数ゲームの商品をまとめて扱う場合（シミュレーション集計など）は
+    ゲームごとに別のシャード番号を使えば衝突しない。
+"""
+
+import itertools
+from typing import Iterable
+
+SHARD_SHIFT = 40  # 1シャードあたり約1兆個まで
+MAX_SEQUENCE = (1 << SHARD_SHIFT) - 1
+
+
+class ItemIdAllocator:
+    """単調増加の商品ID採番器（時刻・乱数を使わず、同一採番器内で重複しない）"""
+
+    __slots__ = ('shard', '_counter', '_next')
+
+    def __init__(self, shard: int = 0, start: int = 1):
+        """
+        Args:
+            shard: シャード番号（IDの上位ビット）
+            start: 最初に発行する連番
+        """
+        if shard < 0:
+            raise ValueError(f"シャード番号は0以上で指定してください: {shard}")
+        self.shard = shard
+        self._reset_counter(start)
+
+    def _reset_counter(self, next_sequence: int) -> None:
+        if next_sequence > MAX_SEQUENCE:
+            raise OverflowError(f"シャード{self.shard}の連番が上限に達しました")
+        self._next = next_sequence
+        # itertools.count の next() はGILの下でアトミック（ロック不要）
+        self._counter = itertools.count(next_sequence)
+
+    def allocate(self) -> int:
+        """IDを1つ発行"""
+        sequence = next(self._counter)
+        self._next = sequence + 1
+        return (self.shard << SHARD_SHIFT) | sequence
+
+    @property
+    def next_id(self) -> int:
+        """次に発行されるID（保存用）"""
+        return (self.shard << SHARD_SHIFT) | self._next
+
+    def observe(self, item_ids: Iterable[int]) -> None:
+        """
+        既存IDより後から発行するように連番を進める
+
+        読み込んだセーブデータや外部で生成した商品（旧形式の時刻ベースIDを含む）を
+        取り込んだ後に呼び、以降の発行IDと重複しないようにする。
+        """
+        highest = max((item_id for item_id in item_ids if item_id >> SHARD_SHIFT == self.shard), default=None)
+        if highest is not None and (highest & MAX_SEQUENCE) >= self._next:
+            self._reset_counter((highest & MAX_SEQUENCE) + 1)
+
+    def restore(self, next_id: int) -> None:
+        """保存された next_id から再開（既に進んでいる場合は戻さない）"""
+        self.observe([next_id - 1])
+
+    def reset(self) -> None:
+        """連番を最初に戻す（新しいゲーム開始時）"""
+        self._reset_counter(1)
+
+
+# グローバルインスタンス（採番器を指定せずに商品を生成した場合に使用）
+item_id_allocator = ItemIdAllocator()
@@ -0,0 +1,253 @@
+"""
+タイムトラベル仕入れゲーム - 自動投資プランナー
+大ターンの残りの子ターンについて、既知の価格倍率（TurnSystem.turn_multipliers）から各ターンの投資割合を
+動的計画法で決め、大ターン終了時の期待資産を最大化する
+
+モデル（期待値、仕入れ総価値のばらつきは平均で評価）:
+    固定費 F = 資産 A × 固定費率 r（AssetManager.calculate_fixed_cost と同じ率）
+    投資額 x = 割合 f × (現金 C - F)、仕入れ価値 = x × 価格倍率 m
+    C' = C - F - x、A' = A - F + x × (m - 1)
+売却率 ρ を指定すると、仕入れた商品は次のターンまでに基本価値 × ρ で現金化されるとみなす
+（A' に x × m × (ρ - 1) の売却益、C' に x × m × ρ の売却代金が加わる）。
+どちらの場合も、商品が売れなくても残りの全ターンの固定費を現金で払えることを制約とする。
+（毎リクエストで現在の状態から計画し直すので、実際の売却結果は次の計画に反映される）
+
+状態も価値も資産に比例するため、現金比率 c = C / A の1次元で解ける（v = m または ρm、a = c - r）:
+    A' / A = 1 - r + f a (v - 1)、c' = (a (1 - f) + 売却代金) / (A' / A)
+割合0のまま残り k ターンを進めるのに必要な現金比率は 1 - (1 - r)^k。
+売却しても c' はこの値を下回らないので、価値関数は [1 - (1 - r)^k, 1] の格子で持てる。
+"""
+
+import bisect
+import math
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+from .asset_manager import AssetManager
+from .phase2_config import FIXED_COST_RATE
+from .travel_config import YEARS_MIN, YEARS_MAX, DISTANCE_MIN, DISTANCE_MAX
+from .travel_table import VALUE_VARIANCE_MEAN
+
+try:
+    import numpy as np
+except ImportError:  # NumPy未導入環境では価値関数を逐次計算で代替
+    np = None
+
+# 比率の丸め誤差の許容幅
+_EPSILON = 1e-9
+
+
+def required_cash_ratio(turns: int, rate: float = FIXED_COST_RATE) -> float:
+    """投資せずに残り turns ターンの固定費を払い切るのに必要な現金比率（現金 / 資産）"""
+    return 1.0 - (1.0 - rate) ** turns
+
+
+def split_exact(amount: float) -> Tuple[int, int]:
+    """
+    投資額を年数と距離に割り振る（乱数なし、年数 × 距離 ≤ 投資額で最大に近い組）
+
+    ItemSystem.split_investment と同じく平方根で分配するが、年数を固定して端数の損失を√投資額未満に抑える。
+    """
+    amount = max(int(amount), 0)
+    years = max(YEARS_MIN, min(math.isqrt(amount), YEARS_MAX))
+    distance = max(DISTANCE_MIN, min(amount // years, DISTANCE_MAX))
+    return years, distance
+
+
+def _interp(x: float, xs: Sequence[float], ys: Sequence[float]) -> float:
+    """折れ線の線形補間（xs は昇順、範囲外は端の値）"""
+    if x <= xs[0]:
+        return ys[0]
+    if x >= xs[-1]:
+        return ys[-1]
+    i = bisect.bisect_right(xs, x)
+    ratio = (x - xs[i - 1]) / (xs[i] - xs[i - 1])
+    return ys[i - 1] + (ys[i] - ys[i - 1]) * ratio
+
+
+class InvestmentPlanner:
+    """残りの子ターンの投資割合を動的計画法で決める自動投資プランナー"""
+
+    def __init__(self, ratio_step: float = 0.05, grid_size: int = 201, cache_size: int = 32):
+        """
+        Args:
+            ratio_step: 投資割合の候補の刻み（ほかに現金制約ぎりぎりの割合も候補にする）
+            grid_size: 価値関数を持つ現金比率の格子点数
+            cache_size: 価値関数表のメモ化件数（残りの倍率列ごと、大ターン中は同じ表を使い回す）
+        """
+        steps = int(round(1.0 / ratio_step))
+        self.ratios = [i / steps for i in range(steps + 1)]
+        self.grid_size = grid_size
+        self.rate = FIXED_COST_RATE
+        self._value_tables = lru_cache(maxsize=cache_size)(self._solve)
+
+    def _candidates(self, cash_ratio: float, multiplier: float, next_required: float) -> List[float]:
+        """現金比率 cash_ratio で取れる投資割合の候補（次ターン以降の固定費を残せるもの）"""
+        available = cash_ratio - self.rate
+        slack = available - next_required * (1.0 - self.rate)
+        if available <= 0 or slack < -_EPSILON:
+            return []
+        limit = min(max(slack / (available * (1.0 + next_required * (multiplier - 1.0))), 0.0), 1.0)
+        return [f for f in self.ratios if f < limit] + [limit]
+
+    def _step(self, cash_ratio: float, multiplier: float, ratio: float,
+              resale_rate: Optional[float]) -> Tuple[float, float]:
+        """割合 ratio で投資したときの (資産の伸び率, 次の現金比率)"""
+        available = cash_ratio - self.rate
+        proceeds = 0.0 if resale_rate is None else multiplier * resale_rate
+        value = multiplier if resale_rate is None else proceeds
+        growth = 1.0 - self.rate + ratio * available * (value - 1.0)
+        return growth, available * (1.0 - ratio + ratio * proceeds) / growth
+
+    def _best(self, cash_ratio: float, multiplier: float, next_required: float,
+              next_grid: Sequence[float], next_values: Sequence[float],
+              resale_rate: Optional[float]) -> Tuple[Optional[float], float]:
+        """1ターン分の最適な投資割合と、そこから大ターン終了までの資産の伸び率"""
+        best_ratio, best_value = None, -math.inf
+        for ratio in self._candidates(cash_ratio, multiplier, next_required):
+            growth, next_ratio = self._step(cash_ratio, multiplier, ratio, resale_rate)
+            value = growth * _interp(max(next_ratio, next_required), next_grid, next_values)
+            if value > best_value + _EPSILON:
+                best_ratio, best_value = ratio, value
+        return best_ratio, best_value
+
+    def _solve_stage_numpy(self, grid, multiplier: float, next_required: float, next_grid, next_values,
+                           resale_rate: Optional[float]):
+        """1ターン分の価値関数を格子全体で一括計算（NumPy）"""
+        available = grid - self.rate
+        slack = available - next_required * (1.0 - self.rate)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            limit = np.clip(slack / (available * (1.0 + next_required * (multiplier - 1.0))), 0.0, 1.0)
+        limit = np.where(available > 0, limit, 0.0)
+        ratios = np.broadcast_to(np.asarray(self.ratios), (len(grid), len(self.ratios)))
+        ratios = np.concatenate([ratios, limit[:, None]], axis=1)
+        feasible = ratios <= limit[:, None]
+
+        proceeds = 0.0 if resale_rate is None else multiplier * resale_rate
+        value = multiplier if resale_rate is None else proceeds
+        growth = 1.0 - self.rate + ratios * available[:, None] * (value - 1.0)
+        next_ratio = available[:, None] * (1.0 - ratios + ratios * proceeds) / growth
+        continuation = np.interp(np.maximum(next_ratio, next_required), next_grid, next_values)
+        return np.where(feasible, growth * continuation, -np.inf).max(axis=1)
+
+    def _solve(self, multipliers: Tuple[float, ...], resale_rate: Optional[float]) -> List[Tuple[Any, Any]]:
+        """
+        価値関数表を後ろ向きに計算
+
+        Returns:
+            ターンごとの (現金比率の格子, 大ターン終了までの資産の伸び率)。
+            格子は残りの固定費を払える範囲 [必要現金比率, 1] に張る。最後の要素は終了時点（伸び率1）。
+        """
+        turns = len(multipliers)
+        tables: List[Tuple[Any, Any]] = [None] * (turns + 1)
+        if np is not None:
+            tables[turns] = (np.linspace(0.0, 1.0, 2), np.ones(2))
+        else:
+            tables[turns] = ([0.0, 1.0], [1.0, 1.0])
+
+        for t in reversed(range(turns)):
+            remaining = turns - t
+            required = required_cash_ratio(remaining, self.rate)
+            next_required = required_cash_ratio(remaining - 1, self.rate)
+            multiplier = multipliers[t] * VALUE_VARIANCE_MEAN
+            next_grid, next_values = tables[t + 1]
+            if np is not None:
+                grid = np.linspace(required, 1.0, self.grid_size)
+                values = self._solve_stage_numpy(grid, multiplier, next_required, next_grid, next_values,
+                                                 resale_rate)
+            else:
+                grid = [required + (1.0 - required) * i / (self.grid_size - 1) for i in range(self.grid_size)]
+                values = [self._best(c, multiplier, next_required, next_grid, next_values, resale_rate)[1]
+                          for c in grid]
+            tables[t] = (grid, values)
+        return tables
+
+    def plan(self, money: float, assets: float, multipliers: Sequence[float],
+             major_turn: int = 1, minor_turn: int = 1, resale_rate: Optional[float] = None) -> Dict[str, Any]:
+        """
+        残りの子ターンの投資計画を作成
+
+        Args:
+            money: 現在の所持金
+            assets: 現在の総資産
+            multipliers: 残りの子ターンの価格倍率（今のターンから順に）
+            major_turn: 現在の大ターン（表示用）
+            minor_turn: 現在の子ターン（表示用）
+            resale_rate: 仕入れた商品を次のターンまでに売却する場合の売却率（基本価値に対する手取り、省略時は保有）
+
+        Returns:
+            各ターンの投資割合・年数・距離・期待資産と、大ターン終了時の期待資産。
+            投資しないのが最適なターンは skip=True（年数・距離・投資額は0）。
+            現金が残りの固定費に足りない場合は払えるターン数までの計画（covers_major_turn=False）。
+        """
+        multipliers = tuple(float(m) for m in multipliers)
+        cash_ratio = min(money / assets, 1.0) if assets > 0 and money > 0 else 0.0
+        horizon = len(multipliers)
+        while horizon > 0 and cash_ratio < required_cash_ratio(horizon, self.rate) - _EPSILON:
+            horizon -= 1
+        if resale_rate is not None and resale_rate < 0:
+            raise ValueError(f"売却率は0以上で指定してください: {resale_rate}")
+        tables = self._value_tables(multipliers[:horizon], resale_rate)
+
+        steps = []
+        for t in range(horizon):
+            fixed_cost = AssetManager.calculate_fixed_cost(assets)
+            available = money - fixed_cost
+            multiplier = multipliers[t] * VALUE_VARIANCE_MEAN
+            next_required = required_cash_ratio(horizon - t - 1, self.rate)
+            ratio, _ = self._best(min(money / assets, 1.0), multiplier, next_required, *tables[t + 1], resale_rate)
+            if ratio is None:  # 固定費の丸めで制約を割った場合
+                break
+
+            target = available * ratio
+            # 投資しないのが最適なターン（割合0・1円未満）は見送り。期待値は固定費だけ払う前提で計算する
+            skip = target < 1
+            years, distance = (0, 0) if skip else split_exact(target)
+            investment = years * distance
+            money = money - fixed_cost - investment
+            assets = assets - fixed_cost + investment * (multiplier - 1.0)
+            if resale_rate is not None:
+                money += investment * multiplier * resale_rate
+                assets += investment * multiplier * (resale_rate - 1.0)
+            steps.append({
+                'major_turn': major_turn,
+                'minor_turn': minor_turn + t,
+                'price_multiplier': multipliers[t],
+                'ratio': round(ratio, 4),
+                'skip': skip,
+                'available_for_investment': round(available, 2),
+                'target_investment': round(target, 2),
+                'years': years,
+                'distance': distance,
+                'investment': investment,
+                'fixed_cost': fixed_cost,
+                'expected_money': round(money, 2),
+                'expected_assets': round(assets, 2)
+            })
+
+        return {
+            'remaining_turns': len(multipliers),
+            'planned_turns': len(steps),
+            'covers_major_turn': len(steps) == len(multipliers),
+            'fixed_cost_rate': self.rate,
+            'resale_rate': resale_rate,
+            'steps': steps,
+            'recommendation': steps[0] if steps else None,
+            'expected_final_money': round(money, 2),
+            'expected_final_assets': round(assets, 2)
+        }
+
+    def plan_for_engine(self, engine, resale_rate: Optional[float] = None) -> Dict[str, Any]:
+        """GameEngine の現在の状態とターンシステムの価格倍率から計画を作成"""
+        turn_system = engine.turn_system
+        assets = engine.get_assets()
+        result = self.plan(engine.state['money'], assets,
+                           turn_system.turn_multipliers[turn_system.minor_turn - 1:],
+                           turn_system.major_turn, turn_system.minor_turn, resale_rate)
+        result['current_assets'] = assets
+        result['expected_growth'] = round(result['expected_final_assets'] / assets, 4) if assets > 0 else 0.0
+        return result
+
+
+# グローバルインスタンス
+investment_planner = InvestmentPlanner()
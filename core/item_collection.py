@@ -0,0 +1,155 @@
+"""
+タイムトラベル仕入れゲーム - ID索引付きコレクション
+在庫・出品リストを挿入順を保ったままID検索・削除O(1)で管理
+"""
+
+from typing import Dict, List, Any, Callable, Iterable, Iterator, Optional
+
+
+def inventory_item_id(item: Dict[str, Any]) -> int:
+    """在庫アイテムのID"""
+    return item['id']
+
+
+def auction_item_id(auction_item: Dict[str, Any]) -> int:
+    """出品アイテムのID（出品中の商品ID）"""
+    return auction_item['item']['id']
+
+
+class IndexedCollection:
+    """
+    IDで索引付けされた挿入順コレクション
+
+    dictの挿入順保持を利用し、イテレーションは追加順のまま
+    ID検索・削除をO(1)で行う。JSON出力時は to_list() でリストに変換する。
+    """
+
+    __slots__ = ('_items', '_key')
+
+    def __init__(self, items: Iterable[Dict[str, Any]] = None,
+                 key: Callable[[Dict[str, Any]], int] = inventory_item_id):
+        """
+        Args:
+            items: 初期要素
+            key: 要素からIDを取り出す関数
+        """
+        self._items: Dict[int, Dict[str, Any]] = {}
+        self._key = key
+        if items:
+            self.extend(items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __bool__(self) -> bool:
+        return bool(self._items)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self._items.values())
+
+    def __contains__(self, item_id: int) -> bool:
+        return item_id in self._items
+
+    def __getitem__(self, index):
+        """位置指定アクセス（互換用、O(n)）"""
+        return self.to_list()[index]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, IndexedCollection):
+            return self.to_list() == other.to_list()
+        if isinstance(other, list):
+            return self.to_list() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"IndexedCollection({self.to_list()!r})"
+
+    def append(self, item: Dict[str, Any]) -> None:
+        """末尾に追加（ID重複はエラー）"""
+        item_id = self._key(item)
+        if item_id in self._items:
+            raise ValueError(f"ID {item_id} は既に存在します")
+        self._items[item_id] = item
+
+    def extend(self, items: Iterable[Dict[str, Any]]) -> None:
+        """複数要素を末尾に追加"""
+        for item in items:
+            self.append(item)
+
+    def get(self, item_id: int) -> Optional[Dict[str, Any]]:
+        """IDで検索（O(1)）"""
+        return self._items.get(item_id)
+
+    def pop(self, item_id: int) -> Optional[Dict[str, Any]]:
+        """IDで削除して返す（O(1)、存在しなければNone）"""
+        return self._items.pop(item_id, None)
+
+    def remove_where(self, predicate: Callable[[Dict[str, Any]], bool]) -> List[Dict[str, Any]]:
+        """条件に一致する要素を削除して返す"""
+        removed_ids = [item_id for item_id, item in self._items.items() if predicate(item)]
+        return [self._items.pop(item_id) for item_id in removed_ids]
+
+    def clear(self) -> None:
+        """全要素を削除"""
+        self._items.clear()
+
+    def ids(self) -> List[int]:
+        """IDの一覧（挿入順）"""
+        return list(self._items)
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """リストに変換（JSON出力用、従来のlist形式と同じ形）"""
+        return list(self._items.values())
+
+    def copy(self) -> List[Dict[str, Any]]:
+        """従来のlist.copy()互換のリストコピー"""
+        return self.to_list()
+
+    def view(self) -> 'CollectionView':
+        """コピーせずに参照する読み取り専用ビュー"""
+        return CollectionView(self)
+
+
+class CollectionView:
+    """IndexedCollectionの読み取り専用ビュー（元データを共有し、コピーしない）"""
+
+    __slots__ = ('_collection',)
+
+    def __init__(self, collection: IndexedCollection):
+        self._collection = collection
+
+    def __len__(self) -> int:
+        return len(self._collection)
+
+    def __bool__(self) -> bool:
+        return bool(self._collection)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self._collection)
+
+    def __contains__(self, item_id: int) -> bool:
+        return item_id in self._collection
+
+    def __getitem__(self, index):
+        """位置指定アクセス（互換用、O(n)）"""
+        return self._collection[index]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, CollectionView):
+            return self._collection == other._collection
+        return self._collection == other
+
+    def __repr__(self) -> str:
+        return f"CollectionView({self._collection.to_list()!r})"
+
+    def get(self, item_id: int) -> Optional[Dict[str, Any]]:
+        """IDで検索（O(1)）"""
+        return self._collection.get(item_id)
+
+    def ids(self) -> List[int]:
+        """IDの一覧（挿入順）"""
+        return self._collection.ids()
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """リストに変換（JSON出力用）"""
+        return self._collection.to_list()
@@ -0,0 +1,156 @@
+"""
+タイムトラベル仕入れゲーム - 在庫の列指向ストア
+在庫の一括集計用に、商品の属性を列ごとの配列（struct-of-arrays）で保持する
+GameEngine の在庫価値台帳（total_cents）と在庫サマリーはこのストアから取る
+
+行の並びは挿入順ではない（削除は末尾行との入れ替えで O(1)）。
+表示順が必要な処理は IndexedCollection を、集計は ItemColumns を使う。
+台帳として使うストア（track=True）は登録した Item に自身を覚えさせ、在庫中の商品の
+価値・ジャンル・状態・レア度の書き換えを拒否させる（列と商品の値がずれないように）。
+"""
+
+from array import array
+from typing import Dict, List, Any, Iterable
+
+from .item_record import Item, GENRES, CONDITION_KEYS, RARITY_NAMES, label_code
+
+# コード列名 → コード表（コード = 添字）
+CODE_COLUMNS = {
+    'genre': GENRES,
+    'condition': CONDITION_KEYS,
+    'rarity': RARITY_NAMES,
+}
+
+
+def _value_cents(item) -> int:
+    """商品価値（銭単位、GameEngine の在庫価値台帳と同じ丸め）"""
+    return int(round(float(item['base_value']) * 100))
+
+
+class ItemColumns:
+    """在庫の列指向ストア（ID・ジャンル・状態・レア度コード・価値を列ごとに保持）"""
+
+    __slots__ = ('ids', 'genre', 'condition', 'rarity', 'value_cents', 'total_cents', 'tracking', '_rows')
+
+    def __init__(self, items: Iterable[Any] = None, track: bool = False):
+        """
+        Args:
+            items: 最初に追加する商品
+            track: 在庫価値台帳として使うか（追加した Item の列の値を書き換えられなくする）
+        """
+        self.ids = array('q')
+        self.genre = array('b')
+        self.condition = array('b')
+        self.rarity = array('b')
+        self.value_cents = array('q')
+        self.total_cents = 0  # value_cents の合計（追加・削除のたびに更新）
+        self.tracking = track
+        self._rows: Dict[int, int] = {}
+        if items:
+            self.extend(items)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, item_id: int) -> bool:
+        return item_id in self._rows
+
+    def add(self, item) -> None:
+        """商品を1行追加（Item・商品辞書のどちらでも可）"""
+        item_id = item['id']
+        if item_id in self._rows:
+            raise ValueError(f"ID {item_id} は既に存在します")
+        # 行を追加する前に変換して、不明な値で列の長さがずれないようにする
+        genre = label_code('genre', item['genre'])
+        condition = label_code('condition', item['condition'])
+        rarity = label_code('rarity', item['rarity'])
+        cents = _value_cents(item)
+        self._rows[item_id] = len(self.ids)
+        self.ids.append(item_id)
+        self.genre.append(genre)
+        self.condition.append(condition)
+        self.rarity.append(rarity)
+        self.value_cents.append(cents)
+        self.total_cents += cents
+        if self.tracking and isinstance(item, Item):
+            item._ledger = self
+
+    def track(self, items: Iterable[Any]) -> None:
+        """台帳として使い始める（列から直接生成したストアに、同じ内容の在庫の Item を登録する）"""
+        self.tracking = True
+        for item in items:
+            if isinstance(item, Item):
+                item._ledger = self
+
+    def holds(self, item: Item) -> bool:
+        """商品がこの台帳に登録済みで、まだ削除されていないか"""
+        return item._ledger is self and item.id in self._rows
+
+    @classmethod
+    def from_arrays(cls, ids: Iterable[int], genre: Iterable[int], condition: Iterable[int],
+                    rarity: Iterable[int], value_cents: Iterable[int]) -> 'ItemColumns':
+        """列の値から直接生成（列形式のセーブデータ読み込み用、商品ごとの辞書アクセスをしない）"""
+        columns = cls()
+        columns.ids.extend(ids)
+        columns.genre.extend(genre)
+        columns.condition.extend(condition)
+        columns.rarity.extend(rarity)
+        columns.value_cents.extend(value_cents)
+        columns.total_cents = sum(columns.value_cents)
+        columns._rows = {item_id: row for row, item_id in enumerate(columns.ids)}
+        if len(columns._rows) != len(columns.ids):
+            raise ValueError("IDが重複しています")
+        return columns
+
+    def extend(self, items: Iterable[Any]) -> None:
+        """複数の商品を追加"""
+        for item in items:
+            self.add(item)
+
+    def remove(self, item_id: int) -> bool:
+        """商品の行を削除（末尾行と入れ替えるため O(1)）"""
+        row = self._rows.pop(item_id, None)
+        if row is None:
+            return False
+        self.total_cents -= self.value_cents[row]
+        last = len(self.ids) - 1
+        if row != last:
+            for column in (self.ids, self.genre, self.condition, self.rarity, self.value_cents):
+                column[row] = column[last]
+            self._rows[self.ids[row]] = row
+        for column in (self.ids, self.genre, self.condition, self.rarity, self.value_cents):
+            column.pop()
+        return True
+
+    def clear(self) -> None:
+        """全行を削除"""
+        for column in (self.ids, self.genre, self.condition, self.rarity, self.value_cents):
+            del column[:]
+        self.total_cents = 0
+        self._rows.clear()
+
+    def total_value(self) -> float:
+        """価値合計（銭単位の累計から、O(1)）"""
+        return self.total_cents / 100
+
+    def breakdown(self, column: str) -> Dict[str, Dict[str, Any]]:
+        """コード列ごとの件数・価値合計を1回の走査で集計（{ラベル: {'count', 'value'}}、コード順）"""
+        labels = CODE_COLUMNS[column]
+        counts = [0] * len(labels)
+        totals = [0] * len(labels)
+        for code, cents in zip(getattr(self, column), self.value_cents):
+            counts[code] += 1
+            totals[code] += cents
+        return {labels[code]: {'count': counts[code], 'value': totals[code] / 100}
+                for code in range(len(labels)) if counts[code]}
+
+    def summary(self) -> Dict[str, Any]:
+        """在庫サマリー（件数・価値合計・平均とジャンル・レア度・状態別の内訳、金額は銭単位で集計）"""
+        count = len(self.ids)
+        summary: Dict[str, Any] = {'total_items': count, 'total_value': round(self.total_cents / 100, 2)}
+        if count:
+            summary['average_value'] = round(self.total_cents / count / 100, 2)
+        summary['genre_breakdown'] = self.breakdown('genre')
+        summary['rarity_breakdown'] = self.breakdown('rarity')
+        summary['condition_breakdown'] = self.breakdown('condition')
+        return summary
@@ -0,0 +1,242 @@
+"""
+タイムトラベル仕入れゲーム - 商品レコード
+商品を __slots__ 付きの軽量オブジェクトで表現し、ジャンル・状態・レア度は共有テーブルのコードで保持する
+
+Item は従来の商品辞書と同じキーで読み書きできる（item['genre'] / item.get(...) / テンプレートの item.genre）。
+JSONにするのはAPI境界（Flaskの jsonify・セーブファイル）だけで、その時に to_dict() で従来形式に変換する。
+"""
+
+from collections.abc import MutableMapping
+from typing import Dict, Any, Iterator, Optional
+
+# 10ジャンルのハードコード（ジャンルコード = 添字）
+GENRES = (
+    "家電", "玩具", "服飾", "書籍", "美術品",
+    "楽器", "スポーツ用品", "工具", "食器", "アクセサリー"
+)
+
+# 状態の定義（状態コード = CONDITION_KEYS の添字）
+CONDITIONS = {
+    'A': {'name': '新品', 'multiplier': 1.0},
+    'B': {'name': '良品', 'multiplier': 0.8},
+    'C': {'name': '劣化', 'multiplier': 0.6}
+}
+CONDITION_KEYS = tuple(CONDITIONS)
+
+# レア度名（レア度コード = 添字、低い順）
+RARITY_NAMES = ('コモン', 'レア', 'ウルトラレア', '伝説', '神話')
+
+GENRE_CODES = {genre: code for code, genre in enumerate(GENRES)}
+CONDITION_CODES = {condition: code for code, condition in enumerate(CONDITION_KEYS)}
+RARITY_CODES = {rarity: code for code, rarity in enumerate(RARITY_NAMES)}
+
+# コード化する項目 → (表示名, コード表)
+_CODE_FIELDS = {
+    'genre': ('ジャンル', GENRE_CODES),
+    'condition': ('状態', CONDITION_CODES),
+    'rarity': ('レア度', RARITY_CODES),
+}
+
+# to_dict() のキー順（従来の商品辞書と同じ）
+ITEM_KEYS = (
+    'id', 'genre', 'condition', 'condition_name', 'rarity', 'rarity_multiplier',
+    'base_value', 'estimated_price', 'display_base_value', 'years', 'distance', 'created_at'
+)
+# 旧仕様の generate_item では生成されないキー（None なら辞書に含めない）
+_OPTIONAL_KEYS = frozenset(('estimated_price', 'display_base_value'))
+# 他のキーから導出されるため直接書き込めないキー
+_DERIVED_KEYS = frozenset(('condition_name',))
+# 在庫の列指向ストア（台帳）が列として持つため、在庫中は書き換えられないキー
+_LEDGER_KEYS = frozenset(('genre', 'condition', 'rarity', 'base_value'))
+_KEY_SET = frozenset(ITEM_KEYS)
+
+
+def label_code(field: str, value: Any) -> int:
+    """
+    ジャンル・状態・レア度の値をコードに変換
+
+    Raises:
+        ValueError: コード表にない値の場合（項目名と値をメッセージに含める）
+    """
+    name, codes = _CODE_FIELDS[field]
+    try:
+        return codes[value]
+    except (KeyError, TypeError):
+        raise ValueError(f"不明な{name}です: {field}={value!r}") from None
+
+
+class Item(MutableMapping):
+    """1商品分のレコード（従来の商品辞書と互換のマッピング）"""
+
+    __slots__ = ('id', 'genre_code', 'condition_code', 'rarity_code', 'rarity_multiplier',
+                 'base_value', 'estimated_price', 'display_base_value', 'years', 'distance',
+                 'created_at', '_extra', '_ledger')
+
+    def __init__(self, item_id: int, genre: str, condition: str, rarity: str,
+                 rarity_multiplier: float, base_value: float, years: int, distance: int,
+                 created_at: float, estimated_price: float = None, display_base_value: float = None):
+        self.id = item_id
+        self.genre_code = label_code('genre', genre)
+        self.condition_code = label_code('condition', condition)
+        self.rarity_code = label_code('rarity', rarity)
+        self.rarity_multiplier = rarity_multiplier
+        self.base_value = base_value
+        self.estimated_price = estimated_price
+        self.display_base_value = display_base_value
+        self.years = years
+        self.distance = distance
+        self.created_at = created_at
+        self._extra: Optional[Dict[str, Any]] = None
+        self._ledger = None  # 登録先の在庫台帳（ItemColumns.add / track で設定）
+
+    # --- 共有テーブルから引く表示用の値 ---
+
+    @property
+    def genre(self) -> str:
+        return GENRES[self.genre_code]
+
+    @property
+    def condition(self) -> str:
+        return CONDITION_KEYS[self.condition_code]
+
+    @property
+    def condition_name(self) -> str:
+        return CONDITIONS[CONDITION_KEYS[self.condition_code]]['name']
+
+    @property
+    def rarity(self) -> str:
+        return RARITY_NAMES[self.rarity_code]
+
+    # --- 辞書互換のアクセス ---
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _KEY_SET:
+            value = getattr(self, key)
+            if value is None and key in _OPTIONAL_KEYS:
+                raise KeyError(key)
+            return value
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in _LEDGER_KEYS and self._ledger is not None and self._ledger.holds(self):
+            raise ValueError(f"在庫中の商品の {key} は変更できません（在庫台帳と値がずれるため）: id={self.id}")
+        if key == 'genre':
+            self.genre_code = label_code('genre', value)
+        elif key == 'condition':
+            self.condition_code = label_code('condition', value)
+        elif key == 'rarity':
+            self.rarity_code = label_code('rarity', value)
+        elif key in _DERIVED_KEYS:
+            if value != self[key]:
+                raise ValueError(f"{key} は他の項目から決まるため直接変更できません")
+        elif key in _KEY_SET:
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in _OPTIONAL_KEYS and getattr(self, key) is not None:
+            setattr(self, key, None)
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for key in ITEM_KEYS:
+            if key not in _OPTIONAL_KEYS or getattr(self, key) is not None:
+                yield key
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"Item({self.to_dict()!r})"
+
+    def copy(self) -> 'Item':
+        """同じ内容の別レコード"""
+        return Item.from_dict(self.to_dict())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """従来形式の商品辞書に変換（JSON出力用）"""
+        condition = CONDITION_KEYS[self.condition_code]
+        result = {
+            'id': self.id,
+            'genre': GENRES[self.genre_code],
+            'condition': condition,
+            'condition_name': CONDITIONS[condition]['name'],
+            'rarity': RARITY_NAMES[self.rarity_code],
+            'rarity_multiplier': self.rarity_multiplier,
+            'base_value': self.base_value,
+        }
+        if self.estimated_price is not None:
+            result['estimated_price'] = self.estimated_price
+        if self.display_base_value is not None:
+            result['display_base_value'] = self.display_base_value
+        result['years'] = self.years
+        result['distance'] = self.distance
+        result['created_at'] = self.created_at
+        if self._extra:
+            result.update(self._extra)
+        return result
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Item':
+        """従来形式の商品辞書（セーブデータ等）から生成"""
+        item = cls(
+            item_id=data['id'],
+            genre=data['genre'],
+            condition=data['condition'],
+            rarity=data['rarity'],
+            rarity_multiplier=data['rarity_multiplier'],
+            base_value=data['base_value'],
+            years=data['years'],
+            distance=data['distance'],
+            created_at=data.get('created_at', 0.0),
+            estimated_price=data.get('estimated_price'),
+            display_base_value=data.get('display_base_value'),
+        )
+        for key, value in data.items():
+            if key not in _KEY_SET:
+                item[key] = value
+        return item
+
+    @classmethod
+    def from_codes(cls, item_id: int, genre_code: int, condition_code: int, rarity_code: int,
+                   rarity_multiplier: float, base_value: float, years: int, distance: int,
+                   created_at: float, estimated_price: float = None, display_base_value: float = None,
+                   extra: Optional[Dict[str, Any]] = None) -> 'Item':
+        """コード化済みの値から生成（列形式のセーブデータ用、文字列の引き直しをしない）"""
+        item = cls.__new__(cls)
+        item.id = item_id
+        item.genre_code = genre_code
+        item.condition_code = condition_code
+        item.rarity_code = rarity_code
+        item.rarity_multiplier = rarity_multiplier
+        item.base_value = base_value
+        item.estimated_price = estimated_price
+        item.display_base_value = display_base_value
+        item.years = years
+        item.distance = distance
+        item.created_at = created_at
+        item._extra = dict(extra) if extra else None
+        item._ledger = None
+        return item
+
+
+def as_item(data) -> 'Item':
+    """商品辞書を Item に変換（既に Item ならそのまま）"""
+    return data if isinstance(data, Item) else Item.from_dict(data)
+
+
+def json_default(obj: Any) -> Any:
+    """json.dumps の default 用（Item を従来形式の辞書にする）"""
+    if isinstance(obj, Item):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
@@ -3,28 +3,31 @@
 商品の生成、管理、評価ロジックを担当
 """
 
-import random
 import time
 from typing import Dict, List, Any, Tuple
 from .turn_system import turn_system
-from .travel_config import YEARS_MIN, YEARS_MAX, DISTANCE_MIN, DISTANCE_MAX
+from .travel_config import (
+    YEARS_MIN, YEARS_MAX, DISTANCE_MIN, DISTANCE_MAX,
+    RARITY_BASE_MULTIPLIER, RARITY_YEAR_BONUS_RATE, RARITY_YEAR_BONUS_CAP,
+    RARITY_DISTANCE_BONUS_RATE, RARITY_DISTANCE_BONUS_CAP,
+    RARITY_COMBO_BONUS_RATE, RARITY_COMBO_BONUS_CAP,
+    VALUE_VARIANCE_MIN, VALUE_VARIANCE_MAX
+)
+from .game_logger import get_logger
+from .rng import resolve_rng
+from .id_allocator import item_id_allocator
+from .item_record import Item, GENRES, CONDITIONS
+from .item_columns import ItemColumns
+
+logger = get_logger('item')
 
 
 class ItemSystem:
     """商品システム管理"""
     
-    # 10ジャンルのハードコード
-    GENRES = [
-        "家電", "玩具", "服飾", "書籍", "美術品",
-        "楽器", "スポーツ用品", "工具", "食器", "アクセサリー"
-    ]
-    
-    # 状態の定義
-    CONDITIONS = {
-        'A': {'name': '新品', 'multiplier': 1.0},
-        'B': {'name': '良品', 'multiplier': 0.8},
-        'C': {'name': '劣化', 'multiplier': 0.6}
-    }
+    # 10ジャンル・状態の定義（商品レコードのコード表と共有）
+    GENRES = list(GENRES)
+    CONDITIONS = CONDITIONS
     
     def __init__(self):
         """アイテムシステム初期化"""
@@ -39,17 +42,17 @@ class ItemSystem:
     def calculate_rarity_multiplier(years: int, distance: int) -> float:
         """距離と年数に基づいてレア度倍率を計算"""
         # 基本倍率
-        base_multiplier = 1.0
+        base_multiplier = RARITY_BASE_MULTIPLIER
         
         # 年数ボーナス（古いほど希少）
-        year_bonus = min(years * 0.02, 2.0)  # 最大2.0倍まで
+        year_bonus = min(years * RARITY_YEAR_BONUS_RATE, RARITY_YEAR_BONUS_CAP)  # 最大2.0倍まで
         
         # 距離ボーナス（遠いほど希少）
-        distance_bonus = min(distance * 0.001, 1.5)  # 最大1.5倍まで
+        distance_bonus = min(distance * RARITY_DISTANCE_BONUS_RATE, RARITY_DISTANCE_BONUS_CAP)  # 最大1.5倍まで
         
         # 組み合わせボーナス（年数と距離の相乗効果）
-        combo_bonus = (years * distance) * 0.00001
-        combo_bonus = min(combo_bonus, 1.0)  # 最大1.0倍まで
+        combo_bonus = (years * distance) * RARITY_COMBO_BONUS_RATE
+        combo_bonus = min(combo_bonus, RARITY_COMBO_BONUS_CAP)  # 最大1.0倍まで
         
         total_multiplier = base_multiplier + year_bonus + distance_bonus + combo_bonus
         return round(total_multiplier, 2)
@@ -69,9 +72,17 @@ class ItemSystem:
             return '神話'
     
     @classmethod
-    def generate_item_with_predetermined_value(cls, actual_value: float, years: int, distance: int) -> Dict[str, Any]:
-        """事前決定された価値でアイテムを生成（新仕様）"""
-        genre = random.choice(cls.GENRES)
+    def generate_item_with_predetermined_value(cls, actual_value: float, years: int, distance: int,
+                                               rng=None, id_allocator=None) -> Item:
+        """
+        事前決定された価値でアイテムを生成（新仕様）
+        
+        Args:
+            rng: 乱数生成器（省略時はグローバルのrandom）
+            id_allocator: 商品ID採番器（省略時はグローバルの採番器）
+        """
+        rng = resolve_rng(rng)
+        genre = rng.choice(cls.GENRES)
         
         # 年代が古いほど劣化しやすい（表示用）
         condition_weights = {
@@ -79,7 +90,7 @@ class ItemSystem:
             'B': 0.5,
             'C': min(0.9, years * 0.01)
         }
-        condition = random.choices(
+        condition = rng.choices(
             list(condition_weights.keys()), 
             weights=list(condition_weights.values())
         )[0]
@@ -96,30 +107,31 @@ class ItemSystem:
         # estimated_priceは売却時の推定価格（base_valueの100%）
         estimated_price = round(actual_value * 1.0, 2)
         
-        print(f"[ItemSystem] 商品生成: base_value={actual_value:.2f}円（価格倍率適用済み）, estimated_price={estimated_price:.2f}円（売却用）")
-        
-        # 一意のIDを生成
-        item_id = int(time.time() * 1000000 + random.randint(0, 999999))
-        
-        return {
-            'id': item_id,
-            'genre': genre,
-            'condition': condition,
-            'condition_name': cls.CONDITIONS[condition]['name'],
-            'rarity': rarity_name,
-            'rarity_multiplier': rarity_multiplier,
-            'base_value': round(actual_value, 2),  # 実際の価値（価格曲線適用前）
-            'estimated_price': estimated_price,   # 価格曲線適用後の推定価格
-            'display_base_value': round(display_base_value, 2),  # 表示用
-            'years': years,
-            'distance': distance,
-            'created_at': time.time()
-        }
+        logger.debug("商品生成: base_value=%.2f円（価格倍率適用済み）, estimated_price=%.2f円（売却用）",
+                     actual_value, estimated_price)
+        
+        # 一意のIDを採番
+        item_id = (id_allocator or item_id_allocator).allocate()
+        
+        return Item(
+            item_id=item_id,
+            genre=genre,
+            condition=condition,
+            rarity=rarity_name,
+            rarity_multiplier=rarity_multiplier,
+            base_value=round(actual_value, 2),  # 実際の価値（価格曲線適用前）
+            estimated_price=estimated_price,   # 価格曲線適用後の推定価格
+            display_base_value=round(display_base_value, 2),  # 表示用
+            years=years,
+            distance=distance,
+            created_at=time.time()
+        )
 
     @classmethod
-    def generate_item(cls, years: int, distance: int) -> Dict[str, Any]:
+    def generate_item(cls, years: int, distance: int, rng=None, id_allocator=None) -> Item:
         """年代と距離に基づいて商品を生成（旧仕様・互換性維持）"""
-        genre = random.choice(cls.GENRES)
+        rng = resolve_rng(rng)
+        genre = rng.choice(cls.GENRES)
         
         # 年代が古いほど劣化しやすい
         condition_weights = {
@@ -127,7 +139,7 @@ class ItemSystem:
             'B': 0.5,
             'C': min(0.9, years * 0.01)
         }
-        condition = random.choices(
+        condition = rng.choices(
             list(condition_weights.keys()), 
             weights=list(condition_weights.values())
         )[0]
@@ -137,30 +149,30 @@ class ItemSystem:
         rarity_name = cls.get_rarity_name(rarity_multiplier)
         
         # 基本価値を計算
-        base_value = random.uniform(100, 1000)
+        base_value = rng.uniform(100, 1000)
         base_value *= cls.CONDITIONS[condition]['multiplier']
         base_value *= rarity_multiplier
         
-        # 一意のIDを生成
-        item_id = int(time.time() * 1000000 + random.randint(0, 999999))
-        
-        return {
-            'id': item_id,
-            'genre': genre,
-            'condition': condition,
-            'condition_name': cls.CONDITIONS[condition]['name'],
-            'rarity': rarity_name,
-            'rarity_multiplier': rarity_multiplier,
-            'base_value': round(base_value, 2),
-            'years': years,
-            'distance': distance,
-            'created_at': time.time()
-        }
+        # 一意のIDを採番
+        item_id = (id_allocator or item_id_allocator).allocate()
+        
+        return Item(
+            item_id=item_id,
+            genre=genre,
+            condition=condition,
+            rarity=rarity_name,
+            rarity_multiplier=rarity_multiplier,
+            base_value=round(base_value, 2),
+            years=years,
+            distance=distance,
+            created_at=time.time()
+        )
     
     @classmethod
-    def generate_items(cls, years: int, distance: int, count: int) -> List[Dict[str, Any]]:
+    def generate_items(cls, years: int, distance: int, count: int, rng=None,
+                       id_allocator=None) -> List[Item]:
         """複数のアイテムを生成"""
-        return [cls.generate_item(years, distance) for _ in range(count)]
+        return [cls.generate_item(years, distance, rng=rng, id_allocator=id_allocator) for _ in range(count)]
     
     @classmethod
     def calculate_estimated_selling_price(cls, item: Dict[str, Any]) -> float:
@@ -200,6 +212,19 @@ class ItemSystem:
         
         return True, ""
     
+    @classmethod
+    def split_investment(cls, target_investment: float, rng=None) -> Tuple[int, int]:
+        """投資額を年数と距離に割り振る（自動投資用、平方根で分配）"""
+        rng = resolve_rng(rng)
+        sqrt_investment = target_investment ** 0.5
+        base_years = int(sqrt_investment * rng.uniform(0.5, 1.5))
+        base_distance = int(target_investment / max(base_years, 1))
+        
+        # 制限内に収める
+        years = max(YEARS_MIN, min(base_years, YEARS_MAX))
+        distance = max(DISTANCE_MIN, min(base_distance, DISTANCE_MAX))
+        return years, distance
+    
     @classmethod
     def simulate_travel_failure(cls) -> bool:
         """タイムトラベル失敗をシミュレート（10%の確率）"""
@@ -208,10 +233,11 @@ class ItemSystem:
         return False  # 常に成功
     
     @classmethod
-    def distribute_value_across_items(cls, target_total: float, num_items: int) -> List[float]:
+    def distribute_value_across_items(cls, target_total: float, num_items: int, rng=None) -> List[float]:
         """目標総価値をアイテム間で分配（新仕様）"""
         if num_items <= 0:
             return []
+        rng = resolve_rng(rng)
         
         base_value = target_total / num_items
         values = []
@@ -228,7 +254,7 @@ class ItemSystem:
             if max_val <= min_val:
                 max_val = min_val * 1.1
             
-            item_value = random.uniform(min_val, max_val)
+            item_value = rng.uniform(min_val, max_val)
             values.append(item_value)
             remaining_total -= item_value
         
@@ -237,8 +263,18 @@ class ItemSystem:
         return values
 
     @classmethod
-    def get_travel_result(cls, years: int, distance: int, available_money: float) -> Dict[str, Any]:
-        """タイムトラベルの結果を取得（フェーズ2: UFOサイズ廃止）"""
+    def get_travel_result(cls, years: int, distance: int, available_money: float,
+                          price_multiplier: float = None, rng=None,
+                          id_allocator=None) -> Dict[str, Any]:
+        """
+        タイムトラベルの結果を取得（フェーズ2: UFOサイズ廃止）
+        
+        Args:
+            price_multiplier: 適用する子ターン価格倍率（省略時はグローバルのターンシステムから取得）
+            rng: 乱数生成器（省略時はグローバルのrandom）
+            id_allocator: 商品ID採番器（省略時はグローバルの採番器）
+        """
+        rng = resolve_rng(rng)
         # パラメータ検証
         valid, error_message = cls.validate_travel_parameters(years, distance)
         if not valid:
@@ -270,25 +306,29 @@ class ItemSystem:
             }
         
         # 新仕様: アイテム数を2-5個固定
-        item_count = random.randint(2, 5)
+        item_count = rng.randint(2, 5)
         
         # フェーズ2: 子フェーズ価格倍率適用（各ターン倍率を使用）
-        from .turn_system import turn_system
-        price_multiplier = turn_system.get_current_price_multiplier()
+        if price_multiplier is None:
+            from .turn_system import turn_system
+            price_multiplier = turn_system.get_current_price_multiplier()
         
         # 新仕様: 目標総価値（投資額 × 各ターン倍率 ± 10%）
-        variance = random.uniform(0.9, 1.1)
+        variance = rng.uniform(VALUE_VARIANCE_MIN, VALUE_VARIANCE_MAX)
         target_total_value = cost * price_multiplier * variance
         
-        print(f"[ItemSystem] 価格計算: 投資額{cost}円 × 価格倍率{price_multiplier:.2f} × バリエーション{variance:.2f} = 目標総価値{target_total_value:.2f}円")
+        logger.debug("価格計算: 投資額%s円 × 価格倍率%.2f × バリエーション%.2f = 目標総価値%.2f円",
+                     cost, price_multiplier, variance, target_total_value)
         
         # 価値分配
-        individual_values = cls.distribute_value_across_items(target_total_value, item_count)
+        individual_values = cls.distribute_value_across_items(target_total_value, item_count, rng=rng)
         
         # アイテム生成
         items = []
         for actual_value in individual_values:
-            item = cls.generate_item_with_predetermined_value(actual_value, years, distance)
+            item = cls.generate_item_with_predetermined_value(
+                actual_value, years, distance, rng=rng, id_allocator=id_allocator
+            )
             items.append(item)
         
         return {
@@ -303,53 +343,8 @@ class ItemSystem:
     
     @classmethod
     def get_inventory_summary(cls, inventory: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """在庫のサマリー情報を取得"""
-        if not inventory:
-            return {
-                'total_items': 0,
-                'total_value': 0,
-                'genre_breakdown': {},
-                'rarity_breakdown': {},
-                'condition_breakdown': {}
-            }
-        
-        total_value = sum(item['base_value'] for item in inventory)
-        
-        # ジャンル別集計
-        genre_breakdown = {}
-        for item in inventory:
-            genre = item['genre']
-            if genre not in genre_breakdown:
-                genre_breakdown[genre] = {'count': 0, 'value': 0}
-            genre_breakdown[genre]['count'] += 1
-            genre_breakdown[genre]['value'] += item['base_value']
-        
-        # レア度別集計
-        rarity_breakdown = {}
-        for item in inventory:
-            rarity = item['rarity']
-            if rarity not in rarity_breakdown:
-                rarity_breakdown[rarity] = {'count': 0, 'value': 0}
-            rarity_breakdown[rarity]['count'] += 1
-            rarity_breakdown[rarity]['value'] += item['base_value']
-        
-        # 状態別集計
-        condition_breakdown = {}
-        for item in inventory:
-            condition = item['condition']
-            if condition not in condition_breakdown:
-                condition_breakdown[condition] = {'count': 0, 'value': 0}
-            condition_breakdown[condition]['count'] += 1
-            condition_breakdown[condition]['value'] += item['base_value']
-        
-        return {
-            'total_items': len(inventory),
-            'total_value': round(total_value, 2),
-            'average_value': round(total_value / len(inventory), 2),
-            'genre_breakdown': genre_breakdown,
-            'rarity_breakdown': rarity_breakdown,
-            'condition_breakdown': condition_breakdown
-        }
+        """在庫のサマリー情報を取得（ゲーム中の在庫は GameEngine.get_inventory_summary のキャッシュを使う）"""
+        return ItemColumns(inventory).summary()
 
 
 # シングルトンインスタンス
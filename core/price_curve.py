@@ -0,0 +1,311 @@
+"""
+タイムトラベル仕入れゲーム - 価格倍率曲線の生成
+大ターンの各子ターンの乗数を、候補曲線の一括生成と目標倍率への補正で作る。大ターン開始用の曲線は先読みしておく
+
+既定の戦略 batch の候補1本の作り方は従来の TurnSystem の試行と同じ:
+    乗数 = (目標 / 現在の累積) ^ (1 / 残りターン数) × 一様分布[0.6, 1.4]、[0.5, 2.0] に制限
+候補を NumPy でまとめて引いて目標に最も近い1本を選び、制限に当たっていない乗数を同じ比率で
+伸縮して累積を目標に一致させる（目標が 0.5^n〜2.0^n の範囲なら子ターン数に関係なく厳密に一致）。
+
+ほかの生成方法は CURVE_STRATEGIES に登録し、TurnSystem の curve_strategy（既定は
+GameConfig.PRICE_CURVE_STRATEGY）で選ぶ。
+"""
+
+import math
+import os
+import random
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .asset_manager import AssetManager
+from .rng import resolve_rng, numpy_generator
+
+try:
+    import numpy as np
+except ImportError:  # NumPy未導入環境では候補を逐次生成
+    np = None
+
+# 乗数の揺らぎ（理想の乗数に対する倍率）と乗数の範囲
+FLUCTUATION_MIN = 0.6
+FLUCTUATION_MAX = 1.4
+FACTOR_MIN = 0.5
+FACTOR_MAX = 2.0
+
+# 一括生成する候補数（NumPy未導入時は従来どおりの試行回数）
+CANDIDATE_COUNT = 256
+FALLBACK_CANDIDATE_COUNT = 10
+
+# 目標倍率との許容誤差（相対）
+TARGET_TOLERANCE = 1e-12
+
+
+def _clamp(value: float) -> float:
+    return max(FACTOR_MIN, min(FACTOR_MAX, value))
+
+
+def draw_candidates(target: float, turns: int, rng=None, count: int = CANDIDATE_COUNT) -> List[List[float]]:
+    """
+    候補曲線（各子ターンの乗数）をまとめて生成
+
+    NumPy があれば全候補を子ターンごとに配列で一括計算し（(候補数, 子ターン数) の配列を返す）、
+    なければ1本ずつ生成する。
+    """
+    rng = resolve_rng(rng)
+    if np is None:
+        candidates = []
+        for _ in range(count):
+            current = 1.0
+            multipliers = []
+            for i in range(turns):
+                ideal = pow(target / current, 1.0 / (turns - i))
+                factor = _clamp(ideal * (FLUCTUATION_MIN + rng.random() * (FLUCTUATION_MAX - FLUCTUATION_MIN)))
+                multipliers.append(factor)
+                current *= factor
+            candidates.append(multipliers)
+        return candidates
+
+    fluctuation = numpy_generator(rng).uniform(FLUCTUATION_MIN, FLUCTUATION_MAX, size=(count, turns))
+    factors = np.empty((count, turns))
+    current = np.ones(count)
+    for i in range(turns):
+        ideal = np.power(target / current, 1.0 / (turns - i))
+        factors[:, i] = np.clip(ideal * fluctuation[:, i], FACTOR_MIN, FACTOR_MAX)
+        current *= factors[:, i]
+    return factors
+
+
+def correct_to_target(multipliers: List[float], target: float) -> List[float]:
+    """
+    累積（乗数の積）が目標倍率に一致するよう乗数を補正
+
+    制限に当たっていない乗数を同じ比率で伸縮する。制限に当たった乗数は次の反復から外すため、
+    子ターン数回以内に一致するか、これ以上動かせる乗数がなくなる（目標が範囲外）。
+    """
+    corrected = [float(m) for m in multipliers]
+    for _ in range(len(corrected) + 1):
+        final = math.prod(corrected)
+        if abs(final - target) <= target * TARGET_TOLERANCE:
+            break
+        growing = target > final
+        free = [i for i, m in enumerate(corrected) if (m < FACTOR_MAX if growing else m > FACTOR_MIN)]
+        if not free:
+            break
+        scale = (target / final) ** (1.0 / len(free))
+        for i in free:
+            corrected[i] = _clamp(corrected[i] * scale)
+    return corrected
+
+
+def generate_curve(target: float, turns: int, rng=None, count: Optional[int] = None) -> List[float]:
+    """
+    目標倍率に到達する乗数列を生成
+
+    Args:
+        target: 目標倍率（全子ターンの乗数の積）
+        turns: 子ターン数
+        rng: 乱数生成器
+        count: 候補数（省略時は NumPy 有無に応じた既定値）
+
+    Returns:
+        各子ターンの乗数
+    """
+    if count is None:
+        count = CANDIDATE_COUNT if np is not None else FALLBACK_CANDIDATE_COUNT
+    candidates = draw_candidates(target, turns, rng, count)
+    if np is not None:
+        best = candidates[int(np.argmin(np.abs(candidates.prod(axis=1) - target)))]
+    else:
+        best = min(candidates, key=lambda multipliers: abs(math.prod(multipliers) - target))
+    return correct_to_target(best, target)
+
+
+# ===== 曲線生成戦略 =====
+# 戦略名 → 生成関数 (目標倍率, 子ターン数, 乱数生成器, 設定) → 各子ターンの乗数
+# 設定は TurnSystem の random_min / random_max / first_turn_min（使わない戦略は無視する）
+CurveStrategy = Callable[[float, int, Any, Dict[str, Any]], List[float]]
+CURVE_STRATEGIES: Dict[str, CurveStrategy] = {}
+
+DEFAULT_CURVE_OPTIONS = {'random_min': 0.5, 'random_max': 1.8, 'first_turn_min': 1.0}
+
+
+def register_curve_strategy(name: str) -> Callable[[CurveStrategy], CurveStrategy]:
+    """曲線生成戦略を登録するデコレータ"""
+    def decorator(strategy: CurveStrategy) -> CurveStrategy:
+        CURVE_STRATEGIES[name] = strategy
+        return strategy
+    return decorator
+
+
+def get_curve_strategy(name: str) -> CurveStrategy:
+    """登録済みの曲線生成戦略を取得"""
+    strategy = CURVE_STRATEGIES.get(name)
+    if strategy is None:
+        raise ValueError(f"不明な価格曲線戦略: {name}（{', '.join(sorted(CURVE_STRATEGIES))}）")
+    return strategy
+
+
+def _draw_raw(turns: int, rng, options: Dict[str, Any], count: int = 1) -> List[List[float]]:
+    """目標を見ない一様乱数の乗数（1ターン目は first_turn_min 未満なら切り上げ）"""
+    options = dict(DEFAULT_CURVE_OPTIONS, **options)
+    low, high, first_min = options['random_min'], options['random_max'], options['first_turn_min']
+    if np is not None:
+        raw = numpy_generator(rng).uniform(low, high, size=(count, turns))
+        raw[:, 0] = np.maximum(raw[:, 0], first_min)
+        return raw
+    rng = resolve_rng(rng)
+    rows = [[rng.uniform(low, high) for _ in range(turns)] for _ in range(count)]
+    for row in rows:
+        row[0] = max(row[0], first_min)
+    return rows
+
+
+@register_curve_strategy('batch')
+def _batch_strategy(target: float, turns: int, rng, options: Dict[str, Any]) -> List[float]:
+    """候補の一括生成と目標への補正（累積 = 目標）"""
+    return generate_curve(target, turns, rng, options.get('candidates'))
+
+
+@register_curve_strategy('mean_scaled')
+def _mean_scaled_strategy(target: float, turns: int, rng, options: Dict[str, Any]) -> List[float]:
+    """一様乱数を、乗数の平均が目標になるよう定数倍（旧 test_price_logic の v1）"""
+    raw = [float(m) for m in _draw_raw(turns, rng, options)[0]]
+    scale = target / (sum(raw) / turns)
+    return [m * scale for m in raw]
+
+
+@register_curve_strategy('product_scaled')
+def _product_scaled_strategy(target: float, turns: int, rng, options: Dict[str, Any]) -> List[float]:
+    """
+    一様乱数を、累積が目標になるよう各乗数を (目標 / 累積)^(1/n) 倍（旧 test_price_logic の v2）
+
+    旧実装は各乗数を 目標 / 累積 倍しており累積が目標にならなかったため、n乗根で揃える。
+    """
+    raw = [float(m) for m in _draw_raw(turns, rng, options)[0]]
+    scale = (target / math.prod(raw)) ** (1.0 / turns)
+    return [m * scale for m in raw]
+
+
+@register_curve_strategy('mean_search')
+def _mean_search_strategy(target: float, turns: int, rng, options: Dict[str, Any]) -> List[float]:
+    """一様乱数の候補から乗数の平均が目標に最も近いものを採用（旧 test_price_logic の v3、既定1000本）"""
+    candidates = _draw_raw(turns, rng, options, count=options.get('candidates', 1000))
+    if np is not None:
+        best = candidates[int(np.argmin(np.abs(candidates.mean(axis=1) - target)))]
+    else:
+        best = min(candidates, key=lambda row: abs(sum(row) / turns - target))
+    return [float(m) for m in best]
+
+
+def generate_with_strategy(name: str, target: float, turns: int, rng=None,
+                           options: Optional[Dict[str, Any]] = None) -> List[float]:
+    """登録済みの戦略で乗数列を生成"""
+    return list(get_curve_strategy(name)(target, turns, resolve_rng(rng), options or {}))
+
+
+def cumulative(multipliers: List[float]) -> List[float]:
+    """乗数列から各子ターン後の累積倍率を求める"""
+    result = []
+    current = 1.0
+    for m in multipliers:
+        current *= m
+        result.append(current)
+    return result
+
+
+# 先読みの補充に使う共有スレッド（全プールで1本、最初の補充時に起動）
+_refill_executor: Optional[ThreadPoolExecutor] = None
+_refill_executor_lock = threading.Lock()
+
+
+def _get_refill_executor() -> ThreadPoolExecutor:
+    global _refill_executor
+    with _refill_executor_lock:
+        if _refill_executor is None:
+            _refill_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='price-curve')
+        return _refill_executor
+
+
+def _reset_refill_executor() -> None:
+    """fork後の子プロセスでは親のスレッドが存在しないため作り直す"""
+    global _refill_executor, _refill_executor_lock
+    _refill_executor = None
+    _refill_executor_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_refill_executor)
+
+
+class CurvePool:
+    """
+    大ターン開始用の (目標倍率, 乗数列) を先読みしておくプール
+
+    生成は専用の乱数系列で順番に行うので、先読みがいつ走っても取り出す曲線の並びは同じ
+    （同じシードなら同じゲームになる）。取り出すと裏のスレッドで補充する。
+    """
+
+    def __init__(self, rng=None, size: int = 2, background: bool = True):
+        """
+        Args:
+            rng: 乱数生成器（ここから専用系列のシードを1回だけ引く）
+            size: 先読みしておく曲線の数（0なら先読みしない）
+            background: 補充を裏のスレッドで行うか（False なら取り出し時に同期で補充）
+        """
+        self._rng = random.Random(resolve_rng(rng).getrandbits(64))
+        self.size = size
+        self.background = background
+        self._ready: deque = deque()
+        self._lock = threading.Lock()
+        self._refilling = False
+
+    def _produce(self, turns: int, strategy: str, options: Dict[str, Any]) -> Tuple[float, List[float]]:
+        """次の曲線を生成（呼び出し側でロックを持つこと）"""
+        target = AssetManager.generate_target_multiplier(self._rng)
+        return target, generate_with_strategy(strategy, target, turns, self._rng, options)
+
+    def _refill(self, turns: int, strategy: str, options: Dict[str, Any]) -> None:
+        key = (turns, strategy, tuple(sorted(options.items())))
+        try:
+            with self._lock:
+                while len(self._ready) < self.size:
+                    self._ready.append((key,) + self._produce(turns, strategy, options))
+        finally:
+            self._refilling = False
+
+    def take(self, turns: int, strategy: str = 'batch',
+             options: Optional[Dict[str, Any]] = None) -> Tuple[float, List[float]]:
+        """
+        次の大ターンの (目標倍率, 乗数列) を取り出す
+
+        先読み済みならそれを返し、子ターン数・戦略・設定が変わっていた場合や空の場合はその場で生成する。
+        """
+        options = options or {}
+        key = (turns, strategy, tuple(sorted(options.items())))
+        with self._lock:
+            # 先読みは生成順に使う（条件が変わった分も同じ乱数系列なので捨てて進める）
+            while self._ready:
+                ready_key, target, multipliers = self._ready.popleft()
+                if ready_key == key:
+                    break
+            else:
+                target, multipliers = self._produce(turns, strategy, options)
+        self.prefetch(turns, strategy, options)
+        return target, multipliers
+
+    def prefetch(self, turns: int, strategy: str = 'batch', options: Optional[Dict[str, Any]] = None) -> None:
+        """先読みを補充（背景スレッドに依頼、無効なら同期で補充）"""
+        if self.size <= 0 or len(self._ready) >= self.size or self._refilling:
+            return
+        if not self.background:
+            self._refill(turns, strategy, options or {})
+            return
+        self._refilling = True
+        try:
+            _get_refill_executor().submit(self._refill, turns, strategy, options or {})
+        except RuntimeError:  # インタプリタ終了中は補充しない
+            self._refilling = False
+
+    def __len__(self) -> int:
+        return len(self._ready)
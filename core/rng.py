@@ -0,0 +1,87 @@
+"""
+タイムトラベル仕入れゲーム - 乱数生成器
+各サブシステムに注入する乱数生成器の解決・NumPy Generator との相互変換を担当
+
+サブシステムは random.Random 互換のオブジェクト（random モジュール自体も可）を受け取る。
+NumPy の Generator を渡した場合は NumpyRandom で包んで同じインターフェースにする。
+"""
+
+import random
+from typing import Any, List, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # NumPy未導入環境では random.Random のみ対応
+    np = None
+
+
+class NumpyRandom:
+    """NumPy Generator を random.Random 互換のインターフェースで使うためのラッパー"""
+
+    __slots__ = ('generator',)
+
+    def __init__(self, generator):
+        """
+        Args:
+            generator: numpy.random.Generator
+        """
+        self.generator = generator
+
+    def random(self) -> float:
+        return float(self.generator.random())
+
+    def uniform(self, a: float, b: float) -> float:
+        return float(self.generator.uniform(a, b))
+
+    def randint(self, a: int, b: int) -> int:
+        """a以上b以下の整数（random.randint と同じく上限を含む）"""
+        return int(self.generator.integers(a, b, endpoint=True))
+
+    def choice(self, seq: Sequence[Any]) -> Any:
+        return seq[int(self.generator.integers(len(seq)))]
+
+    def choices(self, population: Sequence[Any], weights: Sequence[float] = None, k: int = 1) -> List[Any]:
+        probabilities = None
+        if weights is not None:
+            total = float(sum(weights))
+            probabilities = [weight / total for weight in weights]
+        indices = self.generator.choice(len(population), size=k, p=probabilities)
+        return [population[int(i)] for i in indices]
+
+    def sample(self, population: Sequence[Any], k: int) -> List[Any]:
+        indices = self.generator.choice(len(population), size=k, replace=False)
+        return [population[int(i)] for i in indices]
+
+    def getrandbits(self, k: int) -> int:
+        value = int.from_bytes(self.generator.bytes((k + 7) // 8), 'little')
+        return value >> (-k % 8)
+
+
+def resolve_rng(rng=None):
+    """
+    注入された乱数生成器を random.Random 互換に解決
+
+    Args:
+        rng: random.Random / random モジュール / numpy.random.Generator / None
+
+    Returns:
+        random.Random 互換のオブジェクト（None ならグローバルの random モジュール）
+    """
+    if rng is None:
+        return random
+    if np is not None and isinstance(rng, np.random.Generator):
+        return NumpyRandom(rng)
+    return rng
+
+
+def numpy_generator(rng=None):
+    """
+    一括計算用の NumPy Generator を取得（NumPy必須）
+
+    NumpyRandom ならその Generator を、random.Random 互換なら
+    そこから引いたシードで生成する（同じ rng からは同じ系列になる）。
+    """
+    rng = resolve_rng(rng)
+    if isinstance(rng, NumpyRandom):
+        return rng.generator
+    return np.random.default_rng(rng.getrandbits(64))
@@ -0,0 +1,327 @@
+"""
+タイムトラベル仕入れゲーム - バイナリセーブ形式
+ゲーム状態を長さ付きブロックのバイナリで保存し、在庫は列ごとの配列（列指向ブロック）で持つ
+
+レイアウト（数値はリトルエンディアン、列データは8バイト境界に配置）:
+    ヘッダ      MAGIC(4) / 形式バージョン(u16) / フラグ(u16) / メタ情報の長さ(u32)
+    メタ情報    在庫以外の状態（お金・出品・ターン状態など）の1行JSON
+    在庫ブロック 行数(u32) / 列定義の長さ(u32) / 列定義JSON [[列名, 型, 開始位置, 長さ], ...] / 各列のデータ
+
+列の型:
+    'q' int64 / 'd' float64 / 'n' float64（NaN = None）/ 'b' int8（ジャンル・状態・レア度のコード）/
+    'j' JSON配列（上記に収まらない値、商品の追加キーなど）
+
+open_save() はファイルを mmap し、在庫を ColumnarInventory として返す。商品は添字アクセス時に
+1件ずつ Item にするため、件数・列の集計だけなら全商品を生成しない。
+壊れた・途中で切れたファイルは開く時点で ValueError にする（列の長さ・コード列の範囲を検査）。
+"""
+
+import json
+import mmap
+import math
+import struct
+import sys
+from array import array
+from typing import Dict, List, Any, Iterator, Optional, Sequence
+
+from .item_columns import ItemColumns, CODE_COLUMNS
+from .item_record import Item, as_item, json_default
+
+try:
+    import numpy as np
+except ImportError:  # NumPy未導入環境では as_numpy() のみ使用不可
+    np = None
+
+MAGIC = b'TTSV'
+FORMAT_VERSION = 1
+_HEADER = struct.Struct('<4sHHI')
+_BLOCK_HEADER = struct.Struct('<II')
+_ALIGN = 8
+_INT64_MIN, _INT64_MAX = -(1 << 63), (1 << 63) - 1
+
+# 型 → array の型コード
+_ARRAY_TYPES = {'q': 'q', 'd': 'd', 'n': 'd', 'b': 'b'}
+
+# 在庫の列（列名, Item の属性名）。コード列は常に 'b'、それ以外は値から型を選ぶ
+_CODE_COLUMNS = (('genre', 'genre_code'), ('condition', 'condition_code'), ('rarity', 'rarity_code'))
+_VALUE_COLUMNS = ('id', 'rarity_multiplier', 'base_value', 'estimated_price', 'display_base_value',
+                  'years', 'distance', 'created_at')
+
+
+def _dumps(data: Any) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=json_default).encode('utf-8')
+
+
+def _padding(length: int) -> bytes:
+    return b'\0' * (-length % _ALIGN)
+
+
+def _value_type(values: List[Any]) -> str:
+    """値の列を損失なく保持できる型を選ぶ"""
+    if all(type(value) is int and _INT64_MIN <= value <= _INT64_MAX for value in values):
+        return 'q'
+    if all(type(value) is float for value in values):
+        return 'd'
+    if all(value is None or (type(value) is float and not math.isnan(value)) for value in values):
+        return 'n'
+    return 'j'
+
+
+def _encode_column(values: List[Any], column_type: str) -> bytes:
+    if column_type == 'j':
+        return _dumps(values)
+    if column_type == 'n':
+        values = [math.nan if value is None else value for value in values]
+    data = array(_ARRAY_TYPES[column_type], values)
+    if sys.byteorder != 'little':
+        data.byteswap()
+    return data.tobytes()
+
+
+def encode_state(state: Dict[str, Any]) -> bytes:
+    """
+    ゲーム状態をバイナリ形式に変換
+
+    Args:
+        state: GameEngine._snapshot_state() 形式の状態（inventory は Item / 商品辞書のリスト）
+    """
+    meta = _dumps({key: value for key, value in state.items() if key != 'inventory'})
+    items = [as_item(item) for item in state.get('inventory', [])]
+
+    columns = [(name, 'b', [getattr(item, attribute) for item in items]) for name, attribute in _CODE_COLUMNS]
+    for name in _VALUE_COLUMNS:
+        values = [getattr(item, name) for item in items]
+        columns.append((name, _value_type(values), values))
+    if any(item._extra for item in items):
+        columns.append(('extra', 'j', [item._extra or None for item in items]))
+    payloads = [(name, column_type, _encode_column(values, column_type)) for name, column_type, values in columns]
+
+    # 列定義の長さが開始位置に影響するため、開始位置を仮置きして長さを確定してから計算する
+    head = _HEADER.size + len(meta) + len(_padding(_HEADER.size + len(meta)))
+    descriptor = [[name, column_type, 0, len(payload)] for name, column_type, payload in payloads]
+    while True:
+        encoded_descriptor = _dumps(descriptor)
+        offset = head + _BLOCK_HEADER.size + len(encoded_descriptor)
+        offset += len(_padding(offset))
+        changed = False
+        for entry in descriptor:
+            if entry[2] != offset:
+                entry[2], changed = offset, True
+            offset += entry[3] + len(_padding(entry[3]))
+        if not changed:
+            break
+
+    parts = [_HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(meta)), meta, _padding(_HEADER.size + len(meta)),
+             _BLOCK_HEADER.pack(len(items), len(encoded_descriptor)), encoded_descriptor]
+    position = head + _BLOCK_HEADER.size + len(encoded_descriptor)
+    parts.append(_padding(position))
+    for _, _, payload in payloads:
+        parts.append(payload)
+        parts.append(_padding(len(payload)))
+    return b''.join(parts)
+
+
+def is_binary_save(path: str) -> bool:
+    """ファイルがバイナリ形式のセーブデータか"""
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+class ColumnarInventory(Sequence):
+    """列指向ブロックの在庫（添字アクセス時に1件ずつ Item を生成）"""
+
+    def __init__(self, buffer, count: int, descriptor: List[List[Any]]):
+        """
+        Args:
+            buffer: セーブデータ全体（bytes / mmap）
+            count: 商品数
+            descriptor: 列定義 [[列名, 型, 開始位置, 長さ], ...]
+
+        Raises:
+            ValueError: 列が欠けている・長さが合わない・コード列がコード表の範囲外の場合
+        """
+        self._buffer = memoryview(buffer)
+        self._count = count
+        self._types = {name: column_type for name, column_type, _, _ in descriptor}
+        self._columns: Dict[str, Any] = {}
+        try:
+            self._read_columns(descriptor)
+        except Exception:
+            self.release()  # mmap を閉じられるよう参照を解放
+            raise
+
+    def _read_columns(self, descriptor: List[List[Any]]) -> None:
+        count = self._count
+        for name, column_type, offset, length in descriptor:
+            if column_type != 'j' and column_type not in _ARRAY_TYPES:
+                raise ValueError(f"在庫の列 {name} の型が不正です: {column_type!r}")
+            if offset < 0 or offset + length > len(self._buffer):
+                raise ValueError(f"在庫の列 {name} がファイルの範囲外です（途中で切れている可能性）")
+            raw = self._buffer[offset:offset + length]
+            if column_type == 'j':
+                values = json.loads(bytes(raw).decode('utf-8'))
+            elif length != count * array(_ARRAY_TYPES[column_type]).itemsize:
+                raise ValueError(f"在庫の列 {name} の長さが商品数と合いません")
+            elif sys.byteorder == 'little':
+                values = raw.cast(_ARRAY_TYPES[column_type])
+            else:
+                values = array(_ARRAY_TYPES[column_type], bytes(raw))
+                values.byteswap()
+            if len(values) != count:
+                raise ValueError(f"在庫の列 {name} の長さが商品数と合いません")
+            self._columns[name] = values
+        self._check_columns()
+
+    def _check_columns(self) -> None:
+        """必要な列がそろい、ジャンル・状態・レア度のコードがコード表の範囲内か"""
+        for name in (*CODE_COLUMNS, *_VALUE_COLUMNS):
+            if name not in self._columns:
+                raise ValueError(f"在庫の列 {name} がありません")
+        for name, labels in CODE_COLUMNS.items():
+            if self._types[name] != 'b':
+                raise ValueError(f"在庫の列 {name} の型が不正です: {self._types[name]!r}")
+            codes = self._columns[name]
+            if self._count and (min(codes) < 0 or max(codes) >= len(labels)):
+                raise ValueError(f"在庫の列 {name} に不明なコードがあります（0～{len(labels) - 1} の範囲外）")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _value(self, name: str, index: int) -> Any:
+        value = self._columns[name][index]
+        if self._types[name] == 'n' and math.isnan(value):
+            return None
+        return value
+
+    def __getitem__(self, index: int) -> Item:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        value = self._value
+        extra = self._columns['extra'][index] if 'extra' in self._columns else None
+        return Item.from_codes(
+            value('id', index), value('genre', index), value('condition', index), value('rarity', index),
+            value('rarity_multiplier', index), value('base_value', index), value('years', index),
+            value('distance', index), value('created_at', index),
+            estimated_price=value('estimated_price', index),
+            display_base_value=value('display_base_value', index),
+            extra=extra,
+        )
+
+    def __iter__(self) -> Iterator[Item]:
+        for index in range(self._count):
+            yield self[index]
+
+    def column(self, name: str) -> Sequence[Any]:
+        """1列分の値（数値列はコピーしない memoryview、'n' 列の None は NaN のまま）"""
+        return self._columns[name]
+
+    def as_numpy(self, name: str) -> 'np.ndarray':
+        """数値列を NumPy 配列として取得（コピーしない）"""
+        if np is None:
+            raise RuntimeError("as_numpy() にはNumPyが必要です")
+        return np.asarray(self._columns[name])
+
+    def _values(self, name: str) -> List[Any]:
+        """1列分の値をPythonの値のリストで取得（'n' 列の NaN は None）"""
+        values = self._columns[name]
+        values = values.tolist() if not isinstance(values, list) else values
+        if self._types[name] == 'n':
+            return [None if value != value else value for value in values]
+        return values
+
+    def materialize(self) -> List[Item]:
+        """全商品を Item のリストにする（列ごとにまとめて変換するため1件ずつより速い）"""
+        extras = self._columns['extra'] if 'extra' in self._columns else [None] * self._count
+        return [
+            Item.from_codes(item_id, genre, condition, rarity, rarity_multiplier, base_value, years, distance,
+                            created_at, estimated_price, display_base_value, extra)
+            for (item_id, genre, condition, rarity, rarity_multiplier, base_value, years, distance, created_at,
+                 estimated_price, display_base_value, extra) in zip(
+                self._values('id'), self._values('genre'), self._values('condition'), self._values('rarity'),
+                self._values('rarity_multiplier'), self._values('base_value'), self._values('years'),
+                self._values('distance'), self._values('created_at'), self._values('estimated_price'),
+                self._values('display_base_value'), extras)
+        ]
+
+    def item_columns(self) -> ItemColumns:
+        """GameEngine の在庫集計用ストアを列から直接生成"""
+        return ItemColumns.from_arrays(
+            self._values('id'), self._values('genre'), self._values('condition'), self._values('rarity'),
+            [int(round(float(value) * 100)) for value in self._values('base_value')],
+        )
+
+    def release(self) -> None:
+        """バッファへの参照を解放（mmap を閉じる前に呼ぶ）"""
+        for name, values in self._columns.items():
+            if isinstance(values, memoryview):
+                values.release()
+        self._columns = {}
+        self._buffer.release()
+
+
+class BinarySave:
+    """読み込んだバイナリセーブデータ（メタ情報と列指向の在庫）"""
+
+    def __init__(self, buffer, mapped: Optional[mmap.mmap] = None):
+        """
+        Args:
+            buffer: セーブデータ全体（bytes / mmap）
+            mapped: open_save() が開いた mmap（close() で閉じる）
+        """
+        try:
+            magic, version, _flags, meta_length = _HEADER.unpack_from(buffer, 0)
+            if magic != MAGIC:
+                raise ValueError("バイナリ形式のセーブデータではありません")
+            if version > FORMAT_VERSION:
+                raise ValueError(f"未対応のセーブ形式バージョンです: {version}")
+            self.meta: Dict[str, Any] = json.loads(
+                bytes(buffer[_HEADER.size:_HEADER.size + meta_length]).decode('utf-8'))
+
+            position = _HEADER.size + meta_length
+            position += -position % _ALIGN
+            count, descriptor_length = _BLOCK_HEADER.unpack_from(buffer, position)
+            position += _BLOCK_HEADER.size
+            descriptor = json.loads(bytes(buffer[position:position + descriptor_length]).decode('utf-8'))
+        except struct.error:
+            raise ValueError("セーブデータが途中で切れています") from None
+        self.inventory = ColumnarInventory(buffer, count, descriptor)
+        self._mapped = mapped
+
+    def to_state(self) -> Dict[str, Any]:
+        """全商品を生成した状態の辞書"""
+        state = dict(self.meta)
+        state['inventory'] = self.inventory.materialize()
+        return state
+
+    def close(self) -> None:
+        """mmap を閉じる（以降 inventory は使えない）"""
+        self.inventory.release()
+        if self._mapped is not None:
+            self._mapped.close()
+            self._mapped = None
+
+    def __enter__(self) -> 'BinarySave':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def open_save(path: str) -> BinarySave:
+    """バイナリセーブデータを mmap で開く（在庫は必要な分だけ生成）"""
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        return BinarySave(mapped, mapped)
+    except Exception:
+        mapped.close()
+        raise
+
+
+def decode_state(data: bytes) -> Dict[str, Any]:
+    """バイナリ形式から状態の辞書に変換（全商品を生成）"""
+    return BinarySave(data).to_state()
@@ -0,0 +1,261 @@
+"""
+タイムトラベル仕入れゲーム - セッションストア
+プレイヤーごとのゲーム状態（エンジン・ターン・AIバイヤー）をLRU+アイドルタイムアウトで管理
+"""
+
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextvars import ContextVar, Token
+from typing import Dict, Any, Optional, Callable
+
+from .ai_buyers import AIBuyerManager, ai_buyer_manager
+from .auction_system import AuctionSystem, auction_system
+from .game_config import GameConfig
+from .game_logger import get_alert_logger
+from .game_engine import GameEngine, game_engine
+from .game_store import GameStore
+from .turn_system import TurnSystem
+from .rng import resolve_rng
+
+
+class GameSession:
+    """1プレイヤー分のゲーム状態一式"""
+
+    def __init__(self, session_id: str, engine: GameEngine = None,
+                 buyer_manager: AIBuyerManager = None, auction: AuctionSystem = None,
+                 rng=None):
+        """
+        セッション初期化（省略した構成要素はこのセッション専用に新規生成）
+
+        Args:
+            session_id: セッションID
+            engine: ゲームエンジン
+            buyer_manager: AIバイヤー管理
+            auction: オークションシステム
+            rng: このセッションの乱数生成器（random.Random / NumPy Generator、
+                 省略時はセッション専用の random.Random を新規生成）
+        """
+        self.session_id = session_id
+        self.rng = resolve_rng(rng) if rng is not None else random.Random()
+        self.engine = engine if engine is not None else GameEngine(TurnSystem(rng=self.rng))
+        self.buyer_manager = buyer_manager if buyer_manager is not None else AIBuyerManager(rng=self.rng)
+        self.auction_system = auction if auction is not None else AuctionSystem(self.buyer_manager)
+        self.created_at = time.time()
+        self.last_access = self.created_at
+        # リクエスト処理中は保持する（同じセッションへの同時リクエストを直列化し、
+        # エンジンの変更と SessionRecorder の書き出しが混ざらないようにする）
+        self.lock = threading.Lock()
+        # ゲームストア（GameStore.attach で設定、未設定ならプロセス内のみ）
+        self.store: Optional[GameStore] = None
+        self.recorder = None
+
+    @property
+    def turn_system(self) -> TurnSystem:
+        """このセッションのターンシステム"""
+        return self.engine.turn_system
+
+    def touch(self, now: float = None) -> None:
+        """最終アクセス時刻を更新"""
+        self.last_access = time.time() if now is None else now
+
+    def clear_history(self) -> None:
+        """このセッションの履歴を消す（ゲームのやり直し時、次の保存で反映）"""
+        if self.recorder is not None:
+            self.recorder.clear_history()
+
+    def record_event(self, kind: str, **event) -> None:
+        """
+        履歴を1件記録（ゲームストア未使用なら何もしない、リクエスト終了時にまとめて書き込む）
+
+        Args:
+            kind: 'travel'（タイムトラベル） / 'auction'（オークション結果）
+            **event: 履歴の列（core/game_store.py の TRAVEL_EVENT_COLUMNS / AUCTION_RESULT_COLUMNS）
+        """
+        if self.recorder is None:
+            return
+        event.setdefault('created_at', time.time())
+        turn = self.turn_system
+        event.setdefault('major_turn', turn.major_turn)
+        event.setdefault('minor_turn', turn.minor_turn)
+        self.recorder.record_event(kind, event)
+
+
+class SessionStore:
+    """セッションIDをキーにしたゲーム状態ストア（LRU順で保持）"""
+
+    def __init__(self, max_sessions: int = None, idle_timeout: float = None,
+                 session_factory: Callable[[str], GameSession] = None,
+                 clock: Callable[[], float] = time.time,
+                 game_store: Optional[GameStore] = None):
+        """
+        セッションストア初期化
+
+        Args:
+            max_sessions: 最大保持セッション数（超過時は最も古いアクセスのものから破棄）
+            idle_timeout: 無操作で破棄するまでの秒数
+            session_factory: セッション生成関数（テスト用）
+            clock: 現在時刻取得関数（テスト用）
+            game_store: 状態を永続化するゲームストア（省略時はプロセス内のみ、破棄したセッションは失われる）
+        """
+        self.max_sessions = max_sessions if max_sessions is not None else GameConfig.SESSION_MAX_COUNT
+        self.idle_timeout = idle_timeout if idle_timeout is not None else GameConfig.SESSION_IDLE_TIMEOUT
+        self._session_factory = session_factory or GameSession
+        self._clock = clock
+        self.game_store = game_store
+        # 先頭 = 最も長くアクセスされていないセッション
+        self._sessions: "OrderedDict[str, GameSession]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evicted_count = 0
+        self.expired_count = 0
+        self.persist_failures = 0
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def _is_expired(self, session: GameSession, now: float) -> bool:
+        return now - session.last_access > self.idle_timeout
+
+    def _evict_expired_locked(self, now: float) -> int:
+        """期限切れセッションを先頭から破棄（LRU順なので期限切れは必ず先頭に並ぶ）"""
+        removed = 0
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if not self._is_expired(oldest, now):
+                break
+            self._sessions.popitem(last=False)
+            removed += 1
+        self.expired_count += removed
+        return removed
+
+    def _evict_overflow_locked(self) -> None:
+        """最大数を超えた分を最も古いアクセスのものから破棄"""
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+            self.evicted_count += 1
+
+    def attach_store(self, game_store: Optional[GameStore]) -> None:
+        """
+        ゲームストアを設定（Webアプリの起動時に呼ぶ、インポートだけではデータベースを開かない）
+
+        以降に生成するセッションから保存・復元の対象になる。
+        """
+        with self._lock:
+            self.game_store = game_store
+
+    def get(self, session_id: str) -> Optional[GameSession]:
+        """セッションを取得（存在しない・期限切れの場合はNone）"""
+        with self._lock:
+            now = self._clock()
+            self._evict_expired_locked(now)
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            session.touch(now)
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def get_or_create(self, session_id: str = None) -> GameSession:
+        """セッションを取得、無ければ新規作成"""
+        if session_id is None:
+            session_id = uuid.uuid4().hex
+
+        with self._lock:
+            now = self._clock()
+            self._evict_expired_locked(now)
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = self._session_factory(session_id)
+                if self.game_store is not None:
+                    self.game_store.attach(session)
+                self._sessions[session_id] = session
+                self._evict_overflow_locked()
+            else:
+                self._sessions.move_to_end(session_id)
+            session.touch(now)
+            return session
+
+    def remove(self, session_id: str) -> bool:
+        """セッションを破棄（ゲームストアの保存内容も削除）"""
+        with self._lock:
+            removed = self._sessions.pop(session_id, None) is not None
+        if self.game_store is not None:
+            self.game_store.delete_session(session_id)
+        return removed
+
+    def persist(self, session: GameSession) -> bool:
+        """
+        セッションの未保存の変更をゲームストアに書き込む（リクエスト終了時に呼ぶ）
+
+        失敗してもリクエストは失敗させず、障害通知用ロガー（本番モードでも出力）に記録する。
+        トランザクションはロールバックされ、変更はセッションに残るため次のリクエストで書き込み直す。
+
+        Returns:
+            書き込みを行ったか
+        """
+        if self.game_store is None or session.store is not self.game_store:
+            return False
+        try:
+            return self.game_store.save_session(session)
+        except Exception as e:
+            self.persist_failures += 1
+            session.recorder.mark_failed(e)
+            get_alert_logger().error("ゲームストアへの保存に失敗: session=%s 連続%d回目: %s",
+                                     session.session_id, session.recorder.failures, session.recorder.last_error)
+            return False
+
+    def evict_expired(self) -> int:
+        """期限切れセッションを破棄して破棄数を返す"""
+        with self._lock:
+            return self._evict_expired_locked(self._clock())
+
+    def clear(self) -> None:
+        """全セッションを破棄"""
+        with self._lock:
+            self._sessions.clear()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """セッションストアの統計情報を取得"""
+        return {
+            'active_sessions': len(self._sessions),
+            'max_sessions': self.max_sessions,
+            'idle_timeout': self.idle_timeout,
+            'evicted_count': self.evicted_count,
+            'expired_count': self.expired_count,
+            'persist_failures': self.persist_failures
+        }
+
+
+# 既存のグローバルインスタンスをまとめた既定セッション（CLI・ツール用）
+default_session = GameSession(
+    'default', engine=game_engine, buyer_manager=ai_buyer_manager, auction=auction_system,
+    rng=random
+)
+
+# リクエスト処理中のセッション（未設定時は既定セッション）
+_current_session = ContextVar('current_session', default=None)
+
+
+def get_current_session() -> GameSession:
+    """現在のリクエストに対応するセッションを取得"""
+    session = _current_session.get()
+    return session if session is not None else default_session
+
+
+def activate_session(session: GameSession) -> Token:
+    """セッションを現在のコンテキストに設定"""
+    return _current_session.set(session)
+
+
+def deactivate_session(token: Token) -> None:
+    """activate_session で設定したセッションを解除"""
+    _current_session.reset(token)
+
+
+# シングルトンインスタンス（ゲームストアは app.py が起動時に attach_store で設定）
+session_store = SessionStore()
@@ -0,0 +1,286 @@
+"""
+タイムトラベル仕入れゲーム - バランスシミュレーション
+独立したゲームを多数プレイして破産率・資産成長・ターン分布を集計する（画面なし）
+
+使い方:
+    results = run_simulations(1000, strategy='auto_invest', workers=4, seed=1)
+    write_results_csv(results, 'simulation.csv')
+    summary = summarize_results(results)
+"""
+
+import csv
+import multiprocessing
+import random
+import statistics
+from collections import Counter
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+from .game_config import GameConfig
+from .session_store import GameSession
+from .asset_manager import AssetManager
+from .item_system import ItemSystem
+from .invest_planner import investment_planner
+from .travel_config import YEARS_MIN, DISTANCE_MIN
+
+# 1ゲームの結果の列（CSVの列順）
+RESULT_COLUMNS = (
+    'game_index', 'seed', 'strategy', 'turns', 'major_turn', 'bankrupt',
+    'final_money', 'final_assets', 'asset_growth', 'travel_count',
+    'items_bought', 'items_sold', 'end_reason'
+)
+
+DEFAULT_MAX_TURNS = 40  # 1ゲームの最大子ターン数（5大ターン分）
+
+
+def _auto_invest_plan(session: GameSession, options: Dict[str, Any]) -> Optional[Tuple[int, int]]:
+    """自動投資: (現金 - 固定費) の指定割合を投資（/api/auto_invest と同じ割り振り）"""
+    engine = session.engine
+    fixed_cost = engine.get_fixed_cost()
+    available = engine.state['money'] - fixed_cost
+    target_investment = available * options.get('invest_ratio', 0.5)
+    if target_investment < 1:
+        return None
+    return ItemSystem.split_investment(target_investment, rng=session.rng)
+
+
+def _fixed_invest_plan(session: GameSession, options: Dict[str, Any]) -> Optional[Tuple[int, int]]:
+    """定額投資: 毎ターン同じ額を投資（年数10年固定）"""
+    amount = options.get('invest_amount', 100)
+    years = 10
+    return years, max(1, int(amount / years))
+
+
+def _planner_invest_plan(session: GameSession, options: Dict[str, Any]) -> Optional[Tuple[int, int]]:
+    """投資プランナー: 残りの子ターンの価格倍率から今のターンの投資額を決める（/api/auto_invest の strategy=plan と同じ）"""
+    step = investment_planner.plan_for_engine(session.engine, options.get('resale_rate'))['recommendation']
+    if step is None:
+        return None
+    if step['skip']:
+        # 見送りのターンも固定費を払ってターンを進める（最小の年数・距離で移動）
+        return YEARS_MIN, DISTANCE_MIN
+    return step['years'], step['distance']
+
+
+# 戦略名 → 投資計画関数（Noneを返したら投資しない＝ゲーム終了）
+STRATEGIES: Dict[str, Callable[[GameSession, Dict[str, Any]], Optional[Tuple[int, int]]]] = {
+    'auto_invest': _auto_invest_plan,
+    'fixed': _fixed_invest_plan,
+    'planner': _planner_invest_plan,
+}
+
+
+def _travel(session: GameSession, years: int, distance: int) -> Optional[Dict[str, Any]]:
+    """タイムトラベルを実行（TravelAPI.execute_travel と同じ手順、購入できなければNone）"""
+    engine = session.engine
+    assets = engine.get_assets()
+    fixed_cost = AssetManager.calculate_fixed_cost(assets)
+    investment_cost = ItemSystem.calculate_travel_cost(years, distance)
+
+    can_afford, _ = AssetManager.can_afford_purchase(assets, fixed_cost, investment_cost)
+    if not can_afford:
+        return None
+
+    travel_result = ItemSystem.get_travel_result(
+        years, distance, engine.state['money'],
+        price_multiplier=engine.turn_system.get_current_price_multiplier(),
+        rng=session.rng,
+        id_allocator=engine.id_allocator
+    )
+    if not travel_result['success'] or not engine.spend_money(investment_cost + fixed_cost):
+        return None
+
+    if not travel_result['failed']:
+        engine.add_to_inventory(travel_result['items'])
+    return travel_result
+
+
+def _sell_inventory(session: GameSession, sell_markup: float) -> int:
+    """在庫を基本価値×倍率で出品して一括オークションを実行、売れた個数を返す"""
+    engine = session.engine
+    auction = session.auction_system
+    listed = list(engine.state['inventory'])[:GameConfig.MAX_AUCTION_ITEMS]
+    if not listed:
+        return 0
+
+    auction_items = []
+    for item in listed:
+        engine.remove_from_inventory(item['id'])
+        auction_items.append(auction.create_auction_item(item, round(item['base_value'] * sell_markup, 2)))
+
+    sold_count = 0
+    for auction_item, result in zip(auction_items, auction.simulate_auction_batch(auction_items)):
+        if result['sold']:
+            engine.earn_money(auction.calculate_profit(result['final_price']))
+            sold_count += 1
+        else:
+            # 売れ残りは在庫に戻す（AuctionAPI.start_auction と同じ）
+            engine.add_to_inventory([auction_item['item']])
+    return sold_count
+
+
+def play_game(seed: int, strategy: str = 'auto_invest', max_turns: int = DEFAULT_MAX_TURNS,
+              sell: bool = True, sell_markup: float = 1.0, **options) -> Dict[str, Any]:
+    """
+    1ゲームを最後までプレイ
+
+    ゲームごとに専用のセッション（エンジン・ターンシステム・AIバイヤー）を生成し、
+    API層と同じ手順で購入・売却を繰り返す。売却は一括オークションで行う。
+
+    Args:
+        seed: 乱数シード
+        strategy: 投資戦略名（STRATEGIES のキー）
+        max_turns: 最大子ターン数
+        sell: 購入ごとに在庫をオークションに出すか
+        sell_markup: 出品時の開始価格（基本価値に対する倍率）
+        **options: 戦略ごとの設定（invest_ratio, invest_amount, resale_rate）
+
+    Returns:
+        RESULT_COLUMNS の列を持つ結果（game_index を除く）
+    """
+    plan = STRATEGIES.get(strategy)
+    if plan is None:
+        raise ValueError(f"不明な戦略: {strategy}")
+
+    # ゲームごとに専用の乱数生成器を使い、同一プロセス内の他のゲームと干渉しない
+    session = GameSession(f'simulation-{seed}', rng=random.Random(seed))
+    engine = session.engine
+    travel_count = items_bought = items_sold = 0
+    end_reason = 'max_turns'
+
+    while engine.state['turn_count'] < max_turns:
+        if engine.check_game_over():
+            end_reason = 'game_over'
+            break
+
+        params = plan(session, options)
+        if params is None:
+            end_reason = 'no_investment'
+            break
+
+        travel_result = _travel(session, *params)
+        if travel_result is None:
+            end_reason = 'unaffordable'
+            break
+        travel_count += 1
+        items_bought += len(travel_result['items'])
+
+        if sell:
+            items_sold += _sell_inventory(session, sell_markup)
+
+    if end_reason == 'max_turns' and engine.check_game_over():
+        end_reason = 'game_over'
+
+    final_assets = engine.get_assets()
+    return {
+        'seed': seed,
+        'strategy': strategy,
+        'turns': engine.state['turn_count'],
+        'major_turn': engine.turn_system.major_turn,
+        'bankrupt': end_reason == 'game_over',
+        'final_money': round(engine.state['money'], 2),
+        'final_assets': round(final_assets, 2),
+        'asset_growth': round(final_assets / GameConfig.INITIAL_MONEY, 4),
+        'travel_count': travel_count,
+        'items_bought': items_bought,
+        'items_sold': items_sold,
+        'end_reason': end_reason
+    }
+
+
+def _play_game_task(task: Tuple[int, int, Dict[str, Any]]) -> Dict[str, Any]:
+    """プロセスプール用のラッパー（picklableなタプルで受け取る）"""
+    game_index, seed, kwargs = task
+    result = play_game(seed, **kwargs)
+    result['game_index'] = game_index
+    return result
+
+
+def derive_seeds(seed: int, games: int) -> List[int]:
+    """基準シードからゲームごとのシードを導出（並列数に依存しない）"""
+    seed_source = random.Random(seed)
+    return [seed_source.getrandbits(32) for _ in range(games)]
+
+
+def run_simulations(games: int, strategy: str = 'auto_invest', workers: int = None,
+                    seed: int = 0, chunksize: int = None, **kwargs) -> List[Dict[str, Any]]:
+    """
+    独立したゲームを複数プロセスで並列実行
+
+    Args:
+        games: ゲーム数
+        strategy: 投資戦略名
+        workers: プロセス数（省略時はCPU数、1ならこのプロセスで逐次実行）
+        seed: 基準シード（同じ値なら並列数に関係なく同じ結果）
+        chunksize: 1回にプロセスへ渡すゲーム数
+        **kwargs: play_game に渡す設定
+
+    Returns:
+        ゲームごとの結果（game_index 順）
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"不明な戦略: {strategy}")
+
+    kwargs = dict(kwargs, strategy=strategy)
+    tasks = [(i, game_seed, kwargs) for i, game_seed in enumerate(derive_seeds(seed, games))]
+    workers = workers or multiprocessing.cpu_count()
+
+    if workers <= 1 or games <= 1:
+        return [_play_game_task(task) for task in tasks]
+
+    chunksize = chunksize or max(1, games // (workers * 4))
+    with multiprocessing.Pool(processes=workers) as pool:
+        return pool.map(_play_game_task, tasks, chunksize=chunksize)
+
+
+def summarize_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """破産率・資産成長・ターン分布を集計"""
+    if not results:
+        return {'games': 0}
+
+    growths = sorted(result['asset_growth'] for result in results)
+    turns = [result['turns'] for result in results]
+    deciles = statistics.quantiles(growths, n=10) if len(growths) >= 2 else [growths[0]] * 9
+
+    return {
+        'games': len(results),
+        'bankruptcy_rate': round(sum(result['bankrupt'] for result in results) / len(results), 4),
+        'asset_growth': {
+            'mean': round(statistics.fmean(growths), 4),
+            'median': round(statistics.median(growths), 4),
+            'p10': round(deciles[0], 4),
+            'p90': round(deciles[-1], 4),
+            'min': growths[0],
+            'max': growths[-1]
+        },
+        'turns': {
+            'mean': round(statistics.fmean(turns), 2),
+            'distribution': dict(sorted(Counter(turns).items()))
+        },
+        'end_reasons': dict(Counter(result['end_reason'] for result in results))
+    }
+
+
+def write_results_csv(results: List[Dict[str, Any]], filepath: str) -> None:
+    """ゲームごとの結果を列形式（CSV）で保存"""
+    with open(filepath, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_COLUMNS)
+        writer.writeheader()
+        for result in results:
+            writer.writerow({column: result[column] for column in RESULT_COLUMNS})
+
+
+def read_results_csv(filepath: str) -> Dict[str, List[Any]]:
+    """write_results_csv で保存した結果を列ごとのリストで読み込む"""
+    converters = {
+        'game_index': int, 'seed': int, 'turns': int, 'major_turn': int,
+        'bankrupt': lambda value: value == 'True',
+        'final_money': float, 'final_assets': float, 'asset_growth': float,
+        'travel_count': int, 'items_bought': int, 'items_sold': int,
+    }
+    columns: Dict[str, List[Any]] = {column: [] for column in RESULT_COLUMNS}
+    with open(filepath, encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            for column in RESULT_COLUMNS:
+                convert = converters.get(column, str)
+                columns[column].append(convert(row[column]))
+    return columns
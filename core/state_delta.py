@@ -0,0 +1,101 @@
+"""
+タイムトラベル仕入れゲーム - 状態差分
+購入・オークションなどの操作で変わった部分だけを、クライアントが持つ状態バージョンからのパッチとして返す
+
+操作の間 GameEngine が触れた在庫・出品のIDを記録し、操作前後の存在有無から
+追加・削除・更新を判定する（在庫全体の比較はしない）。
+"""
+
+from typing import Dict, Any, Optional, List
+
+from .item_system import ItemSystem
+
+# 記録対象のコレクション（GameEngine.state のキー）
+TRACKED_COLLECTIONS = ('inventory', 'auction_items')
+
+
+class StateChanges:
+    """1回の操作中の状態変更を記録し、差分を生成する（GameEngine.record_changes で使用）"""
+
+    __slots__ = ('_engine', 'client_version', 'base_version', 'replaced',
+                 '_money', '_assets', '_turn', '_touched')
+
+    def __init__(self, engine, client_version: Optional[int] = None):
+        """
+        Args:
+            engine: 記録対象のGameEngine
+            client_version: クライアントが保持している状態バージョン（省略時は照合しない）
+        """
+        self._engine = engine
+        self.client_version = client_version
+        self.base_version = engine.state_version
+        self.replaced = False  # リセット・読み込みで状態全体が差し替えられたか
+        self._money = engine.state['money']
+        self._assets = engine.get_assets()
+        turn_system = engine.turn_system
+        self._turn = (turn_system.major_turn, turn_system.minor_turn)
+        # コレクション名 → {ID: 操作前に存在したか}（最初に触れた時点の値）
+        self._touched: Dict[str, Dict[int, bool]] = {name: {} for name in TRACKED_COLLECTIONS}
+
+    def touch(self, collection: str, item_ids) -> None:
+        """変更直前に呼び、対象IDの操作前の存在有無を記録"""
+        touched = self._touched[collection]
+        items = self._engine.state[collection]
+        for item_id in item_ids:
+            if item_id not in touched:
+                touched[item_id] = item_id in items
+
+    def _collection_delta(self, collection: str) -> Dict[str, List[Any]]:
+        """操作前後の存在有無から追加・更新・削除を判定"""
+        items = self._engine.state[collection]
+        added, updated, removed = [], [], []
+        for item_id, was_present in self._touched[collection].items():
+            current = items.get(item_id)
+            if current is None:
+                if was_present:
+                    removed.append(item_id)
+            elif was_present:
+                updated.append(current)
+            else:
+                added.append(current)
+        return {'added': added, 'updated': updated, 'removed': removed}
+
+    def to_delta(self) -> Dict[str, Any]:
+        """
+        操作前からの差分を取得
+
+        resync_required が True の場合（クライアントの状態バージョンが操作前と異なる、
+        または状態全体が差し替えられた）は、差分を当てずに全状態を取得し直すこと。
+        """
+        engine = self._engine
+        money = engine.state['money']
+        assets = engine.get_assets()
+        turn_info = engine.turn_system.get_turn_info()
+
+        inventory = self._collection_delta('inventory')
+        auction_items = self._collection_delta('auction_items')
+        stale = self.client_version is not None and self.client_version != self.base_version
+
+        return {
+            'base_version': self.base_version,
+            'state_version': engine.state_version,
+            'resync_required': stale or self.replaced,
+            'money': {'before': self._money, 'after': money, 'delta': money - self._money},
+            'assets': {'before': self._assets, 'after': assets, 'delta': assets - self._assets},
+            'turn': {
+                'changed': (turn_info['major_turn'], turn_info['minor_turn']) != self._turn,
+                'major_turn': turn_info['major_turn'],
+                'minor_turn': turn_info['minor_turn'],
+                'minor_turns_total': turn_info['minor_turns_total'],
+                'current_multiplier': turn_info['current_multiplier'],
+            },
+            'inventory': {
+                # 在庫は /api/inventory と同じ表示用形式（更新は追加として扱う）
+                'added': [ItemSystem.get_item_display_info(item)
+                          for item in inventory['added'] + inventory['updated']],
+                'removed': inventory['removed'],
+                'count': len(engine.state['inventory']),
+            },
+            'auction_items': dict(auction_items, count=len(engine.state['auction_items'])),
+            'game_over': engine.check_game_over(),
+        }
@@ -0,0 +1,141 @@
+"""
+タイムトラベル仕入れゲーム - 状態ジャーナル
+ゲーム状態の保存をスナップショット + 追記型ジャーナル（write-ahead log）で行う
+
+ファイル構成（保存先 path ごと）:
+    path              スナップショット（従来の保存形式の状態に turn_system / journal_sequence を追加した1行JSON）
+    path + '.journal' スナップショット以降の変更（1行1件のJSON、seq は通し番号）
+
+変更のたびにジャーナルへ1行追記するため、保存はスナップショット以降の変更分だけの負荷になる。
+変更が JOURNAL_SNAPSHOT_INTERVAL 件たまるとスナップショットを書き直してジャーナルを空にする。
+読み込み時はスナップショットに、その journal_sequence より後の行を順に適用する（途中で壊れた末尾行は捨てる）。
+"""
+
+import json
+import os
+from typing import Dict, Any, List, Optional, Tuple
+
+from .game_config import GameConfig
+from .game_logger import get_logger
+from .item_record import json_default
+
+logger = get_logger('engine')
+
+JOURNAL_SUFFIX = '.journal'
+
+
+def journal_path(path: str) -> str:
+    """スナップショットに対応するジャーナルファイルのパス"""
+    return path + JOURNAL_SUFFIX
+
+
+def _dumps(data: Dict[str, Any]) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=json_default)
+
+
+def read_journal(path: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    スナップショットと未反映のジャーナルを読み込む
+
+    Args:
+        path: スナップショットのパス（ジャーナルがなければスナップショットのみ、従来形式の保存ファイルも可）
+
+    Returns:
+        (スナップショットの状態, スナップショットより後の変更を seq 順に並べたリスト)
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        snapshot = json.load(f)
+    sequence = snapshot.get('journal_sequence', 0)
+
+    entries = []
+    try:
+        with open(journal_path(path), 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    if not line.endswith('\n'):
+                        raise ValueError("改行のない末尾行")
+                    entry = json.loads(line)
+                except ValueError:
+                    # 書き込み途中で落ちた末尾行（以降は信用しない）
+                    logger.warning("ジャーナルの壊れた行以降を無視: %s", journal_path(path))
+                    break
+                if entry['seq'] > sequence:
+                    entries.append(entry)
+    except FileNotFoundError:
+        pass
+    return snapshot, entries
+
+
+class StateJournal:
+    """1つの保存先に対するスナップショット書き出しとジャーナル追記"""
+
+    def __init__(self, path: str, snapshot_interval: int = None, fsync: bool = None):
+        """
+        Args:
+            path: スナップショットのパス
+            snapshot_interval: スナップショットを書き直す変更件数（省略時は GameConfig.JOURNAL_SNAPSHOT_INTERVAL）
+            fsync: sync() で fsync するか（省略時は GameConfig.JOURNAL_FSYNC）
+        """
+        self.path = path
+        self.snapshot_interval = snapshot_interval or GameConfig.JOURNAL_SNAPSHOT_INTERVAL
+        self.fsync = GameConfig.JOURNAL_FSYNC if fsync is None else fsync
+        self.sequence = 0   # 最後に記録した変更の通し番号
+        self.pending = 0    # 最後のスナップショット以降の変更件数
+        self._file = None
+
+    @property
+    def snapshot_due(self) -> bool:
+        """スナップショットを書き直す時期か"""
+        return self.pending >= self.snapshot_interval
+
+    def append(self, op: str, **payload) -> None:
+        """変更を1件追記（プロセスが落ちても残るよう行ごとにフラッシュ）"""
+        self.sequence += 1
+        self._file.write(_dumps(dict(payload, seq=self.sequence, op=op)) + '\n')
+        self._file.flush()
+        self.pending += 1
+
+    def write_snapshot(self, state: Dict[str, Any]) -> None:
+        """
+        スナップショットを書き直してジャーナルを空にする
+
+        一時ファイルに書いてから置き換えるため、途中で落ちても前のスナップショット + ジャーナルから復元できる。
+        置き換え後・ジャーナルを空にする前に落ちた場合も、journal_sequence 以前の行は読み込み時に読み飛ばす。
+        """
+        snapshot = dict(state, journal_sequence=self.sequence)
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(_dumps(snapshot))
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+        if self._file is not None:
+            self._file.close()
+        self._file = open(journal_path(self.path), 'w', encoding='utf-8')
+        self.pending = 0
+        logger.debug("スナップショット保存: %s (seq=%d)", self.path, self.sequence)
+
+    def sync(self) -> None:
+        """ジャーナルを書き出す（fsync 有効時はディスクまで）"""
+        if self._file is not None:
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """ジャーナルを閉じる"""
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    def get_info(self) -> Dict[str, Any]:
+        """保存状況（APIレスポンス用）"""
+        return {
+            'path': self.path,
+            'sequence': self.sequence,
+            'pending': self.pending,
+            'snapshot_interval': self.snapshot_interval,
+        }
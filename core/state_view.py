@@ -0,0 +1,86 @@
+"""
+タイムトラベル仕入れゲーム - ゲーム状態ビュー
+GameEngineの状態をコピーせずに参照し、派生値は初回アクセス時にのみ計算する
+"""
+
+from collections.abc import Mapping
+from typing import Dict, Any, Iterator
+
+
+class GameStateView(Mapping):
+    """
+    get_state() と同じキーを持つ読み取り専用ビュー
+
+    在庫・出品は元データを共有する CollectionView として返し、
+    turn_info / asset_info などの派生値は初回アクセス時に計算してキャッシュする。
+    ビュー取得後に状態を変更した場合は新しいビューを取得すること。
+    """
+
+    KEYS = ('money', 'inventory', 'auction_items', 'game_over',
+            'turn_info', 'asset_info', 'statistics')
+
+    __slots__ = ('_engine', '_cache')
+
+    def __init__(self, engine):
+        """
+        Args:
+            engine: 参照元のGameEngine
+        """
+        self._engine = engine
+        self._cache: Dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._cache:
+            return self._cache[key]
+        if key not in self.KEYS:
+            raise KeyError(key)
+        value = getattr(self, f'_compute_{key}')()
+        self._cache[key] = value
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.KEYS)
+
+    def __len__(self) -> int:
+        return len(self.KEYS)
+
+    def __getattr__(self, key: str) -> Any:
+        # テンプレートからの属性アクセス（game_state.money 等）用
+        if key in GameStateView.KEYS:
+            return self[key]
+        raise AttributeError(key)
+
+    def _compute_money(self) -> float:
+        return self._engine.state['money']
+
+    def _compute_inventory(self):
+        return self._engine.state['inventory'].view()
+
+    def _compute_auction_items(self):
+        return self._engine.state['auction_items'].view()
+
+    def _compute_game_over(self) -> bool:
+        return self['asset_info']['is_game_over']
+
+    def _compute_turn_info(self) -> Dict[str, Any]:
+        return self._engine.turn_system.get_turn_info()
+
+    def _compute_asset_info(self) -> Dict[str, Any]:
+        return self._engine.get_asset_info()
+
+    def _compute_statistics(self) -> Dict[str, Any]:
+        state = self._engine.state
+        return {
+            'turn_count': state['turn_count'],
+            'total_profit': state['total_profit'],
+            'total_spent': state['total_spent'],
+            'inventory_count': len(state['inventory']),
+            'auction_count': len(state['auction_items'])
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """get_state() 互換の辞書に変換（在庫・出品はlistにコピー、JSON出力用）"""
+        result = {key: self[key] for key in self.KEYS}
+        result['inventory'] = result['inventory'].to_list()
+        result['auction_items'] = result['auction_items'].to_list()
+        return result
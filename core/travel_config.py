@@ -15,4 +15,16 @@ DISTANCE_MAX = 1000000  # 100万km
 # デフォルト値
 DEFAULT_YEARS = 10
 DEFAULT_DISTANCE = 100
-# DEFAULT_UFO_SIZE = 1.0  # フェーズ2で廃止
\ No newline at end of file
+# DEFAULT_UFO_SIZE = 1.0  # フェーズ2で廃止
+# レア度倍率 = 1.0 + 年数ボーナス + 距離ボーナス + 組み合わせボーナス（各ボーナスは率×値、上限あり）
+RARITY_BASE_MULTIPLIER = 1.0
+RARITY_YEAR_BONUS_RATE = 0.02        # 1年あたり
+RARITY_YEAR_BONUS_CAP = 2.0          # 100年で上限
+RARITY_DISTANCE_BONUS_RATE = 0.001   # 1kmあたり
+RARITY_DISTANCE_BONUS_CAP = 1.5      # 1500kmで上限
+RARITY_COMBO_BONUS_RATE = 0.00001    # 年数×距離 1あたり
+RARITY_COMBO_BONUS_CAP = 1.0         # 年数×距離 10万で上限
+
+# 仕入れ総価値のばらつき（投資額 × 価格倍率 × 一様乱数[MIN, MAX]）
+VALUE_VARIANCE_MIN = 0.9
+VALUE_VARIANCE_MAX = 1.1
@@ -0,0 +1,132 @@
+"""
+タイムトラベル仕入れゲーム - タイムトラベル価値モデル
+仕入れ総価値の分布（平均・分散・分位点）と購入後のリスクを、乱数を使わず解析的に求める
+
+仕入れ総価値 V = 投資額 × 価格倍率 × U、U ~ 一様分布[VALUE_VARIANCE_MIN, VALUE_VARIANCE_MAX]
+（ItemSystem.get_travel_result と同じ。失敗率 p なら確率 p で V = 0 の混合分布）
+商品への分配は総額を保つため、総価値の分布は個数に依存しない。
+"""
+
+from typing import Dict, Any, Iterable, Optional
+
+from .item_system import ItemSystem
+from .asset_manager import AssetManager
+from .travel_config import VALUE_VARIANCE_MIN, VALUE_VARIANCE_MAX
+from .phase2_config import ENABLE_GAME_OVER
+
+# 返す分位点の既定値
+DEFAULT_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+class TravelValueModel:
+    """1回のタイムトラベルで得る総価値の分布"""
+
+    __slots__ = ('cost', 'price_multiplier', 'failure_rate', 'low', 'high')
+
+    def __init__(self, cost: float, price_multiplier: float, failure_rate: float = 0.0):
+        """
+        Args:
+            cost: 投資額
+            price_multiplier: 適用する子ターン価格倍率
+            failure_rate: 失敗率（現在 ItemSystem.simulate_travel_failure は停止中のため既定0）
+        """
+        if not 0.0 <= failure_rate <= 1.0:
+            raise ValueError(f"失敗率は0〜1で指定してください: {failure_rate}")
+        self.cost = cost
+        self.price_multiplier = price_multiplier
+        self.failure_rate = failure_rate
+        scale = cost * price_multiplier
+        self.low = scale * VALUE_VARIANCE_MIN
+        self.high = scale * VALUE_VARIANCE_MAX
+
+    @property
+    def mean(self) -> float:
+        """期待値"""
+        return (1.0 - self.failure_rate) * (self.low + self.high) / 2
+
+    @property
+    def variance(self) -> float:
+        """分散（成功時の一様分布と失敗時の0の混合）"""
+        success = 1.0 - self.failure_rate
+        second_moment = success * (self.low ** 2 + self.low * self.high + self.high ** 2) / 3
+        return max(second_moment - self.mean ** 2, 0.0)
+
+    @property
+    def std(self) -> float:
+        """標準偏差"""
+        return self.variance ** 0.5
+
+    def cdf(self, value: float) -> float:
+        """総価値が value 未満になる確率"""
+        if value <= 0:
+            return 0.0
+        success = 1.0 - self.failure_rate
+        if value <= self.low:
+            uniform = 0.0
+        elif value >= self.high:
+            uniform = 1.0
+        else:
+            uniform = (value - self.low) / (self.high - self.low)
+        return self.failure_rate + success * uniform
+
+    def quantile(self, q: float) -> float:
+        """q分位点"""
+        if not 0.0 <= q <= 1.0:
+            raise ValueError(f"分位は0〜1で指定してください: {q}")
+        if q <= self.failure_rate:
+            return 0.0
+        uniform = (q - self.failure_rate) / (1.0 - self.failure_rate)
+        return self.low + (self.high - self.low) * uniform
+
+    def to_dict(self, quantiles: Iterable[float] = DEFAULT_QUANTILES) -> Dict[str, Any]:
+        """JSON用の要約"""
+        return {
+            'mean': round(self.mean, 2),
+            'std': round(self.std, 2),
+            'min': round(0.0 if self.failure_rate > 0 else self.low, 2),
+            'max': round(self.high, 2),
+            'quantiles': {str(q): round(self.quantile(q), 2) for q in quantiles}
+        }
+
+
+def evaluate_travel(years: int, distance: int, money: float, assets: float,
+                    price_multiplier: float, failure_rate: float = 0.0,
+                    quantiles: Iterable[float] = DEFAULT_QUANTILES) -> Dict[str, Any]:
+    """
+    タイムトラベル1回の価値分布と購入後のリスクを評価（サンプリングなし）
+
+    購入後の資産 = 資産 - 投資額 - 固定費 + 総価値（在庫価値は台帳どおり base_value の合計）。
+    ゲームオーバーは購入後の資産が購入後の固定費（資産×固定費率）を下回る場合。
+
+    Args:
+        money: 現在の所持金
+        assets: 現在の総資産
+        price_multiplier: 購入時に適用される子ターン価格倍率
+
+    Returns:
+        投資額・固定費・価値分布・期待利益・損失確率・ゲームオーバー確率
+    """
+    cost = ItemSystem.calculate_travel_cost(years, distance)
+    fixed_cost = AssetManager.calculate_fixed_cost(assets)
+    total_cost = cost + fixed_cost
+    affordable, _ = AssetManager.can_afford_purchase(assets, fixed_cost, cost)
+    model = TravelValueModel(cost, price_multiplier, failure_rate)
+
+    # 固定費率 r < 1 なら「資産 < 資産 × r」は「資産 < 0」と同値
+    # → 総価値が (投資額 + 固定費 - 現在の資産) 未満でゲームオーバー
+    game_over_probability: Optional[float] = None
+    if affordable and money >= total_cost:
+        game_over_probability = model.cdf(total_cost - assets) if ENABLE_GAME_OVER else 0.0
+
+    return {
+        'parameters': {'years': years, 'distance': distance},
+        'investment_cost': cost,
+        'fixed_cost': fixed_cost,
+        'total_cost': total_cost,
+        'affordable': affordable and money >= total_cost,
+        'price_multiplier': price_multiplier,
+        'value': model.to_dict(quantiles),
+        'expected_profit': round(model.mean - total_cost, 2),
+        'loss_probability': round(model.cdf(total_cost), 4),
+        'game_over_probability': game_over_probability
+    }
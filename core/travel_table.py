@@ -0,0 +1,136 @@
+"""
+タイムトラベル仕入れゲーム - タイムトラベル早見表
+年数・距離ごとのレア度倍率・コスト・期待価値を表引きで返す（プレビュー・スライダーUI用）
+
+レア度倍率の3つのボーナスはそれぞれ上限で飽和するため、
+(min(年数, 100), min(距離, 1500), min(年数×距離, 10万)) が同じなら倍率も同じになる。
+この圧縮キーでメモ化するので、100万年×100万kmの範囲でもキャッシュは飽和前の領域分で済む。
+"""
+
+import math
+from functools import lru_cache
+from typing import Dict, Any, List, Tuple
+
+from .item_system import ItemSystem
+from .travel_config import (
+    RARITY_BASE_MULTIPLIER, RARITY_YEAR_BONUS_RATE, RARITY_YEAR_BONUS_CAP,
+    RARITY_DISTANCE_BONUS_RATE, RARITY_DISTANCE_BONUS_CAP,
+    RARITY_COMBO_BONUS_RATE, RARITY_COMBO_BONUS_CAP,
+    VALUE_VARIANCE_MIN, VALUE_VARIANCE_MAX
+)
+
+
+def _saturation_point(rate: float, cap: float) -> int:
+    """ボーナスが上限に達する最小の整数値（浮動小数点の誤差を吸収）"""
+    point = math.ceil(cap / rate - 1e-9)
+    assert point * rate >= cap
+    return point
+
+
+# 各ボーナスが飽和する値（これ以上は倍率が変わらない）
+YEARS_SATURATION = _saturation_point(RARITY_YEAR_BONUS_RATE, RARITY_YEAR_BONUS_CAP)              # 100年
+DISTANCE_SATURATION = _saturation_point(RARITY_DISTANCE_BONUS_RATE, RARITY_DISTANCE_BONUS_CAP)  # 1500km
+COST_SATURATION = _saturation_point(RARITY_COMBO_BONUS_RATE, RARITY_COMBO_BONUS_CAP)            # 10万
+
+# 総価値のばらつきの平均（一様分布）
+VALUE_VARIANCE_MEAN = (VALUE_VARIANCE_MIN + VALUE_VARIANCE_MAX) / 2
+
+
+class TravelTable:
+    """レア度倍率のメモ化表と、プレビュー用の早見表"""
+
+    def __init__(self, cache_size: int = 65536):
+        """
+        Args:
+            cache_size: レア度倍率のメモ化件数（圧縮キー単位）
+        """
+        self._rarity = lru_cache(maxsize=cache_size)(self._compute_rarity)
+
+    @staticmethod
+    def compress(years: int, distance: int) -> Tuple[int, int, int]:
+        """年数・距離を飽和点で丸めた圧縮キー（同じキーなら倍率も同じ）"""
+        return (min(years, YEARS_SATURATION),
+                min(distance, DISTANCE_SATURATION),
+                min(years * distance, COST_SATURATION))
+
+    @staticmethod
+    def _compute_rarity(years: int, distance: int, cost: int) -> float:
+        """圧縮キーからレア度倍率を計算（ItemSystem.calculate_rarity_multiplier と同じ演算順）"""
+        year_bonus = min(years * RARITY_YEAR_BONUS_RATE, RARITY_YEAR_BONUS_CAP)
+        distance_bonus = min(distance * RARITY_DISTANCE_BONUS_RATE, RARITY_DISTANCE_BONUS_CAP)
+        combo_bonus = min(cost * RARITY_COMBO_BONUS_RATE, RARITY_COMBO_BONUS_CAP)
+        return round(RARITY_BASE_MULTIPLIER + year_bonus + distance_bonus + combo_bonus, 2)
+
+    def rarity_multiplier(self, years: int, distance: int) -> float:
+        """レア度倍率（ItemSystem.calculate_rarity_multiplier と同じ値、メモ化済み）"""
+        return self._rarity(*self.compress(years, distance))
+
+    @staticmethod
+    def expected_value(years: int, distance: int, price_multiplier: float = 1.0) -> float:
+        """仕入れ総価値の期待値（投資額 × 価格倍率 × ばらつきの平均）"""
+        return ItemSystem.calculate_travel_cost(years, distance) * price_multiplier * VALUE_VARIANCE_MEAN
+
+    def lookup(self, years: int, distance: int, price_multiplier: float = 1.0) -> Dict[str, Any]:
+        """
+        プレビュー用の早見表の1行を取得
+
+        Returns:
+            コスト・レア度倍率・レア度名・総価値の範囲（最小/期待値/最大）
+        """
+        cost = ItemSystem.calculate_travel_cost(years, distance)
+        rarity = self.rarity_multiplier(years, distance)
+        scaled = cost * price_multiplier
+        return {
+            'cost': cost,
+            'rarity_multiplier': rarity,
+            'rarity_name': ItemSystem.get_rarity_name(rarity),
+            'value_range': {
+                'min': scaled * VALUE_VARIANCE_MIN,
+                'avg': scaled * VALUE_VARIANCE_MEAN,
+                'max': scaled * VALUE_VARIANCE_MAX
+            }
+        }
+
+    @staticmethod
+    def slider_table() -> Dict[str, Any]:
+        """
+        スライダーUI向けの圧縮した早見表（JSON用）
+
+        各ボーナスは飽和点までの折れ線（節点と値）で表す。節点間は線形補間すれば元の式と浮動小数点誤差の範囲で一致し、
+        飽和点より先は最後の値のまま。倍率 = base + 年数ボーナス + 距離ボーナス + 組み合わせボーナス（小数2桁に丸め）。
+        """
+        def knots(saturation: int, rate: float, cap: float) -> Dict[str, List[float]]:
+            return {'x': [0, saturation], 'y': [0.0, min(saturation * rate, cap)]}
+
+        return {
+            'base': RARITY_BASE_MULTIPLIER,
+            'years': knots(YEARS_SATURATION, RARITY_YEAR_BONUS_RATE, RARITY_YEAR_BONUS_CAP),
+            'distance': knots(DISTANCE_SATURATION, RARITY_DISTANCE_BONUS_RATE, RARITY_DISTANCE_BONUS_CAP),
+            'cost': knots(COST_SATURATION, RARITY_COMBO_BONUS_RATE, RARITY_COMBO_BONUS_CAP),
+            'value_variance': {'min': VALUE_VARIANCE_MIN, 'max': VALUE_VARIANCE_MAX}
+        }
+
+    @staticmethod
+    def interpolate(table: Dict[str, Any], years: float, distance: float) -> float:
+        """slider_table() の表からレア度倍率を補間（クライアント側と同じ手順）"""
+        def evaluate(curve: Dict[str, List[float]], value: float) -> float:
+            xs, ys = curve['x'], curve['y']
+            if value >= xs[-1]:
+                return ys[-1]
+            for i in range(1, len(xs)):
+                if value < xs[i]:
+                    ratio = (value - xs[i - 1]) / (xs[i] - xs[i - 1])
+                    return ys[i - 1] + (ys[i] - ys[i - 1]) * ratio
+            return ys[0]
+
+        total = (table['base'] + evaluate(table['years'], years) + evaluate(table['distance'], distance)
+                 + evaluate(table['cost'], years * distance))
+        return round(total, 2)
+
+    def cache_info(self):
+        """メモ化の利用状況（functools.lru_cache の CacheInfo）"""
+        return self._rarity.cache_info()
+
+
+# グローバルインスタンス
+travel_table = TravelTable()
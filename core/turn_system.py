@@ -3,10 +3,15 @@
 大ターン・子ターン管理と価格倍率曲線生成
 """
 
-import random
+import logging
 from typing import List, Dict, Any
 import time
-from .asset_manager import AssetManager
+from .game_logger import get_logger
+from .rng import resolve_rng
+from .game_config import GameConfig
+from .price_curve import CurvePool, generate_with_strategy, get_curve_strategy, cumulative
+
+logger = get_logger('turn')
 
 
 class TurnSystem:
@@ -20,84 +25,64 @@ class TurnSystem:
     FIRST_TURN_MIN = 1.0           # 最初の子ターンの最小倍率
     ENABLE_TREND_BIAS = True       # トレンド要素の有効化
     TREND_STRENGTH = 0.1           # トレンド要素の強度
+    CURVE_POOL_SIZE = 2            # 先読みしておく大ターン分の曲線数
+    CURVE_STRATEGY = GameConfig.PRICE_CURVE_STRATEGY  # 価格曲線の生成戦略（price_curve.CURVE_STRATEGIES のキー）
     
-    def __init__(self):
-        """ターンシステム初期化"""
+    def __init__(self, rng=None, curve_strategy: str = None):
+        """
+        ターンシステム初期化
+        
+        Args:
+            rng: 乱数生成器（random.Random / NumPy Generator、省略時はグローバルのrandom）
+            curve_strategy: 価格曲線の生成戦略（省略時は CURVE_STRATEGY）
+        """
+        self.rng = resolve_rng(rng)
+        self.curve_strategy = curve_strategy or self.CURVE_STRATEGY
+        get_curve_strategy(self.curve_strategy)  # 未登録なら ValueError
         self.major_turn = 1
         self.minor_turn = 1
         self.price_curve = []
         self.turn_multipliers = []  # 各ターンの倍率
-        self.target_multiplier = AssetManager.generate_target_multiplier()  # フェーズ2: 目標倍率
-        self.generate_new_price_curve()
+        self.target_multiplier = 1.0  # フェーズ2: 目標倍率（大ターン開始時に決定）
+        self._curve_pool = CurvePool(self.rng, self.CURVE_POOL_SIZE)
+        self._start_major_turn()
         
-        print(f"[TurnSystem] 初期化完了")
-        print(f"  設定: 子ターン数={self.MINOR_TURNS_PER_MAJOR}, 目標倍率={self.target_multiplier:.2f}倍")
-        print(f"  乱数範囲: {self.RANDOM_MIN}～{self.RANDOM_MAX}")
+        logger.debug("初期化完了: 子ターン数=%d, 目標倍率=%.2f倍, 乱数範囲=%s～%s",
+                     self.MINOR_TURNS_PER_MAJOR, self.target_multiplier, self.RANDOM_MIN, self.RANDOM_MAX)
         self._debug_current_state()
     
     def _clamp(self, value: float, min_val: float, max_val: float) -> float:
         """値を最小～最大に収めるユーティリティ"""
         return max(min_val, min(max_val, value))
     
-    def _generate_multipliers(self, target: float) -> List[float]:
-        """目標値targetを8ステップで達成するための乗数を作成"""
-        multipliers = []
-        current = 1.0
-        
-        for i in range(self.MINOR_TURNS_PER_MAJOR):
-            remaining = self.MINOR_TURNS_PER_MAJOR - i
-            # 残りステップで目標値に到達するのに必要な理想的な乗数
-            ideal = pow(target / current, 1.0 / remaining)
-            # 60%-140%の揺らぎを加える
-            factor = ideal * (0.6 + random.random() * 0.8)
-            # 0.5-2.0の範囲に制限
-            factor = self._clamp(factor, 0.5, 2.0)
-            
-            multipliers.append(factor)
-            current *= factor
-            
-        
-        return multipliers
-    
-    def _calc_cumulative(self, multipliers: List[float]) -> List[float]:
-        """乗数配列から各ステップ後の累積値を求める"""
-        cumulative = 1.0
-        result = []
-        for m in multipliers:
-            cumulative *= m
-            result.append(cumulative)
-        return result
-
+    def _curve_options(self) -> Dict[str, Any]:
+        """曲線生成戦略に渡す設定"""
+        return {'random_min': self.RANDOM_MIN, 'random_max': self.RANDOM_MAX, 'first_turn_min': self.FIRST_TURN_MIN}
+    
     def generate_new_price_curve(self) -> List[float]:
-        """新しい価格倍率曲線を生成（JSサンプル移植版）"""
-        print(f"\n[TurnSystem] 大ターン{self.major_turn} - 新しい価格曲線を生成中...")
-        print(f"  目標倍率: {self.target_multiplier:.2f}倍")
-        
-        # 複数回試行して最も良い結果を採用
-        best_multipliers = None
-        best_error = float('inf')
-        
-        for attempt in range(10):  # 10回試行
-            multipliers = self._generate_multipliers(self.target_multiplier)
-            cumulative_values = self._calc_cumulative(multipliers)
-            final_value = cumulative_values[-1]
-            error = abs(final_value - self.target_multiplier)
-            
-            if error < best_error:
-                best_error = error
-                best_multipliers = multipliers
-        
-        # 最良の結果を採用
-        self.turn_multipliers = best_multipliers
-        self.price_curve = self._calc_cumulative(best_multipliers)
-        
-        print(f"  各ターン乗数: {[f'{x:.2f}x' for x in self.turn_multipliers]}")
-        print(f"  累積値: {[f'{x:.2f}' for x in self.price_curve]}")
-        print(f"  最終到達値: {self.price_curve[-1]:.2f} (目標: {self.target_multiplier:.2f})")
-        print(f"  誤差: {best_error:.3f} (10回試行での最良値)")
-        
+        """現在の目標倍率で新しい価格倍率曲線を生成（curve_strategy の戦略で生成）"""
+        logger.debug("大ターン%d - 新しい価格曲線を生成中 (目標倍率: %.2f倍, 戦略: %s)",
+                     self.major_turn, self.target_multiplier, self.curve_strategy)
+        self._apply_curve(generate_with_strategy(self.curve_strategy, self.target_multiplier,
+                                                 self.MINOR_TURNS_PER_MAJOR, self.rng, self._curve_options()))
         return self.price_curve
     
+    def _apply_curve(self, multipliers: List[float]):
+        """乗数列を現在の大ターンの曲線として設定"""
+        self.turn_multipliers = multipliers
+        self.price_curve = cumulative(multipliers)
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("各ターン乗数: %s", [f'{x:.2f}x' for x in self.turn_multipliers])
+            logger.debug("累積値: %s", [f'{x:.2f}' for x in self.price_curve])
+            logger.debug("最終到達値: %.4f (目標: %.2f)", self.price_curve[-1], self.target_multiplier)
+    
+    def _start_major_turn(self):
+        """大ターン開始: 先読み済みの目標倍率と曲線を取り出す（リクエスト中は生成しない）"""
+        self.target_multiplier, multipliers = self._curve_pool.take(
+            self.MINOR_TURNS_PER_MAJOR, self.curve_strategy, self._curve_options())
+        self._apply_curve(multipliers)
+    
     def get_target_multiplier(self) -> float:
         """現在の目標倍率を取得（フェーズ2）"""
         return self.target_multiplier
@@ -105,36 +90,36 @@ class TurnSystem:
     def get_current_price_multiplier(self) -> float:
         """現在の子ターンの価格倍率を取得（各ターンの倍率）"""
         if not self.turn_multipliers or self.minor_turn < 1 or self.minor_turn > len(self.turn_multipliers):
-            print(f"[TurnSystem] WARNING: 無効な子ターン {self.minor_turn}")
+            logger.warning("無効な子ターン %d", self.minor_turn)
             return 1.0
         
         multiplier = self.turn_multipliers[self.minor_turn - 1]
-        print(f"[TurnSystem] 現在のターン倍率: {multiplier:.2f}x (大ターン{self.major_turn}, 子ターン{self.minor_turn})")
+        logger.debug("現在のターン倍率: %.2fx (大ターン%d, 子ターン%d)",
+                     multiplier, self.major_turn, self.minor_turn)
         return multiplier
     
     def get_current_cumulative_multiplier(self) -> float:
         """現在の子ターンの累積価格倍率を取得（商品生成用）"""
         if not self.price_curve or self.minor_turn < 1 or self.minor_turn > len(self.price_curve):
-            print(f"[TurnSystem] WARNING: 無効な子ターン {self.minor_turn}")
+            logger.warning("無効な子ターン %d", self.minor_turn)
             return 1.0
         
         multiplier = self.price_curve[self.minor_turn - 1]
-        print(f"[TurnSystem] 現在の累積倍率: {multiplier:.2f} (商品生成用)")
+        logger.debug("現在の累積倍率: %.2f (商品生成用)", multiplier)
         return multiplier
     
     def advance_minor_turn(self) -> bool:
         """子ターンを進める"""
-        print(f"\n[TurnSystem] 子ターン進行: {self.minor_turn} → {self.minor_turn + 1}")
+        logger.debug("子ターン進行: %d → %d", self.minor_turn, self.minor_turn + 1)
         
         if self.minor_turn >= self.MINOR_TURNS_PER_MAJOR:
             # 大ターン終了、新しい大ターン開始
             self.major_turn += 1
             self.minor_turn = 1
-            # フェーズ2: 新しい目標倍率を生成
-            self.target_multiplier = AssetManager.generate_target_multiplier()
-            self.generate_new_price_curve()
+            # フェーズ2: 新しい目標倍率と曲線（先読み済み）
+            self._start_major_turn()
             
-            print(f"[TurnSystem] 🎉 大ターン{self.major_turn - 1}完了！新しい大ターン{self.major_turn}開始")
+            logger.info("🎉 大ターン%d完了！新しい大ターン%d開始", self.major_turn - 1, self.major_turn)
             self._debug_current_state()
             return True
         else:
@@ -157,25 +142,47 @@ class TurnSystem:
             'is_major_turn_complete': self.minor_turn >= self.MINOR_TURNS_PER_MAJOR
         }
     
+    def export_state(self, include_curve: bool = True) -> Dict[str, Any]:
+        """
+        保存用のターン状態を取得（大ターン・子ターンと現在の曲線）
+
+        Args:
+            include_curve: 目標倍率・乗数列を含めるか（子ターンが進んだだけなら不要）
+        """
+        state = {'major_turn': self.major_turn, 'minor_turn': self.minor_turn}
+        if include_curve:
+            state['target_multiplier'] = float(self.target_multiplier)
+            state['turn_multipliers'] = [float(m) for m in self.turn_multipliers]
+        return state
+
+    def restore_state(self, state: Dict[str, Any]) -> None:
+        """export_state() の内容を復元（曲線を含まない場合は現在の曲線のまま）"""
+        self.major_turn = state['major_turn']
+        self.minor_turn = state['minor_turn']
+        if 'turn_multipliers' in state:
+            self.target_multiplier = state['target_multiplier']
+            self._apply_curve(list(state['turn_multipliers']))
+        self._debug_current_state()
+
     def reset_turns(self):
         """ターンシステムをリセット"""
-        print(f"\n[TurnSystem] ターンシステムリセット")
+        logger.debug("ターンシステムリセット")
         self.major_turn = 1
         self.minor_turn = 1
         self.price_curve = []
         self.turn_multipliers = []
-        # フェーズ2: 新しい目標倍率を生成
-        self.target_multiplier = AssetManager.generate_target_multiplier()
-        self.generate_new_price_curve()
+        # フェーズ2: 新しい目標倍率と曲線（先読み済み）
+        self._start_major_turn()
         self._debug_current_state()
     
     def _debug_current_state(self):
         """デバッグ用現在状態表示"""
-        print(f"[TurnSystem] 現在状態:")
-        print(f"  大ターン: {self.major_turn}")
-        print(f"  子ターン: {self.minor_turn}/{self.MINOR_TURNS_PER_MAJOR}")
-        print(f"  目標倍率: {self.target_multiplier:.2f}倍")
-        print(f"  現在倍率: {self.get_current_price_multiplier():.2f}x")
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        
+        logger.debug("現在状態: 大ターン=%d 子ターン=%d/%d 目標倍率=%.2f倍 現在倍率=%.2fx",
+                     self.major_turn, self.minor_turn, self.MINOR_TURNS_PER_MAJOR,
+                     self.target_multiplier, self.get_current_price_multiplier())
         
         # 価格曲線の進行状況表示
         progress_bar = ""
@@ -186,12 +193,12 @@ class TurnSystem:
                 progress_bar += "●"
             else:
                 progress_bar += "○"
-        print(f"  進行状況: {progress_bar}")
+        logger.debug("進行状況: %s", progress_bar)
         
         # 今後の倍率予告（デバッグ用）
         if len(self.price_curve) >= self.minor_turn:
             upcoming = self.price_curve[self.minor_turn - 1:min(self.minor_turn + 2, len(self.price_curve))]
-            print(f"  今後の倍率: {[f'{x:.2f}' for x in upcoming]}")
+            logger.debug("今後の倍率: %s", [f'{x:.2f}' for x in upcoming])
 
 
 # グローバルインスタンス
@@ -203,29 +210,35 @@ def configure_turn_system(
     minor_turns_per_major: int = None,
     target_growth: float = None,
     random_range: tuple = None,
-    trend_settings: dict = None
+    trend_settings: dict = None,
+    curve_strategy: str = None
 ):
     """ターンシステムの設定を変更"""
     global turn_system
     
     if minor_turns_per_major is not None:
         turn_system.MINOR_TURNS_PER_MAJOR = minor_turns_per_major
-        print(f"[Config] 子ターン数を {minor_turns_per_major} に変更")
+        logger.info("子ターン数を %d に変更", minor_turns_per_major)
     
     if target_growth is not None:
         turn_system.TARGET_GROWTH_MULTIPLIER = target_growth
-        print(f"[Config] 目標成長倍率を {target_growth} に変更")
+        logger.info("目標成長倍率を %s に変更", target_growth)
     
     if random_range is not None:
         turn_system.RANDOM_MIN, turn_system.RANDOM_MAX = random_range
-        print(f"[Config] 乱数範囲を {random_range[0]}～{random_range[1]} に変更")
+        logger.info("乱数範囲を %s～%s に変更", random_range[0], random_range[1])
     
     if trend_settings is not None:
         if 'enable' in trend_settings:
             turn_system.ENABLE_TREND_BIAS = trend_settings['enable']
         if 'strength' in trend_settings:
             turn_system.TREND_STRENGTH = trend_settings['strength']
-        print(f"[Config] トレンド設定を変更: {trend_settings}")
+        logger.info("トレンド設定を変更: %s", trend_settings)
+    
+    if curve_strategy is not None:
+        get_curve_strategy(curve_strategy)
+        turn_system.curve_strategy = curve_strategy
+        logger.info("価格曲線戦略を %s に変更", curve_strategy)
     
     # 設定変更後は新しい曲線を生成
     turn_system.generate_new_price_curve()
\ No newline at end of file
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+バランスシミュレーション実行ツール
+独立したゲームを複数プロセスで多数プレイし、結果をCSVに保存して集計を表示する
+
+例:
+    python tools/analysis/balance_simulation.py --games 2000 --workers 8 --seed 1
+    python tools/analysis/balance_simulation.py --strategy fixed --invest-amount 200
+"""
+
+import sys
+import os
+import json
+import time
+import argparse
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from core.simulation import (
+    STRATEGIES, DEFAULT_MAX_TURNS, run_simulations, summarize_results, write_results_csv
+)
+
+
+def main():
+    """メイン関数"""
+    parser = argparse.ArgumentParser(description='Time Travel Trading Game balance simulation')
+    parser.add_argument('--games', type=int, default=1000, help='Number of games to play')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--seed', type=int, default=0, help='Base random seed')
+    parser.add_argument('--strategy', choices=sorted(STRATEGIES), default='auto_invest')
+    parser.add_argument('--max-turns', type=int, default=DEFAULT_MAX_TURNS, help='Minor turns per game')
+    parser.add_argument('--invest-ratio', type=float, default=0.5, help='auto_invest: ratio of available cash')
+    parser.add_argument('--invest-amount', type=float, default=100, help='fixed: investment per turn')
+    parser.add_argument('--sell-markup', type=float, default=1.0, help='Auction start price / base value')
+    parser.add_argument('--no-sell', action='store_true', help='Never sell inventory')
+    parser.add_argument('--output', default='simulation_results.csv', help='Per-game result CSV')
+    args = parser.parse_args()
+
+    started = time.time()
+    results = run_simulations(
+        args.games, strategy=args.strategy, workers=args.workers, seed=args.seed,
+        max_turns=args.max_turns, sell=not args.no_sell, sell_markup=args.sell_markup,
+        invest_ratio=args.invest_ratio, invest_amount=args.invest_amount
+    )
+    elapsed = time.time() - started
+
+    write_results_csv(results, args.output)
+    print(json.dumps(summarize_results(results), ensure_ascii=False, indent=2))
+    print(f"\n{len(results)}ゲーム / {elapsed:.1f}秒 → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+セーブデータ形式の変換ツール
+JSON形式（従来形式・スナップショット + ジャーナル）とバイナリ形式（列指向）を相互に変換し、サイズを表示する
+
+例:
+    python tools/analysis/convert_save.py archive/save1.json archive/save1.ttsv
+    python tools/analysis/convert_save.py archive/save1.ttsv restored.json --to json
+"""
+
+import sys
+import os
+import json
+import argparse
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from core.game_engine import GameEngine
+from core.turn_system import TurnSystem
+from core.item_record import json_default
+
+
+def main():
+    """メイン関数"""
+    parser = argparse.ArgumentParser(description='Time Travel Trading Game save converter')
+    parser.add_argument('source', help='Save file to read (format is detected)')
+    parser.add_argument('destination', help='File to write')
+    parser.add_argument('--to', choices=['binary', 'json'], default='binary', help='Output format')
+    args = parser.parse_args()
+
+    engine = GameEngine(TurnSystem())
+    if not engine.load_state(args.source):
+        print(f"読み込みに失敗しました: {args.source}")
+        return 1
+
+    if args.to == 'binary':
+        engine.save_state_binary(args.destination)
+    else:
+        # 単体で読める整形済みの従来形式（ジャーナルは付けない）
+        with open(args.destination, 'w', encoding='utf-8') as f:
+            json.dump(engine._snapshot_state(), f, ensure_ascii=False, indent=2, default=json_default)
+
+    source_size = os.path.getsize(args.source)
+    destination_size = os.path.getsize(args.destination)
+    print(f"商品数: {len(engine.state['inventory'])}個")
+    print(f"{args.source}: {source_size:,} bytes → {args.destination}: {destination_size:,} bytes "
+          f"({destination_size / max(source_size, 1):.1%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
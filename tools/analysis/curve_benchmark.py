@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+価格曲線戦略のベンチマーク実行ツール
+登録済みの曲線生成戦略ごとに多数の曲線を生成し、生成時間・目標誤差・乗数の分布を表示する
+
+例:
+    python tools/analysis/curve_benchmark.py --curves 5000 --seed 1
+    python tools/analysis/curve_benchmark.py --strategy batch --strategy product_scaled --turns 20 --json
+"""
+
+import sys
+import os
+import json
+import argparse
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from core.price_curve import CURVE_STRATEGIES
+from core.curve_benchmark import benchmark_curve_strategies, format_report
+
+
+def main():
+    """メイン関数"""
+    parser = argparse.ArgumentParser(description='Time Travel Trading Game price-curve strategy benchmark')
+    parser.add_argument('--strategy', action='append', choices=sorted(CURVE_STRATEGIES),
+                        help='Strategy to benchmark (repeatable, default: all)')
+    parser.add_argument('--curves', type=int, default=2000, help='Curves per strategy')
+    parser.add_argument('--turns', type=int, default=8, help='Minor turns per curve')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    parser.add_argument('--json', action='store_true', help='Output the full report as JSON')
+    args = parser.parse_args()
+
+    report = benchmark_curve_strategies(args.strategy, curves=args.curves, turns=args.turns, seed=args.seed)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print(format_report(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+AIバイヤーのテスト
+一括計算した興味度・入札結果が1人ずつ計算した場合と一致するかの検証
+"""
+
+import sys
+import os
+import random
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+import core.ai_buyers as ai_buyers
+from core.ai_buyers import AIBuyerManager
+from core.item_system import ItemSystem
+
+
+def _make_items(count):
+    """テスト用アイテムを生成（ジャンル・状態を網羅）"""
+    random.seed(7)
+    items = []
+    for i in range(count):
+        item = ItemSystem.generate_item_with_predetermined_value(50.0 + i * 41.3, 10 + i, 10 + i)
+        item['genre'] = ItemSystem.GENRES[i % len(ItemSystem.GENRES)]
+        item['condition'] = list(ItemSystem.CONDITIONS)[i % len(ItemSystem.CONDITIONS)]
+        items.append(item)
+    return items
+
+
+def _scalar_bidding_round(manager, item, current_price, threshold):
+    """従来の1人ずつ計算する入札ラウンド"""
+    interested = [b for b in manager.buyers if b.should_bid(item, current_price, threshold)]
+    best_buyer, highest_bid = None, current_price
+    for buyer in interested:
+        bid_amount = buyer.calculate_bid_amount(item, current_price)
+        if bid_amount > highest_bid:
+            highest_bid, best_buyer = bid_amount, buyer
+    return best_buyer is not None, highest_bid, best_buyer
+
+
+def _check_interests(manager):
+    for item in _make_items(24):
+        for price in (0, item['base_value'] * 0.5, item['base_value'], item['base_value'] * 3):
+            expected = [buyer.calculate_interest(item, price) for buyer in manager.buyers]
+            assert manager.calculate_interests(item, price) == expected, (item['genre'], price)
+
+
+def test_interests_match_scalar():
+    """一括計算の興味度が AIBuyer.calculate_interest と完全一致するか"""
+    print("=== 興味度一括計算テスト ===")
+    random.seed(1)
+    manager = AIBuyerManager()
+    _check_interests(manager)
+
+    # NumPy未導入時の純Python計算も一致するか
+    original_np = ai_buyers.np
+    ai_buyers.np = None
+    try:
+        manager.refresh_buyer_matrix()
+        _check_interests(manager)
+    finally:
+        ai_buyers.np = original_np
+        manager.refresh_buyer_matrix()
+    print("✅ NumPy・純Pythonとも一致")
+
+
+def test_bidding_round_matches_scalar():
+    """同じシードで入札ラウンドの結果と乱数消費が一致するか"""
+    print("=== 入札ラウンド一致テスト ===")
+    random.seed(2)
+    manager = AIBuyerManager()
+    for item in _make_items(24):
+        price = item['base_value'] * 0.6
+        for _ in range(5):
+            random.seed(item['id'] % 1000)
+            expected = _scalar_bidding_round(manager, item, price, 0.3)
+            expected_next = random.random()
+
+            random.seed(item['id'] % 1000)
+            actual = manager.simulate_bidding_round(item, price, 0.3)
+            assert actual == expected
+            assert random.random() == expected_next  # 乱数の消費回数も同じ
+            price = actual[1]
+    print("✅ 入札結果・乱数消費が一致")
+
+
+if __name__ == "__main__":
+    print("AIバイヤーテスト開始\n")
+
+    test_interests_match_scalar()
+    test_bidding_round_matches_scalar()
+
+    print("\nテスト完了")
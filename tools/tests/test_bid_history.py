@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+入札履歴リングバッファのテスト
+容量での上書き・古い順の取得・カウンタによる統計・オークション結果の入札経過の上限の検証
+"""
+
+import sys
+import os
+import random
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from core.bid_history import BidHistory, auction_bid_log
+from core.ai_buyers import AIBuyer, AIBuyerManager
+from core.auction_system import AuctionSystem
+from core.item_system import ItemSystem
+
+
+def test_ring_buffer_keeps_latest():
+    """容量を超えると古い記録から上書きし、古い順に取り出せるか"""
+    print("=== リングバッファテスト ===")
+    history = BidHistory(capacity=4)
+    for i in range(10):
+        history.record(i, i * 10.0, i % 3 == 0, i / 10)
+
+    assert len(history) == 4
+    assert [record['item_id'] for record in history] == [6, 7, 8, 9]
+    assert history.column('bid_amount') == [60.0, 70.0, 80.0, 90.0]
+    assert history.to_list()[0] == {'item_id': 6, 'bid_amount': 60.0, 'won': True, 'timestamp': 0.6}
+    # カウンタは上書きされた分も含む
+    assert history.total_count == 10 and history.win_count == 4
+
+    history.clear()
+    assert len(history) == 0 and history.total_count == 0 and history.win_count == 0
+    history.record(1, 5.0, True, 0.0)
+    assert history.to_list() == [{'item_id': 1, 'bid_amount': 5.0, 'won': True, 'timestamp': 0.0}]
+
+    try:
+        BidHistory(capacity=-1)
+        assert False, "容量0以下はエラー"
+    except ValueError:
+        pass
+    print("✅ 直近の記録のみ保持")
+
+
+def test_profile_and_statistics_use_counters():
+    """プロフィール・統計が容量を超えた分も含めて集計されるか"""
+    print("=== カウンタ集計テスト ===")
+    manager = AIBuyerManager(rng=random.Random(1))
+    buyer = manager.buyers[0]
+    buyer.bid_history = BidHistory(capacity=3)
+    for i in range(50):
+        buyer.record_bid(i, 100.0 + i, i % 2 == 0)
+
+    profile = buyer.get_profile()
+    assert profile['bid_count'] == 50 and profile['wins'] == 25
+    assert len(buyer.bid_history) == 3
+
+    stats = manager.get_statistics()
+    assert stats['total_bids'] == 50 and stats['total_wins'] == 25 and stats['win_rate'] == 50.0
+
+    manager.reset_all_histories()
+    assert manager.get_statistics()['total_bids'] == 0
+    print("✅ カウンタで集計")
+
+
+def test_auction_bid_history_is_bounded():
+    """オークション結果の入札経過が上限件数（直近分）に収まるか"""
+    print("=== 入札経過上限テスト ===")
+    log = auction_bid_log(capacity=2)
+    for round_num in range(1, 6):
+        log.append(round_num, 7, 100.0 + round_num, 99.0 + round_num)
+    assert [record['round'] for record in log.to_list()] == [4, 5]
+
+    random.seed(3)
+    auction = AuctionSystem(AIBuyerManager(rng=random.Random(3)))
+    auction.auction_duration_rounds = 60
+    item = ItemSystem.generate_item_with_predetermined_value(500.0, 10, 10)
+    item['genre'] = ItemSystem.GENRES[0]
+    for simulate in (lambda items: auction.simulate_auction(items, verbose=False), auction.simulate_auction_batch):
+        result = simulate([auction.create_auction_item(item, 10.0)])[0]
+        assert result['bid_count'] > 20
+        assert len(result['bid_history']) == 20  # GameConfig.AUCTION_BID_HISTORY_LIMIT
+        assert result['bid_history'][-1]['bid_amount'] == result['final_price']
+        assert result['bid_history'][-1]['bidder_id'] == result['winner_id']
+    print("✅ 直近20件のみ返す")
+
+
+if __name__ == "__main__":
+    print("入札履歴テスト開始\n")
+
+    test_ring_buffer_keeps_latest()
+    test_profile_and_statistics_use_counters()
+    test_auction_bid_history_is_bounded()
+
+    print("\nテスト完了")
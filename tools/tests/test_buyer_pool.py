@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+AIバイヤープールのテスト
+オークション間でのバイヤー持ち越し・一部入れ替え・ジャンルカバー・パラメータ行列の整合性の検証
+"""
+
+import sys
+import os
+import random
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+import core.ai_buyers as ai_buyers
+from core.ai_buyers import AIBuyerManager
+from core.auction_system import AuctionSystem
+from core.game_config import GameConfig
+from core.item_system import ItemSystem
+
+
+def _matrix_matches_buyers(manager):
+    """パラメータ行列が buyers を作り直した場合と一致するか"""
+    rows = [
+        (list(manager._genre_mask[i]), manager._condition_pref[i], manager._rarity_pref[i],
+         manager._price_sensitivity[i])
+        for i in range(len(manager.buyers))
+    ]
+    manager.refresh_buyer_matrix()
+    expected = [
+        (list(manager._genre_mask[i]), manager._condition_pref[i], manager._rarity_pref[i],
+         manager._price_sensitivity[i])
+        for i in range(len(manager.buyers))
+    ]
+    return [tuple(map(str, row)) for row in rows] == [tuple(map(str, row)) for row in expected]
+
+
+def test_refresh_replaces_fraction():
+    """指定した割合だけ入れ替わり、残りは同じオブジェクト（入札履歴付き）のままか"""
+    print("=== 一部入れ替えテスト ===")
+    manager = AIBuyerManager(rng=random.Random(1))
+    assert len(manager.buyers) == GameConfig.AI_BUYER_COUNT
+    for buyer in manager.buyers:
+        buyer.record_bid(1, 100.0, True)
+    before = list(manager.buyers)
+
+    slots = manager.refresh_buyers(0.2)
+    assert len(slots) == round(GameConfig.AI_BUYER_COUNT * 0.2)
+    for slot, (old, new) in enumerate(zip(before, manager.buyers)):
+        if slot in slots:
+            assert new is not old and len(new.bid_history) == 0
+        else:
+            assert new is old and len(new.bid_history) == 1
+
+    # IDは通し番号で重複しない
+    ids = [buyer.id for buyer in manager.buyers]
+    assert len(set(ids)) == len(ids) and max(ids) == GameConfig.AI_BUYER_COUNT + len(slots) - 1
+
+    assert manager.refresh_buyers(0.0) == []
+    assert len(manager.refresh_buyers(1.0)) == GameConfig.AI_BUYER_COUNT
+    print("✅ 指定割合のみ入れ替え")
+
+
+def test_genre_coverage_and_matrix():
+    """入れ替えを繰り返しても全ジャンルがカバーされ、行列が buyers と一致するか"""
+    print("=== ジャンルカバー・行列整合テスト ===")
+    for numpy_module in (ai_buyers.np, None):
+        original = ai_buyers.np
+        ai_buyers.np = numpy_module
+        try:
+            manager = AIBuyerManager(rng=random.Random(2))
+            for _ in range(30):
+                manager.refresh_buyers(0.4)
+                for slot, genre in enumerate(ItemSystem.GENRES):
+                    assert manager.buyers[slot].interested_genres[0] == genre
+                assert _matrix_matches_buyers(manager)
+        finally:
+            ai_buyers.np = original
+    print("✅ ジャンルカバーと行列を維持")
+
+
+def test_statistics_accumulate_across_auctions():
+    """オークションをまたいで残ったバイヤーの入札統計が積み上がるか"""
+    print("=== 統計持ち越しテスト ===")
+    random.seed(4)
+    auction = AuctionSystem(AIBuyerManager(rng=random.Random(4)))
+    items = []
+    for i in range(6):
+        item = ItemSystem.generate_item_with_predetermined_value(200.0 + i * 30, 10, 10)
+        items.append(auction.create_auction_item(item, item['base_value'] * 0.5))
+
+    total_wins = 0
+    for _ in range(5):
+        results = auction.simulate_auction(items, verbose=False)
+        total_wins += sum(result['sold'] for result in results)
+    stats = auction.buyer_manager.get_statistics()
+    assert stats['total_buyers'] == GameConfig.AI_BUYER_COUNT
+    # 入れ替えで抜けたバイヤーの分だけ少なくなりうるが、直近のオークション分は必ず残る
+    assert sum(result['sold'] for result in results) <= stats['total_wins'] <= total_wins
+    print(f"✅ 落札数 {stats['total_wins']} / 累計 {total_wins}")
+
+
+def test_refresh_is_reproducible():
+    """同じシードなら同じ顔ぶれに入れ替わるか"""
+    print("=== 入れ替え再現性テスト ===")
+
+    def lineup(seed):
+        manager = AIBuyerManager(rng=random.Random(seed))
+        for _ in range(5):
+            manager.refresh_buyers()
+        return [(buyer.id, tuple(buyer.interested_genres), buyer.price_sensitivity) for buyer in manager.buyers]
+
+    assert lineup(6) == lineup(6)
+    assert lineup(6) != lineup(7)
+    print("✅ 同じ顔ぶれ")
+
+
+if __name__ == "__main__":
+    print("AIバイヤープールテスト開始\n")
+
+    test_refresh_replaces_fraction()
+    test_genre_coverage_and_matrix()
+    test_statistics_accumulate_across_auctions()
+    test_refresh_is_reproducible()
+
+    print("\nテスト完了")
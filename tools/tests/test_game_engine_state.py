@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+GameEngine 状態管理のテスト
+在庫価値台帳・ID索引付きコレクション・状態ビューの検証
+"""
+
+import sys
+import os
+import json
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from core.game_engine import GameEngine
+from core.turn_system import TurnSystem
+from core.asset_manager import AssetManager
+from core.item_system import ItemSystem
+from core.auction_system import AuctionSystem
+from core.item_collection import IndexedCollection
+from core.id_allocator import ItemIdAllocator, SHARD_SHIFT
+
+
+def _make_items(count, years=10, distance=10):
+    """テスト用アイテムを生成（IDは連番で上書き）"""
+    items = []
+    for i in range(count):
+        item = ItemSystem.generate_item_with_predetermined_value(100.0 + i * 3.17, years, distance)
+        item['id'] = i + 1
+        items.append(item)
+    return items
+
+
+def _assert_ledger_consistent(engine):
+    """台帳の資産情報が在庫全走査の結果と一致するか"""
+    state = engine.state
+    expected = AssetManager.get_asset_info(state['money'], list(state['inventory']))
+    actual = engine.get_asset_info()
+    assert actual == expected, (actual, expected)
+    assert engine.get_assets() == AssetManager.calculate_assets(state['money'], list(state['inventory']))
+
+
+def test_asset_ledger_tracks_mutations():
+    """在庫・オークション操作後も台帳が全走査と一致するか"""
+    print("=== 在庫価値台帳テスト ===")
+    engine = GameEngine(TurnSystem())
+    auction = AuctionSystem()
+    _assert_ledger_consistent(engine)
+
+    items = _make_items(20)
+    engine.add_to_inventory(items)
+    _assert_ledger_consistent(engine)
+
+    # 在庫から削除
+    engine.remove_from_inventory(items[3]['id'])
+    _assert_ledger_consistent(engine)
+
+    # 出品して取り下げ（在庫に戻る）
+    listed = engine.remove_from_inventory(items[5]['id'])
+    engine.add_to_auction(auction.create_auction_item(listed, 100.0))
+    _assert_ledger_consistent(engine)
+    engine.remove_from_auction(items[5]['id'])
+    _assert_ledger_consistent(engine)
+
+    # JSON経由で状態を差し替え
+    exported = engine.export_state_json()
+    other = GameEngine(TurnSystem())
+    assert other.import_state_json(exported)
+    _assert_ledger_consistent(other)
+
+    engine.reset_game()
+    assert engine.get_inventory_value() == 0
+    print("✅ 台帳と全走査の結果が一致")
+
+
+def test_indexed_collection_order_and_lookup():
+    """挿入順を保ったままID検索・削除できるか"""
+    print("=== ID索引付きコレクションテスト ===")
+    collection = IndexedCollection([{'id': i, 'v': i * 10} for i in range(1, 6)])
+
+    assert collection.get(3) == {'id': 3, 'v': 30}
+    assert collection.pop(3) == {'id': 3, 'v': 30}
+    assert collection.pop(3) is None
+    collection.append({'id': 3, 'v': 31})
+    assert collection.ids() == [1, 2, 4, 5, 3]
+    assert collection[0] == {'id': 1, 'v': 10}
+
+    removed = collection.remove_where(lambda item: item['v'] > 40)
+    assert [item['id'] for item in removed] == [5]
+    assert json.dumps(collection.to_list()) == json.dumps([{'id': 1, 'v': 10}, {'id': 2, 'v': 20},
+                                                           {'id': 4, 'v': 40}, {'id': 3, 'v': 31}])
+
+    try:
+        collection.append({'id': 1, 'v': 0})
+        assert False, "ID重複が検出されなかった"
+    except ValueError:
+        pass
+    print("✅ 挿入順・ID検索・削除が正しい")
+
+
+def test_save_load_keeps_json_shape():
+    """保存ファイルが従来どおりlist形式で、読み込み後も索引が使えるか"""
+    print("=== 保存・読み込みテスト ===")
+    engine = GameEngine(TurnSystem())
+    auction = AuctionSystem()
+    items = _make_items(5)
+    engine.add_to_inventory(items)
+    engine.add_to_auction(auction.create_auction_item(engine.remove_from_inventory(items[0]['id']), 50.0))
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'save.json')
+        engine.save_state(path)
+        with open(path, encoding='utf-8') as f:
+            saved = json.load(f)
+        assert isinstance(saved['inventory'], list) and len(saved['inventory']) == 4
+        assert saved['auction_items'][0]['item']['id'] == items[0]['id']
+
+        loaded = GameEngine(TurnSystem())
+        assert loaded.load_state(path)
+
+    assert loaded.get_inventory_item(items[2]['id']) == items[2]
+    assert loaded.get_auction_item(items[0]['id'])['start_price'] == 50.0
+    _assert_ledger_consistent(loaded)
+    print("✅ JSON形式を維持したまま索引が復元された")
+
+
+def test_state_view_is_lazy_and_copy_free():
+    """状態ビューがコピーせず、派生値を初回アクセス時のみ計算するか"""
+    print("=== 状態ビューテスト ===")
+    engine = GameEngine(TurnSystem())
+    engine.add_to_inventory(_make_items(10))
+
+    calls = {'asset_info': 0}
+    original = engine.get_asset_info
+
+    def counting_get_asset_info():
+        calls['asset_info'] += 1
+        return original()
+
+    engine.get_asset_info = counting_get_asset_info
+
+    view = engine.view()
+    assert len(view['inventory']) == 10
+    assert view['inventory'].get(1) is engine.get_inventory_item(1)  # 同一オブジェクトを共有
+    assert calls['asset_info'] == 0  # 在庫だけなら資産計算しない
+
+    view['asset_info']
+    view['game_over']
+    view['asset_info']
+    assert calls['asset_info'] == 1  # 初回のみ計算
+
+    # get_state() と同じ内容を返す
+    assert view.to_dict() == engine.get_state()
+    assert view.money == engine.state['money']
+    print("✅ コピーなし・遅延計算で get_state() と同じ内容")
+
+
+def test_item_ids_are_dense_and_unique():
+    """商品IDがゲームごとに1からの連番で発行され、保存・読み込み後も重複しないか"""
+    print("=== 商品ID採番テスト ===")
+    engine = GameEngine(TurnSystem())
+    travel = ItemSystem.get_travel_result(10, 10, 1000, price_multiplier=1.0, id_allocator=engine.id_allocator)
+    engine.add_to_inventory(travel['items'])
+    ids = engine.state['inventory'].ids()
+    assert ids == list(range(1, len(ids) + 1))
+
+    # 旧形式（時刻ベース）のIDや外部採番のIDを取り込んでも重複しない
+    legacy = _make_items(2)
+    legacy[0]['id'] = 1749000000000000
+    legacy[1]['id'] = 50
+    engine.add_to_inventory(legacy)
+    assert engine.id_allocator.allocate() == 51
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'save.json')
+        engine.save_state(path)
+        loaded = GameEngine(TurnSystem())
+        assert loaded.load_state(path)
+    assert 'next_item_id' not in loaded.state
+    assert loaded.id_allocator.allocate() == 52
+
+    loaded.reset_game()
+    assert loaded.id_allocator.allocate() == 1
+
+    # シャードごとにIDの上位ビットが分かれる
+    shard = ItemIdAllocator(shard=3)
+    assert shard.allocate() == (3 << SHARD_SHIFT) | 1
+    print("✅ 連番・重複なし・保存後も継続")
+
+
+def _reference_summary(inventory):
+    """在庫サマリーの参照実装（項目ごとに在庫を走査、金額は在庫価値台帳と同じ銭単位で合計）"""
+    cents = [round(item['base_value'] * 100) for item in inventory]
+    summary = {'total_items': len(inventory), 'total_value': round(sum(cents) / 100, 2)}
+    if inventory:
+        summary['average_value'] = round(sum(cents) / len(inventory) / 100, 2)
+    for name, key in (('genre_breakdown', 'genre'), ('rarity_breakdown', 'rarity'),
+                      ('condition_breakdown', 'condition')):
+        breakdown = {}
+        for item, item_cents in zip(inventory, cents):
+            group = breakdown.setdefault(item[key], {'count': 0, 'cents': 0})
+            group['count'] += 1
+            group['cents'] += item_cents
+        summary[name] = {label: {'count': group['count'], 'value': group['cents'] / 100}
+                         for label, group in breakdown.items()}
+    return summary
+
+
+def test_inventory_summary_cache():
+    """在庫サマリーが在庫の増減時だけ再計算され、走査結果と一致するか"""
+    print("=== 在庫サマリーキャッシュテスト ===")
+    engine = GameEngine(TurnSystem())
+    assert engine.get_inventory_summary()['total_items'] == 0
+
+    items = _make_items(30)
+    engine.add_to_inventory(items)
+    summary = engine.get_inventory_summary()
+    assert summary == _reference_summary(list(engine.state['inventory']))
+    assert summary['total_value'] == engine.get_inventory_value()  # 台帳と一致
+    assert engine.get_inventory_summary() is summary  # 変更がなければキャッシュを返す
+
+    engine.spend_money(10)  # 在庫以外の変更では破棄しない
+    assert engine.get_inventory_summary() is summary
+
+    engine.remove_from_inventory(items[4]['id'])
+    summary = engine.get_inventory_summary()
+    assert summary['total_items'] == 29
+    assert summary == _reference_summary(list(engine.state['inventory']))
+
+    other = GameEngine(TurnSystem())
+    other.add_to_inventory(_make_items(2))
+    other.get_inventory_summary()
+    assert other.import_state_json(engine.export_state_json())
+    assert other.get_inventory_summary() == summary
+
+    engine.reset_game()
+    assert engine.get_inventory_summary()['total_items'] == 0
+    print("✅ 在庫変更時のみ再計算")
+
+
+if __name__ == "__main__":
+    print("GameEngine 状態管理テスト開始\n")
+
+    test_asset_ledger_tracks_mutations()
+    test_indexed_collection_order_and_lookup()
+    test_save_load_keeps_json_shape()
+    test_state_view_is_lazy_and_copy_free()
+    test_item_ids_are_dense_and_unique()
+    test_inventory_summary_cache()
+
+    print("\nテスト完了")
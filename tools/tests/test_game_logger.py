@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+ログ管理のテスト
+本番モードの無出力・サブシステム別レベル・出力ハンドラの検証
+"""
+
+import sys
+import os
+import io
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from core.game_logger import configure_logging, get_logger
+from core.asset_manager import AssetManager
+
+
+def test_production_mode_is_silent():
+    """本番モードではホットパスのログが一切出力されないか"""
+    print("=== 本番モード無出力テスト ===")
+    stream = io.StringIO()
+    configure_logging(mode='production', stream=stream)
+    try:
+        AssetManager.get_asset_info(1000, [{'base_value': 100.0}])
+        assert not get_logger('asset').isEnabledFor(50)
+        assert stream.getvalue() == ''
+    finally:
+        configure_logging(mode='production')
+    print("✅ 出力なし")
+
+
+def test_subsystem_levels():
+    """サブシステム別レベルが反映されるか"""
+    print("=== サブシステム別レベルテスト ===")
+    stream = io.StringIO()
+    configure_logging(mode='debug', handler='stream', levels={'asset': 'WARNING'}, stream=stream)
+    try:
+        AssetManager.calculate_fixed_cost(1000)
+        get_logger('turn').debug("turn debug %d", 1)
+        output = stream.getvalue()
+        assert '固定費計算' not in output
+        assert '[timetravel.turn] turn debug 1' in output
+    finally:
+        configure_logging(mode='production')
+    print("✅ assetはWARNING未満を抑制、turnはDEBUGを出力")
+
+
+def test_buffered_and_async_handlers():
+    """バッファ・非同期ハンドラが終了時に書き出すか"""
+    print("=== バッファ・非同期ハンドラテスト ===")
+    for handler in ('buffered', 'async'):
+        stream = io.StringIO()
+        configure_logging(mode='debug', handler=handler, stream=stream)
+        get_logger('engine').debug("%s message", handler)
+        # 設定し直すと保留中のログが書き出される
+        configure_logging(mode='production')
+        assert f'{handler} message' in stream.getvalue(), handler
+    print("✅ 保留ログが書き出された")
+
+
+if __name__ == "__main__":
+    print("ログ管理テスト開始\n")
+
+    test_production_mode_is_silent()
+    test_subsystem_levels()
+    test_buffered_and_async_handlers()
+
+    print("\nテスト完了")
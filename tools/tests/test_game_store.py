@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+ゲームストア（SQLite）のテスト
+再起動後のセッション復元・リクエスト単位の差分書き込み・履歴のページング・セッション削除の検証
+"""
+
+import sys
+import os
+import io
+import random
+import sqlite3
+import subprocess
+import tempfile
+PROJECT_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')
+sys.path.insert(0, PROJECT_ROOT)
+
+from core.game_config import GameConfig
+from core.game_store import GameStore
+from core.game_logger import configure_logging
+from core.session_store import SessionStore, GameSession, activate_session, deactivate_session
+from core.item_system import ItemSystem
+from api.travel_api import travel_api
+from api.auction_api import auction_api
+
+
+def _session_factory(session_id):
+    return GameSession(session_id, rng=random.Random(7))
+
+
+def _make_items(engine, count):
+    """採番器でIDを振ったテスト用アイテム"""
+    items = []
+    for i in range(count):
+        item = ItemSystem.generate_item_with_predetermined_value(100.0 + i * 7.3, 10, 10)
+        item['id'] = engine.id_allocator.allocate()
+        items.append(item)
+    return items
+
+
+def _play(session, steps):
+    """在庫・出品・お金・ターンを一通り変更する操作列"""
+    engine = session.engine
+    for step in range(steps):
+        items = _make_items(engine, 3)
+        engine.spend_money(10)
+        engine.add_to_inventory(items)
+        listed = engine.remove_from_inventory(items[0]['id'])
+        engine.add_to_auction(session.auction_system.create_auction_item(listed, 40.0 + step))
+        engine.update_auction_item(listed['id'], {'current_price': 55.5, 'sold': step % 2 == 0})
+        engine.clear_sold_auction_items()
+        engine.earn_money(12.5)
+
+
+def _fingerprint(engine):
+    turn = engine.turn_system
+    return (engine.get_state(), turn.major_turn, turn.minor_turn, turn.target_multiplier,
+            tuple(turn.price_curve), engine.get_asset_info(), engine.id_allocator.next_id)
+
+
+def test_restore_after_restart():
+    """同じデータベースを開いた新しいSessionStoreが同じセッションIDで状態を復元するか"""
+    print("=== 再起動後の復元テスト ===")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'game.db')
+        store = GameStore(path)
+        sessions = SessionStore(session_factory=_session_factory, game_store=store)
+        session = sessions.get_or_create('player-1')
+        _play(session, 12)  # 大ターンをまたぐ
+        assert sessions.persist(session)
+        expected = _fingerprint(session.engine)
+        store.close()
+
+        # ワーカー再起動相当（プロセス内の状態は持ち越さない）
+        restarted = GameStore(path)
+        sessions = SessionStore(session_factory=_session_factory, game_store=restarted)
+        restored = sessions.get_or_create('player-1')
+        assert restored is not session
+        assert _fingerprint(restored.engine) == expected
+        assert restarted.session_ids() == ['player-1']
+
+        # 復元後の変更も続けて保存できる
+        _play(restored, 2)
+        assert sessions.persist(restored)
+        expected = _fingerprint(restored.engine)
+        again = SessionStore(session_factory=_session_factory, game_store=restarted).get_or_create('player-1')
+        assert _fingerprint(again.engine) == expected
+        restarted.close()
+    print(f"✅ 在庫{len(expected[0]['inventory'])}個・大ターン{expected[1]}を復元")
+
+
+def test_persist_writes_only_touched_rows():
+    """保存がリクエスト中に触れた在庫の行だけを書き、変更がなければ何もしないか"""
+    print("\n=== 差分書き込みテスト ===")
+    store = GameStore()
+    sessions = SessionStore(session_factory=_session_factory, game_store=store)
+    session = sessions.get_or_create('player-2')
+    session.engine.add_to_inventory(_make_items(session.engine, 500))
+    assert sessions.persist(session)
+    assert not sessions.persist(session)  # 変更なし
+
+    before = store._conn.total_changes
+    added = _make_items(session.engine, 1)
+    session.engine.add_to_inventory(added)
+    session.engine.remove_from_inventory(added[0]['id'] - 1)
+    assert sessions.persist(session)
+    written = store._conn.total_changes - before
+    assert written <= 3, written  # セッション行 + 追加1行 + 削除1行
+
+    restored = SessionStore(session_factory=_session_factory, game_store=store).get_or_create('player-2')
+    assert restored.engine.state['inventory'].ids() == session.engine.state['inventory'].ids()
+    assert restored.engine.get_inventory_value() == session.engine.get_inventory_value()
+    store.close()
+    print(f"✅ 在庫500個中の変更2件を{written}行の書き込みで保存")
+
+
+def test_history_pagination():
+    """タイムトラベル・オークション履歴がAPIから新しい順にページングで取得できるか"""
+    print("\n=== 履歴ページングテスト ===")
+    store = GameStore()
+    sessions = SessionStore(session_factory=_session_factory, game_store=store)
+    session = sessions.get_or_create('player-3')
+    token = activate_session(session)
+    try:
+        travels = 0
+        for _ in range(7):
+            if travel_api.execute_travel(5, 5)['success']:
+                travels += 1
+        sessions.persist(session)
+
+        pages, before_id = [], None
+        while True:
+            result = travel_api.get_travel_history(limit=3, before_id=before_id)
+            assert result['success']
+            pages.append(result['data']['history'])
+            before_id = result['data']['next_before_id']
+            if before_id is None:
+                break
+        history = [event for page in pages for event in page]
+        ids = [event['id'] for event in history]
+        assert len(history) == travels and ids == sorted(ids, reverse=True)
+        assert all(event['years'] == 5 and event['total_cost'] > 0 for event in history)
+        assert history[-1]['major_turn'] == 1 and history[-1]['minor_turn'] == 1
+        assert not travel_api.get_travel_history(limit=0)['success']
+
+        inventory = session.engine.state['inventory'].to_list()[:2]
+        auction_api.setup_auction([{'item_id': item['id'], 'start_price': 1.0} for item in inventory])
+        auction_api.start_auction()
+        results = auction_api.get_auction_history()['data']['history']
+        assert sorted(result['item_id'] for result in results) == sorted(item['id'] for item in inventory)
+        assert all(result['genre'] for result in results)
+    finally:
+        deactivate_session(token)
+
+    sessions.remove('player-3')
+    assert store.history('travel', 'player-3') == [] and store.session_ids() == []
+    store.close()
+    print(f"✅ {travels}件を{len(pages)}ページで取得、削除で履歴も消える")
+
+
+def test_persist_failure_is_reported_and_retried():
+    """保存の失敗が本番モードでも通知され、変更を残して次の保存で書き込み直すか"""
+    print("\n=== 保存失敗テスト ===")
+    alerts = io.StringIO()
+    configure_logging(mode='production', alert_stream=alerts)
+    store = GameStore()
+    sessions = SessionStore(session_factory=_session_factory, game_store=store)
+    try:
+        session = sessions.get_or_create('player-4')
+        _play(session, 3)
+
+        # 書き込めない接続に差し替えて保存を失敗させる
+        broken = sqlite3.connect(':memory:')
+        broken.close()
+        working, store._conn = store._conn, broken
+        assert not sessions.persist(session)
+        assert 'ゲームストアへの保存に失敗: session=player-4' in alerts.getvalue()
+        assert session.recorder.dirty and session.recorder.failures == 1 and session.recorder.last_error
+        assert sessions.get_statistics()['persist_failures'] == 1
+
+        store._conn = working
+        assert sessions.persist(session)
+        assert session.recorder.failures == 0 and not session.recorder.dirty
+        restored = SessionStore(session_factory=_session_factory, game_store=store).get_or_create('player-4')
+        assert _fingerprint(restored.engine) == _fingerprint(session.engine)
+    finally:
+        configure_logging(mode='production')
+        store.close()
+    print("✅ 本番モードでも通知され、次の保存で復旧")
+
+
+def _snapshot(path):
+    """ディレクトリの有無と各ファイルのサイズ・更新時刻"""
+    if not os.path.isdir(path):
+        return None
+    return sorted((name, os.stat(os.path.join(path, name)).st_size, os.stat(os.path.join(path, name)).st_mtime_ns)
+                  for name in os.listdir(path))
+
+
+def test_import_does_not_open_store():
+    """TIMETRAVEL_DB_PATH 未設定でも core.simulation・core.session_store のインポートでは instance/ に触れないか"""
+    print("\n=== インポート時の副作用テスト ===")
+    instance_dir = os.path.dirname(GameConfig.GAME_STORE_PATH)
+    before = _snapshot(instance_dir)
+    env = {key: value for key, value in os.environ.items() if key != 'TIMETRAVEL_DB_PATH'}
+    env['PYTHONPATH'] = PROJECT_ROOT
+    result = subprocess.run(
+        [sys.executable, '-c',
+         'import core.simulation, core.session_store; '
+         'assert core.session_store.session_store.game_store is None'],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert _snapshot(instance_dir) == before
+    print("✅ インポートではデータベースを開かない")
+
+
+if __name__ == "__main__":
+    print("ゲームストアテスト開始\n")
+
+    test_restore_after_restart()
+    test_persist_writes_only_touched_rows()
+    test_history_pagination()
+    test_persist_failure_is_reported_and_retried()
+    test_import_does_not_open_store()
+
+    print("\nテスト完了")
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+自動投資プランナーのテスト
+固定割合より期待資産が大きいこと・固定費の制約・NumPy有無での一致・API/CLIからの利用の検証
+"""
+
+import sys
+import os
+import time
+import random
+from types import SimpleNamespace
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+import core.invest_planner as invest_planner
+from core.invest_planner import InvestmentPlanner, split_exact, required_cash_ratio
+from core.asset_manager import AssetManager
+from core.turn_system import TurnSystem
+
+
+def _curves(count, seed=5):
+    rng = random.Random(seed)
+    return [TurnSystem(rng=rng).turn_multipliers for _ in range(count)]
+
+
+def _fixed_ratio_assets(money, assets, multipliers, ratio, resale_rate=None):
+    """
+    毎ターン同じ割合で投資した場合の期待資産（プランナーと同じモデル）
+
+    プランナーと同じく、商品が売れなくても残りの固定費を払えない割合ならNone
+    """
+    for t, multiplier in enumerate(multipliers):
+        fixed_cost = AssetManager.calculate_fixed_cost(assets)
+        investment = (money - fixed_cost) * ratio
+        money -= fixed_cost + investment
+        assets += investment * (multiplier - 1.0) - fixed_cost
+        if money < assets * required_cash_ratio(len(multipliers) - t - 1) - 0.01:
+            return None
+        if resale_rate is not None:
+            money += investment * multiplier * resale_rate
+            assets += investment * multiplier * (resale_rate - 1.0)
+    return assets
+
+
+def test_plan_beats_fixed_ratios():
+    """計画の期待資産が、完走できるどの固定割合よりも大きいか"""
+    print("=== 固定割合との比較テスト ===")
+    planner = InvestmentPlanner()
+    for resale_rate in (None, 1.0, 2.0):
+        for multipliers in _curves(20):
+            plan = planner.plan(100000, 100000, multipliers, resale_rate=resale_rate)
+            assert plan['covers_major_turn'] and plan['planned_turns'] == len(multipliers)
+            for ratio in (0.0, 0.1, 0.3, 0.5, 0.8, 1.0):
+                baseline = _fixed_ratio_assets(100000, 100000, multipliers, ratio, resale_rate)
+                if baseline is not None:
+                    assert plan['expected_final_assets'] >= baseline * 0.995, (resale_rate, ratio)
+    print("✅ 固定割合以上の期待資産")
+
+
+def test_fixed_cost_constraint():
+    """各ターンの後も残りの固定費を現金で払えるか、足りなければ払えるターンまで計画するか"""
+    print("=== 固定費制約テスト ===")
+    planner = InvestmentPlanner()
+    multipliers = _curves(1, seed=9)[0]
+    plan = planner.plan(5000, 10000, multipliers)
+    money = 5000
+    for t, step in enumerate(plan['steps']):
+        assert step['fixed_cost'] + step['investment'] <= money + 0.01
+        money = step['expected_money']
+        remaining = len(multipliers) - t - 1
+        assert money >= step['expected_assets'] * required_cash_ratio(remaining) - 1.0
+
+    short = planner.plan(1000, 10000, multipliers)  # 現金10%では2ターン分しか払えない
+    assert not short['covers_major_turn'] and short['planned_turns'] == 2
+    assert planner.plan(0, 10000, multipliers)['recommendation'] is None
+    print("✅ 固定費を払える範囲で計画")
+
+
+def test_numpy_and_fallback_agree():
+    """NumPyの一括計算と逐次計算で同じ計画になるか"""
+    print("=== NumPy/逐次一致テスト ===")
+    multipliers = _curves(1, seed=11)[0]
+    vectorized = InvestmentPlanner().plan(8000, 10000, multipliers, resale_rate=1.5)
+
+    numpy_module = invest_planner.np
+    invest_planner.np = None
+    try:
+        sequential = InvestmentPlanner().plan(8000, 10000, multipliers, resale_rate=1.5)
+    finally:
+        invest_planner.np = numpy_module
+
+    assert [s['ratio'] for s in vectorized['steps']] == [s['ratio'] for s in sequential['steps']]
+    assert vectorized['expected_final_assets'] == sequential['expected_final_assets']
+    print("✅ 計画が一致")
+
+
+def test_split_exact_and_speed():
+    """年数・距離の割り振りと、毎リクエストで呼べる速さ"""
+    print("=== 割り振り・速度テスト ===")
+    for amount in (0, 1, 2, 99, 1000, 123456, 10 ** 9):
+        years, distance = split_exact(amount)
+        assert years >= 1 and 0 <= amount - years * distance < max(years, 1)
+
+    planner = InvestmentPlanner()
+    multipliers = _curves(1, seed=13)[0]
+    planner.plan(9000, 10000, multipliers)  # 価値関数表を作成
+    start = time.perf_counter()
+    for money in range(1000, 10000, 100):
+        planner.plan(money, 10000, multipliers)
+    per_call = (time.perf_counter() - start) / 90
+    print(f"   1回あたり {per_call * 1000:.2f}ms")
+    assert per_call < 0.05
+    print("✅ 十分に速い")
+
+
+def test_plan_api_and_cli():
+    """計画API（ETag付き）・自動投資の strategy=plan・CLIのplanコマンド"""
+    print("=== API/CLIテスト ===")
+    from app import app
+    from cli.game_cli import run_command_mode
+    from core.session_store import session_store
+    client = app.test_client()
+    client.get('/api/reset')
+    with client.session_transaction() as cookie:
+        game_session = session_store.get(cookie['game_session_id'])
+    game_session.turn_system._apply_curve([3.0] + [1.2] * (TurnSystem.MINOR_TURNS_PER_MAJOR - 1))  # 今のターンに投資する曲線
+
+    response = client.get('/api/auto_invest/plan')
+    body = response.get_json()
+    assert response.status_code == 200 and body['success']
+    assert body['data']['remaining_turns'] == TurnSystem.MINOR_TURNS_PER_MAJOR
+    assert client.get('/api/auto_invest/plan', headers={'If-None-Match': response.headers['ETag']}).status_code == 304
+
+    step = body['data']['recommendation']
+    assert not step['skip']
+    result = client.post('/api/auto_invest', json={'strategy': 'plan'}).get_json()
+    assert result['success'] and result['auto_invest_info']['strategy'] == 'plan'
+    info = result['auto_invest_info']
+    assert (info['calculated_years'], info['calculated_distance']) == (step['years'], step['distance'])
+    assert client.get('/api/auto_invest/plan').get_json()['data']['remaining_turns'] == \
+        TurnSystem.MINOR_TURNS_PER_MAJOR - 1
+    assert not client.post('/api/auto_invest', json={'strategy': 'unknown'}).get_json()['success']
+
+    args = SimpleNamespace(command='plan', years=None, distance=None, json=True, resale_rate=2.0)
+    assert run_command_mode(args)
+    print("✅ API・CLIから利用可能")
+
+
+def test_skip_when_investing_loses():
+    """投資すると損なターンは skip=True の見送りになり、自動投資はタイムトラベルを実行しないか"""
+    print("=== 投資見送りテスト ===")
+    from app import app
+    from core.session_store import session_store
+    planner = InvestmentPlanner()
+    multipliers = [0.3] * TurnSystem.MINOR_TURNS_PER_MAJOR
+    plan = planner.plan(100000, 100000, multipliers)
+    assert plan['steps'] and all(step['skip'] and step['ratio'] == 0 for step in plan['steps'])
+    assert all((step['years'], step['distance'], step['investment']) == (0, 0, 0) for step in plan['steps'])
+    assert not planner.plan(100000, 100000, [3.0] + [0.5] * 7)['recommendation']['skip']
+
+    client = app.test_client()
+    client.get('/api/reset')
+    with client.session_transaction() as cookie:
+        game_session = session_store.get(cookie['game_session_id'])
+    game_session.turn_system._apply_curve(multipliers)
+    money, turn = game_session.engine.state['money'], game_session.turn_system.minor_turn
+
+    result = client.post('/api/auto_invest', json={'strategy': 'plan'}).get_json()
+    assert result['success'] and result['skipped']
+    assert result['auto_invest_info']['plan']['recommendation']['skip']
+    assert game_session.engine.state['money'] == money and game_session.turn_system.minor_turn == turn
+    print("✅ 見送りのターンは移動しない")
+
+
+if __name__ == "__main__":
+    print("自動投資プランナーテスト開始\n")
+
+    test_plan_beats_fixed_ratios()
+    test_fixed_cost_constraint()
+    test_numpy_and_fallback_agree()
+    test_split_exact_and_speed()
+    test_plan_api_and_cli()
+    test_skip_when_investing_loses()
+
+    print("\nテスト完了")
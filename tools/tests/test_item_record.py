@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+商品レコード（Item）と在庫の列指向ストア（ItemColumns）のテスト
+従来の商品辞書との互換性・JSON形式の不変性・メモリ削減・一括集計の検証
+"""
+
+import sys
+import os
+import json
+import random
+import tempfile
+import tracemalloc
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from core.item_record import Item, as_item, json_default
+from core.item_columns import ItemColumns
+from core.item_system import ItemSystem
+from core.id_allocator import ItemIdAllocator
+from core.game_engine import GameEngine
+
+
+def _make_items(count, seed=3):
+    return ItemSystem.generate_items(10, 50, count, rng=random.Random(seed), id_allocator=ItemIdAllocator())
+
+
+def test_item_dict_compatibility():
+    """Item が従来の商品辞書と同じキー・値で読み書きできるか"""
+    print("=== 辞書互換テスト ===")
+    item = ItemSystem.generate_item_with_predetermined_value(5000, 10, 50, rng=random.Random(1),
+                                                             id_allocator=ItemIdAllocator())
+    assert isinstance(item, Item)
+
+    data = item.to_dict()
+    assert list(item.keys()) == list(data.keys())
+    assert dict(item) == data
+    assert item == data  # Mapping同士の比較
+    assert item['condition_name'] == ItemSystem.CONDITIONS[item['condition']]['name']
+    assert Item.from_dict(data).to_dict() == data
+
+    item['genre'] = '玩具'
+    item['note'] = 'メモ'
+    assert item.genre == '玩具' and item['note'] == 'メモ'
+    assert 'display_base_value' in item
+    del item['display_base_value']
+    assert 'display_base_value' not in item and item.get('display_base_value') is None
+
+    legacy = ItemSystem.generate_item(10, 50, rng=random.Random(2))
+    assert 'estimated_price' not in legacy  # 旧仕様の生成では含まれない
+    assert as_item(legacy) is legacy
+    print("✅ 従来の辞書と同じキー・値")
+
+
+def test_json_shape_unchanged():
+    """API境界（json_default・Flask）で従来と同じJSONになるか"""
+    print("=== JSON形式テスト ===")
+    items = _make_items(5)
+    dumped = json.loads(json.dumps(items, default=json_default, ensure_ascii=False))
+    assert dumped == [item.to_dict() for item in items]
+
+    from app import app
+    with app.app_context():
+        assert json.loads(app.json.dumps({'items': items})) == {'items': dumped}
+    print("✅ JSON形式は従来のまま")
+
+
+def test_engine_round_trip():
+    """エンジンの保存・読み込みで商品がItemに戻り、列ストアが再構築されるか"""
+    print("=== セーブ往復テスト ===")
+    engine = GameEngine(id_allocator=ItemIdAllocator())
+    items = _make_items(6)
+    engine.add_to_inventory([items[0].to_dict()] + items[1:])  # 辞書で渡しても Item に変換
+    assert all(isinstance(item, Item) for item in engine.state['inventory'])
+    engine.remove_from_inventory(items[2]['id'])
+    assert len(engine.inventory_columns) == 5
+    # 在庫価値台帳は列指向ストアの銭単位の累計
+    assert engine.get_inventory_value() == sum(engine.inventory_columns.value_cents) / 100
+
+    restored = GameEngine(id_allocator=ItemIdAllocator())
+    assert restored.import_state_json(engine.export_state_json())
+    assert [item.to_dict() for item in restored.state['inventory']] == \
+        [item.to_dict() for item in engine.state['inventory']]
+    assert all(isinstance(item, Item) for item in restored.state['inventory'])
+    assert restored.inventory_columns.breakdown('genre') == engine.inventory_columns.breakdown('genre')
+    print("✅ 保存・読み込み後も同じ商品")
+
+
+def test_memory_footprint():
+    """Item が同内容の辞書より小さいか"""
+    print("=== メモリ使用量テスト ===")
+    items = _make_items(2000)
+
+    def measure(factory):
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        kept = [factory(item) for item in items]
+        size = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        del kept
+        return size
+
+    record_size = measure(Item.copy)
+    dict_size = measure(Item.to_dict)
+    print(f"   Item: {record_size / len(items):.0f} bytes/件, dict: {dict_size / len(items):.0f} bytes/件")
+    assert record_size < dict_size * 0.6
+    print("✅ 辞書より小さい")
+
+
+def test_item_columns():
+    """列指向ストアの追加・削除・集計が在庫と一致するか"""
+    print("=== 列指向ストアテスト ===")
+    items = _make_items(50)
+    columns = ItemColumns(items)
+    for item in items[::3]:
+        assert columns.remove(item['id'])
+    assert not columns.remove(items[0]['id'])
+    remaining = [item for item in items if item not in items[::3]]
+
+    assert len(columns) == len(remaining)
+    assert sorted(columns.ids) == sorted(item['id'] for item in remaining)
+    assert abs(columns.total_value() - sum(item['base_value'] for item in remaining)) < 0.01
+    assert columns.total_cents == sum(columns.value_cents)  # 累計は削除後も列と一致
+
+    expected = {}
+    for item in remaining:
+        count, cents = expected.get(item['genre'], (0, 0))
+        expected[item['genre']] = (count + 1, cents + round(item['base_value'] * 100))
+    assert columns.breakdown('genre') == {genre: {'count': count, 'value': cents / 100}
+                                          for genre, (count, cents) in expected.items()}
+
+    columns.clear()
+    assert len(columns) == 0 and columns.breakdown('genre') == {} and columns.total_cents == 0
+    print("✅ 集計が一致")
+
+
+def test_unknown_labels():
+    """コード表にないジャンル・状態・レア度は項目名付きの ValueError になり、在庫・状態を変えないか"""
+    print("=== 不明な値テスト ===")
+    item = _make_items(1)[0].to_dict()
+    for field in ('genre', 'condition', 'rarity'):
+        try:
+            Item.from_dict(dict(item, **{field: 'x'}))
+        except ValueError as e:
+            assert f"{field}='x'" in str(e)
+        else:
+            raise AssertionError(f"{field} の不明な値が通った")
+
+    engine = GameEngine(id_allocator=ItemIdAllocator())
+    engine.add_to_inventory(_make_items(2))
+    before = engine.get_state()
+    try:
+        engine.add_to_inventory([dict(item, id=999, genre='骨董品')])
+    except ValueError as e:
+        assert 'ジャンル' in str(e)
+    else:
+        raise AssertionError("不明なジャンルの商品が在庫に入った")
+    assert engine.get_state() == before and len(engine.inventory_columns) == 2
+
+    # 読み込み・インポートは失敗を返し、現在の状態を残す
+    saved = json.loads(engine.export_state_json())
+    saved['inventory'][0]['rarity'] = '超レア'
+    assert not engine.import_state_json(json.dumps(saved, ensure_ascii=False))
+    assert engine.get_state() == before
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'save.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(dict(engine._serializable_state(), inventory=saved['inventory']), f,
+                      ensure_ascii=False, default=json_default)
+        assert not engine.load_state(path)
+    assert engine.get_state() == before
+    print("✅ 項目名付きのエラーで状態はそのまま")
+
+
+def test_ledger_rejects_value_writes():
+    """在庫中の商品の価値・ジャンル・状態・レア度は書き換えられず、在庫から外せば書き換えられるか"""
+    print("=== 在庫台帳の書き換え拒否テスト ===")
+    engine = GameEngine(id_allocator=ItemIdAllocator())
+    engine.add_to_inventory(_make_items(5))
+    item = engine.state['inventory'][0]
+    total_cents = engine.inventory_columns.total_cents
+    for key, value in (('base_value', 1.0), ('genre', item['genre']), ('rarity', item['rarity'])):
+        try:
+            item[key] = value
+            assert False, f"{key} の書き換えが通った"
+        except ValueError as e:
+            assert key in str(e)
+    item['note'] = '追加キーは書ける'
+    assert engine.inventory_columns.total_cents == total_cents == round(engine.get_inventory_value() * 100)
+
+    # 読み込み直した在庫も台帳に登録される
+    restored = GameEngine(id_allocator=ItemIdAllocator())
+    assert restored.import_state_json(engine.export_state_json())
+    try:
+        restored.state['inventory'][0]['base_value'] = 1.0
+        assert False, "読み込んだ在庫の書き換えが通った"
+    except ValueError:
+        pass
+
+    # 在庫から外した商品・台帳でないストアに入れた商品は書き換えられる
+    removed = engine.remove_from_inventory(item['id'])
+    removed_cents = round(removed['base_value'] * 100)
+    removed['base_value'] = 1.0
+    loose = _make_items(1)[0]
+    ItemColumns([loose])
+    loose['base_value'] = 2.0
+    assert engine.inventory_columns.total_cents == total_cents - removed_cents
+    print("✅ 在庫中の列の値は書き換え不可")
+
+
+if __name__ == "__main__":
+    print("商品レコードテスト開始\n")
+
+    test_item_dict_compatibility()
+    test_json_shape_unchanged()
+    test_engine_round_trip()
+    test_memory_footprint()
+    test_item_columns()
+    test_unknown_labels()
+    test_ledger_rejects_value_writes()
+
+    print("\nテスト完了")
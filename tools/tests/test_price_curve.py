@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+価格倍率曲線の生成テスト
+目標倍率への厳密な一致・乗数の範囲・NumPy有無・先読みプールの再現性とリクエスト中の非生成の検証
+"""
+
+import sys
+import os
+import math
+import time
+import random
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+import core.price_curve as price_curve
+from core.price_curve import (
+    generate_curve, correct_to_target, draw_candidates, FACTOR_MIN, FACTOR_MAX
+)
+from core.turn_system import TurnSystem
+from core.game_config import GameConfig
+
+
+def test_curve_reaches_target_exactly():
+    """子ターン数に関係なく累積が目標倍率に一致し、乗数が範囲内か"""
+    print("=== 目標一致テスト ===")
+    rng = random.Random(1)
+    for turns in (4, 8, 30, 100):  # 目標10倍まで届く子ターン数
+        for _ in range(50):
+            target = rng.uniform(1.0, 10.0)
+            multipliers = generate_curve(target, turns, rng)
+            assert len(multipliers) == turns
+            assert all(FACTOR_MIN <= m <= FACTOR_MAX for m in multipliers)
+            assert abs(math.prod(multipliers) - target) <= target * 1e-9, (turns, target)
+
+    # 範囲外の目標は制限いっぱいまで
+    assert correct_to_target([1.0], 10.0) == [FACTOR_MAX]
+    print("✅ 目標倍率に一致")
+
+
+def test_candidates_follow_original_rule():
+    """一括生成の候補が従来の試行と同じ規則（理想の乗数×揺らぎ、範囲制限）か"""
+    print("=== 候補生成テスト ===")
+    candidates = draw_candidates(4.0, 8, random.Random(2), count=1000)
+    assert candidates.shape == (1000, 8)
+    assert candidates.min() >= FACTOR_MIN and candidates.max() <= FACTOR_MAX
+    # 1ターン目は理想 4^(1/8) に 0.6〜1.4 の揺らぎ
+    ideal = 4.0 ** (1 / 8)
+    assert ideal * 0.6 - 1e-9 <= candidates[:, 0].min() and candidates[:, 0].max() <= ideal * 1.4 + 1e-9
+    errors = [abs(math.prod(row) - 4.0) for row in candidates]
+    assert min(errors) < 0.05  # 候補の中には目標に近いものがある
+
+    numpy_module = price_curve.np
+    price_curve.np = None
+    try:
+        fallback = generate_curve(4.0, 8, random.Random(2))
+        assert isinstance(draw_candidates(4.0, 8, random.Random(2), count=3), list)
+    finally:
+        price_curve.np = numpy_module
+    assert abs(math.prod(fallback) - 4.0) < 1e-9
+    print("✅ 従来と同じ規則")
+
+
+def test_pool_is_reproducible():
+    """先読みのタイミングに関係なく、同じシードなら同じ曲線の並びになるか"""
+    print("=== 先読み再現性テスト ===")
+
+    def play(seed, background, size):
+        TurnSystem.CURVE_POOL_SIZE = size
+        try:
+            turn_system = TurnSystem(rng=random.Random(seed))
+        finally:
+            TurnSystem.CURVE_POOL_SIZE = 2
+        turn_system._curve_pool.background = background
+        curves = [(turn_system.target_multiplier, tuple(turn_system.turn_multipliers))]
+        for _ in range(TurnSystem.MINOR_TURNS_PER_MAJOR * 4):
+            if turn_system.advance_minor_turn():
+                curves.append((turn_system.target_multiplier, tuple(turn_system.turn_multipliers)))
+        return curves
+
+    expected = play(7, False, 0)
+    assert len(expected) == 5
+    assert play(7, True, 2) == expected
+    assert play(7, False, 3) == expected
+    assert play(8, True, 2) != expected
+    print("✅ 同じシードなら同じ曲線")
+
+
+def test_major_turn_start_uses_prefetched_curve():
+    """大ターン開始時に曲線を生成しない（先読み済みを使う）か"""
+    print("=== リクエスト中の非生成テスト ===")
+    turn_system = TurnSystem(rng=random.Random(3))
+    pool = turn_system._curve_pool
+    deadline = time.time() + 5
+    while len(pool) < pool.size and time.time() < deadline:
+        time.sleep(0.01)
+    assert len(pool) == pool.size
+
+    original = price_curve.generate_curve
+    calls = []
+    price_curve.generate_curve = lambda *args, **kwargs: calls.append(args) or original(*args, **kwargs)
+    try:
+        pool.background = False  # 補充は同期（呼び出し回数を数えるため）
+        pool.size = 0             # 取り出し後も補充しない
+        for _ in range(TurnSystem.MINOR_TURNS_PER_MAJOR):
+            turn_system.advance_minor_turn()
+    finally:
+        price_curve.generate_curve = original
+    assert turn_system.major_turn == 2 and calls == []
+    assert abs(turn_system.price_curve[-1] - turn_system.target_multiplier) < 1e-9
+    print("✅ 先読み済みの曲線を使用")
+
+
+def test_strategy_selection():
+    """TurnSystem が設定された曲線戦略で生成するか"""
+    print("=== 曲線戦略選択テスト ===")
+    assert TurnSystem(rng=random.Random(1)).curve_strategy == GameConfig.PRICE_CURVE_STRATEGY
+
+    turn_system = TurnSystem(rng=random.Random(1), curve_strategy='mean_scaled')
+    turn_system.RANDOM_MAX = 1.2
+    turn_system.generate_new_price_curve()
+    average = sum(turn_system.turn_multipliers) / len(turn_system.turn_multipliers)
+    assert abs(average - turn_system.target_multiplier) < 1e-9  # 平均が目標
+
+    # 設定変更後の大ターンは新しい戦略・設定の曲線（先読みは捨てる）
+    turn_system.curve_strategy = 'product_scaled'
+    for _ in range(TurnSystem.MINOR_TURNS_PER_MAJOR):
+        turn_system.advance_minor_turn()
+    assert abs(turn_system.price_curve[-1] - turn_system.target_multiplier) < 1e-9
+
+    try:
+        TurnSystem(curve_strategy='unknown')
+        assert False, "未登録の戦略はエラー"
+    except ValueError:
+        pass
+    print("✅ 設定した戦略で生成")
+
+
+if __name__ == "__main__":
+    print("価格倍率曲線テスト開始\n")
+
+    test_curve_reaches_target_exactly()
+    test_candidates_follow_original_rule()
+    test_pool_is_reproducible()
+    test_major_turn_start_uses_prefetched_curve()
+    test_strategy_selection()
+
+    print("\nテスト完了")
@@ -2,37 +2,26 @@
 """
 価格曲線ロジックの単体テスト
 目標倍率と8回の投資でランダムウォークしながら到達する計算を検証
+
+v1〜v3 の各方式は core/price_curve.py の曲線生成戦略（mean_scaled / product_scaled / mean_search）に
+移したため、ここでは登録済みの戦略を呼び出して結果を表示・検証する。
 """
 
+import sys
+import os
 import random
-import math
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
 
-def generate_price_curve_v1(target_multiplier, turns=8, random_min=0.5, random_max=1.8):
-    """
-    バージョン1: 各ターン倍率の平均が目標倍率になる方式
-    """
-    print(f"=== V1: 平均ベース方式 ===")
-    print(f"目標倍率: {target_multiplier:.2f}x")
-    
-    # ランダム倍率生成
-    raw_multipliers = []
-    for i in range(turns):
-        multiplier = random.uniform(random_min, random_max)
-        if i == 0 and multiplier < 1.0:  # 初回は1.0以上
-            multiplier = 1.0
-        raw_multipliers.append(multiplier)
-    
-    # 平均が目標倍率になるよう正規化
-    average = sum(raw_multipliers) / len(raw_multipliers)
-    scale_factor = target_multiplier / average
-    turn_multipliers = [m * scale_factor for m in raw_multipliers]
-    
-    print(f"生ランダム倍率: {[f'{x:.2f}' for x in raw_multipliers]}")
-    print(f"平均: {average:.2f}, スケール係数: {scale_factor:.3f}")
-    print(f"正規化後倍率: {[f'{x:.2f}' for x in turn_multipliers]}")
-    print(f"実際の平均: {sum(turn_multipliers)/len(turn_multipliers):.2f}")
-    
-    # 投資シミュレーション
+from core.price_curve import CURVE_STRATEGIES, generate_with_strategy, cumulative
+from core.curve_benchmark import benchmark_curve_strategies, format_report
+
+
+def _options(random_min, random_max):
+    return {'random_min': random_min, 'random_max': random_max, 'first_turn_min': 1.0}
+
+
+def _simulate_investment(turn_multipliers):
+    """毎ターン100円投資した場合の結果を表示し、最終倍率（総価値 / 総投資額）を返す"""
     total_investment = 0
     total_value = 0
     print("\n投資シミュレーション:")
@@ -42,136 +31,110 @@ def generate_price_curve_v1(target_multiplier, turns=8, random_min=0.5, random_m
         total_investment += investment
         total_value += value
         print(f"  ターン{i+1}: {investment}円 × {multiplier:.2f}x = {value:.0f}円")
-    
     final_multiplier = total_value / total_investment
     print(f"結果: {total_investment}円 → {total_value:.0f}円 (倍率: {final_multiplier:.2f}x)")
+    return final_multiplier
+
+
+def generate_price_curve_v1(target_multiplier, turns=8, random_min=0.5, random_max=1.8):
+    """
+    バージョン1: 各ターン倍率の平均が目標倍率になる方式（戦略 mean_scaled）
+    """
+    print(f"=== V1: 平均ベース方式 ===")
+    print(f"目標倍率: {target_multiplier:.2f}x")
+
+    turn_multipliers = generate_with_strategy('mean_scaled', target_multiplier, turns, random,
+                                              _options(random_min, random_max))
+    print(f"正規化後倍率: {[f'{x:.2f}' for x in turn_multipliers]}")
+    print(f"実際の平均: {sum(turn_multipliers)/len(turn_multipliers):.2f}")
+
+    final_multiplier = _simulate_investment(turn_multipliers)
     print(f"目標達成: {'✅' if abs(final_multiplier - target_multiplier) < 0.1 else '❌'}")
-    
+    assert abs(final_multiplier - target_multiplier) < 1e-9
+
     return turn_multipliers
 
+
 def generate_price_curve_v2(target_multiplier, turns=8, random_min=0.5, random_max=1.8):
     """
-    バージョン2: 累積乗算が目標倍率になる方式
+    バージョン2: 累積乗算が目標倍率になる方式（戦略 product_scaled）
     """
     print(f"\n=== V2: 累積乗算方式 ===")
     print(f"目標倍率: {target_multiplier:.2f}x")
-    
-    # ランダム倍率生成
-    raw_multipliers = []
-    for i in range(turns):
-        multiplier = random.uniform(random_min, random_max)
-        if i == 0 and multiplier < 1.0:  # 初回は1.0以上
-            multiplier = 1.0
-        raw_multipliers.append(multiplier)
-    
-    # 累積乗算が目標倍率になるよう正規化
-    cumulative_product = 1.0
-    for m in raw_multipliers:
-        cumulative_product *= m
-    
-    scale_factor = target_multiplier / cumulative_product
-    turn_multipliers = [m * scale_factor for m in raw_multipliers]
-    
-    print(f"生ランダム倍率: {[f'{x:.2f}' for x in raw_multipliers]}")
-    print(f"累積積: {cumulative_product:.2f}, スケール係数: {scale_factor:.3f}")
+
+    turn_multipliers = generate_with_strategy('product_scaled', target_multiplier, turns, random,
+                                              _options(random_min, random_max))
+    cumulative_values = cumulative(turn_multipliers)
     print(f"正規化後倍率: {[f'{x:.2f}' for x in turn_multipliers]}")
-    
-    # 累積値計算
-    cumulative = 1.0
-    cumulative_values = []
-    for m in turn_multipliers:
-        cumulative *= m
-        cumulative_values.append(cumulative)
-    
     print(f"累積値: {[f'{x:.2f}' for x in cumulative_values]}")
     print(f"最終累積値: {cumulative_values[-1]:.2f}")
     print(f"目標達成: {'✅' if abs(cumulative_values[-1] - target_multiplier) < 0.01 else '❌'}")
-    
+    assert abs(cumulative_values[-1] - target_multiplier) < 1e-9
+
     return turn_multipliers, cumulative_values
 
+
 def generate_price_curve_v3(target_multiplier, turns=8, random_min=0.5, random_max=1.8):
     """
-    バージョン3: 各ターンで1円投資し続けた場合の最終資産が目標倍率になる方式
+    バージョン3: 各ターンで1円投資し続けた場合の最終資産が目標倍率になる方式（戦略 mean_search、1000本から探索）
     """
     print(f"\n=== V3: 継続投資資産成長方式 ===")
     print(f"目標倍率: {target_multiplier:.2f}x")
-    
-    # 試行錯誤で目標倍率に近づける
-    best_multipliers = None
-    best_error = float('inf')
-    
-    for attempt in range(1000):  # 1000回試行
-        # ランダム倍率生成
-        raw_multipliers = []
-        for i in range(turns):
-            multiplier = random.uniform(random_min, random_max)
-            if i == 0 and multiplier < 1.0:
-                multiplier = 1.0
-            raw_multipliers.append(multiplier)
-        
-        # 継続投資シミュレーション
-        total_investment = 0
-        total_assets = 0
-        
-        for i, multiplier in enumerate(raw_multipliers):
-            # 毎ターン1円投資
-            investment = 1
-            value = investment * multiplier
-            total_investment += investment
-            total_assets += value
-        
-        final_multiplier = total_assets / total_investment
-        error = abs(final_multiplier - target_multiplier)
-        
-        if error < best_error:
-            best_error = error
-            best_multipliers = raw_multipliers.copy()
-    
+
+    best_multipliers = generate_with_strategy('mean_search', target_multiplier, turns, random,
+                                              _options(random_min, random_max))
+    best_error = abs(sum(best_multipliers) / turns - target_multiplier)
     print(f"最適解探索完了 (誤差: {best_error:.4f})")
     print(f"最適倍率: {[f'{x:.2f}' for x in best_multipliers]}")
-    
-    # 検証
-    total_investment = 0
-    total_assets = 0
-    print("\n継続投資シミュレーション:")
-    
-    for i, multiplier in enumerate(best_multipliers):
-        investment = 1
-        value = investment * multiplier
-        total_investment += investment
-        total_assets += value
-        print(f"  ターン{i+1}: {investment}円 × {multiplier:.2f}x = {value:.2f}円 (累計資産: {total_assets:.2f}円)")
-    
-    final_multiplier = total_assets / total_investment
-    print(f"結果: {total_investment}円 → {total_assets:.2f}円 (倍率: {final_multiplier:.2f}x)")
+
+    final_multiplier = _simulate_investment(best_multipliers)
     print(f"目標達成: {'✅' if abs(final_multiplier - target_multiplier) < 0.1 else '❌'}")
-    
+    # 探索は目標を見ない一様乱数から選ぶだけなので、乗数は random_min〜random_max に収まる
+    assert all(random_min <= m <= random_max for m in best_multipliers)
+
     return best_multipliers
 
+
 def test_all_approaches():
     """全てのアプローチをテスト"""
     target_multipliers = [2.5, 5.0, 7.5, 10.0]
-    
+
     for target in target_multipliers:
         print("=" * 80)
         print(f"目標倍率: {target}倍でのテスト")
         print("=" * 80)
-        
+
         # 3つの方式を比較
         v1_result = generate_price_curve_v1(target)
         v2_result = generate_price_curve_v2(target)
         v3_result = generate_price_curve_v3(target)
-        
+
         print(f"\n{'='*50}")
         print(f"目標{target}倍のテスト完了")
         print(f"{'='*50}\n")
 
+
+def test_strategy_benchmark():
+    """全戦略のベンチマーク（生成時間・目標誤差・分布）"""
+    print("=== 曲線戦略ベンチマーク ===")
+    report = benchmark_curve_strategies(curves=1000, seed=3)
+    print(format_report(report))
+    assert set(report['results']) == set(CURVE_STRATEGIES)
+    for name in ('batch', 'product_scaled'):  # 累積を目標に合わせる戦略
+        assert report['results'][name]['product_hit_rate'] == 1.0
+    batch = report['results']['batch']['multipliers']
+    assert batch['out_of_range_rate'] == 0.0 and batch['min'] >= 0.5 and batch['max'] <= 2.0
+    assert all(result['microseconds_per_curve'] > 0 for result in report['results'].values())
+    print("✅ ベンチマーク完了")
+
+
 if __name__ == "__main__":
     print("価格曲線ロジック単体テスト")
     print("3つの異なるアプローチで目標倍率達成を検証")
     print()
-    
+
     # 固定シードで再現性確保
     random.seed(42)
-    
-    test_all_approaches()
\ No newline at end of file
+
+    test_all_approaches()
+    test_strategy_benchmark()
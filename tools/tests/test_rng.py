@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+乱数生成器注入のテスト
+セッションごとの乱数の再現性・独立性・グローバル状態への非干渉の検証
+"""
+
+import sys
+import os
+import random
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+import numpy as np
+
+from core.rng import NumpyRandom, resolve_rng
+from core.session_store import GameSession
+from core.item_system import ItemSystem
+from core.simulation import play_game
+
+
+def _fingerprint(session):
+    """セッションの乱数に依存する値をまとめる（IDなど時刻依存の値は除く）"""
+    turn_system = session.turn_system
+    buyers = [
+        (tuple(buyer.interested_genres), buyer.condition_preference, buyer.price_sensitivity)
+        for buyer in session.buyer_manager.buyers
+    ]
+    travel = ItemSystem.get_travel_result(10, 50, 10000, price_multiplier=1.2, rng=session.rng)
+    items = [(item['genre'], item['condition'], item['base_value']) for item in travel['items']]
+    return turn_system.target_multiplier, tuple(turn_system.price_curve), tuple(buyers), tuple(items)
+
+
+def test_same_seed_same_game():
+    """同じシードのセッションは同じ乱数系列になるか"""
+    print("=== 同一シード再現テスト ===")
+    assert _fingerprint(GameSession('a', rng=random.Random(5))) == _fingerprint(GameSession('b', rng=random.Random(5)))
+    assert _fingerprint(GameSession('a', rng=random.Random(5))) != _fingerprint(GameSession('b', rng=random.Random(6)))
+
+    generator_a = GameSession('a', rng=np.random.default_rng(5))
+    generator_b = GameSession('b', rng=np.random.default_rng(5))
+    assert isinstance(generator_a.rng, NumpyRandom)
+    assert _fingerprint(generator_a) == _fingerprint(generator_b)
+    print("✅ random.Random / NumPy Generator とも再現")
+
+
+def test_games_do_not_interfere():
+    """ゲームを交互に進めても単独実行と同じ結果になり、グローバルのrandomに触れないか"""
+    print("=== ゲーム間独立性テスト ===")
+    alone = play_game(21, max_turns=6)
+
+    random.seed(0)
+    global_state = random.getstate()
+    first = GameSession('x', rng=random.Random(1))
+    play_game(99, max_turns=6)  # 間に別のゲームを挟む
+    second = GameSession('y', rng=random.Random(1))
+    assert _fingerprint(first) == _fingerprint(second)
+    assert play_game(21, max_turns=6) == alone
+    assert random.getstate() == global_state
+    print("✅ 互いに独立・グローバル状態は不変")
+
+
+def test_numpy_random_adapter():
+    """NumpyRandom が random.Random と同じ値域を返すか"""
+    print("=== NumPyアダプタテスト ===")
+    rng = resolve_rng(np.random.default_rng(7))
+    values = {rng.randint(2, 5) for _ in range(400)}
+    assert values == {2, 3, 4, 5}  # 上限を含む
+    assert all(0.9 <= rng.uniform(0.9, 1.1) <= 1.1 for _ in range(100))
+    assert len(set(rng.sample(ItemSystem.GENRES, 4))) == 4
+    assert rng.choices(['A', 'B'], weights=[0.0, 1.0])[0] == 'B'
+    assert 0 <= rng.getrandbits(64) < 2 ** 64
+    assert resolve_rng(None) is random
+    print("✅ 値域が一致")
+
+
+if __name__ == "__main__":
+    print("乱数生成器テスト開始\n")
+
+    test_same_seed_same_game()
+    test_games_do_not_interfere()
+    test_numpy_random_adapter()
+
+    print("\nテスト完了")
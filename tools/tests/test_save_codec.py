@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+バイナリセーブ形式のテスト
+JSONとの往復一致・列指向ブロックの遅延読み込み・GameEngine/APIからの保存と自動判別・壊れたファイルの検出の検証
+"""
+
+import sys
+import os
+import json
+import random
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+import numpy as np
+
+from core.game_engine import GameEngine
+from core.turn_system import TurnSystem
+from core.item_system import ItemSystem
+from core.item_record import Item, json_default
+from core.auction_system import AuctionSystem
+from core.save_codec import encode_state, decode_state, open_save, is_binary_save
+from core.session_store import GameSession, activate_session, deactivate_session
+from api.game_api import GameAPI
+
+
+def _make_engine(count):
+    engine = GameEngine(TurnSystem(rng=random.Random(1)))
+    items = []
+    for i in range(count):
+        item = ItemSystem.generate_item_with_predetermined_value(80.0 + i * 1.37, 10 + i % 5, 20 + i % 7)
+        item['id'] = engine.id_allocator.allocate()
+        items.append(item)
+    engine.add_to_inventory(items)
+    listed = engine.remove_from_inventory(items[0]['id'])
+    engine.add_to_auction(AuctionSystem().create_auction_item(listed, 33.0))
+    engine.spend_money(25)
+    return engine
+
+
+def test_round_trip_matches_json():
+    """バイナリ形式の往復がJSON形式と同じ内容になるか（省略可能キー・追加キー・型の混在も含む）"""
+    print("=== 往復一致テスト ===")
+    engine = _make_engine(40)
+    inventory = list(engine.state['inventory'])
+    del inventory[1]['estimated_price']          # 省略可能キーなし（None）
+    inventory[2]['note'] = {'tag': 'テスト'}     # 追加キー
+    inventory[3]['years'] = 12.5                 # 整数列に小数が混ざる
+    state = engine._snapshot_state()
+
+    decoded = decode_state(encode_state(state))
+    expected = json.loads(json.dumps(state, default=json_default))
+    actual = json.loads(json.dumps(decoded, default=json_default))
+    assert actual == expected
+    assert all(isinstance(item, Item) for item in decoded['inventory'])
+    assert decoded['inventory'][1].get('estimated_price') is None
+    assert decoded['inventory'][2]['note'] == {'tag': 'テスト'}
+    assert type(decoded['inventory'][0]['years']) is int and decoded['inventory'][3]['years'] == 12.5
+
+    assert decode_state(encode_state({'money': 5, 'inventory': []})) == {'money': 5, 'inventory': []}
+    print("✅ JSONと同じ内容")
+
+
+def test_open_save_is_lazy():
+    """mmapで開いた在庫が件数・列・個別の商品を全件生成せずに返すか"""
+    print("=== 遅延読み込みテスト ===")
+    engine = _make_engine(500)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'archive.ttsv')
+        engine.save_state_binary(path)
+        assert is_binary_save(path)
+
+        original_from_codes = Item.from_codes
+        calls = []
+        Item.from_codes = classmethod(lambda cls, *args, **kwargs: calls.append(1) or original_from_codes(*args, **kwargs))
+        try:
+            with open_save(path) as save:
+                inventory = save.inventory
+                assert len(inventory) == 499
+                assert save.meta['money'] == engine.state['money']
+                assert save.meta['turn_system'] == engine.turn_system.export_state()
+                assert list(inventory.column('id')) == engine.state['inventory'].ids()
+                total = float(inventory.as_numpy('base_value').sum())
+                assert abs(total - sum(item['base_value'] for item in engine.state['inventory'])) < 1e-6
+                assert calls == []
+
+                assert inventory[10] == engine.state['inventory'][10]
+                assert inventory[-1] == engine.state['inventory'][-1]
+                assert len(calls) == 2
+        finally:
+            Item.from_codes = original_from_codes
+        json_size = len(json.dumps(engine._serializable_state(), ensure_ascii=False, indent=2,
+                                   default=json_default).encode('utf-8'))
+        assert os.path.getsize(path) < json_size / 3
+    print("✅ 必要な分だけ生成")
+
+
+def test_engine_and_api_load_binary():
+    """GameEngine・APIがバイナリ形式で保存し、形式を判別して読み込めるか"""
+    print("=== エンジン・API読み込みテスト ===")
+    engine = _make_engine(60)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'save.ttsv')
+        engine.save_state_binary(path)
+        loaded = GameEngine(TurnSystem(rng=random.Random(2)))
+        assert loaded.load_state(path)
+        assert loaded.get_state() == engine.get_state()
+        assert loaded.get_asset_info() == engine.get_asset_info()
+        assert loaded.inventory_columns.summary() == engine.inventory_columns.summary()
+        assert all(loaded.inventory_columns.holds(item) for item in loaded.state['inventory'])
+        assert loaded.turn_system.export_state() == engine.turn_system.export_state()
+        assert loaded.id_allocator.next_id == engine.id_allocator.next_id
+
+        session = GameSession('codec', rng=random.Random(3))
+        token = activate_session(session)
+        try:
+            session.engine.add_to_inventory(list(engine.state['inventory'])[:5])
+            assert GameAPI.save_game(os.path.join(tmpdir, 'api.ttsv'), 'binary')['success']
+            assert not GameAPI.save_game(os.path.join(tmpdir, 'api.bad'), 'xml')['success']
+            session.engine.reset_game()
+            result = GameAPI.load_game(os.path.join(tmpdir, 'api.ttsv'))
+            assert result['success'] and len(result['data']['inventory']) == 5
+        finally:
+            deactivate_session(token)
+    print("✅ 保存・自動判別読み込み")
+
+
+def test_corrupt_file_fails_cleanly():
+    """範囲外のコード・途中で切れたファイルが開く時点で ValueError になり、読み込み先の状態を変えないか"""
+    print("=== 壊れたファイルテスト ===")
+    engine = _make_engine(30)
+    state = engine._snapshot_state()
+    valid = encode_state(state)
+
+    # コード表にないジャンルのコード（列の値はそのまま書き込まれる）
+    bad_item = state['inventory'][4].copy()
+    bad_item.genre_code = 99
+    bad_genre = encode_state(dict(state, inventory=state['inventory'][:4] + [bad_item]))
+
+    for name, data in (('不明なコード', bad_genre), ('途中で切れた在庫', valid[:-16]),
+                       ('途中で切れたヘッダ', valid[:6])):
+        try:
+            decode_state(data)
+            assert False, f"{name}を読み込めてしまった"
+        except ValueError as e:
+            print(f"   {name}: {e}")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'broken.ttsv')
+        with open(path, 'wb') as f:
+            f.write(bad_genre)
+        loaded = _make_engine(5)
+        before = loaded.get_state()
+        assert not loaded.load_state(path)
+        assert loaded.get_state() == before
+    print("✅ 読み込み失敗として扱う")
+
+
+if __name__ == "__main__":
+    print("バイナリセーブ形式テスト開始\n")
+
+    test_round_trip_matches_json()
+    test_open_save_is_lazy()
+    test_engine_and_api_load_binary()
+    test_corrupt_file_fails_cleanly()
+
+    print("\nテスト完了")
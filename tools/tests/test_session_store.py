@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+セッションストアのテスト
+セッションごとの状態分離・LRU破棄・アイドルタイムアウトの検証
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from core.session_store import (
+    SessionStore, GameSession, default_session,
+    get_current_session, activate_session, deactivate_session
+)
+from core.game_engine import game_engine
+from api.game_api import game_api
+
+
+class FakeClock:
+    """テスト用の手動進行クロック"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_sessions_are_isolated():
+    """セッションごとにエンジン・ターン・バイヤーが独立しているか"""
+    print("=== セッション分離テスト ===")
+    store = SessionStore(max_sessions=10, idle_timeout=60)
+    a = store.get_or_create('a')
+    b = store.get_or_create('b')
+
+    assert a.engine is not b.engine
+    assert a.turn_system is not b.turn_system
+    assert a.buyer_manager is not b.buyer_manager
+    assert a.auction_system.buyer_manager is a.buyer_manager
+
+    a.engine.spend_money(100)
+    assert a.engine.state['money'] == 900
+    assert b.engine.state['money'] == 1000
+    assert a.turn_system.minor_turn == 2
+    assert b.turn_system.minor_turn == 1
+    assert store.get_or_create('a') is a
+    print("✅ セッション間で状態が分離されている")
+
+
+def test_lru_eviction():
+    """最大数を超えたら最も古いアクセスのセッションから破棄されるか"""
+    print("=== LRU破棄テスト ===")
+    store = SessionStore(max_sessions=2, idle_timeout=60)
+    store.get_or_create('a')
+    store.get_or_create('b')
+    store.get('a')  # aを最新に
+    store.get_or_create('c')
+
+    assert 'a' in store
+    assert 'b' not in store
+    assert 'c' in store
+    assert store.get_statistics()['evicted_count'] == 1
+    print("✅ LRU順で破棄された")
+
+
+def test_idle_timeout():
+    """アイドルタイムアウトしたセッションが破棄されるか"""
+    print("=== アイドルタイムアウトテスト ===")
+    clock = FakeClock()
+    store = SessionStore(max_sessions=10, idle_timeout=60, clock=clock)
+    store.get_or_create('a')
+    clock.now += 30
+    store.get_or_create('b')
+    clock.now += 45  # aは75秒、bは45秒無操作
+
+    assert store.get('a') is None
+    assert store.get('b') is not None
+    assert store.get_statistics()['expired_count'] == 1
+    print("✅ 期限切れセッションのみ破棄された")
+
+
+def test_api_resolves_current_session():
+    """APIが現在のコンテキストのセッションを参照するか"""
+    print("=== APIセッション解決テスト ===")
+    assert get_current_session() is default_session
+    assert default_session.engine is game_engine
+
+    session = GameSession('api-test')
+    session.engine.state['money'] = 12345
+    token = activate_session(session)
+    try:
+        assert game_api.get_game_state()['data']['money'] == 12345
+    finally:
+        deactivate_session(token)
+
+    assert get_current_session() is default_session
+    print("✅ APIがリクエスト中のセッションを参照した")
+
+
+def test_requests_on_same_session_are_serialized():
+    """同じセッションへのリクエストは前のリクエストが終わるまで待ち、別のセッションは待たないか"""
+    print("=== 同一セッションの直列化テスト ===")
+    import threading
+    from app import app
+    from core.session_store import session_store
+
+    first = app.test_client()
+    first.get('/api/reset')
+    with first.session_transaction() as cookie:
+        session_id = cookie['game_session_id']
+    game_session = session_store.get(session_id)
+
+    done = threading.Event()
+
+    def request_same_session():
+        client = app.test_client()
+        with client.session_transaction() as cookie:
+            cookie['game_session_id'] = session_id
+        client.get('/api/state')
+        done.set()
+
+    game_session.lock.acquire()  # 処理中のリクエストの代わり
+    worker = threading.Thread(target=request_same_session)
+    try:
+        worker.start()
+        assert not done.wait(0.3), "処理中のセッションへのリクエストが待たずに実行された"
+        assert app.test_client().get('/api/state').status_code == 200  # 別のセッションは待たない
+    finally:
+        game_session.lock.release()
+    worker.join(5)
+    assert done.is_set() and not game_session.lock.locked()
+    print("✅ 同じセッションのリクエストは1件ずつ処理")
+
+
+if __name__ == "__main__":
+    print("セッションストアテスト開始\n")
+
+    test_sessions_are_isolated()
+    test_lru_eviction()
+    test_idle_timeout()
+    test_api_resolves_current_session()
+    test_requests_on_same_session_are_serialized()
+
+    print("\nテスト完了")
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+バランスシミュレーションのテスト
+ゲームごとの独立性・並列実行時の再現性・集計と列形式出力の検証
+"""
+
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from core.simulation import (
+    RESULT_COLUMNS, play_game, run_simulations, summarize_results,
+    write_results_csv, read_results_csv
+)
+from core.game_engine import game_engine
+from core.turn_system import turn_system
+
+
+def test_play_game_is_isolated_and_reproducible():
+    """同じシードで同じ結果になり、グローバルのゲーム状態に触れないか"""
+    print("=== 1ゲームプレイテスト ===")
+    before_money = game_engine.state['money']
+    before_turn = (turn_system.major_turn, turn_system.minor_turn)
+
+    first = play_game(42, max_turns=10)
+    second = play_game(42, max_turns=10)
+    assert first == second
+    assert first['turns'] == 10 and first['travel_count'] == 10
+    assert first['items_bought'] >= 20  # 1回2〜5個
+
+    assert game_engine.state['money'] == before_money
+    assert (turn_system.major_turn, turn_system.minor_turn) == before_turn
+    print(f"✅ 再現性あり（資産{first['asset_growth']}倍）・グローバル状態は不変")
+
+
+def test_parallel_matches_sequential():
+    """並列実行と逐次実行で同じ結果になるか"""
+    print("=== 並列実行テスト ===")
+    sequential = run_simulations(6, workers=1, seed=3, max_turns=8)
+    parallel = run_simulations(6, workers=2, seed=3, max_turns=8)
+    assert sequential == parallel
+    assert [result['game_index'] for result in parallel] == list(range(6))
+    assert len({result['seed'] for result in parallel}) == 6
+    print("✅ 並列数に関係なく同じ結果")
+
+
+def test_summary_and_columnar_output():
+    """集計値とCSVの列形式出力が正しいか"""
+    print("=== 集計・CSV出力テスト ===")
+    results = run_simulations(5, strategy='fixed', workers=1, seed=5, max_turns=8, invest_amount=200)
+    summary = summarize_results(results)
+    assert summary['games'] == 5
+    assert 0.0 <= summary['bankruptcy_rate'] <= 1.0
+    assert sum(summary['turns']['distribution'].values()) == 5
+    assert summary['asset_growth']['min'] <= summary['asset_growth']['median'] <= summary['asset_growth']['max']
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'results.csv')
+        write_results_csv(results, path)
+        columns = read_results_csv(path)
+
+    assert tuple(columns) == RESULT_COLUMNS
+    assert columns['asset_growth'] == [result['asset_growth'] for result in results]
+    assert columns['bankrupt'] == [result['bankrupt'] for result in results]
+    print("✅ 集計・列形式出力が一致")
+
+
+if __name__ == "__main__":
+    print("バランスシミュレーションテスト開始\n")
+
+    test_play_game_is_isolated_and_reproducible()
+    test_parallel_matches_sequential()
+    test_summary_and_columnar_output()
+
+    print("\nテスト完了")
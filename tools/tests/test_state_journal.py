@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+状態ジャーナル（スナップショット + 追記型ジャーナル）のテスト
+保存が変更分だけの書き込みになること・ターン状態の復元・定期スナップショット・クラッシュ後の復元の検証
+"""
+
+import sys
+import os
+import json
+import random
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from core.game_engine import GameEngine
+from core.turn_system import TurnSystem
+from core.item_system import ItemSystem
+from core.auction_system import AuctionSystem
+from core.state_journal import journal_path, read_journal
+from core.item_record import json_default
+
+
+def _make_items(engine, count):
+    """採番器でIDを振ったテスト用アイテム"""
+    items = []
+    for i in range(count):
+        item = ItemSystem.generate_item_with_predetermined_value(100.0 + i * 7.3, 10, 10)
+        item['id'] = engine.id_allocator.allocate()
+        items.append(item)
+    return items
+
+
+def _play(engine, steps):
+    """在庫・出品・お金・ターンを一通り変更する操作列"""
+    auction = AuctionSystem()
+    for step in range(steps):
+        items = _make_items(engine, 3)
+        engine.spend_money(10)
+        engine.add_to_inventory(items)
+        listed = engine.remove_from_inventory(items[0]['id'])
+        engine.add_to_auction(auction.create_auction_item(listed, 40.0 + step))
+        engine.update_auction_item(listed['id'], {'current_price': 55.5, 'sold': step % 2 == 0})
+        engine.remove_from_auction(items[0]['id']) if step % 3 == 0 else engine.clear_sold_auction_items()
+        engine.earn_money(12.5)
+
+
+def _fingerprint(engine):
+    turn = engine.turn_system
+    return (engine.get_state(), turn.major_turn, turn.minor_turn, turn.target_multiplier,
+            tuple(turn.price_curve), engine.get_asset_info(), engine.id_allocator.next_id)
+
+
+def test_save_appends_only_changes():
+    """2回目以降の保存はスナップショットを書き直さず、変更がジャーナルに追記されているか"""
+    print("=== 追記保存テスト ===")
+    engine = GameEngine(TurnSystem(rng=random.Random(1)))
+    _play(engine, 3)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'save.json')
+        engine.save_state(path)
+        with open(path, encoding='utf-8') as f:
+            snapshot = f.read()
+        assert json.loads(snapshot)['turn_system']['major_turn'] == 1
+
+        _play(engine, 12)  # 大ターンをまたぐ
+        engine.save_state(path)
+        with open(path, encoding='utf-8') as f:
+            assert f.read() == snapshot
+        with open(journal_path(path), encoding='utf-8') as f:
+            lines = f.readlines()
+        assert len(lines) == engine.journal.pending and lines[0].startswith('{')
+        assert engine.turn_system.major_turn == 2
+
+        loaded = GameEngine(TurnSystem(rng=random.Random(99)))
+        assert loaded.load_state(path)
+        engine.detach_journal()
+    assert _fingerprint(loaded) == _fingerprint(engine)
+    assert loaded.journal is None  # 読み込みだけではジャーナルを付けない
+    print(f"✅ {len(lines)}件の変更を再生して一致")
+
+
+def test_periodic_snapshot_compacts_journal():
+    """変更が間隔に達するとスナップショットを書き直してジャーナルを空にするか"""
+    print("=== 定期スナップショットテスト ===")
+    engine = GameEngine(TurnSystem(rng=random.Random(2)))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'save.json')
+        engine.save_state(path)
+        engine.journal.snapshot_interval = 10
+        _play(engine, 20)
+        assert engine.journal.pending < 10
+        snapshot, entries = read_journal(path)
+        assert snapshot['journal_sequence'] == engine.journal.sequence - engine.journal.pending
+        assert len(entries) == engine.journal.pending
+
+        loaded = GameEngine(TurnSystem(rng=random.Random(3)))
+        assert loaded.load_state(path)
+
+        # リセットもスナップショットとして記録される
+        engine.reset_game()
+        assert engine.journal.pending == 0
+        reset = GameEngine(TurnSystem(rng=random.Random(4)))
+        assert reset.load_state(path)
+        assert reset.state['money'] == 1000 and len(reset.state['inventory']) == 0
+        engine.detach_journal()
+    assert _fingerprint(loaded)[0] != _fingerprint(engine)[0]
+    print("✅ スナップショット + 残りのジャーナルで復元")
+
+
+def test_crash_recovery_replays_tail():
+    """書き込み途中の末尾行を捨て、スナップショット済みの行を読み飛ばして復元できるか"""
+    print("=== クラッシュ復元テスト ===")
+    engine = GameEngine(TurnSystem(rng=random.Random(5)))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'save.json')
+        engine.save_state(path)
+        _play(engine, 4)
+        expected = _fingerprint(engine)
+        with open(journal_path(path), encoding='utf-8') as f:
+            journal_lines = f.read()
+
+        # 書き込み途中で落ちた末尾行
+        with open(journal_path(path), 'a', encoding='utf-8') as f:
+            f.write('{"seq": 999, "op": "ea')
+        loaded = GameEngine(TurnSystem(rng=random.Random(6)))
+        assert loaded.load_state(path)
+        assert _fingerprint(loaded) == expected
+
+        # スナップショットを置き換えた直後（ジャーナルを空にする前）に落ちた場合
+        engine.journal.write_snapshot(engine._snapshot_state())
+        with open(journal_path(path), 'w', encoding='utf-8') as f:
+            f.write(journal_lines)
+        engine.detach_journal()
+        loaded = GameEngine(TurnSystem(rng=random.Random(7)))
+        assert loaded.load_state(path)
+        assert _fingerprint(loaded) == expected
+    print("✅ ジャーナル末尾から復元")
+
+
+def test_legacy_save_file_loads():
+    """従来形式（状態のみの整形JSON）の保存ファイルも読み込めるか"""
+    print("=== 従来形式読み込みテスト ===")
+    engine = GameEngine(TurnSystem(rng=random.Random(8)))
+    engine.add_to_inventory(_make_items(engine, 4))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'legacy.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(engine._serializable_state(), ensure_ascii=False, indent=2, default=json_default))
+        loaded = GameEngine(TurnSystem(rng=random.Random(9)))
+        assert loaded.load_state(path)
+    assert loaded.state['inventory'].ids() == engine.state['inventory'].ids()
+    assert loaded.get_asset_info() == engine.get_asset_info()
+    print("✅ 従来形式を読み込み")
+
+
+def test_failed_replay_keeps_live_game():
+    """ジャーナルの再生に途中で失敗しても、読み込み先のお金・ターン・在庫が元のままか"""
+    print("=== 再生失敗テスト ===")
+    source = GameEngine(TurnSystem(rng=random.Random(10)))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'save.json')
+        source.save_state(path)
+        _play(source, 12)  # 大ターンをまたぐ変更の後に不正な行
+        source.journal.append('unknown_op')
+        source.detach_journal()
+
+        live = GameEngine(TurnSystem(rng=random.Random(11)))
+        _play(live, 5)
+        expected = _fingerprint(live)
+        columns = live.inventory_columns
+        assert not live.load_state(path)
+    assert _fingerprint(live)[:-1] == expected[:-1]  # 採番器は進んだまま（IDが飛ぶだけ）
+    assert live.inventory_columns is columns and columns.total_value() == live.get_inventory_value()
+    live.add_to_inventory(_make_items(live, 1))  # 戻した状態で続けて遊べる
+    assert len(live.state['inventory']) == len(expected[0]['inventory']) + 1
+    print("✅ 読み込み前の状態のまま")
+
+
+if __name__ == "__main__":
+    print("状態ジャーナルテスト開始\n")
+
+    test_save_appends_only_changes()
+    test_periodic_snapshot_compacts_journal()
+    test_crash_recovery_replays_tail()
+    test_legacy_save_file_loads()
+    test_failed_replay_keeps_live_game()
+
+    print("\nテスト完了")
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+状態バージョン・ETag付き読み取りAPIのテスト
+状態変更時のみバージョンが進むこと・If-None-Match で304になること・操作結果の状態差分の検証
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from core.game_engine import GameEngine
+from core.turn_system import TurnSystem
+from core.item_system import ItemSystem
+from core.auction_system import AuctionSystem
+from app import app
+
+READ_ENDPOINTS = ('/api/state', '/api/inventory', '/api/auction/items', '/api/turn')
+
+
+def test_engine_version_tracks_mutations():
+    """状態を変更する操作でのみバージョンが進むか"""
+    print("=== 状態バージョンテスト ===")
+    engine = GameEngine(TurnSystem())
+    version = engine.state_version
+
+    def changed():
+        nonlocal version
+        advanced = engine.state_version > version
+        version = engine.state_version
+        return advanced
+
+    engine.view()
+    engine.get_state()
+    engine.get_inventory_summary()
+    assert not changed()
+
+    item = ItemSystem.generate_item_with_predetermined_value(500.0, 10, 10)
+    engine.add_to_inventory([item])
+    assert changed()
+    assert engine.spend_money(10) and changed()
+    assert not engine.spend_money(10 ** 9) and not changed()  # 残高不足は変更なし
+    engine.earn_money(5)
+    assert changed()
+
+    listed = engine.remove_from_inventory(item['id'])
+    assert changed()
+    engine.add_to_auction(AuctionSystem().create_auction_item(listed, 100.0))
+    assert changed()
+    engine.update_auction_item(item['id'], {'sold': True})
+    assert changed()
+    engine.clear_sold_auction_items()
+    assert changed()
+    engine.clear_sold_auction_items()  # 何も消えなければ変更なし
+    assert not changed()
+
+    tag = engine.state_tag
+    engine.reset_game()
+    assert changed() and engine.state_tag != tag
+    assert GameEngine(TurnSystem()).state_tag != GameEngine(TurnSystem()).state_tag  # エポックが異なる
+    print("✅ 変更時のみバージョンが進む")
+
+
+def test_read_endpoints_return_304():
+    """読み取りAPIがETagを返し、未変更なら304・変更後は200になるか"""
+    print("=== ETag付き読み取りAPIテスト ===")
+    client = app.test_client()
+    client.get('/api/reset')
+
+    etags = {}
+    for path in READ_ENDPOINTS:
+        response = client.get(path)
+        assert response.status_code == 200, path
+        body = response.get_json()
+        assert body['success'] and isinstance(body['state_version'], int)
+        etags[path] = response.headers['ETag']
+        assert client.get(path, headers={'If-None-Match': etags[path]}).status_code == 304
+
+    assert client.post('/api/buy', json={'years': 10, 'distance': 50}).status_code == 200
+    for path in READ_ENDPOINTS:
+        response = client.get(path, headers={'If-None-Match': etags[path]})
+        assert response.status_code == 200, path
+        assert response.headers['ETag'] != etags[path]
+
+    inventory = client.get('/api/inventory').get_json()['data']
+    assert inventory['summary']['total_items'] == len(inventory['inventory']) > 0
+
+    page = client.get('/sell')
+    assert page.status_code == 200
+    assert client.get('/sell', headers={'If-None-Match': page.headers['ETag']}).status_code == 304
+    print("✅ 未変更なら304")
+
+
+def test_operations_return_state_delta():
+    """購入・オークションの応答の差分を当てると全状態の再取得と一致するか"""
+    print("=== 状態差分テスト ===")
+    client = app.test_client()
+    client.get('/api/reset')
+    state = client.get('/api/state').get_json()
+    inventory = {item['id']: item for item in client.get('/api/inventory').get_json()['data']['inventory']}
+    version = state['state_version']
+
+    bought = client.post('/api/buy', json={'years': 10, 'distance': 50, 'state_version': version}).get_json()
+    delta = bought['data']['delta']
+    assert not delta['resync_required'] and delta['base_version'] == version
+    assert delta['turn']['changed'] and delta['money']['delta'] < 0
+    inventory.update((item['id'], item) for item in delta['inventory']['added'])
+    for item_id in delta['inventory']['removed']:
+        inventory.pop(item_id)
+
+    fresh = client.get('/api/inventory').get_json()['data']['inventory']
+    assert list(inventory.values()) == fresh
+    assert delta['inventory']['count'] == len(fresh)
+    assert delta['money']['after'] == client.get('/api/state').get_json()['data']['money']
+
+    # 出品設定後のバージョンを基準にオークション
+    listed = [{'item_id': item['id'], 'start_price': 1} for item in fresh[:2]]
+    setup = client.post('/api/auction/setup', json={'items': listed}).get_json()
+    result = client.post('/api/auction/start', json={'state_version': setup['state_version']}).get_json()
+    delta = result['data']['delta']
+    assert not delta['resync_required']
+    assert sorted(delta['auction_items']['removed']) == sorted(item['item_id'] for item in listed)
+    assert delta['auction_items']['count'] == 0
+    sold = {r['item_id'] for r in result['data']['results'] if r['sold']}
+    assert {item['id'] for item in delta['inventory']['added']} == {i['item_id'] for i in listed} - sold
+    profit = sum(r['profit'] for r in result['data']['results'] if r['sold'])
+    assert abs(delta['money']['delta'] - profit) < 0.01 * len(listed)  # 結果のprofitは丸め済み
+
+    # 古いバージョンを送ると再取得を要求
+    stale = client.post('/api/buy', json={'years': 1, 'distance': 1, 'state_version': version}).get_json()
+    assert stale['data']['delta']['resync_required']
+    print("✅ 差分から全状態を再現")
+
+
+if __name__ == "__main__":
+    print("状態バージョンテスト開始\n")
+
+    test_engine_version_tracks_mutations()
+    test_read_endpoints_return_304()
+    test_operations_return_state_delta()
+
+    print("\nテスト完了")
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+タイムトラベル履歴（台帳）のテスト
+大ターン範囲のページング・大ターンごとのROIと移動ROI・大量履歴での索引利用とメモリ・リセット時の履歴の消去の検証
+"""
+
+import sys
+import os
+import random
+import time
+import tracemalloc
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from core.game_store import GameStore
+from core.session_store import SessionStore, GameSession, activate_session, deactivate_session
+from api.travel_api import travel_api
+from api.game_api import game_api
+
+
+def _session_factory(session_id):
+    return GameSession(session_id, rng=random.Random(3))
+
+
+def _record_travels(store, session, major_turns, per_major=8, batch=10000, seed=0):
+    """大ターンごとに per_major 件のタイムトラベル履歴を batch 件ずつ書き込む（期待値計算用の大ターン別合計を返す）"""
+    rng = random.Random(seed)
+    totals = {}
+    pending = 0
+    for major in range(1, major_turns + 1):
+        for minor in range(1, per_major + 1):
+            investment = float(rng.randint(1, 400))
+            fixed = round(rng.uniform(0, 50), 2)
+            value = round(investment * rng.uniform(0.3, 2.5), 2)
+            cost, total = totals.get(major, (0.0, 0.0))
+            totals[major] = (cost + investment + fixed, total + value)
+            session.recorder.record_event('travel', {
+                'created_at': time.time(), 'major_turn': major, 'minor_turn': minor, 'years': 10, 'distance': 10,
+                'price_multiplier': 1.0, 'investment_cost': investment, 'fixed_cost': fixed,
+                'total_cost': investment + fixed, 'failed': False, 'item_count': 3, 'total_value': value,
+                'money_after': 0.0, 'assets_after': 0.0,
+            })
+            pending += 1
+            if pending == batch:
+                store.save_session(session)
+                pending = 0
+    store.save_session(session)
+    return totals
+
+
+def _open(session_id):
+    store = GameStore()
+    session = SessionStore(session_factory=_session_factory, game_store=store).get_or_create(session_id)
+    store.save_session(session)
+    return store, session
+
+
+def test_turn_range_pagination():
+    """大ターン範囲を指定した履歴が範囲内を新しい順に重複なくページングできるか"""
+    print("=== 大ターン範囲ページングテスト ===")
+    store, session = _open('ledger-1')
+    _record_travels(store, session, 30)
+
+    rows, before_id, pages = [], None, 0
+    while True:
+        page = store.history_page(session, 'travel', 5, before_id, major_from=10, major_to=12)
+        rows.extend(page['history'])
+        pages += 1
+        before_id = page['next_before_id']
+        if before_id is None:
+            break
+    keys = [(row['major_turn'], row['id']) for row in rows]
+    assert len(rows) == 24 and len(set(keys)) == 24
+    assert keys == sorted(keys, reverse=True)
+    assert all(10 <= row['major_turn'] <= 12 for row in rows)
+    store.close()
+    print(f"✅ 大ターン10～12の{len(rows)}件を{pages}ページで取得")
+
+
+def test_rolling_roi():
+    """大ターンごとのROI・移動ROIが素朴な計算と一致し、next_major_from でページングできるか"""
+    print("\n=== 移動ROIテスト ===")
+    store, session = _open('ledger-2')
+    totals = _record_travels(store, session, 25, seed=5)
+    window = 4
+
+    turns, major_from = [], 1
+    while major_from is not None:
+        result = store.travel_roi(session.session_id, window, major_from, limit=7)
+        turns.extend(result['turns'])
+        major_from = result['next_major_from']
+    assert [turn['major_turn'] for turn in turns] == list(range(1, 26))
+
+    for turn in turns:
+        major = turn['major_turn']
+        cost, value = totals[major]
+        assert turn['roi'] == round((value - cost) / cost, 4)
+        recent = [totals[m] for m in range(max(1, major - window + 1), major + 1)]
+        window_cost = sum(c for c, _ in recent)
+        window_value = sum(v for _, v in recent)
+        assert abs(turn['rolling_roi'] - (window_value - window_cost) / window_cost) < 1e-4
+        assert turn['travels'] == 8
+
+    # 途中の大ターンからでも移動ROIは手前の大ターンを含めて計算する
+    middle = store.travel_roi(session.session_id, window, 10, 12)['turns']
+    assert middle == turns[9:12]
+    store.close()
+    print(f"✅ 25大ターンのROI・{window}大ターン移動ROIが一致")
+
+
+def test_large_ledger_uses_index_in_constant_memory():
+    """20万件の履歴でも大ターン範囲・ROIの問い合わせが索引を使い、メモリが件数に比例しないか"""
+    print("\n=== 大量履歴テスト ===")
+    store, session = _open('ledger-3')
+    _record_travels(store, session, 25000)  # 20万件
+
+    for query, params in (
+        ('SELECT id FROM travel_events WHERE session_id = ? AND major_turn >= ? AND major_turn <= ?'
+         ' ORDER BY major_turn DESC, id DESC LIMIT 20', (session.session_id, 100, 200)),
+        ('SELECT major_turn, SUM(total_cost) FROM travel_events WHERE session_id = ? AND major_turn >= ?'
+         ' GROUP BY major_turn ORDER BY major_turn', (session.session_id, 1)),
+    ):
+        plan = ' '.join(row[-1] for row in store._conn.execute('EXPLAIN QUERY PLAN ' + query, params))
+        assert 'idx_travel_events_turn' in plan and 'TEMP B-TREE' not in plan, plan
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    page = store.history_page(session, 'travel', 100, major_from=20000, major_to=24000)
+    roi = store.travel_roi(session.session_id, 3, 1, limit=100)
+    tail = store.travel_roi(session.session_id, 3, 24950, limit=100)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert len(page['history']) == 100 and page['history'][0]['major_turn'] == 24000
+    assert len(roi['turns']) == 100 and roi['next_major_from'] == 101
+    assert [turn['major_turn'] for turn in tail['turns']] == list(range(24950, 25001))
+    assert peak < 1024 * 1024, peak
+    store.close()
+    print(f"✅ 20万件: 問い合わせ{elapsed * 1000:.1f}ms・最大{peak / 1024:.0f}KB")
+
+
+def test_api_and_reset():
+    """execute_travel が台帳に記録され、APIから参照でき、リセットで履歴が消えるか"""
+    print("\n=== API・リセットテスト ===")
+    store = GameStore()
+    sessions = SessionStore(session_factory=_session_factory, game_store=store)
+    session = sessions.get_or_create('ledger-4')
+    token = activate_session(session)
+    try:
+        travels = sum(1 for _ in range(10) if travel_api.execute_travel(5, 5)['success'])
+        result = travel_api.get_travel_roi(window=2)
+        assert result['success']
+        assert sum(turn['travels'] for turn in result['data']['turns']) == travels
+        history = travel_api.get_travel_history(major_from=2)['data']['history']
+        assert all(event['major_turn'] >= 2 for event in history)
+        assert not travel_api.get_travel_history(major_from=3, major_to=2)['success']
+        assert not travel_api.get_travel_roi(window=0)['success']
+
+        game_api.reset_game()
+        sessions.persist(session)
+        assert travel_api.get_travel_history()['data']['history'] == []
+        assert travel_api.execute_travel(5, 5)['success']
+        history = travel_api.get_travel_history()['data']['history']
+        assert len(history) == 1 and history[0]['major_turn'] == 1 and history[0]['minor_turn'] == 1
+    finally:
+        deactivate_session(token)
+    store.close()
+    print(f"✅ {travels}件を記録・リセット後は新しいゲームの分のみ")
+
+
+if __name__ == "__main__":
+    print("タイムトラベル履歴テスト開始\n")
+
+    test_turn_range_pagination()
+    test_rolling_roi()
+    test_large_ledger_uses_index_in_constant_memory()
+    test_api_and_reset()
+
+    print("\nテスト完了")
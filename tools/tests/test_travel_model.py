@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+タイムトラベル価値モデルのテスト
+解析的に求めた平均・分散・分位点・ゲームオーバー確率がサンプリング結果と一致するかの検証
+"""
+
+import sys
+import os
+import random
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from core.item_system import ItemSystem
+from core.id_allocator import ItemIdAllocator
+from core.travel_model import TravelValueModel, evaluate_travel
+
+
+def _sample_totals(years, distance, price_multiplier, count, seed=5):
+    """get_travel_result を実際に回した総価値の標本"""
+    rng = random.Random(seed)
+    allocator = ItemIdAllocator()
+    totals = []
+    for _ in range(count):
+        result = ItemSystem.get_travel_result(years, distance, 10 ** 9, price_multiplier=price_multiplier,
+                                              rng=rng, id_allocator=allocator)
+        totals.append(sum(item['base_value'] for item in result['items']))
+    return sorted(totals)
+
+
+def test_moments_match_sampling():
+    """平均・標準偏差・分位点がサンプリングと一致するか"""
+    print("=== 分布一致テスト ===")
+    years, distance, multiplier = 20, 300, 1.37
+    totals = _sample_totals(years, distance, multiplier, 4000)
+    model = TravelValueModel(ItemSystem.calculate_travel_cost(years, distance), multiplier)
+
+    mean = sum(totals) / len(totals)
+    std = (sum((t - mean) ** 2 for t in totals) / (len(totals) - 1)) ** 0.5
+    print(f"   平均: 解析{model.mean:.1f} / 標本{mean:.1f}, 標準偏差: 解析{model.std:.1f} / 標本{std:.1f}")
+    assert abs(mean - model.mean) < 4 * model.std / len(totals) ** 0.5
+    assert abs(std - model.std) / model.std < 0.05
+    for q in (0.05, 0.5, 0.95):
+        empirical = totals[int(q * len(totals))]
+        assert abs(empirical - model.quantile(q)) < 0.02 * model.mean, q
+    assert abs(model.cdf(model.quantile(0.3)) - 0.3) < 1e-12
+    print("✅ サンプリングと一致")
+
+
+def test_failure_mixture():
+    """失敗率を含む混合分布の平均・分散・分位点"""
+    print("=== 失敗混合テスト ===")
+    model = TravelValueModel(1000, 1.0, failure_rate=0.1)
+    assert abs(model.mean - 900.0) < 1e-9
+    # E[V^2] = 0.9 × (0.9² + 0.9×1.1 + 1.1²)/3 × 1000²
+    second = 0.9 * (0.81 + 0.99 + 1.21) / 3 * 1e6
+    assert abs(model.variance - (second - 900.0 ** 2)) < 1e-6
+    assert model.quantile(0.05) == 0.0 and model.cdf(1.0) == 0.1
+    assert abs(model.quantile(0.55) - 1000.0) < 1e-9
+    print("✅ 混合分布が正しい")
+
+
+def test_game_over_probability():
+    """購入後のゲームオーバー確率が実際の判定と一致するか"""
+    print("=== ゲームオーバー確率テスト ===")
+    # 資産に対して投資が大きい場合: 価格倍率が低いと資産が目減りする
+    evaluation = evaluate_travel(10, 90, money=1000, assets=1000, price_multiplier=0.1)
+    assert evaluation['affordable']
+    assert evaluation['game_over_probability'] == 0.0  # 購入可能なら資産は負にならない
+    assert evaluation['loss_probability'] == 1.0
+    assert evaluation['expected_profit'] < 0
+
+    # 倍率1.0: 総費用 = 900 + 50 に対し価値は 810〜990 → 損失確率は (950-810)/180
+    evaluation = evaluate_travel(10, 90, money=1000, assets=1000, price_multiplier=1.0)
+    assert abs(evaluation['loss_probability'] - round((950 - 810) / 180, 4)) < 1e-9
+    assert evaluation['value']['quantiles']['0.5'] == 900.0
+
+    # 所持金が足りなければ評価のみ（確率はなし）
+    evaluation = evaluate_travel(100, 100, money=1000, assets=1000, price_multiplier=1.0)
+    assert not evaluation['affordable'] and evaluation['game_over_probability'] is None
+    print("✅ リスク指標が一致")
+
+
+if __name__ == "__main__":
+    print("タイムトラベル価値モデルテスト開始\n")
+
+    test_moments_match_sampling()
+    test_failure_mixture()
+    test_game_over_probability()
+
+    print("\nテスト完了")
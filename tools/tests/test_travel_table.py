@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+タイムトラベル早見表のテスト
+メモ化したレア度倍率が元の式と一致すること・飽和点での圧縮・スライダー用の表の補間精度の検証
+"""
+
+import sys
+import os
+import random
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from core.item_system import ItemSystem
+from core.travel_table import (
+    TravelTable, YEARS_SATURATION, DISTANCE_SATURATION, COST_SATURATION
+)
+from core.travel_config import YEARS_MIN, YEARS_MAX, DISTANCE_MIN, DISTANCE_MAX
+
+
+def _sample_points(count=20000, seed=11):
+    """境界・飽和点付近を含む年数・距離の組"""
+    rng = random.Random(seed)
+    special_years = [YEARS_MIN, YEARS_SATURATION - 1, YEARS_SATURATION, YEARS_SATURATION + 1, YEARS_MAX]
+    special_distances = [DISTANCE_MIN, DISTANCE_SATURATION - 1, DISTANCE_SATURATION,
+                         DISTANCE_SATURATION + 1, DISTANCE_MAX]
+    points = [(y, d) for y in special_years for d in special_distances]
+    for _ in range(count):
+        # 対数的にばらつかせて小さい値も十分に含める
+        years = min(YEARS_MAX, int(10 ** rng.uniform(0, 6)))
+        distance = min(DISTANCE_MAX, int(10 ** rng.uniform(0, 6)) - 1)
+        points.append((years, distance))
+    return points
+
+
+def test_rarity_matches_formula():
+    """メモ化したレア度倍率が ItemSystem の式と完全に一致するか"""
+    print("=== レア度倍率一致テスト ===")
+    table = TravelTable()
+    for years, distance in _sample_points():
+        assert table.rarity_multiplier(years, distance) == ItemSystem.calculate_rarity_multiplier(years, distance), \
+            (years, distance)
+    # 飽和点より先は同じキーに圧縮される
+    assert table.compress(YEARS_MAX, DISTANCE_MAX) == (YEARS_SATURATION, DISTANCE_SATURATION, COST_SATURATION)
+    assert table.rarity_multiplier(YEARS_MAX, DISTANCE_MAX) == table.rarity_multiplier(
+        YEARS_SATURATION, DISTANCE_SATURATION)
+    info = table.cache_info()
+    print(f"   キャッシュ: {info.currsize}件 (ヒット{info.hits}回)")
+    assert info.hits > 0
+    print("✅ 元の式と一致")
+
+
+def test_lookup_rows():
+    """早見表の1行がコスト・期待値の定義どおりか"""
+    print("=== 早見表テスト ===")
+    table = TravelTable()
+    row = table.lookup(30, 500, price_multiplier=1.2)
+    assert row['cost'] == ItemSystem.calculate_travel_cost(30, 500)
+    assert row['rarity_name'] == ItemSystem.get_rarity_name(row['rarity_multiplier'])
+    value_range = row['value_range']
+    assert value_range['min'] < value_range['avg'] < value_range['max']
+    assert abs(value_range['avg'] - row['cost'] * 1.2) < 1e-9
+    assert table.expected_value(30, 500, 1.2) == value_range['avg']
+    print("✅ コスト・期待値が一致")
+
+
+def test_slider_table_interpolation():
+    """スライダー用の圧縮表の補間が元の式と±0.01以内で一致するか"""
+    print("=== スライダー表補間テスト ===")
+    slider = TravelTable.slider_table()
+    worst = 0.0
+    for years, distance in _sample_points(5000):
+        exact = ItemSystem.calculate_rarity_multiplier(years, distance)
+        worst = max(worst, abs(TravelTable.interpolate(slider, years, distance) - exact))
+    print(f"   最大誤差: {worst:.4f}")
+    assert worst <= 0.0100001
+    print("✅ 補間誤差は丸め1桁以内")
+
+
+if __name__ == "__main__":
+    print("タイムトラベル早見表テスト開始\n")
+
+    test_rarity_matches_formula()
+    test_lookup_rows()
+    test_slider_table_interpolation()
+
+    print("\nテスト完了")